@@ -4,6 +4,11 @@ from django.urls import path
 from rest_framework.routers import DefaultRouter
 from rest_framework.routers import SimpleRouter
 
+from kancraonewms.audit.api.views import AuditEntryViewSet
+from kancraonewms.core.api.views import DatabasePoolMetricsView
+from kancraonewms.core.transactions import atomic_writes_patterns
+from kancraonewms.inventory.api.views import CycleCountTaskViewSet
+from kancraonewms.inventory.api.views import StockAvailabilityViewSet
 from kancraonewms.master.api.views import AccessibilityViewSet
 from kancraonewms.master.api.views import ItemUOMViewSet
 from kancraonewms.master.api.views import ItemViewSet
@@ -11,7 +16,9 @@ from kancraonewms.master.api.views import MenuViewSet
 from kancraonewms.master.api.views import RackViewSet
 from kancraonewms.master.api.views import RoleMenuAccessViewSet
 from kancraonewms.master.api.views import RoleViewSet
+from kancraonewms.master.api.views import UOMCacheMetricsView
 from kancraonewms.master.api.views import UOMViewSet
+from kancraonewms.master.api.views import UserRoleViewSet
 from kancraonewms.organizations.api.views import CompanyViewSet
 from kancraonewms.organizations.api.views import WarehouseViewSet
 from kancraonewms.users.api.views import UserViewSet
@@ -29,11 +36,32 @@ router.register("roles", RoleViewSet)
 router.register("accessibilities", AccessibilityViewSet)
 router.register("menus", MenuViewSet)
 router.register("role-menu-accesses", RoleMenuAccessViewSet)
+router.register("user-roles", UserRoleViewSet)
+router.register("cycle-count-tasks", CycleCountTaskViewSet)
+router.register("audit-entries", AuditEntryViewSet)
+router.register(
+    "stock-availability",
+    StockAvailabilityViewSet,
+    basename="stock-availability",
+)
 
 
 app_name = "api"
 urlpatterns = [  # noqa: RUF005
     # Auth endpoints
     path("auth/", include("kancraonewms.users.api.auth_urls")),
+    # Instrumentation endpoints
+    path(
+        "metrics/db-pool/",
+        DatabasePoolMetricsView.as_view(),
+        name="db-pool-metrics",
+    ),
+    path(
+        "metrics/uom-cache/",
+        UOMCacheMetricsView.as_view(),
+        name="uom-cache-metrics",
+    ),
     # Router endpoints
 ] + router.urls
+# Reads run outside the ATOMIC_REQUESTS transaction
+atomic_writes_patterns(urlpatterns)
@@ -10,6 +10,7 @@ https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
 
 import os
 import sys
+import time
 from pathlib import Path
 
 from django.core.asgi import get_asgi_application
@@ -31,6 +32,8 @@ from config.websocket import websocket_application  # noqa: E402
 
 async def application(scope, receive, send):
     if scope["type"] == "http":
+        # Start of the queue latency measured by LoadSheddingMiddleware
+        scope["received_at"] = time.monotonic()
         await django_application(scope, receive, send)
     elif scope["type"] == "websocket":
         await websocket_application(scope, receive, send)
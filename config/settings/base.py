@@ -1,10 +1,13 @@
 # ruff: noqa: ERA001, E501
 """Base settings to build other settings files upon."""
 
+import os
 import ssl
 from pathlib import Path
 
 import environ
+from celery.schedules import crontab
+from corsheaders.defaults import default_headers
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
 # kancraonewms/
@@ -48,6 +51,17 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Read replicas, e.g. DATABASE_REPLICA_URLS=postgres://replica1/db,postgres://...
+# Safe requests read from them, see kancraonewms.core.replicas
+for _index, _url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), 1):
+    DATABASES[f"replica{_index}"] = env.db_url_config(_url)
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["kancraonewms.core.replicas.ReplicaRouter"]
+# Seconds a caller reads from the primary after writing
+REPLICA_PIN_SECONDS = env.int("DJANGO_REPLICA_PIN_SECONDS", default=5)
+# Replicas further behind than this many seconds are not read from
+REPLICA_MAX_LAG = env.float("DJANGO_REPLICA_MAX_LAG", default=2.0)
+REPLICA_LAG_CHECK_INTERVAL = env.float("DJANGO_REPLICA_LAG_CHECK_INTERVAL", default=5.0)
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -92,9 +106,12 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    "kancraonewms.core",
     "kancraonewms.users",
     "kancraonewms.master",
     "kancraonewms.organizations",
+    "kancraonewms.inventory",
+    "kancraonewms.audit",
     # Your stuff: custom apps go here
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -124,7 +141,9 @@ LOGIN_URL = "account_login"
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
 PASSWORD_HASHERS = [
     # https://docs.djangoproject.com/en/dev/topics/auth/passwords/#using-argon2-with-django
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    # Reads and writes the stock "argon2" format; the stock hasher is left out
+    # so that it does not take over the algorithm name from the pooled one.
+    "kancraonewms.users.hashers.PooledArgon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
@@ -143,6 +162,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "kancraonewms.core.middleware.LoadSheddingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -151,6 +171,9 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "kancraonewms.audit.middleware.AuditMiddleware",
+    "kancraonewms.core.replicas.ReplicaMiddleware",
+    "kancraonewms.core.idempotency.IdempotencyMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
@@ -312,6 +335,38 @@ CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERY_WORKER_SEND_TASK_EVENTS = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_send_sent_event
 CELERY_TASK_SEND_SENT_EVENT = True
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-schedule
+# The DatabaseScheduler syncs these entries into django_celery_beat on startup.
+CELERY_BEAT_SCHEDULE = {
+    "inventory-classify-items-abc": {
+        "task": "kancraonewms.inventory.tasks.classify_items_abc",
+        "schedule": crontab(minute=0, hour=1),
+    },
+    "inventory-generate-cycle-count-tasks": {
+        "task": "kancraonewms.inventory.tasks.generate_cycle_count_tasks",
+        "schedule": crontab(minute=0, hour=2),
+    },
+    "inventory-reconcile-cycle-counts": {
+        "task": "kancraonewms.inventory.tasks.reconcile_cycle_counts",
+        "schedule": crontab(minute=0, hour=3),
+    },
+    "inventory-ensure-stock-partitions": {
+        "task": "kancraonewms.inventory.tasks.ensure_stock_partitions",
+        "schedule": crontab(minute=30, hour=0),
+    },
+    "inventory-refresh-stock-summaries": {
+        "task": "kancraonewms.inventory.tasks.refresh_stock_summaries",
+        "schedule": crontab(minute=30, hour=3),
+    },
+    "audit-ensure-partitions": {
+        "task": "kancraonewms.audit.tasks.ensure_audit_partitions",
+        "schedule": crontab(minute=45, hour=0),
+    },
+    "users-prune-outstanding-tokens": {
+        "task": "kancraonewms.users.tasks.prune_outstanding_tokens",
+        "schedule": crontab(minute=15),
+    },
+}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-hijack-root-logger
 CELERY_WORKER_HIJACK_ROOT_LOGGER = False
 # django-allauth
@@ -337,12 +392,17 @@ SOCIALACCOUNT_FORMS = {"signup": "kancraonewms.users.forms.UserSocialSignupForm"
 # django-rest-framework - https://www.django-rest-framework.org/api-guide/settings/
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.TokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_THROTTLE_RATES": {
+        "auth_ip": env("THROTTLE_AUTH_IP", default="30/min"),
+        "auth_username": env("THROTTLE_AUTH_USERNAME", default="5/min"),
+        "token_refresh": env("THROTTLE_TOKEN_REFRESH", default="60/min"),
+    },
 }
 
 # Simple JWT
@@ -362,11 +422,14 @@ SIMPLE_JWT = {
     "USER_ID_FIELD": "id",
     "USER_ID_CLAIM": "user_id",
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
+    "TOKEN_USER_CLASS": "kancraonewms.users.authentication.LazyUser",
     "TOKEN_TYPE_CLAIM": "token_type",
 }
 
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
 CORS_URLS_REGEX = r"^/api/.*$"
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+CORS_EXPOSE_HEADERS = ["Idempotent-Replayed", "Retry-After"]
 
 # By Default swagger ui is available only to admin user(s). You can change permission classes to change that
 # See more configuration options at https://drf-spectacular.readthedocs.io/en/latest/settings.html#settings
@@ -389,3 +452,61 @@ WEBPACK_LOADER = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Authentication
+# ------------------------------------------------------------------------------
+# Seconds a user loaded by stateless JWT authentication stays cached
+AUTH_USER_CACHE_TIMEOUT = env.int("AUTH_USER_CACHE_TIMEOUT", default=60)
+# Embed the role permission bitmap in access tokens
+JWT_PERMISSION_BITMAP = env.bool("JWT_PERMISSION_BITMAP", default=False)
+# Threads hashing passwords concurrently in each process
+PASSWORD_HASHING_WORKERS = env.int("PASSWORD_HASHING_WORKERS", default=os.cpu_count())
+# Argon2 costs (Django defaults); memory_cost is in KiB per hash
+PASSWORD_HASHING_ARGON2 = {
+    "time_cost": env.int("ARGON2_TIME_COST", default=2),
+    "memory_cost": env.int("ARGON2_MEMORY_COST", default=102400),
+    "parallelism": env.int("ARGON2_PARALLELISM", default=8),
+}
+# Load shedding
+# ------------------------------------------------------------------------------
+# Average seconds requests wait for a worker before shedding starts (0: never)
+LOAD_SHEDDING_QUEUE_LATENCY = env.float("LOAD_SHEDDING_QUEUE_LATENCY", default=0.5)
+# Path prefixes whose requests may be shed
+LOAD_SHEDDING_PATHS = env.list("LOAD_SHEDDING_PATHS", default=["/api/"])
+# Proxy addresses or networks whose X-Request-Start header is trusted
+LOAD_SHEDDING_TRUSTED_PROXIES = env.list("LOAD_SHEDDING_TRUSTED_PROXIES", default=[])
+# Idempotency keys
+# ------------------------------------------------------------------------------
+# Seconds a response is replayed for retries carrying the same Idempotency-Key
+IDEMPOTENCY_TTL = env.int("IDEMPOTENCY_TTL", default=24 * 60 * 60)
+# Seconds a request holds its key; duplicates arriving meanwhile get 409
+IDEMPOTENCY_LOCK_TIMEOUT = env.int("IDEMPOTENCY_LOCK_TIMEOUT", default=30)
+# Path prefixes honouring the Idempotency-Key header
+IDEMPOTENCY_PATHS = env.list("IDEMPOTENCY_PATHS", default=["/api/"])
+# Stock partitioning
+# ------------------------------------------------------------------------------
+# Monthly stock movement partitions kept created ahead of the current month
+STOCK_MOVEMENT_PARTITION_MONTHS_AHEAD = env.int(
+    "STOCK_MOVEMENT_PARTITION_MONTHS_AHEAD",
+    default=3,
+)
+# Audit trail
+# ------------------------------------------------------------------------------
+# Write the entries buffered by a request from a Celery task instead of the request
+AUDIT_ASYNC = env.bool("AUDIT_ASYNC", default=False)
+# Monthly audit trail partitions kept created ahead of the current month
+AUDIT_PARTITION_MONTHS_AHEAD = env.int("AUDIT_PARTITION_MONTHS_AHEAD", default=3)
+# Days the audit trail API reads back when not given ``since`` or an object
+AUDIT_QUERY_DAYS = env.int("AUDIT_QUERY_DAYS", default=30)
+# Cycle counting
+# ------------------------------------------------------------------------------
+# Outbound movement window used to compute item velocity for ABC classification
+CYCLE_COUNT_VELOCITY_DAYS = env.int("CYCLE_COUNT_VELOCITY_DAYS", default=90)
+# Cumulative velocity share closing class A and class B
+CYCLE_COUNT_ABC_THRESHOLDS = (0.8, 0.95)
+# Working days between two counts of the same item-rack pair, per ABC class
+CYCLE_COUNT_INTERVALS = {"A": 20, "B": 60, "C": 240}
+# numpy.busday weekmask (Monday first) and holidays (ISO dates) of the count calendar
+CYCLE_COUNT_WEEKMASK = env("CYCLE_COUNT_WEEKMASK", default="1111100")
+CYCLE_COUNT_HOLIDAYS = env.list("CYCLE_COUNT_HOLIDAYS", default=[])
+# Rows per bulk insert/update and per reconciliation transaction
+CYCLE_COUNT_BATCH_SIZE = env.int("CYCLE_COUNT_BATCH_SIZE", default=5000)
@@ -7,6 +7,8 @@ from sentry_sdk.integrations.django import DjangoIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
 from sentry_sdk.integrations.redis import RedisIntegration
 
+from kancraonewms.core.db import pool_options
+
 from .base import *  # noqa: F403
 from .base import DATABASES
 from .base import INSTALLED_APPS
@@ -23,7 +25,26 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["putram.works@gmail.co
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# https://docs.djangoproject.com/en/stable/ref/databases/#connection-pool
+# One psycopg pool per worker process, shared by the threads UvicornWorker runs
+# sync views in. Sized from the server's connection limit and the gunicorn
+# worker count; DJANGO_DB_POOL=False falls back to persistent connections.
+# The read replicas get a pool of the same size.
+if env.bool("DJANGO_DB_POOL", default=True):
+    _pool = pool_options(
+        workers=env.int("WEB_CONCURRENCY", default=1),
+        max_connections=env.int("DJANGO_DB_MAX_CONNECTIONS", default=100),
+        reserved=env.int("DJANGO_DB_RESERVED_CONNECTIONS", default=20),
+        max_size=env.int("DJANGO_DB_POOL_MAX_SIZE", default=None),
+        min_size=env.int("DJANGO_DB_POOL_MIN_SIZE", default=None),
+        timeout=env.float("DJANGO_DB_POOL_TIMEOUT", default=10.0),
+    )
+    for _database in DATABASES.values():
+        _database["CONN_MAX_AGE"] = 0
+        _database.setdefault("OPTIONS", {})["pool"] = dict(_pool)
+else:
+    for _database in DATABASES.values():
+        _database["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
 
 # CACHES
 # ------------------------------------------------------------------------------
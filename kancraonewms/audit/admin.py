@@ -0,0 +1,28 @@
+from django.contrib import admin
+
+from .models import AuditEntry
+
+
+@admin.register(AuditEntry)
+class AuditEntryAdmin(admin.ModelAdmin):
+    list_display = ["created_at", "action", "content_type", "object_id", "user"]
+    list_filter = ["action", "content_type", "created_at"]
+    search_fields = ["=object_id", "user__username"]
+    ordering = ["-created_at"]
+    readonly_fields = [
+        "content_type",
+        "object_id",
+        "action",
+        "changes",
+        "user",
+        "created_at",
+    ]
+    list_select_related = ["content_type", "user"]
+    show_full_result_count = False
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
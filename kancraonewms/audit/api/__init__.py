@@ -0,0 +1 @@
+"""Audit API package"""
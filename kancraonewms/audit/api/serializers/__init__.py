@@ -0,0 +1,9 @@
+"""Audit API serializers package"""
+
+from .audit_entry import AuditEntryQuerySerializer
+from .audit_entry import AuditEntrySerializer
+
+__all__ = [
+    "AuditEntryQuerySerializer",
+    "AuditEntrySerializer",
+]
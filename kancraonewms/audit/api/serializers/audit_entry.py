@@ -0,0 +1,64 @@
+from django.contrib.contenttypes.models import ContentType
+from rest_framework import serializers
+
+from kancraonewms.audit.models import AuditEntry
+
+
+class AuditEntrySerializer(serializers.ModelSerializer):
+    """Serializer for AuditEntry model"""
+
+    model = serializers.SerializerMethodField()
+    username = serializers.CharField(
+        source="user.username",
+        read_only=True,
+        default=None,
+    )
+
+    class Meta:
+        model = AuditEntry
+        fields = [
+            "id",
+            "model",
+            "object_id",
+            "action",
+            "changes",
+            "user",
+            "username",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+    def get_model(self, obj) -> str:
+        return f"{obj.content_type.app_label}.{obj.content_type.model}"
+
+
+class AuditEntryQuerySerializer(serializers.Serializer):
+    """Query parameters of the audit trail list"""
+
+    model = serializers.CharField(
+        required=False,
+        help_text="Audited model as app_label.model, e.g. master.item",
+    )
+    object_id = serializers.IntegerField(required=False)
+    user = serializers.IntegerField(required=False)
+    action = serializers.ChoiceField(
+        choices=AuditEntry.ACTION_CHOICES,
+        required=False,
+    )
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate_model(self, value):
+        app_label, _, model = value.lower().partition(".")
+        try:
+            return ContentType.objects.get_by_natural_key(app_label, model)
+        except ContentType.DoesNotExist:
+            msg = f"Unknown model {value}."
+            raise serializers.ValidationError(msg) from None
+
+    def validate(self, attrs):
+        if "object_id" in attrs and "model" not in attrs:
+            raise serializers.ValidationError(
+                {"model": "Required when filtering by object_id."},
+            )
+        return attrs
@@ -0,0 +1,7 @@
+"""Audit API views package"""
+
+from .audit_entry import AuditEntryViewSet
+
+__all__ = [
+    "AuditEntryViewSet",
+]
@@ -0,0 +1,66 @@
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.mixins import ListModelMixin
+from rest_framework.mixins import RetrieveModelMixin
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAdminUser
+from rest_framework.viewsets import GenericViewSet
+
+from kancraonewms.audit.api.serializers import AuditEntryQuerySerializer
+from kancraonewms.audit.api.serializers import AuditEntrySerializer
+from kancraonewms.audit.models import AuditEntry
+
+
+class AuditEntryPagination(CursorPagination):
+    """Newest first, without the COUNT(*) and OFFSET scans of page numbers"""
+
+    ordering = ("-created_at", "-id")
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class AuditEntryViewSet(
+    ListModelMixin,
+    RetrieveModelMixin,
+    GenericViewSet,
+):
+    """
+    ViewSet untuk audit trail (riwayat perubahan data)
+    Filter: ``model`` (app_label.model) dan ``object_id``, ``user``,
+    ``action``, ``since`` dan ``until``. Tanpa ``object_id`` dan ``since``
+    hanya ``AUDIT_QUERY_DAYS`` hari terakhir yang dibaca
+    """
+
+    queryset = AuditEntry.objects.select_related("content_type", "user")
+    serializer_class = AuditEntrySerializer
+    pagination_class = AuditEntryPagination
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != "list":
+            return queryset
+
+        query = AuditEntryQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        if "model" in params:
+            queryset = queryset.filter(content_type=params["model"])
+        if "object_id" in params:
+            queryset = queryset.filter(object_id=params["object_id"])
+        if "user" in params:
+            queryset = queryset.by_user(params["user"])
+        if "action" in params:
+            queryset = queryset.filter(action=params["action"])
+
+        # Bound the months scanned unless a single object's history is asked
+        since = params.get("since")
+        if since is None and "object_id" not in params:
+            since = timezone.now() - datetime.timedelta(
+                days=settings.AUDIT_QUERY_DAYS,
+            )
+        return queryset.for_period(since, params.get("until"))
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class AuditConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "kancraonewms.audit"
+    verbose_name = _("Audit")
+
+    def ready(self):
+        from . import signals  # noqa: PLC0415
+
+        signals.connect_audited_models()
@@ -0,0 +1,18 @@
+from .services import recorder
+
+
+class AuditMiddleware:
+    """
+    Buffer the audit entries committed while serving a request.
+
+    They are written with one bulk insert once the response is ready, so the
+    writes of the view (committed before, see
+    :func:`kancraonewms.core.transactions.atomic_writes`) never wait on them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with recorder.buffered(request):
+            return self.get_response(request)
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.11 on 2026-10-19 17:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.BigIntegerField(verbose_name='Object ID')),
+                ('action', models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete')], max_length=10, verbose_name='Action')),
+                ('changes', models.JSONField(default=dict, help_text='Changed fields as {field: [old, new]}', verbose_name='Changes')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, help_text='When the change was made', verbose_name='Created At')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='contenttypes.contenttype', verbose_name='Content Type')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Audit Entry',
+                'verbose_name_plural': 'Audit Entries',
+                'db_table': 'audit_entry',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['content_type', 'object_id', 'created_at'], name='audit_entry_content_24df9e_idx'), models.Index(fields=['user', 'created_at'], name='audit_entry_user_id_4de5fc_idx'), models.Index(fields=['created_at'], name='audit_entry_created_f6d558_idx')],
+            },
+        ),
+    ]
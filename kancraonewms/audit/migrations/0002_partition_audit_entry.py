@@ -0,0 +1,61 @@
+import datetime
+
+from django.conf import settings
+from django.db import migrations
+
+from kancraonewms.inventory import partitions
+
+AUDIT_ENTRY_TABLE = "audit_entry"
+
+
+def partition_audit_entry(apps, schema_editor):
+    """Convert the audit trail to a monthly partitioned table on Postgres."""
+    if not partitions.is_supported(schema_editor.connection):
+        return
+
+    current = partitions.month_start(datetime.datetime.now(tz=datetime.UTC).date())
+    months = [
+        partitions.add_months(current, offset)
+        for offset in range(settings.AUDIT_PARTITION_MONTHS_AHEAD + 1)
+    ]
+    # The foreign key columns lead the composite indexes, so they need no
+    # index of their own.
+    partitions.partition_table(
+        schema_editor,
+        AUDIT_ENTRY_TABLE,
+        "RANGE (created_at)",
+        [
+            (
+                partitions.month_partition_name(month, AUDIT_ENTRY_TABLE),
+                partitions.month_bound(month),
+            )
+            for month in months
+        ],
+        primary_key=["id", "created_at"],
+        unique=[],
+        foreign_keys=[
+            ("content_type_id", "django_content_type"),
+            ("user_id", "users_user"),
+        ],
+        indexes=[
+            (
+                "audit_entry_content_24df9e_idx",
+                ["content_type_id", "object_id", "created_at"],
+            ),
+            ("audit_entry_user_id_4de5fc_idx", ["user_id", "created_at"]),
+            ("audit_entry_created_f6d558_idx", ["created_at"]),
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+    ]
+
+    operations = [
+        # Partitioned tables cannot carry the original single-column primary
+        # key, so this conversion is not reversible.
+        migrations.RunPython(partition_audit_entry),
+    ]
@@ -0,0 +1,80 @@
+"""
+Field-level change capture for audited models.
+
+:class:`AuditedModelMixin` snapshots the field values of a row when it is
+loaded and, on save, records the fields that differ from the snapshot. Rows
+created or changed set-based (``bulk_create``, :func:`kancraonewms.core.bulk.update`,
+raw SQL) are recorded by their callers or by the receivers in
+:mod:`kancraonewms.audit.signals`.
+"""
+
+from .services import recorder
+
+
+class AuditedModelMixin:
+    """
+    Model mixin recording creates and field-level updates in the audit trail.
+
+    Fields listed in ``audit_exclude`` (the timestamps by default) are not
+    recorded. Entries are queued until the transaction commits, see
+    :mod:`kancraonewms.audit.services.recorder`.
+    """
+
+    audit_exclude = ("created_at", "updated_at")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._audit_snapshot = instance.audit_values()  # noqa: SLF001
+        return instance
+
+    def audit_values(self):
+        """Loaded values of the audited fields by attribute name (``role_id``)"""
+        return {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if not field.primary_key
+            and field.name not in self.audit_exclude
+            and field.attname in self.__dict__
+        }
+
+    def audit_entry(self, action, changes=None):
+        """
+        Entry row for ``action`` on this row.
+
+        Without ``changes`` a create records every value as ``[None, value]``
+        and a delete as ``[value, None]``.
+        """
+        if changes is None:
+            values = self.audit_values()
+            if action == "delete":
+                changes = {name: (value, None) for name, value in values.items()}
+            else:
+                changes = {name: (None, value) for name, value in values.items()}
+        return recorder.entry(type(self), self.pk, action, changes)
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        values = self.audit_values()
+        snapshot = getattr(self, "_audit_snapshot", {})
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            saved = {self._meta.get_field(name).attname for name in update_fields}
+            values = {name: value for name, value in values.items() if name in saved}
+        if adding:
+            entry = self.audit_entry("create")
+        else:
+            changes = {
+                name: (snapshot.get(name), value)
+                for name, value in values.items()
+                if name not in snapshot or snapshot[name] != value
+            }
+            entry = self.audit_entry("update", changes) if changes else None
+        if entry is not None:
+            recorder.record([entry], using=self._state.db)
+        self._audit_snapshot = {**snapshot, **values}
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._audit_snapshot = self.audit_values()
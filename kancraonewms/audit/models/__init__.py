@@ -0,0 +1,7 @@
+"""Audit models package"""
+
+from .audit_entry import AuditEntry
+
+__all__ = [
+    "AuditEntry",
+]
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .managers import AuditEntryManager
+
+
+class AuditEntry(models.Model):
+    """
+    Model untuk audit trail perubahan data
+
+    One row per created, updated or deleted object with the changed fields as
+    ``{field: [old, new]}``. Rows are written in batches after the changes
+    commit (see :mod:`kancraonewms.audit.services.recorder`). On Postgres the
+    table is RANGE-partitioned by month of ``created_at``; bound queries with
+    ``AuditEntry.objects.for_period()``.
+    """
+
+    ACTION_CREATE = "create"
+    ACTION_UPDATE = "update"
+    ACTION_DELETE = "delete"
+    ACTION_CHOICES = [
+        (ACTION_CREATE, _("Create")),
+        (ACTION_UPDATE, _("Update")),
+        (ACTION_DELETE, _("Delete")),
+    ]
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.PROTECT,
+        related_name="+",
+        verbose_name=_("Content Type"),
+    )
+    object_id = models.BigIntegerField(
+        _("Object ID"),
+    )
+    action = models.CharField(
+        _("Action"),
+        max_length=10,
+        choices=ACTION_CHOICES,
+    )
+    changes = models.JSONField(
+        _("Changes"),
+        default=dict,
+        help_text=_("Changed fields as {field: [old, new]}"),
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("User"),
+    )
+    created_at = models.DateTimeField(
+        _("Created At"),
+        default=timezone.now,
+        help_text=_("When the change was made"),
+    )
+
+    objects = AuditEntryManager()
+
+    class Meta:
+        verbose_name = _("Audit Entry")
+        verbose_name_plural = _("Audit Entries")
+        ordering = ["-created_at"]
+        db_table = "audit_entry"
+        indexes = [
+            models.Index(fields=["content_type", "object_id", "created_at"]),
+            models.Index(fields=["user", "created_at"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.content_type.model} #{self.object_id}"
@@ -0,0 +1,33 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class AuditEntryQuerySet(models.QuerySet):
+    """QuerySet for the month-partitioned audit trail"""
+
+    def for_object(self, instance):
+        """History of one audited row"""
+        return self.filter(
+            content_type=ContentType.objects.get_for_model(type(instance)),
+            object_id=instance.pk,
+        )
+
+    def for_model(self, model):
+        """History of every row of an audited model"""
+        return self.filter(content_type=ContentType.objects.get_for_model(model))
+
+    def by_user(self, user):
+        """Changes made by one user"""
+        return self.filter(user_id=getattr(user, "pk", user))
+
+    def for_period(self, start=None, end=None):
+        """Restrict to ``[start, end)`` so only the matching months are scanned"""
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(created_at__gte=start)
+        if end is not None:
+            queryset = queryset.filter(created_at__lt=end)
+        return queryset
+
+
+AuditEntryManager = models.Manager.from_queryset(AuditEntryQuerySet)
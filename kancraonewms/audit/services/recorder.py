@@ -0,0 +1,162 @@
+"""
+Batched audit trail writes.
+
+Saving an audited model must not cost an extra ``INSERT``. Changes are turned
+into entry rows (plain, JSON serializable dicts) and queued with
+``transaction.on_commit``, so the rows of a rolled back transaction or
+savepoint are dropped with it. Once committed, they go:
+
+* inside :func:`buffered` (every request, through
+  :class:`kancraonewms.audit.middleware.AuditMiddleware`) to the buffer of
+  the request, written with one bulk insert when the request ends, attributed
+  to the request user
+* elsewhere (Celery tasks, management commands) straight to the table, one
+  bulk insert per batch recorded
+
+With ``AUDIT_ASYNC`` the bulk insert runs in a Celery task instead of the
+request (one task per ``BATCH_SIZE`` rows). Writing never fails the request:
+the changes are committed by then, and an error response would make clients
+retry them.
+"""
+
+import contextlib
+import contextvars
+import datetime
+import functools
+import logging
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError
+from django.db import transaction
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+
+BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+_encoder = DjangoJSONEncoder()
+# Buffer of the current request: {"request": ..., "rows": [...]}
+_buffer = contextvars.ContextVar("audit_buffer", default=None)
+
+
+def jsonable(value):
+    """Field value as stored in ``changes``"""
+    if value is None or isinstance(value, bool | int | float | str | list | dict):
+        return value
+    try:
+        return _encoder.default(value)
+    except TypeError:
+        return str(value)
+
+
+def entry(model, object_id, action, changes):
+    """Build the row recording ``changes`` (``{field: [old, new]}``)"""
+    return {
+        "content_type_id": ContentType.objects.get_for_model(model).pk,
+        "object_id": object_id,
+        "action": action,
+        "changes": {
+            name: [jsonable(old), jsonable(new)] for name, (old, new) in changes.items()
+        },
+        "created_at": timezone.now().isoformat(),
+    }
+
+
+def record(rows, using=None):
+    """Queue entry ``rows`` to be written once the current transaction commits"""
+    rows = list(rows)
+    if rows:
+        transaction.on_commit(functools.partial(_committed, rows), using=using)
+
+
+def _committed(rows):
+    pending = _buffer.get()
+    if pending is None:
+        flush(rows)
+    else:
+        pending["rows"].extend(rows)
+
+
+@contextlib.contextmanager
+def buffered(request=None):
+    """Collect the entries committed inside the block and write them at the end"""
+    pending = {"request": request, "rows": []}
+    token = _buffer.set(pending)
+    try:
+        yield pending
+    finally:
+        _buffer.reset(token)
+        if pending["rows"]:
+            flush(pending["rows"], _user_id(request))
+
+
+def _user_id(request):
+    # Read at the end of the request: DRF authenticates inside the view
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+def flush(rows, user_id=None):
+    """
+    Write ``rows`` now or, with ``AUDIT_ASYNC``, from a Celery task.
+
+    Rows that cannot be inserted in place (e.g. their month partition is
+    missing) are handed to the Celery task to be retried by a worker; only
+    without a broker as well are they logged and dropped.
+    """
+    if settings.AUDIT_ASYNC:
+        # No broker: write the rest in place instead
+        rows = _enqueue(rows, user_id)
+        if not rows:
+            return
+    try:
+        with transaction.atomic():
+            write(rows, user_id)
+    except DatabaseError:
+        # Already tried the broker with AUDIT_ASYNC
+        dropped = rows if settings.AUDIT_ASYNC else _enqueue(rows, user_id)
+        logger.exception(
+            "Writing %d audit entries failed, %d dropped without a broker",
+            len(rows),
+            len(dropped),
+        )
+
+
+def _enqueue(rows, user_id):
+    """Send ``rows`` to the Celery task; return those the broker did not take"""
+    from kancraonewms.audit.tasks import write_audit_entries  # noqa: PLC0415
+
+    for start in range(0, len(rows), BATCH_SIZE):
+        try:
+            write_audit_entries.delay(rows[start : start + BATCH_SIZE], user_id)
+        except OperationalError:
+            return rows[start:]
+    return []
+
+
+def write(rows, user_id=None):
+    """Insert entry ``rows`` with one statement per ``BATCH_SIZE`` rows"""
+    from kancraonewms.audit.models import AuditEntry  # noqa: PLC0415
+
+    return len(
+        AuditEntry.objects.bulk_create(
+            [
+                AuditEntry(
+                    **{
+                        **row,
+                        "created_at": datetime.datetime.fromisoformat(
+                            row["created_at"],
+                        ),
+                    },
+                    user_id=user_id,
+                )
+                for row in rows
+            ],
+            batch_size=BATCH_SIZE,
+        ),
+    )
@@ -0,0 +1,45 @@
+from django.apps import apps
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from kancraonewms.core.bulk import bulk_updated
+
+from .mixins import AuditedModelMixin
+from .services import recorder
+
+
+def record_delete(sender, instance, using, **kwargs):
+    """Record deleted audited rows, including cascades and queryset deletes"""
+    recorder.record([instance.audit_entry("delete")], using=using)
+
+
+def connect_audited_models():
+    """
+    Connect :func:`record_delete` to each audited model.
+
+    A ``post_delete`` receiver without a sender would make Django collect
+    every deleted row of every model instead of fast deleting them.
+    """
+    for model in apps.get_models():
+        if issubclass(model, AuditedModelMixin):
+            post_delete.connect(
+                record_delete,
+                sender=model,
+                dispatch_uid=f"audit_record_delete_{model._meta.label_lower}",  # noqa: SLF001
+            )
+
+
+@receiver(bulk_updated)
+def record_bulk_update(sender, queryset, values, **kwargs):
+    """Record the rows changed by a set-based update, with the new values only"""
+    if not issubclass(sender, AuditedModelMixin):
+        return
+    changes = {
+        sender._meta.get_field(name).attname: (None, value)  # noqa: SLF001
+        for name, value in values.items()
+        if name not in sender.audit_exclude
+    }
+    recorder.record(
+        recorder.entry(sender, pk, "update", changes)
+        for pk in queryset.order_by().values_list("pk", flat=True)
+    )
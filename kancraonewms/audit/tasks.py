@@ -0,0 +1,23 @@
+from celery import shared_task
+from django.conf import settings
+
+from kancraonewms.inventory import partitions
+
+from .models import AuditEntry
+from .services import recorder
+
+
+@shared_task()
+def write_audit_entries(rows, user_id=None):
+    """Bulk insert audit entries buffered by a request."""
+    return recorder.write(rows, user_id)
+
+
+@shared_task()
+def ensure_audit_partitions():
+    """Daily: create the audit trail partitions of the upcoming months."""
+    created = partitions.ensure_upcoming_month_partitions(
+        settings.AUDIT_PARTITION_MONTHS_AHEAD,
+        table=AuditEntry._meta.db_table,  # noqa: SLF001
+    )
+    return [month.isoformat() for month in created]
@@ -0,0 +1,269 @@
+"""
+Tests for the audit trail
+"""
+
+import datetime
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+from django.db import DatabaseError
+from django.db import connection
+from django.db import transaction
+from django.db.models.deletion import Collector
+from django.db.models.signals import post_delete
+from django.test import TestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from kancraonewms.audit.models import AuditEntry
+from kancraonewms.audit.services import recorder
+from kancraonewms.audit.tasks import ensure_audit_partitions
+from kancraonewms.audit.tasks import write_audit_entries
+from kancraonewms.core import bulk
+from kancraonewms.inventory.models import StockMovement
+from kancraonewms.master.models import Accessibility
+from kancraonewms.master.models import Item
+from kancraonewms.master.services import role_matrix
+from kancraonewms.master.tests.factories import AccessibilityFactory
+from kancraonewms.master.tests.factories import ItemFactory
+from kancraonewms.master.tests.factories import RoleFactory
+from kancraonewms.organizations.models import Company
+from kancraonewms.organizations.tests.factories import CompanyFactory
+from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
+
+
+def _inserts(queries):
+    return [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith('INSERT INTO "audit_entry"')
+    ]
+
+
+class AuditRecorderTest(TestCase):
+    """Tests for change capture and batched writes"""
+
+    def test_create_and_field_level_update(self):
+        """Creates record every value, updates only the changed fields"""
+        with self.captureOnCommitCallbacks(execute=True):
+            item = ItemFactory(name="Bolt")
+        item = Item.objects.get(pk=item.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            item.name = "Hex Bolt"
+            item.save()
+            item.save()
+
+        created, updated = AuditEntry.objects.for_object(item).order_by("id")
+        assert created.action == "create"
+        assert created.changes["code"] == [None, item.code]
+        assert "updated_at" not in created.changes
+        assert updated.action == "update"
+        assert updated.changes == {"name": ["Bolt", "Hex Bolt"]}
+        assert updated.user is None
+
+    def test_rolled_back_changes_are_not_recorded(self):
+        """Entries of a rolled back savepoint are dropped with it"""
+        company = Company.objects.get(pk=CompanyFactory(credit_limit=0).pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            company.credit_limit = Decimal("100.00")
+            company.save()
+            with transaction.atomic():
+                company.name = "Rolled back"
+                company.save()
+                transaction.set_rollback(True)
+
+        entries = AuditEntry.objects.for_object(company)
+        assert [entry.changes for entry in entries] == [
+            {"credit_limit": ["0.00", "100.00"]},
+        ]
+
+    def test_buffer_is_written_with_one_insert(self):
+        """Entries committed inside a request are inserted together at its end"""
+        request = mock.Mock(user=UserFactory())
+        with CaptureQueriesContext(connection) as queries, recorder.buffered(request):
+            with self.captureOnCommitCallbacks(execute=True):
+                items = ItemFactory.create_batch(3)
+            with self.captureOnCommitCallbacks(execute=True):
+                CompanyFactory()
+            assert not AuditEntry.objects.exists()
+
+        assert len(_inserts(queries)) == 1
+        assert AuditEntry.objects.filter(user=request.user).count() == 4  # noqa: PLR2004
+        assert AuditEntry.objects.for_object(items[0]).get().action == "create"
+
+    def test_delete_and_bulk_update(self):
+        """Deletes and set-based updates bypassing save are recorded"""
+        items = ItemFactory.create_batch(2)
+        pks = {item.pk for item in items}
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.update(Item.objects.all(), is_active=False)
+            Item.objects.filter(pk=items[1].pk).delete()
+
+        updates = AuditEntry.objects.for_model(Item).filter(action="update")
+        assert {entry.object_id for entry in updates} == pks
+        assert updates[0].changes == {"is_active": [None, False]}
+        deleted = AuditEntry.objects.get(action="delete")
+        assert deleted.object_id == items[1].pk
+        assert deleted.changes["code"] == [items[1].code, None]
+
+    def test_other_models_keep_fast_delete(self):
+        """Only audited models have a delete receiver"""
+        collector = Collector(using="default")
+
+        assert collector.can_fast_delete(StockMovement.objects.all())
+        assert post_delete.has_listeners(Item)
+
+    def test_role_matrix_changes_are_recorded(self):
+        """Set-based matrix writes record created, changed and removed rows"""
+        role = RoleFactory()
+        kept = AccessibilityFactory(role=role, is_granted=True)
+        removed = AccessibilityFactory(role=role)
+        rows = [
+            {
+                "module": kept.module,
+                "feature": kept.feature,
+                "permission": kept.permission,
+                "is_granted": False,
+            },
+            {
+                "module": "inventory",
+                "feature": "stock",
+                "permission": "read",
+                "is_granted": True,
+            },
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            role_matrix.apply_matrix(role, rows, [])
+
+        entries = {
+            entry.action: entry for entry in AuditEntry.objects.for_model(Accessibility)
+        }
+        assert entries["update"].object_id == kept.pk
+        assert entries["update"].changes == {"is_granted": [True, False]}
+        assert entries["delete"].object_id == removed.pk
+        assert entries["create"].changes["feature"] == [None, "stock"]
+
+    @override_settings(AUDIT_ASYNC=True)
+    def test_async_writes_from_celery(self):
+        """With AUDIT_ASYNC the buffered rows are sent to a Celery task"""
+        user = UserFactory()
+        with mock.patch.object(write_audit_entries, "delay") as delay:
+            with (
+                recorder.buffered(mock.Mock(user=user)),
+                self.captureOnCommitCallbacks(execute=True),
+            ):
+                item = ItemFactory()
+            assert not AuditEntry.objects.exists()
+
+        delay.assert_called_once()
+        write_audit_entries(*delay.call_args.args)
+        assert AuditEntry.objects.for_object(item).by_user(user).exists()
+
+
+class AuditEntryApiTest(APITransactionTestCase):
+    """Tests for recording API changes and querying the trail"""
+
+    def authenticate(self, user):
+        token = UserRefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_api_changes_are_attributed_and_queryable(self):
+        """Entries carry the token user and are filtered by object, user and time"""
+        admin = UserFactory(is_staff=True)
+        item = ItemFactory(name="Bolt")
+        self.authenticate(admin)
+
+        response = self.client.patch(
+            reverse("api:item-detail", args=[item.pk]),
+            {"name": "Hex Bolt"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        url = reverse("api:auditentry-list")
+        response = self.client.get(
+            url,
+            {"model": "master.item", "object_id": item.pk, "user": admin.pk},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data["results"]
+        assert [entry["action"] for entry in results] == ["update"]
+        assert results[0]["changes"] == {"name": ["Bolt", "Hex Bolt"]}
+        assert results[0]["username"] == admin.username
+
+        since = timezone.now() + datetime.timedelta(minutes=1)
+        response = self.client.get(url, {"since": since.isoformat()})
+        assert response.data["results"] == []
+        response = self.client.get(url, {"model": "master.unknown"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_failed_audit_write_keeps_response(self):
+        """An audit insert error neither fails nor loses a committed change"""
+        item = ItemFactory(name="Bolt")
+        self.authenticate(UserFactory())
+        with (
+            mock.patch.object(recorder, "write", side_effect=DatabaseError),
+            mock.patch.object(write_audit_entries, "delay") as delay,
+        ):
+            response = self.client.patch(
+                reverse("api:item-detail", args=[item.pk]),
+                {"name": "Hex Bolt"},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        item.refresh_from_db()
+        assert item.name == "Hex Bolt"
+        # Handed to a worker to retry
+        delay.assert_called_once()
+
+    def test_failed_audit_write_without_broker(self):
+        """Without a broker the entries are logged and dropped"""
+        item = ItemFactory(name="Bolt")
+        self.authenticate(UserFactory())
+        with (
+            mock.patch.object(recorder, "write", side_effect=DatabaseError),
+            mock.patch.object(
+                write_audit_entries,
+                "delay",
+                side_effect=OperationalError,
+            ),
+            self.assertLogs(recorder.logger, "ERROR"),
+        ):
+            response = self.client.patch(
+                reverse("api:item-detail", args=[item.pk]),
+                {"name": "Hex Bolt"},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_staff_only(self):
+        """Regular users cannot read the trail"""
+        self.authenticate(UserFactory())
+        response = self.client.get(reverse("api:auditentry-list"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "Requires PostgreSQL")
+class AuditPartitionTest(TestCase):
+    """Tests for the monthly partitions of the audit trail"""
+
+    def test_entries_land_in_month_partition(self):
+        """Rows are routed to the partition of their month"""
+        ensure_audit_partitions()
+        with self.captureOnCommitCallbacks(execute=True):
+            item = ItemFactory()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM audit_entry WHERE object_id = %s",
+                [item.pk],
+            )
+            (partition,) = cursor.fetchone()
+        month = timezone.now().astimezone(datetime.UTC)
+        assert partition == f"audit_entry_y{month.year:04d}m{month.month:02d}"
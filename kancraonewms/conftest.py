@@ -1,5 +1,7 @@
 import pytest
+from django.core.cache import cache
 
+from kancraonewms.master.services import uom_cache
 from kancraonewms.users.models import User
 from kancraonewms.users.tests.factories import UserFactory
 
@@ -12,3 +14,10 @@ def _media_storage(settings, tmpdir) -> None:
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    # Throttle counters and cached lookups must not leak between tests
+    cache.clear()
+    uom_cache.clear_local()
@@ -0,0 +1 @@
+"""Shared building blocks used across the kancraonewms apps"""
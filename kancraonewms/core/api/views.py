@@ -0,0 +1,18 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from kancraonewms.core import db
+
+
+class DatabasePoolMetricsView(APIView):
+    """
+    API endpoint untuk statistik connection pool database
+    Returns: ukuran pool, koneksi tersedia, antrean dan counter psycopg_pool
+    Angka berlaku untuk worker process yang melayani request (lihat ``pid``)
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(db.pool_stats())
@@ -0,0 +1,87 @@
+"""
+Set-based updates of many rows, for the API and the admin.
+
+:func:`update` selects the matching rows that do not hold the values yet,
+changes them with one ``UPDATE`` by primary key and then sends one
+:data:`bulk_updated` signal for the whole batch instead of a ``post_save`` per
+row. Receivers that keep derived state (caches, compiled permissions) listen to
+both.
+
+:func:`bulk_action` builds the list-level ViewSet actions, e.g.
+``POST /api/racks/bulk-activate/``. The rows are given as ``ids`` in the body
+and/or selected with the list endpoint's own query parameter filters; at
+least one of the two is required so a bare request cannot touch every row.
+Only the filters the ViewSet names in ``bulk_filters`` count:
+``?format=json`` or an empty ``?search=`` select nothing and do not stand in
+for a selection.
+"""
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+# Sent once per bulk update with ``queryset`` (the changed rows), ``values``
+# (field -> new value) and ``count`` (rows changed).
+bulk_updated = Signal()
+
+
+def update(queryset, **values):
+    """Set ``values`` on every row of ``queryset``; return the rows changed"""
+    model = queryset.model
+    changes = dict(values)
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):  # noqa: SLF001
+        changes["updated_at"] = timezone.now()
+    with transaction.atomic():
+        # Captured first: the filter may no longer match the rows afterwards
+        pks = list(queryset.exclude(**values).values_list("pk", flat=True))
+        changed = model._default_manager.filter(pk__in=pks)  # noqa: SLF001
+        count = changed.update(**changes) if pks else 0
+        if count:
+            bulk_updated.send(
+                sender=model,
+                queryset=changed,
+                values=values,
+                count=count,
+            )
+    return count
+
+
+def bulk_action(url_path, **values):
+    """
+    List-level ViewSet action applying ``values`` to the selected rows.
+
+    The action is named after ``url_path`` (``bulk-activate`` becomes
+    ``bulk_activate``) and must be assigned to an attribute of that name.
+    The ViewSet lists the query parameters its ``get_queryset`` filters by in
+    ``bulk_filters``.
+    """
+
+    def handler(self, request):
+        ids = request.data.get("ids") if hasattr(request.data, "get") else None
+        if ids is not None and (
+            not isinstance(ids, list)
+            or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids)
+        ):
+            return Response(
+                {"error": "ids must be a list of integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if ids is None and not any(
+            request.query_params.get(name) for name in self.bulk_filters
+        ):
+            return Response(
+                {"error": "ids or a filter is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        return Response({"updated": update(queryset, **values)})
+
+    handler.__name__ = url_path.replace("-", "_")
+    handler.__doc__ = f"Set {values} on the selected rows in one statement"
+    return action(detail=False, methods=["post"], url_path=url_path)(handler)
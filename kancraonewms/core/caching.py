@@ -0,0 +1,295 @@
+"""
+Caching helpers on top of the shared cache (Redis in production).
+
+:class:`LocalCache` is a size-bounded LRU whose entries also expire after a
+fixed number of seconds. It saves the network round trip to Redis for values
+read in tight loops; the TTL bounds how long a process may serve a value
+after another process changed it.
+
+:func:`stampede_cached` (functions) and :func:`cached_action` (ViewSet
+actions) cache expensive aggregates without thundering herds when an entry
+expires under load:
+
+* probabilistic early refresh: each read refreshes an entry slightly before
+  it expires with a probability that grows as expiry nears and with the time
+  the value took to compute (``beta`` scales it), so refreshes of popular
+  entries spread out instead of piling up at the expiry instant
+* single flight: one caller per key holds a lock (``cache.add``, an atomic
+  ``SET NX`` on Redis) while recomputing; on a miss the others wait for its
+  result instead of running the same queries
+* stale while revalidate: for ``stale`` seconds after expiry the old value
+  is still served while one refresh runs, for functions in a Celery task
+  (:func:`kancraonewms.core.tasks.refresh_cached`)
+
+Entries are keyed by the arguments (or the request) and by ``version()``,
+e.g. a generation token, so that changes can invalidate them.
+
+:func:`isolated_cache` gives benchmarks a cold cache of their own: the
+shared one also holds the token blacklist, idempotency records and throttle
+counters, so it must never be flushed to measure a cache miss.
+"""
+
+import contextlib
+import functools
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test.utils import override_settings
+from django_redis import get_redis_connection
+from kombu.exceptions import OperationalError
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+KEY_PREFIX = "stampede"
+# Longest a refresh may hold its key's lock
+LOCK_TIMEOUT = 60
+# How long callers wait for another caller's refresh before computing anyway
+WAIT_TIMEOUT = 5.0
+WAIT_INTERVAL = 0.05
+
+
+class LocalCache:
+    """Thread-safe LRU of at most ``maxsize`` entries living ``ttl`` seconds"""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _cache_key(name, version, parts):
+    digest = hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode(),
+    ).hexdigest()[:32]
+    return f"{KEY_PREFIX}:{name}:{version() if version else ''}:{digest}"
+
+
+def _store(key, compute, timeout, stale):
+    started = time.monotonic()
+    value = compute()
+    entry = {
+        "value": value,
+        "delta": time.monotonic() - started,
+        "expires": time.time() + timeout,
+    }
+    cache.set(key, entry, timeout + stale)
+    return value
+
+
+def _refresh_early(entry, beta):
+    # XFetch: -log(u) for u in (0, 1] is exponentially distributed
+    jitter = entry["delta"] * beta * -math.log(1.0 - random.random())  # noqa: S311
+    return time.time() + jitter >= entry["expires"]
+
+
+def _fetch(key, compute, *, timeout, stale, beta, refresh_later=None):  # noqa: PLR0913
+    """
+    Return the cached value of ``key``, computing it with ``compute``.
+
+    ``refresh_later(lock_key)`` schedules a refresh of a stale or nearly
+    expired entry and must release the lock when done; without it the caller
+    holding the lock refreshes in place.
+    """
+    lock_key = f"{key}:lock"
+    entry = cache.get(key)
+    if entry is not None and not _refresh_early(entry, beta):
+        return entry["value"]
+
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        if entry is not None and refresh_later is not None:
+            refresh_later(lock_key)
+            return entry["value"]
+        try:
+            return _store(key, compute, timeout, stale)
+        finally:
+            cache.delete(lock_key)
+    if entry is not None:
+        # Stale or about to expire and another caller is refreshing it
+        return entry["value"]
+    return _wait(key, compute)
+
+
+def _wait(key, compute):
+    # Another caller is computing the value: wait for it
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["value"]
+    return compute()
+
+
+def stampede_cached(timeout, *, stale=0, beta=1.0, version=None):
+    """
+    Cache a module-level function's results for ``timeout`` seconds.
+
+    The arguments must be JSON serializable (ids, codes, dates as strings):
+    they make up the cache key and are sent to the Celery task refreshing
+    stale entries. The wrapped function gains ``refresh(*args, **kwargs)``,
+    which recomputes and stores the result, and ``invalidate(*args,
+    **kwargs)``.
+    """
+
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        def key(args, kwargs):
+            return _cache_key(name, version, [args, kwargs])
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            def refresh_later(lock_key):
+                from kancraonewms.core.tasks import refresh_cached  # noqa: PLC0415
+
+                try:
+                    refresh_cached.delay(name, args, kwargs, lock_key)
+                except OperationalError:
+                    # No broker: refresh in place instead
+                    refresh_cached(name, args, kwargs, lock_key)
+
+            return _fetch(
+                key(args, kwargs),
+                lambda: func(*args, **kwargs),
+                timeout=timeout,
+                stale=stale,
+                beta=beta,
+                refresh_later=refresh_later if stale else None,
+            )
+
+        def refresh(*args, **kwargs):
+            return _store(
+                key(args, kwargs),
+                lambda: func(*args, **kwargs),
+                timeout,
+                stale,
+            )
+
+        def invalidate(*args, **kwargs):
+            cache.delete(key(args, kwargs))
+
+        wrapper.refresh = refresh
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorator
+
+
+def cached_action(timeout, *, stale=0, beta=1.0, version=None, per_user=False):
+    """
+    Cache the response data of the GET requests of a ViewSet action.
+
+    The key covers the ViewSet, the action, the URL kwargs and the query
+    parameters, plus the user when ``per_user`` is set; only 200 responses
+    are cached. A hit skips the action body, including object permission
+    checks made there. Recomputing needs the request, so a stale or nearly
+    expired entry is refreshed by the one request holding the lock while
+    concurrent requests are served the stale data.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in SAFE_METHODS:
+                return method(view, request, *args, **kwargs)
+            responses = []
+
+            def compute():
+                response = method(view, request, *args, **kwargs)
+                responses.append(response)
+                if response.status_code != status.HTTP_200_OK:
+                    raise _Uncacheable
+                return response.data
+
+            parts = [
+                sorted(kwargs.items()),
+                sorted(request.query_params.lists()),
+                request.user.pk if per_user else None,
+            ]
+            key = _cache_key(
+                f"{type(view).__module__}.{type(view).__qualname__}.{method.__name__}",
+                version,
+                parts,
+            )
+            try:
+                data = _fetch(key, compute, timeout=timeout, stale=stale, beta=beta)
+            except _Uncacheable:
+                return responses[-1]
+            return Response(data)
+
+        return wrapper
+
+    return decorator
+
+
+class _Uncacheable(Exception):  # noqa: N818
+    """Raised to skip caching an error response"""
+
+
+@contextlib.contextmanager
+def isolated_cache(name):
+    """
+    Point the default cache at an empty namespace of its own for the block.
+
+    The namespace is a fresh ``KEY_PREFIX`` (a private store for the in-memory
+    backend); its keys, and only those, are deleted when the block exits.
+    """
+    prefix = f"{name}-{uuid.uuid4().hex}"
+    config = {**settings.CACHES["default"], "KEY_PREFIX": prefix}
+    in_memory = config["BACKEND"].endswith(".LocMemCache")
+    if in_memory:
+        config["LOCATION"] = prefix
+    with override_settings(CACHES={**settings.CACHES, "default": config}):
+        try:
+            yield
+        finally:
+            if in_memory:
+                cache.clear()
+            else:
+                _delete_prefixed(prefix)
+
+
+def _delete_prefixed(prefix):
+    try:
+        client = get_redis_connection("default")
+    except NotImplementedError:
+        return
+    keys = list(client.scan_iter(match=f"{prefix}:*", count=1000))
+    for start in range(0, len(keys), 1000):
+        client.delete(*keys[start : start + 1000])
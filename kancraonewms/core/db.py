@@ -0,0 +1,70 @@
+"""
+PostgreSQL connection pooling.
+
+Under gunicorn with ``UvicornWorker`` every request runs its sync view in a
+thread of its own, so persistent connections (``CONN_MAX_AGE``) are not
+reused across requests: each thread opens its own connection and leaves it
+behind. Django's psycopg ``pool`` option keeps one pool per worker process
+instead, shared by all threads.
+
+:func:`pool_options` sizes that pool from the deployment: the connections
+PostgreSQL accepts, minus those reserved for Celery, migrations and admin
+sessions, split over the gunicorn workers. :func:`pool_stats` reports the
+pool of the current process for the metrics endpoint.
+"""
+
+import os
+
+from django.db import connections
+
+# Below this the pool cannot serve a request and a health check at once
+MIN_POOL_SIZE = 2
+
+
+def pool_options(  # noqa: PLR0913
+    *,
+    workers,
+    max_connections,
+    reserved,
+    max_size=None,
+    min_size=None,
+    timeout=10.0,
+    max_lifetime=3600.0,
+    max_idle=600.0,
+):
+    """
+    Return the ``OPTIONS["pool"]`` of one worker process.
+
+    ``max_connections`` is the server's connection limit, of which ``reserved``
+    stay available to other clients; the rest is split evenly over
+    ``workers`` processes. An explicit ``max_size`` takes precedence. Requests
+    wait up to ``timeout`` seconds for a connection before failing.
+    """
+    if max_size is None:
+        max_size = max(MIN_POOL_SIZE, (max_connections - reserved) // max(1, workers))
+    if min_size is None:
+        min_size = max(1, max_size // 4)
+    return {
+        "min_size": min(min_size, max_size),
+        "max_size": max_size,
+        "timeout": timeout,
+        "max_lifetime": max_lifetime,
+        "max_idle": max_idle,
+    }
+
+
+def pool_stats():
+    """Statistics of the connection pool of every database, for this process"""
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is None:
+            stats[alias] = {"pooled": False}
+            continue
+        stats[alias] = {
+            "pooled": True,
+            "pid": os.getpid(),
+            "timeout": pool.timeout,
+            **pool.get_stats(),
+        }
+    return stats
@@ -0,0 +1,116 @@
+"""
+"Only one flagged row per parent" flags, e.g. the default warehouse of a
+company or the base UOM of an item.
+
+The invariant is enforced by the database with a partial unique index (see
+:func:`exclusive_flag_constraint`). Moving the flag is a set-based swap: lock
+the parent rows, clear the flag on the rows that hold it, set it on the new
+rows. Locking the parents serializes concurrent swaps of the same parent, so
+two saves can no longer both end up flagged, and the clearing ``UPDATE`` only
+touches rows that actually hold the flag. Both updates go through
+:func:`kancraonewms.core.bulk.update`, so receivers of ``bulk_updated`` see
+the swap.
+"""
+
+from django.db import models
+from django.db import transaction
+
+from kancraonewms.core import bulk
+
+
+def exclusive_flag_constraint(parent, flag, name):
+    """Partial unique index allowing one row with ``flag`` set per ``parent``"""
+    # An expression rather than ``fields`` keeps DRF from turning the
+    # constraint into a uniqueness validator on the parent field.
+    return models.UniqueConstraint(
+        models.F(parent),
+        condition=models.Q(**{flag: True}),
+        name=name,
+    )
+
+
+def set_exclusive_flag(model, flag, parent, pks):
+    """
+    Make the rows ``pks`` the flagged rows of their parents.
+
+    At most one row per parent may be given. Works for any number of parents
+    with three statements: lock parents, clear, set. Each update sends
+    ``bulk_updated``. Returns the number of rows that became flagged.
+    """
+    pks = list(pks)
+    if not pks:
+        return 0
+    parent_model = getattr(model, parent).field.related_model
+    with transaction.atomic():
+        winners = dict(
+            model.objects.filter(pk__in=pks).values_list("pk", f"{parent}_id"),
+        )
+        parent_ids = set(winners.values())
+        if len(parent_ids) != len(winners):
+            msg = f"Only one {model.__name__} per {parent} can have {flag} set."
+            raise ValueError(msg)
+        _lock(parent_model, parent_ids)
+        bulk.update(
+            model.objects.filter(
+                **{f"{parent}_id__in": parent_ids, flag: True},
+            ).exclude(pk__in=winners),
+            **{flag: False},
+        )
+        return bulk.update(model.objects.filter(pk__in=winners), **{flag: True})
+
+
+def _lock(parent_model, parent_ids):
+    # Lock in primary key order so concurrent multi-parent swaps cannot deadlock.
+    list(
+        parent_model.objects.select_for_update()
+        .filter(pk__in=parent_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True),
+    )
+
+
+class ExclusiveFlagMixin:
+    """
+    Model mixin keeping ``exclusive_flag`` unique per ``exclusive_flag_parent``.
+
+    Saving a row that newly carries the flag clears it on its siblings first,
+    under a lock on the parent row. Rows that already carried the flag when
+    loaded save without touching their siblings.
+    """
+
+    exclusive_flag = None
+    exclusive_flag_parent = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_flag = getattr(instance, cls.exclusive_flag, None)  # noqa: SLF001
+        return instance
+
+    def save(self, *args, **kwargs):
+        flag = self.exclusive_flag
+        claims_flag = getattr(self, flag) and not getattr(self, "_loaded_flag", False)
+        if not claims_flag:
+            super().save(*args, **kwargs)
+        else:
+            parent = self.exclusive_flag_parent
+            parent_id = getattr(self, f"{parent}_id")
+            with transaction.atomic():
+                _lock(getattr(type(self), parent).field.related_model, [parent_id])
+                siblings = type(self).objects.filter(
+                    **{f"{parent}_id": parent_id, flag: True},
+                )
+                if self.pk is not None:
+                    siblings = siblings.exclude(pk=self.pk)
+                siblings.update(**{flag: False})
+                super().save(*args, **kwargs)
+        self._loaded_flag = getattr(self, flag)
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._loaded_flag = getattr(self, self.exclusive_flag)
+
+    def validate_constraints(self, exclude=None):
+        # Saving swaps the flag, so a flagged sibling is not a validation error.
+        exclude = {*(exclude or ()), self.exclusive_flag_parent}
+        super().validate_constraints(exclude=exclude)
@@ -0,0 +1,180 @@
+"""
+``Idempotency-Key`` support for mutating API calls.
+
+Handheld clients retry requests whose response got lost on the way back. A
+client that sends an ``Idempotency-Key`` header with a POST, PUT, PATCH or
+DELETE gets the effect of the request at most once:
+
+* the first request runs under a short lock; its response is stored in the
+  cache (Redis in production) for ``IDEMPOTENCY_TTL`` seconds together with
+  a fingerprint of the request (method, path and body)
+* a retry with the same key and fingerprint gets the stored response back,
+  marked ``Idempotent-Replayed: true``, without running the view again
+* a duplicate arriving while the first is still running gets 409 and
+  ``Retry-After``; reusing a key for a different request gets 422
+
+Keys are scoped to the caller (the user of its access token, otherwise its
+``Authorization`` header, session user or address), so clients cannot collide
+with each other's keys. Server errors (5xx) and answers that depend on the
+moment rather than on the request (401, 403, 409, 429) are not stored, so
+retrying them runs the request again.
+
+The lock holds a token of its own and is only released by the request that
+took it: one that outlived ``IDEMPOTENCY_LOCK_TIMEOUT`` leaves alone the lock
+a retry took in the meantime.
+"""
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.http import JsonResponse
+from django_redis import get_redis_connection
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+HEADER = "Idempotency-Key"
+KEY_PREFIX = "idempotency"
+METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_KEY_LENGTH = 255
+# Response headers replayed along with the stored body
+REPLAYED_HEADERS = ("Content-Type", "Location")
+# Responses a retry may well get differently: never stored
+UNSTORED_STATUSES = {401, 403, 409, 429}
+
+# Delete the lock only while it still holds the token of the caller
+RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class IdempotencyMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        key = request.headers.get(HEADER)
+        if (
+            not key
+            or request.method not in METHODS
+            or not request.path.startswith(tuple(settings.IDEMPOTENCY_PATHS))
+        ):
+            return self.get_response(request)
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(f"{HEADER} is too long.", 400)
+
+        cache_key = f"{KEY_PREFIX}:{caller_id(request)}:{key}"
+        fingerprint = _fingerprint(request)
+        stored = cache.get(cache_key)
+        if stored is not None:
+            return _replay(stored, fingerprint)
+
+        lock_key = f"{cache_key}:lock"
+        token = uuid.uuid4().hex
+        if not _acquire(lock_key, token):
+            response = _error("A request with this key is in progress.", 409)
+            response["Retry-After"] = "1"
+            return response
+        try:
+            # The first request may have finished between the read and the lock
+            stored = cache.get(cache_key)
+            if stored is not None:
+                return _replay(stored, fingerprint)
+            response = self.get_response(request)
+            if _storable(response):
+                cache.set(
+                    cache_key,
+                    {
+                        "fingerprint": fingerprint,
+                        "status": response.status_code,
+                        "content": response.content,
+                        "headers": {
+                            name: response[name]
+                            for name in REPLAYED_HEADERS
+                            if response.has_header(name)
+                        },
+                    },
+                    settings.IDEMPOTENCY_TTL,
+                )
+            return response
+        finally:
+            _release(lock_key, token)
+
+
+def _storable(response):
+    return (
+        response.status_code < 500  # noqa: PLR2004
+        and response.status_code not in UNSTORED_STATUSES
+        and not response.streaming
+    )
+
+
+def _redis():
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def _acquire(lock_key, token):
+    client = _redis()
+    if client is None:
+        return cache.add(lock_key, token, settings.IDEMPOTENCY_LOCK_TIMEOUT)
+    return bool(
+        client.set(lock_key, token, nx=True, ex=settings.IDEMPOTENCY_LOCK_TIMEOUT),
+    )
+
+
+def _release(lock_key, token):
+    client = _redis()
+    if client is None:
+        # Not atomic; only used where the cache is not Redis (development)
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+        return
+    client.eval(RELEASE_SCRIPT, 1, lock_key, token)
+
+
+def caller_id(request):
+    """Identify the client: token user, Authorization hash, session user or IP"""
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        # Scope to the token's user, so a retry with a refreshed access token
+        # still finds the key; only verified tokens qualify.
+        try:
+            authenticated = JWTStatelessUserAuthentication().authenticate(request)
+        except (AuthenticationFailed, InvalidToken):
+            authenticated = None
+        if authenticated is not None:
+            return f"user-{authenticated[0].pk}"
+        return hashlib.sha256(authorization.encode()).hexdigest()[:32]
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"user-{user.pk}"
+    return f"ip-{request.META.get('REMOTE_ADDR', '')}"
+
+
+def _fingerprint(request):
+    digest = hashlib.sha256(f"{request.method} {request.get_full_path()}\n".encode())
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _replay(stored, fingerprint):
+    if stored["fingerprint"] != fingerprint:
+        return _error(f"{HEADER} was already used for a different request.", 422)
+    response = HttpResponse(stored["content"], status=stored["status"])
+    for name, value in stored["headers"].items():
+        response[name] = value
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _error(message, status):
+    return JsonResponse({"error": message}, status=status)
@@ -0,0 +1,380 @@
+import datetime
+import itertools
+import json
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+import factory.random
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch
+from django.urls import resolve
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+
+from config.api_router import router
+from kancraonewms.core.caching import isolated_cache
+from kancraonewms.master.models import UOM
+from kancraonewms.master.models import Accessibility
+from kancraonewms.master.models import Item
+from kancraonewms.master.models import ItemUOM
+from kancraonewms.master.models import Menu
+from kancraonewms.master.models import Rack
+from kancraonewms.master.models import Role
+from kancraonewms.master.models import RoleMenuAccess
+from kancraonewms.master.tests.factories import AccessibilityFactory
+from kancraonewms.master.tests.factories import ItemFactory
+from kancraonewms.master.tests.factories import ItemUOMFactory
+from kancraonewms.master.tests.factories import MenuFactory
+from kancraonewms.master.tests.factories import RackFactory
+from kancraonewms.master.tests.factories import RoleFactory
+from kancraonewms.master.tests.factories import RoleMenuAccessFactory
+from kancraonewms.master.tests.factories import UOMFactory
+from kancraonewms.master.tests.factories import UserRoleFactory
+from kancraonewms.organizations.models import Warehouse
+from kancraonewms.organizations.tests.factories import CompanyFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+BATCH_SIZE = 5000
+RACKS_PER_WAREHOUSE = 10_000
+MODULES = ["master", "inventory", "transaction", "report"]
+FEATURES = ["item", "uom", "rack", "warehouse"]
+PERMISSIONS = ["create", "read", "update", "delete", "export", "import"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency, throughput and query counts of every GET endpoint of "
+        "the API router against a dataset seeded with the test factories at "
+        "1k/100k/1m rows, and store the results as JSON for comparison "
+        "between commits. Seeded data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            default="1k",
+            help=f"Comma separated dataset scales ({', '.join(SCALES)})",
+        )
+        parser.add_argument(
+            "--existing",
+            action="store_true",
+            help="Measure the current database instead of seeding a dataset",
+        )
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument(
+            "--max-seconds",
+            type=float,
+            default=10.0,
+            help="Stop measuring an endpoint after this long (at least one request)",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--output-dir",
+            default=".benchmarks",
+            help="Directory receiving api-<scale>-<commit>.json",
+        )
+        parser.add_argument("--compare", help="Earlier result file to compare with")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=20.0,
+            help="p95 slowdown in percent reported as a regression",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        scales = ["existing"] if options["existing"] else options["scale"].split(",")
+        unknown = [scale for scale in scales if scale not in {*SCALES, "existing"}]
+        if unknown:
+            msg = f"Unknown scale {', '.join(unknown)}; use {', '.join(SCALES)}."
+            raise CommandError(msg)
+
+        for scale in scales:
+            with transaction.atomic():
+                factory.random.reseed_random(options["seed"])
+                if scale == "existing":
+                    token = self._token()
+                else:
+                    self.stdout.write(f"Seeding {scale} dataset...")
+                    token = self._seed(SCALES[scale])
+                result = self._run(scale, token)
+                transaction.set_rollback(True)
+            path = self._write(result)
+            self.stdout.write(f"Results written to {path}")
+            if options["compare"]:
+                self._compare(result, options["compare"])
+
+    # Seeding
+
+    def _token(self):
+        user = UserFactory(username="bench-api", is_staff=True, is_superuser=True)
+        return str(UserRefreshToken.for_user(user).access_token)
+
+    def _bulk(self, model, objects):
+        for batch in itertools.batched(objects, BATCH_SIZE, strict=False):
+            model.objects.bulk_create(batch)
+
+    def _seed(self, rows):
+        company = CompanyFactory(code="BENCH-API")
+        warehouses = [
+            WarehouseFactory(company=company, code=f"BENCH-API-{index:03d}")
+            for index in range(max(1, rows // RACKS_PER_WAREHOUSE))
+        ]
+        uoms = [UOMFactory(code=f"BENCH-{index:02d}") for index in range(20)]
+
+        self._bulk(
+            Item,
+            (
+                ItemFactory.build(code=f"BENCH-ITEM-{index:07d}")
+                for index in range(rows)
+            ),
+        )
+        item_ids = Item.objects.filter(code__startswith="BENCH-ITEM-").values_list(
+            "pk",
+            flat=True,
+        )
+        self._bulk(
+            ItemUOM,
+            (
+                ItemUOMFactory.build(
+                    item_id=item_id,
+                    uom=uoms[index % len(uoms)],
+                    barcode=f"2{index:012d}",
+                    is_base_uom=True,
+                )
+                for index, item_id in enumerate(item_ids.iterator())
+            ),
+        )
+        self._bulk(
+            Rack,
+            (
+                _rack(
+                    warehouse=warehouses[index % len(warehouses)],
+                    code=f"BENCH-RACK-{index:07d}",
+                )
+                for index in range(rows)
+            ),
+        )
+
+        roles = [
+            RoleFactory(code=f"BENCH-ROLE-{index}", name=f"Benchmark role {index}")
+            for index in range(10)
+        ]
+        self._bulk(
+            Menu,
+            (MenuFactory.build(code=f"BENCH-MENU-{index:02d}") for index in range(50)),
+        )
+        menus = list(Menu.objects.filter(code__startswith="BENCH-MENU-"))
+        self._bulk(
+            Accessibility,
+            (
+                AccessibilityFactory.build(
+                    role=role,
+                    module=module,
+                    feature=feature,
+                    permission=permission,
+                )
+                for role in roles
+                for module, feature, permission in itertools.product(
+                    MODULES,
+                    FEATURES,
+                    PERMISSIONS,
+                )
+            ),
+        )
+        self._bulk(
+            RoleMenuAccess,
+            (
+                RoleMenuAccessFactory.build(role=role, menu=menu)
+                for role in roles
+                for menu in menus
+            ),
+        )
+
+        user = UserFactory(username="bench-api", is_staff=True, is_superuser=True)
+        UserRoleFactory(user=user, role=roles[0])
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+        return str(UserRefreshToken.for_user(user).access_token)
+
+    # Measuring
+
+    def _endpoints(self):
+        """
+        Yield ``(name, path, list_path)`` for every GET route of the router.
+
+        Detail routes are yielded as URL names with the path of their list
+        route, which supplies the sample primary key; list routes come first.
+        """
+        for _prefix, viewset, basename in router.registry:
+            list_path = None
+            if hasattr(viewset, "list"):
+                list_path = reverse(f"api:{basename}-list")
+                yield f"{basename}-list", list_path, None
+            if hasattr(viewset, "retrieve"):
+                yield f"{basename}-detail", f"api:{basename}-detail", list_path
+            for extra in viewset.get_extra_actions():
+                if "get" not in extra.mapping:
+                    continue
+                name = f"{basename}-{extra.url_name}"
+                if extra.detail:
+                    yield name, f"api:{name}", list_path
+                else:
+                    yield name, reverse(f"api:{name}"), None
+
+    def _run(self, scale, token):
+        self.factory = APIRequestFactory()
+        self.token = token
+        result = {
+            "scale": scale,
+            "commit": _commit(),
+            "created_at": datetime.datetime.now(tz=datetime.UTC).isoformat(),
+            "database": connection.vendor,
+            "rows": {
+                "items": Item.objects.count(),
+                "item_uoms": ItemUOM.objects.count(),
+                "racks": Rack.objects.count(),
+                "warehouses": Warehouse.objects.count(),
+                "uoms": UOM.objects.count(),
+                "roles": Role.objects.count(),
+            },
+            "endpoints": {},
+        }
+        self.stdout.write(
+            f"{'endpoint':<44} {'status':>6} {'n':>5} {'queries':>7} "
+            f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}",
+        )
+        sample_pks = {}
+        for name, path, list_path in self._endpoints():
+            if path.startswith("api:"):
+                pk = sample_pks.get(list_path)
+                if pk is None:
+                    continue
+                try:
+                    path = reverse(path, kwargs={"pk": pk})  # noqa: PLW2901
+                except NoReverseMatch:
+                    continue
+            stats, data = self._measure(path)
+            if name.endswith("-list") and isinstance(data, list) and data:
+                first = data[0]
+                if isinstance(first, dict) and "id" in first:
+                    sample_pks[path] = first["id"]
+            result["endpoints"][name] = stats
+            self.stdout.write(
+                f"{name:<44} {stats['status']:>6} {stats['requests']:>5} "
+                f"{stats['queries']:>7.1f} {stats['p50_ms']:>9.2f} "
+                f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+                f"{stats['throughput']:>8.1f}",
+            )
+        return result
+
+    def _call(self, path):
+        request = self.factory.get(path, HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def _measure(self, path):
+        # A namespace of its own per endpoint: the first call runs cold
+        # without clearing the keys of anything else sharing the cache
+        with isolated_cache("benchmark-api"):
+            return self._time(path)
+
+    def _time(self, path):
+        started = time.perf_counter()
+        response = self._call(path)
+        cold_ms = (time.perf_counter() - started) * 1000
+        data = getattr(response, "data", None)
+
+        timings = []
+        budget = time.perf_counter() + self.options["max_seconds"]
+        with CaptureQueriesContext(connection) as queries:
+            while len(timings) < self.options["requests"] and (
+                not timings or time.perf_counter() < budget
+            ):
+                started = time.perf_counter()
+                self._call(path)
+                timings.append((time.perf_counter() - started) * 1000)
+
+        if len(timings) > 1:
+            percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+            p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+        else:
+            p50 = p95 = p99 = timings[0]
+        return {
+            "path": path,
+            "status": response.status_code,
+            "bytes": len(response.content),
+            "requests": len(timings),
+            "queries": len(queries) / len(timings),
+            "cold_ms": cold_ms,
+            "mean_ms": statistics.mean(timings),
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "throughput": len(timings) / (sum(timings) / 1000),
+        }, data
+
+    # Results
+
+    def _write(self, result):
+        directory = Path(self.options["output_dir"])
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"api-{result['scale']}-{result['commit'] or 'local'}.json"
+        path.write_text(json.dumps(result, indent=2, sort_keys=True))
+        return path
+
+    def _compare(self, result, baseline_path):
+        baseline = json.loads(Path(baseline_path).read_text())
+        self.stdout.write(
+            f"\nCompared with {baseline.get('commit')} ({baseline.get('scale')}):",
+        )
+        self.stdout.write(
+            f"{'endpoint':<44} {'p95 ms':>9} {'change':>8} {'queries':>9}",
+        )
+        regressions = 0
+        for name, stats in result["endpoints"].items():
+            before = baseline["endpoints"].get(name)
+            if before is None:
+                continue
+            change = (stats["p95_ms"] / before["p95_ms"] - 1) * 100
+            queries = stats["queries"] - before["queries"]
+            regressed = change > self.options["threshold"] or queries > 0
+            regressions += regressed
+            self.stdout.write(
+                f"{name:<44} {stats['p95_ms']:>9.2f} {change:>+7.1f}% "
+                f"{queries:>+9.1f}{'  REGRESSION' if regressed else ''}",
+            )
+        self.stdout.write(f"{regressions} regressions")
+
+
+def _rack(**fields):
+    # bulk_create skips Rack.save, which derives the location numbers
+    rack = RackFactory.build(**fields)
+    rack.apply_location_code()
+    return rack
+
+
+def _commit():
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
@@ -0,0 +1,147 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from kancraonewms.core.db import pool_options
+from kancraonewms.master.models import Item
+
+MODES = ("new", "persistent", "pool")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare connection churn and latency percentiles of a new connection "
+        "per request, persistent connections (CONN_MAX_AGE) and a psycopg "
+        "pool when, as under UvicornWorker, every request runs in a new thread."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument(
+            "--pool-size",
+            type=int,
+            default=10,
+            help="max_size of the pool (one worker process)",
+        )
+        parser.add_argument(
+            "--modes",
+            default=",".join(MODES),
+            help=f"Comma separated modes ({', '.join(MODES)})",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            msg = "Connection pooling is only available on PostgreSQL."
+            raise CommandError(msg)
+        modes = options["modes"].split(",")
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            msg = f"Unknown modes: {', '.join(sorted(unknown))}."
+            raise CommandError(msg)
+        self.options = options
+
+        self.stdout.write(
+            f"{'mode':<12} {'requests':>9} {'connects':>9} {'mean ms':>9} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'failed':>7}",
+        )
+        for mode in modes:
+            self._run(mode)
+
+    def _alias(self, mode):
+        alias = f"benchmark-{mode}"
+        settings_dict = {**connections.settings["default"], "ATOMIC_REQUESTS": False}
+        settings_dict["OPTIONS"] = {
+            key: value
+            for key, value in settings_dict["OPTIONS"].items()
+            if key != "pool"
+        }
+        settings_dict["CONN_MAX_AGE"] = 60 if mode == "persistent" else 0
+        if mode == "pool":
+            settings_dict["OPTIONS"]["pool"] = pool_options(
+                workers=1,
+                max_connections=0,
+                reserved=0,
+                max_size=self.options["pool_size"],
+            )
+        connections.settings[alias] = settings_dict
+        return alias
+
+    def _run(self, mode):
+        alias = self._alias(mode)
+        timings = []
+        connects = []
+        failures = []
+        lock = threading.Lock()
+        slots = threading.BoundedSemaphore(self.options["concurrency"])
+
+        def count_connect(sender, connection, **kwargs):
+            if connection.alias == alias:
+                with lock:
+                    connects.append(1)
+
+        def request():
+            started = time.perf_counter()
+            try:
+                list(Item.objects.using(alias).order_by("pk")[:20])
+                # What the request_finished signal does
+                connections[alias].close_if_unusable_or_obsolete()
+                with lock:
+                    timings.append((time.perf_counter() - started) * 1000)
+            except Exception as exc:  # noqa: BLE001
+                # Raised in the thread it would only be printed, and lost
+                with lock:
+                    failures.append(exc)
+            finally:
+                slots.release()
+
+        connection_created.connect(count_connect)
+        threads = []
+        started = time.perf_counter()
+        try:
+            for _index in range(self.options["requests"]):
+                slots.acquire()
+                # A new thread per request, like sync views under UvicornWorker
+                thread = threading.Thread(target=request)
+                thread.start()
+                threads.append(thread)
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(count_connect)
+            wrapper = connections[alias]
+            if mode == "pool":
+                # Physical connections, not checkouts
+                connects = [1] * wrapper.pool.get_stats().get("connections_num", 0)
+                wrapper.close_pool()
+            wrapper.close()
+            del connections.settings[alias]
+
+        self._report(mode, timings, len(connects), failures, elapsed)
+
+    def _report(self, mode, timings, connects, failures, elapsed):
+        if not timings:
+            msg = f"Every {mode} request failed, the first with: {failures[0]!r}"
+            raise CommandError(msg)
+        if len(timings) > 1:
+            cuts = statistics.quantiles(timings, n=100, method="inclusive")
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        else:
+            p50 = p95 = p99 = timings[0]
+        self.stdout.write(
+            f"{mode:<12} {len(timings):>9} {connects:>9} "
+            f"{statistics.mean(timings):>9.2f} {p50:>8.2f} {p95:>8.2f} "
+            f"{p99:>8.2f} {len(timings) / elapsed:>8.1f} {len(failures):>7}",
+        )
+        if failures:
+            self.stderr.write(
+                f"{len(failures)} {mode} requests failed, the first with: "
+                f"{failures[0]!r}",
+            )
@@ -0,0 +1,519 @@
+import itertools
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from kancraonewms.master.location_code import get_grammar
+from kancraonewms.master.models import UOM
+from kancraonewms.master.models import Accessibility
+from kancraonewms.master.models import Item
+from kancraonewms.master.models import ItemUOM
+from kancraonewms.master.models import Menu
+from kancraonewms.master.models import Rack
+from kancraonewms.master.models import Role
+from kancraonewms.master.models import RoleMenuAccess
+from kancraonewms.master.models import UserRole
+from kancraonewms.master.services import permissions
+from kancraonewms.master.services import uom_cache
+from kancraonewms.organizations.models import Company
+from kancraonewms.organizations.models import Warehouse
+
+PREFIX = "GEN"
+MODULES = ["master", "inventory", "transaction", "report"]
+FEATURES = ["item", "uom", "rack", "warehouse", "stock", "cycle_count"]
+PERMISSIONS = [choice for choice, _label in Accessibility.PERMISSION_CHOICES]
+# Bays per aisle and levels per bay of the generated rack layout
+BAYS = 20
+LEVELS = 5
+AISLES_PER_ZONE = 25
+
+# (code, name, type, factor to base, base code); base units come first
+UOM_HIERARCHY = [
+    ("PCS", "Piece", "quantity", "1", None),
+    ("KG", "Kilogram", "weight", "1", None),
+    ("L", "Liter", "volume", "1", None),
+    ("M", "Meter", "length", "1", None),
+    ("PACK", "Pack", "quantity", "6", "PCS"),
+    ("BOX", "Box", "quantity", "12", "PCS"),
+    ("CTN", "Carton", "quantity", "48", "PCS"),
+    ("PLT", "Pallet", "quantity", "1920", "PCS"),
+    ("G", "Gram", "weight", "0.001", "KG"),
+    ("SACK", "Sack", "weight", "25", "KG"),
+    ("ML", "Milliliter", "volume", "0.001", "L"),
+    ("DRUM", "Drum", "volume", "200", "L"),
+    ("CM", "Centimeter", "length", "0.01", "M"),
+    ("ROLL", "Roll", "length", "50", "M"),
+]
+# Base unit of an item -> packing units it is also handled in
+PACKINGS = {
+    "PCS": ["PACK", "BOX", "CTN", "PLT"],
+    "KG": ["SACK", "G"],
+    "L": ["DRUM", "ML"],
+    "M": ["ROLL", "CM"],
+}
+ITEM_UNITS = {"PCS": "pcs", "KG": "kg", "L": "liter", "M": "m"}
+
+ADJECTIVES = [
+    "Premium",
+    "Standard",
+    "Economy",
+    "Heavy Duty",
+    "Compact",
+    "Organic",
+    "Industrial",
+    "Fresh",
+    "Frozen",
+    "Stainless",
+    "Plastic",
+    "Wooden",
+]
+PRODUCTS = {
+    "PCS": ["Bolt", "Bearing", "Bottle", "Light Bulb", "Filter", "Valve", "Tile"],
+    "KG": ["Rice", "Sugar", "Flour", "Cement", "Coffee Beans", "Detergent"],
+    "L": ["Cooking Oil", "Engine Oil", "Paint", "Milk", "Solvent"],
+    "M": ["Cable", "Rope", "Hose", "Fabric", "Pipe"],
+}
+VARIANTS = ["Small", "Medium", "Large", "XL", "Red", "Blue", "Black", "White"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large, reproducible master dataset for load tests: "
+        "warehouses with rack layouts, items with UOM packings and barcodes, "
+        "roles, menus and accessibilities. Rows are streamed with COPY on "
+        "PostgreSQL and bulk inserted elsewhere."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=2_000_000)
+        parser.add_argument(
+            "--uoms-per-item",
+            type=int,
+            default=3,
+            help="Item-UOM rows per item, the base unit included",
+        )
+        parser.add_argument("--warehouses", type=int, default=20)
+        parser.add_argument("--racks-per-warehouse", type=int, default=100_000)
+        parser.add_argument("--roles", type=int, default=100)
+        parser.add_argument("--menus", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk inserts even on PostgreSQL",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete a previously generated dataset first",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.random = random.Random(options["seed"])  # noqa: S311
+        self.use_copy = connection.vendor == "postgresql" and not options["no_copy"]
+        self.now = timezone.now()
+        self.total = 0
+        started = time.perf_counter()
+
+        self.stdout.write(f"{'table':<28} {'rows':>12} {'seconds':>9} {'rows/s':>10}")
+        with transaction.atomic():
+            if options["clear"]:
+                self._clear()
+            warehouses = self._warehouses()
+            self._racks(warehouses)
+            uoms = self._uoms()
+            self._items()
+            self._item_uoms(uoms)
+            roles = self._roles()
+            menus = self._menus()
+            self._accessibilities(roles)
+            self._role_menu_accesses(roles, menus)
+            permissions.bump_generation()
+            uom_cache.bump_generation()
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{'total':<28} {self.total:>12} {elapsed:>9.1f} "
+            f"{self.total / elapsed:>10.0f}",
+        )
+
+    # Writing
+
+    def _insert(self, model, columns, rows):
+        """Write ``rows`` (tuples ordered like ``columns``) into ``model``"""
+        started = time.perf_counter()
+        count = 0
+        if self.use_copy:
+            table = connection.ops.quote_name(model._meta.db_table)  # noqa: SLF001
+            names = ", ".join(connection.ops.quote_name(column) for column in columns)
+            with (
+                connection.cursor() as cursor,
+                cursor.copy(f"COPY {table} ({names}) FROM STDIN") as copy,
+            ):
+                for row in rows:
+                    copy.write_row(row)
+                    count += 1
+        else:
+            for batch in itertools.batched(
+                rows,
+                self.options["batch_size"],
+                strict=False,
+            ):
+                model.objects.bulk_create(
+                    [model(**dict(zip(columns, row, strict=True))) for row in batch],
+                )
+                count += len(batch)
+
+        elapsed = time.perf_counter() - started
+        self.total += count
+        self.stdout.write(
+            f"{model._meta.db_table:<28} {count:>12} {elapsed:>9.1f} "  # noqa: SLF001
+            f"{count / elapsed if elapsed else 0:>10.0f}",
+        )
+
+    def _ids(self, model, **filters):
+        """Primary keys of generated rows, in insertion order"""
+        return list(
+            model.objects.filter(**filters).order_by("pk").values_list("pk", flat=True),
+        )
+
+    def _clear(self):
+        """Delete generated rows, children first, without loading them"""
+        code = f"{PREFIX}-"
+        for queryset in (
+            UserRole.objects.filter(role__code__startswith=code),
+            RoleMenuAccess.objects.filter(role__code__startswith=code),
+            Accessibility.objects.filter(role__code__startswith=code),
+            Role.objects.filter(code__startswith=code),
+            Menu.objects.filter(code__startswith=code, parent__isnull=False),
+            Menu.objects.filter(code__startswith=code),
+            ItemUOM.objects.filter(item__code__startswith=code),
+            Item.objects.filter(code__startswith=code),
+            UOM.objects.filter(code__startswith=code, base_uom__isnull=False),
+            UOM.objects.filter(code__startswith=code),
+            Rack.objects.filter(code__startswith=code),
+            Warehouse.objects.filter(code__startswith=code),
+            Company.objects.filter(code__startswith=code),
+        ):
+            queryset._raw_delete(queryset.db)  # noqa: SLF001
+
+    # Organization and layout
+
+    def _warehouses(self):
+        company = Company.objects.create(
+            code=f"{PREFIX}-COMPANY",
+            name="Generated Company",
+            company_type="own",
+        )
+        warehouses = []
+        for index in range(1, self.options["warehouses"] + 1):
+            code = f"{PREFIX}-WH{index:03d}"
+            warehouses.append(
+                Warehouse.objects.create(
+                    company=company,
+                    code=code,
+                    name=f"Generated Warehouse {index}",
+                    city=self.random.choice(["Jakarta", "Surabaya", "Bandung"]),
+                    is_default=index == 1,
+                    location_code_format=(
+                        f"{code}-Z{{zone:d2}}-A{{aisle:d2}}-B{{bay:d2}}-L{{level:d}}"
+                    ),
+                ),
+            )
+        return warehouses
+
+    def _racks(self, warehouses):
+        per_warehouse = self.options["racks_per_warehouse"]
+
+        def rows():
+            for warehouse in warehouses:
+                grammar = get_grammar(warehouse.location_code_format)
+                for index in range(per_warehouse):
+                    position, level = divmod(index, LEVELS)
+                    position, bay = divmod(position, BAYS)
+                    zone, aisle = divmod(position, AISLES_PER_ZONE)
+                    zone, aisle, bay, level = zone + 1, aisle + 1, bay + 1, level + 1
+                    location = grammar.build(
+                        zone=zone,
+                        aisle=aisle,
+                        bay=bay,
+                        level=level,
+                    )
+                    yield (
+                        warehouse.pk,
+                        location.code,
+                        f"Zone {zone} aisle {aisle} bay {bay} level {level}",
+                        "",
+                        location.parts["zone"],
+                        location.parts["aisle"],
+                        location.parts["bay"],
+                        location.parts["level"],
+                        zone,
+                        aisle,
+                        bay,
+                        level,
+                        Decimal(self.random.choice([1, 2, 4, 8])),
+                        Decimal(self.random.choice([250, 500, 1000, 2000])),
+                        True,
+                        "",
+                        self.now,
+                        self.now,
+                    )
+
+        self._insert(
+            Rack,
+            [
+                "warehouse_id",
+                "code",
+                "name",
+                "description",
+                "zone",
+                "aisle",
+                "bay",
+                "level",
+                "zone_no",
+                "aisle_no",
+                "bay_no",
+                "level_no",
+                "capacity",
+                "max_weight",
+                "is_active",
+                "notes",
+                "created_at",
+                "updated_at",
+            ],
+            rows(),
+        )
+
+    # Items
+
+    def _uoms(self):
+        uoms = {}
+        for code, name, uom_type, factor, base in UOM_HIERARCHY:
+            uoms[code] = UOM.objects.create(
+                code=f"{PREFIX}-{code}",
+                name=name,
+                uom_type=uom_type,
+                conversion_factor=Decimal(factor),
+                base_uom=uoms.get(base),
+            )
+        return uoms
+
+    def _items(self):
+        # The base unit of item n is drawn again in _item_uoms from the same
+        # per-item seed, so the two passes agree without keeping state
+        def rows():
+            for index in range(self.options["items"]):
+                rng = self._item_random(index)
+                base = rng.choice(list(PACKINGS))
+                yield (
+                    f"{PREFIX}-ITEM-{index:08d}",
+                    f"{rng.choice(ADJECTIVES)} {rng.choice(PRODUCTS[base])} "
+                    f"{rng.choice(VARIANTS)}",
+                    "",
+                    ITEM_UNITS[base],
+                    rng.random() > 0.02,  # noqa: PLR2004
+                    self.now,
+                    self.now,
+                )
+
+        self._insert(
+            Item,
+            [
+                "code",
+                "name",
+                "description",
+                "unit",
+                "is_active",
+                "created_at",
+                "updated_at",
+            ],
+            rows(),
+        )
+
+    def _item_uoms(self, uoms):
+        item_ids = self._ids(Item, code__startswith=f"{PREFIX}-ITEM-")
+        per_item = self.options["uoms_per_item"]
+
+        def rows():
+            serial = itertools.count()
+            for index, item_id in enumerate(item_ids):
+                rng = self._item_random(index)
+                base = rng.choice(list(PACKINGS))
+                packings = PACKINGS[base][: per_item - 1]
+                for position, code in enumerate([base, *packings]):
+                    uom = uoms[code]
+                    yield (
+                        item_id,
+                        uom.pk,
+                        uom.conversion_factor,
+                        position == 0,
+                        position > 0,
+                        True,
+                        True,
+                        ean13(next(serial)),
+                        True,
+                        self.now,
+                        self.now,
+                    )
+
+        self._insert(
+            ItemUOM,
+            [
+                "item_id",
+                "uom_id",
+                "conversion_factor",
+                "is_base_uom",
+                "is_purchase_uom",
+                "is_sales_uom",
+                "is_stock_uom",
+                "barcode",
+                "is_active",
+                "created_at",
+                "updated_at",
+            ],
+            rows(),
+        )
+
+    def _item_random(self, index):
+        return random.Random(self.options["seed"] * 1_000_003 + index)  # noqa: S311
+
+    # Roles and menus
+
+    def _roles(self):
+        self._insert(
+            Role,
+            ["code", "name", "description", "is_active", "created_at", "updated_at"],
+            (
+                (
+                    f"{PREFIX}-ROLE-{index:04d}",
+                    f"Generated Role {index}",
+                    "",
+                    True,
+                    self.now,
+                    self.now,
+                )
+                for index in range(1, self.options["roles"] + 1)
+            ),
+        )
+        return self._ids(Role, code__startswith=f"{PREFIX}-ROLE-")
+
+    def _menus(self):
+        columns = [
+            "code",
+            "name",
+            "icon",
+            "url",
+            "parent_id",
+            "order",
+            "is_active",
+            "module",
+            "created_at",
+            "updated_at",
+        ]
+        # One root per module, the rest spread below them
+        total = self.options["menus"]
+        roots = min(len(MODULES), total)
+        self._insert(
+            Menu,
+            columns,
+            (
+                (
+                    f"{PREFIX}-MENU-{index:04d}",
+                    MODULES[index].title(),
+                    "folder",
+                    f"/{MODULES[index]}",
+                    None,
+                    index,
+                    True,
+                    MODULES[index],
+                    self.now,
+                    self.now,
+                )
+                for index in range(roots)
+            ),
+        )
+        root_ids = self._ids(Menu, code__startswith=f"{PREFIX}-MENU-")
+
+        def children():
+            for index in range(roots, total):
+                module = index % roots
+                feature = self.random.choice(FEATURES)
+                yield (
+                    f"{PREFIX}-MENU-{index:04d}",
+                    f"{feature.replace('_', ' ').title()} {index}",
+                    feature,
+                    f"/{MODULES[module]}/{feature}/{index}",
+                    root_ids[module],
+                    index,
+                    True,
+                    MODULES[module],
+                    self.now,
+                    self.now,
+                )
+
+        self._insert(Menu, columns, children())
+        return self._ids(Menu, code__startswith=f"{PREFIX}-MENU-")
+
+    def _accessibilities(self, roles):
+        def rows():
+            for role_id in roles:
+                for module, feature, permission in itertools.product(
+                    MODULES,
+                    FEATURES,
+                    PERMISSIONS,
+                ):
+                    yield (
+                        role_id,
+                        module,
+                        feature,
+                        permission,
+                        permission == "read" or self.random.random() < 0.5,  # noqa: PLR2004
+                        self.now,
+                        self.now,
+                    )
+
+        self._insert(
+            Accessibility,
+            [
+                "role_id",
+                "module",
+                "feature",
+                "permission",
+                "is_granted",
+                "created_at",
+                "updated_at",
+            ],
+            rows(),
+        )
+
+    def _role_menu_accesses(self, roles, menus):
+        def rows():
+            for role_id in roles:
+                for menu_id in self.random.sample(menus, k=len(menus) // 2 or 1):
+                    yield (role_id, menu_id, True, self.now, self.now)
+
+        self._insert(
+            RoleMenuAccess,
+            ["role_id", "menu_id", "can_access", "created_at", "updated_at"],
+            rows(),
+        )
+
+
+def ean13(serial):
+    """Valid EAN-13 in the restricted-circulation range (prefix 20)"""
+    digits = f"20{serial:010d}"
+    total = sum(
+        int(digit) * (3 if position % 2 else 1) for position, digit in enumerate(digits)
+    )
+    return f"{digits}{(10 - total % 10) % 10}"
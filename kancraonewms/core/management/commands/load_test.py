@@ -0,0 +1,320 @@
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from kancraonewms.master.models import Item
+from kancraonewms.master.models import ItemUOM
+from kancraonewms.organizations.models import Warehouse
+from kancraonewms.users.models import User
+from kancraonewms.users.tokens import UserRefreshToken
+
+# Relative weight of each scenario in the traffic mix, like a Locust task set
+SCENARIOS = {
+    "scanner": 60,
+    "racks": 25,
+    "bootstrap": 10,
+    "sync": 5,
+}
+SYNC_BATCH = 50
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a running server with a warehouse traffic mix: scanner barcode "
+        "lookups, rack browsing by warehouse, the menu bootstrap after login and "
+        "the nightly item sync. Reports p50/p95/p99 latency, throughput and "
+        "error rate per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="http://localhost:8000")
+        parser.add_argument("--users", type=int, default=20, help="Virtual users")
+        parser.add_argument(
+            "--spawn-rate",
+            type=float,
+            default=5.0,
+            help="Virtual users started per second",
+        )
+        parser.add_argument("--duration", type=float, default=60.0, help="Seconds")
+        parser.add_argument(
+            "--wait",
+            default="0.5,2",
+            help="Think time between tasks, min,max seconds",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=list(SCENARIOS),
+            help="Run only these scenarios (repeatable)",
+        )
+        parser.add_argument(
+            "--username",
+            required=True,
+            help="Existing user the virtual users act as",
+        )
+        parser.add_argument(
+            "--password",
+            help="Log in over HTTP; without it a token is issued locally",
+        )
+        parser.add_argument("--sample", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--timeout", type=float, default=30.0)
+        parser.add_argument("--output", help="Write the results as JSON")
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.host = urlsplit(options["host"])
+        if self.host.scheme not in {"http", "https"}:
+            msg = "--host must be an http(s) URL."
+            raise CommandError(msg)
+        low, _sep, high = options["wait"].partition(",")
+        self.wait = (float(low), float(high or low))
+        names = options["scenario"] or list(SCENARIOS)
+        self.scenarios = [getattr(self, f"scenario_{name}") for name in names]
+        self.weights = [SCENARIOS[name] for name in names]
+
+        self.random = random.Random(options["seed"])  # noqa: S311
+        self._sample_data()
+        self.token = self._token()
+        self.stats = defaultdict(lambda: {"timings": [], "failures": 0, "errors": {}})
+        self.lock = threading.Lock()
+
+        self.stdout.write(
+            f"Running {options['users']} users for {options['duration']:.0f}s "
+            f"against {options['host']} ({', '.join(names)})",
+        )
+        self.started = time.perf_counter()
+        self.deadline = self.started + options["duration"]
+        with ThreadPoolExecutor(max_workers=options["users"]) as pool:
+            for index in range(options["users"]):
+                pool.submit(self._user, index)
+                time.sleep(1 / options["spawn_rate"])
+        self._report(time.perf_counter() - self.started)
+
+    # Setup
+
+    def _sample(self, queryset, field):
+        """Up to ``--sample`` values of ``field`` spread over the table"""
+        values = list(
+            queryset.order_by("pk").values_list(field, flat=True)[
+                : self.options["sample"] * 20
+            ],
+        )
+        return self.random.sample(values, min(len(values), self.options["sample"]))
+
+    def _sample_data(self):
+        self.barcodes = self._sample(ItemUOM.objects.exclude(barcode=""), "barcode")
+        self.warehouses = self._sample(Warehouse.objects.all(), "pk")
+        self.items = list(
+            Item.objects.order_by("pk").values("pk", "name")[: self.options["sample"]],
+        )
+        if not self.barcodes or not self.warehouses or not self.items:
+            msg = (
+                "The database has no item-UOMs, warehouses or items to sample; "
+                "load a dataset first, e.g. with generate_dataset."
+            )
+            raise CommandError(msg)
+
+    def _token(self):
+        if self.options["password"] is None:
+            try:
+                user = User.objects.get(username=self.options["username"])
+            except User.DoesNotExist as exc:
+                msg = f"User '{self.options['username']}' does not exist."
+                raise CommandError(msg) from exc
+            return str(UserRefreshToken.for_user(user).access_token)
+
+        client = Client(self.host, self.options["timeout"])
+        status, body = client.request(
+            "POST",
+            "/api/auth/login/",
+            {
+                "username": self.options["username"],
+                "password": self.options["password"],
+            },
+        )
+        if status != 200:  # noqa: PLR2004
+            msg = f"Login failed with status {status}: {body[:200]!r}"
+            raise CommandError(msg)
+        return json.loads(body)["access"]
+
+    # Virtual users
+
+    def _user(self, index):
+        rng = random.Random(self.options["seed"] + index)  # noqa: S311
+        client = Client(self.host, self.options["timeout"], self.token)
+        try:
+            while time.perf_counter() < self.deadline:
+                scenario = rng.choices(self.scenarios, self.weights)[0]
+                scenario(client, rng)
+                time.sleep(rng.uniform(*self.wait))
+        except Exception as exc:  # noqa: BLE001
+            self.stderr.write(f"User {index} stopped: {exc!r}")
+        finally:
+            client.close()
+
+    def _call(self, client, name, path, data=None, headers=None):
+        """Send a request and record it under ``name``, e.g. ``GET /api/x/``"""
+        method = name.split(" ", 1)[0]
+        started = time.perf_counter()
+        try:
+            status, body = client.request(method, path, data, headers)
+        except (OSError, http.client.HTTPException) as exc:
+            status, body, error = 0, b"", type(exc).__name__
+        else:
+            error = None if status < 400 else str(status)  # noqa: PLR2004
+        elapsed = (time.perf_counter() - started) * 1000
+        with self.lock:
+            stats = self.stats[name]
+            stats["timings"].append(elapsed)
+            if error is not None:
+                stats["failures"] += 1
+                stats["errors"][error] = stats["errors"].get(error, 0) + 1
+        return status, body
+
+    def scenario_scanner(self, client, rng):
+        """A handheld scans a barcode and looks the item-UOM up"""
+        barcode = rng.choice(self.barcodes)
+        self._call(
+            client,
+            "GET /api/item-uoms/?search=[barcode]",
+            f"/api/item-uoms/?{urlencode({'search': barcode, 'is_active': 'true'})}",
+        )
+
+    def scenario_racks(self, client, rng):
+        """An operator browses the racks of a warehouse, then one aisle"""
+        warehouse = rng.choice(self.warehouses)
+        self._call(
+            client,
+            "GET /api/racks/?warehouse=[id]",
+            f"/api/racks/?warehouse={warehouse}",
+        )
+        aisle = rng.randint(1, 25)
+        self._call(
+            client,
+            "GET /api/racks/?warehouse=[id]&aisle_min&aisle_max",
+            f"/api/racks/?warehouse={warehouse}&aisle_min={aisle}&aisle_max={aisle}",
+        )
+
+    def scenario_bootstrap(self, client, rng):
+        """The frontend loads profile, permissions and menus after login"""
+        self._call(client, "GET /api/auth/me/bootstrap/", "/api/auth/me/bootstrap/")
+
+    def scenario_sync(self, client, rng):
+        """The nightly ERP sync pushes a batch of item updates"""
+        batch = rng.sample(self.items, min(SYNC_BATCH, len(self.items)))
+        for item in batch:
+            self._call(
+                client,
+                "PATCH /api/items/[id]/",
+                f"/api/items/{item['pk']}/",
+                {"name": item["name"]},
+                {"Idempotency-Key": uuid.uuid4().hex},
+            )
+        self._call(
+            client,
+            "POST /api/items/bulk-activate/",
+            "/api/items/bulk-activate/",
+            {"ids": [item["pk"] for item in batch]},
+        )
+
+    # Report
+
+    def _report(self, elapsed):
+        result = {"host": self.options["host"], "duration": elapsed, "requests": {}}
+        self.stdout.write(
+            f"\n{'request':<52} {'reqs':>7} {'fail %':>7} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'req/s':>7}",
+        )
+        total = failures = 0
+        for name, stats in sorted(self.stats.items()):
+            timings = stats["timings"]
+            summary = {
+                "requests": len(timings),
+                "failures": stats["failures"],
+                "error_rate": stats["failures"] / len(timings),
+                "errors": stats["errors"],
+                **percentiles(timings),
+                "max_ms": max(timings),
+                "throughput": len(timings) / elapsed,
+            }
+            result["requests"][name] = summary
+            total += len(timings)
+            failures += stats["failures"]
+            self.stdout.write(
+                f"{name:<52} {summary['requests']:>7} "
+                f"{summary['error_rate'] * 100:>7.2f} {summary['p50_ms']:>8.1f} "
+                f"{summary['p95_ms']:>8.1f} {summary['p99_ms']:>8.1f} "
+                f"{summary['max_ms']:>8.1f} {summary['throughput']:>7.1f}",
+            )
+        result["total"] = {
+            "requests": total,
+            "failures": failures,
+            "error_rate": failures / total if total else 0,
+            "throughput": total / elapsed,
+        }
+        self.stdout.write(
+            f"{'total':<52} {total:>7} "
+            f"{result['total']['error_rate'] * 100:>7.2f} "
+            f"{'':>35} {result['total']['throughput']:>7.1f}",
+        )
+        if self.options["output"]:
+            Path(self.options["output"]).write_text(json.dumps(result, indent=2))
+
+
+def percentiles(timings):
+    if len(timings) == 1:
+        return dict.fromkeys(("p50_ms", "p95_ms", "p99_ms"), timings[0])
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    return {"p50_ms": cuts[49], "p95_ms": cuts[94], "p99_ms": cuts[98]}
+
+
+class Client:
+    """Keep-alive JSON client of one virtual user"""
+
+    def __init__(self, url, timeout, token=None):
+        self.url = url
+        self.timeout = timeout
+        self.token = token
+        self.connection = None
+
+    def request(self, method, path, data=None, headers=None):
+        headers = {"Accept": "application/json", **(headers or {})}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        body = None
+        if data is not None:
+            body = json.dumps(data)
+            headers["Content-Type"] = "application/json"
+        if self.connection is None:
+            connection_class = (
+                http.client.HTTPSConnection
+                if self.url.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            self.connection = connection_class(self.url.netloc, timeout=self.timeout)
+        try:
+            self.connection.request(method, path, body, headers)
+            response = self.connection.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            # Reconnect on the next request
+            self.close()
+            raise
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
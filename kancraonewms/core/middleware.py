@@ -0,0 +1,103 @@
+"""
+Adaptive load shedding.
+
+When workers fall behind, requests spend longer queued before a worker picks
+them up than they spend being served, and answering them late only deepens
+the backlog (clients have often given up already). The middleware measures
+that queue latency for every request:
+
+* under ASGI, from the moment ``config.asgi`` received the request
+  (``scope["received_at"]``) to the moment the middleware runs
+* otherwise from an ``X-Request-Start`` header (``t=<unix seconds>``, or
+  milliseconds), only when set by one of ``LOAD_SHEDDING_TRUSTED_PROXIES``
+
+and keeps an exponentially weighted moving average per process. Each sample
+counts for at most twice the threshold, so one request (or a bogus header)
+cannot hold the average up for long. Once the
+average exceeds ``LOAD_SHEDDING_QUEUE_LATENCY`` seconds, requests under
+``LOAD_SHEDDING_PATHS`` are rejected with 503 and ``Retry-After``, with a
+probability growing from 0 at the threshold to 1 at twice the threshold, so
+the load admitted adapts to what the workers keep up with.
+"""
+
+import functools
+import ipaddress
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.http import JsonResponse
+
+# Weight of the newest sample in the moving average
+SMOOTHING = 0.2
+# Largest sample, in thresholds: the latency at which every request is shed
+MAX_SAMPLE = 2
+RETRY_AFTER = 1
+
+
+class LoadSheddingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.average = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        latency = queue_latency(request)
+        if latency is not None:
+            threshold = settings.LOAD_SHEDDING_QUEUE_LATENCY
+            if threshold:
+                latency = min(latency, MAX_SAMPLE * threshold)
+            with self.lock:
+                self.average += SMOOTHING * (latency - self.average)
+            if self.should_shed(request):
+                response = JsonResponse(
+                    {"error": "Server is overloaded. Please try again later."},
+                    status=503,
+                )
+                response["Retry-After"] = str(RETRY_AFTER)
+                return response
+        return self.get_response(request)
+
+    def should_shed(self, request):
+        threshold = settings.LOAD_SHEDDING_QUEUE_LATENCY
+        if not threshold or self.average <= threshold:
+            return False
+        if not request.path.startswith(tuple(settings.LOAD_SHEDDING_PATHS)):
+            return False
+        overload = (self.average - threshold) / threshold
+        return random.random() < overload  # noqa: S311
+
+
+def queue_latency(request, now=None):
+    """Seconds ``request`` waited before reaching the middleware, or None"""
+    scope = getattr(request, "scope", None)
+    if scope and "received_at" in scope:
+        return max(0.0, time.monotonic() - scope["received_at"])
+
+    if not _from_trusted_proxy(request):
+        return None
+    header = request.headers.get("X-Request-Start", "")
+    try:
+        started = float(header.removeprefix("t="))
+    except ValueError:
+        return None
+    if started > 1e11:  # noqa: PLR2004
+        # Milliseconds since the epoch
+        started /= 1000
+    now = time.time() if now is None else now
+    return max(0.0, now - started)
+
+
+def _from_trusted_proxy(request):
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    networks = _networks(tuple(settings.LOAD_SHEDDING_TRUSTED_PROXIES))
+    return any(address in network for network in networks)
+
+
+@functools.cache
+def _networks(proxies):
+    return [ipaddress.ip_network(proxy, strict=False) for proxy in proxies]
@@ -0,0 +1,153 @@
+"""
+Read replicas with read-your-writes consistency.
+
+:class:`ReplicaMiddleware` lets safe requests (GET, HEAD, OPTIONS: lists,
+retrieves, exports and searches) read from a replica; :class:`ReplicaRouter`
+sends their reads to the replica picked for the request. Writes, reads in
+unsafe requests and everything outside a request (Celery tasks, management
+commands) use the primary.
+
+Read-your-writes:
+
+* a successful unsafe request pins its caller (the token user, otherwise
+  the session user or address) to the primary for ``REPLICA_PIN_SECONDS``,
+  in the cache and in a cookie, so the next reads see the write even
+  though the replicas may not have replayed it yet
+* a safe request that writes anyway reads from the primary from then on
+
+Replica lag is measured at most every ``REPLICA_LAG_CHECK_INTERVAL`` seconds
+per process. A replica lagging more than ``REPLICA_MAX_LAG`` seconds, or not
+reachable, is skipped until the next check; without a usable replica reads
+fall back to the primary.
+"""
+
+import contextvars
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db import DatabaseError
+from django.db import connections
+
+from .idempotency import caller_id
+
+PIN_COOKIE = "primary_pin"
+PIN_KEY_PREFIX = "replica:pin"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+# Replica chosen for the current request and whether it wrote since
+_request = contextvars.ContextVar("replica_request", default=None)
+# alias -> (monotonic time of the check, lag in seconds)
+_lag_checks = {}
+
+
+def replica_lag(alias):
+    """Seconds the replica ``alias`` is behind the primary"""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(LAG_SQL)
+        return float(cursor.fetchone()[0] or 0)
+
+
+def usable_replicas():
+    """Replicas whose last measured lag is within ``REPLICA_MAX_LAG``"""
+    now = time.monotonic()
+    usable = []
+    for alias in settings.DATABASE_REPLICAS:
+        checked, lag = _lag_checks.get(alias, (None, None))
+        if checked is None or now - checked >= settings.REPLICA_LAG_CHECK_INTERVAL:
+            try:
+                lag = replica_lag(alias)
+            except DatabaseError:
+                lag = float("inf")
+            _lag_checks[alias] = (now, lag)
+        if lag <= settings.REPLICA_MAX_LAG:
+            usable.append(alias)
+    return usable
+
+
+def is_pinned(request):
+    """Whether the caller wrote recently and must read from the primary"""
+    if request.COOKIES.get(PIN_COOKIE):
+        return True
+    return cache.get(f"{PIN_KEY_PREFIX}:{caller_id(request)}") is not None
+
+
+def pin(request, response):
+    """Pin the caller of ``request`` to the primary for a while"""
+    seconds = settings.REPLICA_PIN_SECONDS
+    cache.set(f"{PIN_KEY_PREFIX}:{caller_id(request)}", 1, seconds)
+    response.set_cookie(PIN_COOKIE, "1", max_age=seconds, httponly=True)
+
+
+class ReplicaMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        if request.method in SAFE_METHODS:
+            replicas = [] if is_pinned(request) else usable_replicas()
+            if not replicas:
+                return self.get_response(request)
+            token = _request.set({"replica": random.choice(replicas), "wrote": False})  # noqa: S311
+            try:
+                return self.get_response(request)
+            finally:
+                _request.reset(token)
+
+        response = self.get_response(request)
+        if response.status_code < 400:  # noqa: PLR2004
+            pin(request, response)
+        return response
+
+
+class ReplicaRouter:
+    """Route the reads of safe requests to their replica"""
+
+    def db_for_read(self, model, **hints):
+        state = _request.get()
+        if state is None or state["wrote"]:
+            return DEFAULT_DB_ALIAS if state else None
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:  # noqa: SLF001
+            return instance._state.db  # noqa: SLF001
+        return state["replica"]
+
+    def db_for_write(self, model, **hints):
+        state = _request.get()
+        if state is not None:
+            state["wrote"] = True
+        instance = hints.get("instance")
+        if (
+            instance is not None and instance._state.db in settings.DATABASE_REPLICAS  # noqa: SLF001
+        ):
+            # Rows read from a replica are saved to the primary
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:  # noqa: SLF001
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,13 @@
+from celery import shared_task
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+
+@shared_task()
+def refresh_cached(name, args, kwargs, lock_key=None):
+    """Recompute a stale stampede_cached entry, then release its lock."""
+    try:
+        import_string(name).refresh(*args, **kwargs)
+    finally:
+        if lock_key:
+            cache.delete(lock_key)
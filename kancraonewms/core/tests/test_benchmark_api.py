@@ -0,0 +1,85 @@
+"""
+Tests for the API benchmark command
+"""
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from kancraonewms.master.models import Item
+from kancraonewms.master.tests.factories import ItemUOMFactory
+from kancraonewms.master.tests.factories import RackFactory
+
+
+class BenchmarkApiCommandTest(TestCase):
+    """Tests for benchmark_api"""
+
+    def setUp(self):
+        ItemUOMFactory.create_batch(3)
+        RackFactory()
+        self.directory = Path(tempfile.mkdtemp())
+
+    def run_command(self, *args):
+        call_command(
+            "benchmark_api",
+            *args,
+            "--requests=2",
+            f"--output-dir={self.directory}",
+            stdout=StringIO(),
+        )
+        return json.loads(next(self.directory.glob("api-*.json")).read_text())
+
+    def test_results_cover_router_endpoints(self):
+        """Every list and detail route is measured and stored as JSON"""
+        result = self.run_command("--existing")
+
+        assert result["scale"] == "existing"
+        assert result["rows"]["items"] == Item.objects.count()
+        endpoints = result["endpoints"]
+        assert {"item-list", "item-detail", "rack-list", "uom-list"} <= set(endpoints)
+        stats = endpoints["item-list"]
+        assert stats["status"] == 200  # noqa: PLR2004
+        assert stats["requests"] == 2  # noqa: PLR2004
+        assert stats["p50_ms"] <= stats["p99_ms"]
+        assert stats["queries"] > 0
+
+    def test_shared_cache_is_left_alone(self):
+        """Measuring does not clear the keys of other cache users"""
+        cache.set("benchmark-api-test", "kept")
+        self.addCleanup(cache.delete, "benchmark-api-test")
+
+        self.run_command("--existing")
+
+        assert cache.get("benchmark-api-test") == "kept"
+
+    def test_compare_reports_regressions(self):
+        """A baseline with fewer queries is reported as regressed"""
+        result = self.run_command("--existing")
+        for stats in result["endpoints"].values():
+            stats["queries"] -= 1
+        baseline = self.directory / "baseline.json"
+        baseline.write_text(json.dumps(result))
+        out = StringIO()
+
+        call_command(
+            "benchmark_api",
+            "--existing",
+            "--requests=1",
+            f"--output-dir={self.directory}",
+            f"--compare={baseline}",
+            stdout=out,
+        )
+
+        assert "REGRESSION" in out.getvalue()
+
+    def test_unknown_scale(self):
+        """Unknown scales are rejected before seeding"""
+        with pytest.raises(CommandError):
+            call_command("benchmark_api", "--scale=10", stdout=StringIO())
@@ -0,0 +1,142 @@
+"""
+Tests for bulk updates
+"""
+
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from kancraonewms.core import bulk
+from kancraonewms.inventory.services import availability
+from kancraonewms.master.models import Accessibility
+from kancraonewms.master.models import Rack
+from kancraonewms.master.services import permissions
+from kancraonewms.master.tests.factories import AccessibilityFactory
+from kancraonewms.master.tests.factories import ItemUOMFactory
+from kancraonewms.master.tests.factories import RackFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
+
+
+class BulkActionTest(APITestCase):
+    """Tests for list-level bulk actions"""
+
+    def setUp(self):
+        token = UserRefreshToken.for_user(UserFactory()).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.warehouse = WarehouseFactory()
+        self.racks = RackFactory.create_batch(
+            3,
+            warehouse=self.warehouse,
+            is_active=False,
+        )
+        self.other = RackFactory(is_active=False)
+        self.url = reverse("api:rack-bulk-activate")
+
+    def test_activate_by_ids_in_one_statement(self):
+        """Selected rows change with a single UPDATE"""
+        ids = [rack.pk for rack in self.racks[:2]]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {"ids": ids}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"updated": 2}
+        updates = [q for q in queries if q["sql"].startswith("UPDATE")]
+        assert len(updates) == 1
+        active = Rack.objects.filter(is_active=True).values_list("pk", flat=True)
+        assert set(active) == set(ids)
+
+    def test_activate_by_filter(self):
+        """The list filters select the rows"""
+        url = f"{self.url}?warehouse={self.warehouse.pk}"
+        response = self.client.post(url, {}, format="json")
+
+        assert response.data == {"updated": 3}
+        self.other.refresh_from_db()
+        assert not self.other.is_active
+
+    def test_rows_already_set_are_skipped(self):
+        """Only rows that change are counted"""
+        self.client.post(self.url, {"ids": [self.racks[0].pk]}, format="json")
+        response = self.client.post(
+            self.url,
+            {"ids": [rack.pk for rack in self.racks]},
+            format="json",
+        )
+
+        assert response.data == {"updated": 2}
+
+    def test_selection_is_required(self):
+        """A request without ids or filter is rejected"""
+        response = self.client.post(self.url, {}, format="json")
+        invalid = self.client.post(self.url, {"ids": "all"}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Rack.objects.filter(is_active=True).exists()
+
+    def test_unrelated_params_are_not_a_selection(self):
+        """Parameters that filter nothing do not select every row"""
+        for query in ("format=json", "search=", "page=1"):
+            response = self.client.post(f"{self.url}?{query}", {}, format="json")
+
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Rack.objects.filter(is_active=True).exists()
+
+    def test_changed_rows_are_sent_by_primary_key(self):
+        """Receivers get the changed rows, not every row saved at that moment"""
+        received = []
+
+        def receiver(sender, queryset, **kwargs):
+            received.append(set(queryset))
+
+        bulk.bulk_updated.connect(receiver, sender=Rack)
+        self.addCleanup(bulk.bulk_updated.disconnect, receiver, sender=Rack)
+        now = timezone.now()
+        with mock.patch("kancraonewms.core.bulk.timezone.now", return_value=now):
+            Rack.objects.filter(pk=self.other.pk).update(updated_at=now)
+            bulk.update(Rack.objects.filter(warehouse=self.warehouse), is_active=True)
+
+        assert received == [set(self.racks)]
+
+
+class BulkUpdatedSignalTest(APITestCase):
+    """Tests for the aggregated change signal"""
+
+    def test_signal_sent_once_with_changed_rows(self):
+        """Receivers get one signal listing the changed rows"""
+        racks = RackFactory.create_batch(3, is_active=True)
+        received = []
+
+        def receiver(sender, queryset, values, count, **kwargs):
+            received.append((sender, set(queryset), values, count))
+
+        bulk.bulk_updated.connect(receiver, sender=Rack)
+        self.addCleanup(bulk.bulk_updated.disconnect, receiver, sender=Rack)
+        bulk.update(Rack.objects.filter(is_active=True), is_active=False)
+
+        assert received == [(Rack, set(racks), {"is_active": False}, 3)]
+
+    def test_grant_invalidates_compiled_permissions(self):
+        """Bulk grants start a new permissions generation"""
+        AccessibilityFactory(is_granted=False)
+        generation = permissions.get_generation()
+
+        bulk.update(Accessibility.objects.all(), is_granted=True)
+
+        assert permissions.get_generation() != generation
+
+    def test_item_uom_deactivation_drops_cached_factors(self):
+        """Deactivated item-UOMs leave the cached conversion factors"""
+        item_uom = ItemUOMFactory()
+        assert availability.get_uom_factors([item_uom.item_id])[item_uom.item_id]
+
+        bulk.update(type(item_uom).objects.filter(is_active=True), is_active=False)
+
+        assert not availability.get_uom_factors([item_uom.item_id])[item_uom.item_id]
@@ -0,0 +1,145 @@
+"""
+Tests for the in-process cache and stampede protection
+"""
+
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from kancraonewms.core import caching
+from kancraonewms.core.caching import LocalCache
+from kancraonewms.core.caching import stampede_cached
+from kancraonewms.core.tasks import refresh_cached
+
+calls = []
+
+
+@stampede_cached(60)
+def square(number):
+    calls.append(number)
+    return number * number
+
+
+@stampede_cached(60, stale=30)
+def cube(number):
+    calls.append(number)
+    return number**3
+
+
+def _key(func, *args):
+    name = f"{__name__}.{func.__name__}"
+    return caching._cache_key(name, None, [args, {}])  # noqa: SLF001
+
+
+class LocalCacheTest(SimpleTestCase):
+    """Tests for LRU eviction and expiry"""
+
+    def test_least_recently_used_is_evicted(self):
+        """Reading an entry keeps it over older ones"""
+        local = LocalCache(maxsize=2, ttl=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        assert local.get("a") == 1
+        assert local.get("b") is None
+        assert len(local) == 2  # noqa: PLR2004
+
+    def test_entries_expire(self):
+        """Entries are gone ttl seconds after they were set"""
+        local = LocalCache(maxsize=2, ttl=10)
+        with mock.patch("kancraonewms.core.caching.time.monotonic", return_value=100):
+            local.set("a", None)
+            assert local.get("a", "missing") is None
+        with mock.patch("kancraonewms.core.caching.time.monotonic", return_value=110):
+            assert local.get("a", "missing") == "missing"
+        assert len(local) == 0
+
+
+class StampedeCachedTest(SimpleTestCase):
+    """Tests for early refresh, single flight and stale while revalidate"""
+
+    def setUp(self):
+        calls.clear()
+
+    def _expire(self, func, *args, seconds=0):
+        key = _key(func, *args)
+        entry = cache.get(key)
+        entry["expires"] = time.time() + seconds
+        cache.set(key, entry)
+
+    def test_cached(self):
+        """Repeated calls are computed once"""
+        assert square(3) == 9  # noqa: PLR2004
+        assert square(3) == 9  # noqa: PLR2004
+        assert square(4) == 16  # noqa: PLR2004
+
+        assert calls == [3, 4]
+
+    def test_early_refresh(self):
+        """Entries close to expiry are refreshed with growing probability"""
+        square(3)
+        self._expire(square, 3, seconds=1)
+        entry = cache.get(_key(square, 3))
+        entry["delta"] = 1.0
+        cache.set(_key(square, 3), entry)
+
+        with mock.patch.object(caching.random, "random", return_value=0.0):
+            square(3)
+        assert calls == [3]
+        with mock.patch.object(caching.random, "random", return_value=0.9):
+            square(3)
+        assert calls == [3, 3]
+
+    def test_stale_served_while_celery_refreshes(self):
+        """An expired entry within the stale window is served and refreshed once"""
+        cube(2)
+        self._expire(cube, 2, seconds=-1)
+
+        with mock.patch.object(refresh_cached, "delay") as delay:
+            assert cube(2) == 8  # noqa: PLR2004
+            assert cube(2) == 8  # noqa: PLR2004
+
+        delay.assert_called_once()
+        refresh_cached(*delay.call_args.args)
+        assert calls == [2, 2]
+        assert cache.get(_key(cube, 2))["expires"] > time.time()
+        assert cache.get(f"{_key(cube, 2)}:lock") is None
+
+    def test_single_flight(self):
+        """A miss waits for the caller holding the lock instead of computing"""
+        key = _key(square, 5)
+        cache.add(f"{key}:lock", 1)
+
+        def finish():
+            time.sleep(0.1)
+            cache.set(key, {"value": 25, "delta": 0, "expires": time.time() + 60})
+
+        thread = threading.Thread(target=finish)
+        thread.start()
+        with mock.patch.object(caching, "WAIT_INTERVAL", 0.01):
+            assert square(5) == 25  # noqa: PLR2004
+        thread.join()
+
+        assert calls == []
+
+
+class IsolatedCacheTest(SimpleTestCase):
+    """Tests for the private cache namespace of benchmarks"""
+
+    def test_shared_keys_are_kept(self):
+        """The block starts cold and leaves the shared entries alone"""
+        cache.set("shared", 1)
+        self.addCleanup(cache.delete, "shared")
+
+        with caching.isolated_cache("test"):
+            assert cache.get("shared") is None
+            cache.set("own", 2)
+            assert cache.get("own") == 2  # noqa: PLR2004
+
+        assert cache.get("shared") == 1
+        assert cache.get("own") is None
@@ -0,0 +1,135 @@
+"""
+Tests for database connection pooling
+"""
+
+import unittest
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError
+from django.db import connection
+from django.db import connections
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+from django.urls import reverse
+from psycopg_pool import ConnectionPool
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from kancraonewms.core import db
+from kancraonewms.master.models import Item
+from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
+
+
+class PoolOptionsTest(SimpleTestCase):
+    """Tests for pool sizing"""
+
+    def test_split_over_workers(self):
+        """The unreserved connections are split over the workers"""
+        options = db.pool_options(workers=4, max_connections=100, reserved=20)
+
+        assert options["max_size"] == 20  # noqa: PLR2004
+        assert options["min_size"] == 5  # noqa: PLR2004
+
+    def test_explicit_sizes_and_floor(self):
+        """Explicit sizes win and the pool never drops below two connections"""
+        crowded = db.pool_options(workers=64, max_connections=100, reserved=20)
+        explicit = db.pool_options(
+            workers=4,
+            max_connections=100,
+            reserved=20,
+            max_size=8,
+            min_size=12,
+        )
+
+        assert crowded["max_size"] == db.MIN_POOL_SIZE
+        assert explicit["max_size"] == 8  # noqa: PLR2004
+        assert explicit["min_size"] == 8  # noqa: PLR2004
+
+
+class DatabasePoolMetricsTest(APITestCase):
+    """Tests for the pool metrics endpoint"""
+
+    url = reverse("api:db-pool-metrics")
+
+    def authenticate(self, **fields):
+        token = UserRefreshToken.for_user(UserFactory(**fields)).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_unpooled_database(self):
+        """Databases without a pool are reported as such"""
+        self.authenticate(is_staff=True)
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["default"] == {"pooled": False}
+
+    def test_pool_statistics(self):
+        """A pooled database reports the psycopg_pool statistics"""
+        pool = ConnectionPool("", open=False, min_size=1, max_size=4, timeout=5)
+        self.authenticate(is_staff=True)
+        with mock.patch.object(
+            type(connections["default"]),
+            "pool",
+            new_callable=mock.PropertyMock,
+            return_value=pool,
+            create=True,
+        ):
+            response = self.client.get(self.url)
+
+        stats = response.data["default"]
+        assert stats["pooled"]
+        assert stats["pool_max"] == 4  # noqa: PLR2004
+        assert stats["timeout"] == 5  # noqa: PLR2004
+        assert "requests_waiting" in stats
+
+    def test_staff_only(self):
+        """Other users cannot read the metrics"""
+        self.authenticate()
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "Requires PostgreSQL")
+class BenchmarkDbPoolCommandTest(TransactionTestCase):
+    """Tests for benchmark_db_pool"""
+
+    # The command opens aliases of its own on the test database
+    databases = "__all__"
+
+    def test_pool_opens_fewer_connections(self):
+        """The pool reuses connections that new threads would open again"""
+        out = StringIO()
+        call_command(
+            "benchmark_db_pool",
+            "--requests=50",
+            "--concurrency=5",
+            "--pool-size=5",
+            "--modes=new,pool",
+            stdout=out,
+        )
+
+        rows = {
+            line.split()[0]: line.split() for line in out.getvalue().splitlines()[1:]
+        }
+        assert int(rows["new"][2]) == 50  # noqa: PLR2004
+        assert int(rows["pool"][2]) <= 5  # noqa: PLR2004
+        assert rows["pool"][-1] == "0"
+
+    def test_failed_requests_are_reported(self):
+        """A mode whose every request fails stops with an error"""
+        with (
+            mock.patch.object(Item.objects, "using", side_effect=DatabaseError),
+            pytest.raises(CommandError, match="Every new request failed"),
+        ):
+            call_command(
+                "benchmark_db_pool",
+                "--requests=3",
+                "--modes=new",
+                stdout=StringIO(),
+            )
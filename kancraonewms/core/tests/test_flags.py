@@ -0,0 +1,121 @@
+"""
+Tests for exclusive flags
+"""
+
+import pytest
+from django.db import IntegrityError
+from django.db import transaction
+from django.test import TestCase
+
+from kancraonewms.core.bulk import bulk_updated
+from kancraonewms.core.flags import set_exclusive_flag
+from kancraonewms.master.models import ItemUOM
+from kancraonewms.master.tests.factories import ItemFactory
+from kancraonewms.master.tests.factories import ItemUOMFactory
+from kancraonewms.organizations.models import Warehouse
+from kancraonewms.organizations.tests.factories import CompanyFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+
+
+class ExclusiveFlagMixinTest(TestCase):
+    """Tests for saving flagged rows"""
+
+    def setUp(self):
+        self.company = CompanyFactory()
+        self.first = WarehouseFactory(company=self.company, is_default=True)
+
+    def test_new_default_clears_previous(self):
+        """Saving a new default clears the previous one"""
+        second = WarehouseFactory(company=self.company, is_default=True)
+
+        self.first.refresh_from_db()
+        assert not self.first.is_default
+        assert second.is_default
+
+    def test_saving_existing_default_skips_siblings(self):
+        """Re-saving the default issues no sibling update"""
+        warehouse = Warehouse.objects.get(pk=self.first.pk)
+        warehouse.name = "Renamed"
+
+        # One UPDATE for the row itself
+        with self.assertNumQueries(1):
+            warehouse.save()
+
+    def test_database_rejects_second_default(self):
+        """The partial unique index rejects two defaults per company"""
+        second = WarehouseFactory(company=self.company)
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Warehouse.objects.filter(pk=second.pk).update(is_default=True)
+
+    def test_other_companies_unaffected(self):
+        """Defaults are per company"""
+        other = WarehouseFactory(is_default=True)
+
+        self.first.refresh_from_db()
+        assert self.first.is_default
+        assert other.is_default
+
+    def test_validate_constraints_allows_swap(self):
+        """Model validation does not block a new default"""
+        second = WarehouseFactory.build(company=self.company, is_default=True)
+
+        second.validate_constraints()
+
+
+class SetExclusiveFlagTest(TestCase):
+    """Tests for the set-based swap"""
+
+    def test_bulk_swap(self):
+        """Several parents swap their base UOM at once"""
+        items = [ItemFactory() for _ in range(3)]
+        old = [ItemUOMFactory(item=item, is_base_uom=True) for item in items]
+        new = [ItemUOMFactory(item=item) for item in items]
+
+        # Lock, then select and update for the clear and the set, plus the
+        # savepoints of the nested atomic blocks
+        with self.assertNumQueries(12):
+            updated = set_exclusive_flag(
+                ItemUOM,
+                "is_base_uom",
+                "item",
+                [item_uom.pk for item_uom in new],
+            )
+
+        assert updated == 3  # noqa: PLR2004
+        assert set(
+            ItemUOM.objects.filter(is_base_uom=True).values_list("pk", flat=True),
+        ) == {item_uom.pk for item_uom in new}
+        assert not ItemUOM.objects.filter(pk__in=[i.pk for i in old], is_base_uom=True)
+
+    def test_swap_sends_bulk_updated(self):
+        """Receivers see both the cleared and the newly flagged rows"""
+        item = ItemFactory()
+        old = ItemUOMFactory(item=item, is_base_uom=True)
+        new = ItemUOMFactory(item=item)
+        received = []
+
+        def receiver(sender, queryset, values, count, **kwargs):
+            received.append((set(queryset), values, count))
+
+        bulk_updated.connect(receiver, sender=ItemUOM)
+        self.addCleanup(bulk_updated.disconnect, receiver, sender=ItemUOM)
+        set_exclusive_flag(ItemUOM, "is_base_uom", "item", [new.pk])
+
+        assert received == [
+            ({old}, {"is_base_uom": False}, 1),
+            ({new}, {"is_base_uom": True}, 1),
+        ]
+
+    def test_one_row_per_parent(self):
+        """Two rows of the same parent cannot both be flagged"""
+        item = ItemFactory()
+        item_uoms = [ItemUOMFactory(item=item) for _ in range(2)]
+
+        with pytest.raises(ValueError, match="Only one"):
+            set_exclusive_flag(
+                ItemUOM,
+                "is_base_uom",
+                "item",
+                [item_uom.pk for item_uom in item_uoms],
+            )
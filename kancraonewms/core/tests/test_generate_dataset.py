@@ -0,0 +1,85 @@
+"""
+Tests for the synthetic dataset generator
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from kancraonewms.core.management.commands.generate_dataset import ean13
+from kancraonewms.master.models import UOM
+from kancraonewms.master.models import Accessibility
+from kancraonewms.master.models import Item
+from kancraonewms.master.models import ItemUOM
+from kancraonewms.master.models import Menu
+from kancraonewms.master.models import Rack
+from kancraonewms.master.models import Role
+from kancraonewms.master.models import RoleMenuAccess
+from kancraonewms.organizations.models import Warehouse
+
+
+class GenerateDatasetCommandTest(TestCase):
+    """Tests for generate_dataset"""
+
+    def generate(self, *args):
+        call_command(
+            "generate_dataset",
+            "--items=50",
+            "--warehouses=2",
+            "--racks-per-warehouse=120",
+            "--roles=3",
+            "--menus=10",
+            *args,
+            stdout=StringIO(),
+        )
+
+    def test_row_counts(self):
+        """Every table gets the requested number of rows"""
+        self.generate()
+
+        assert Warehouse.objects.count() == 2  # noqa: PLR2004
+        assert Rack.objects.count() == 240  # noqa: PLR2004
+        assert Item.objects.count() == 50  # noqa: PLR2004
+        assert ItemUOM.objects.count() == 150  # noqa: PLR2004
+        assert ItemUOM.objects.filter(is_base_uom=True).count() == 50  # noqa: PLR2004
+        assert Role.objects.count() == 3  # noqa: PLR2004
+        assert Menu.objects.count() == 10  # noqa: PLR2004
+        assert Menu.objects.filter(parent__isnull=True).count() == 4  # noqa: PLR2004
+        assert Accessibility.objects.count() == 3 * 4 * 6 * 6
+        assert RoleMenuAccess.objects.count() == 3 * 5
+
+    def test_racks_follow_the_warehouse_layout(self):
+        """Rack codes parse with the warehouse grammar into their numbers"""
+        self.generate()
+
+        for rack in Rack.objects.select_related("warehouse")[:130]:
+            location = rack.warehouse.location_code_grammar.parse(rack.code)
+            assert location.code == rack.code
+            assert location.numbers == {
+                "zone": rack.zone_no,
+                "aisle": rack.aisle_no,
+                "bay": rack.bay_no,
+                "level": rack.level_no,
+            }
+        assert Rack.objects.filter(zone_no=1, aisle_no=2, bay_no=4).count() == 2 * 5
+
+    def test_uom_hierarchy_and_barcodes(self):
+        """Packing units derive from a base unit and barcodes are unique EAN-13"""
+        self.generate()
+
+        assert UOM.objects.get(code="GEN-BOX").base_uom.code == "GEN-PCS"
+        barcodes = list(ItemUOM.objects.values_list("barcode", flat=True))
+        assert len(set(barcodes)) == len(barcodes)
+        assert all(barcode == ean13(int(barcode[2:12])) for barcode in barcodes)
+        assert ean13(0) == "2000000000008"
+
+    def test_same_seed_same_dataset(self):
+        """Regenerating with the same seed reproduces the rows"""
+        self.generate()
+        first = list(Item.objects.order_by("code").values_list("code", "name"))
+
+        self.generate("--clear")
+
+        assert list(Item.objects.order_by("code").values_list("code", "name")) == first
+        assert Rack.objects.count() == 240  # noqa: PLR2004
@@ -0,0 +1,134 @@
+"""
+Tests for Idempotency-Key handling
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+
+from kancraonewms.core import idempotency
+from kancraonewms.core.idempotency import KEY_PREFIX
+from kancraonewms.master.api.views import RackViewSet
+from kancraonewms.master.models import Rack
+from kancraonewms.master.tests.factories import RackFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
+
+
+class IdempotencyMiddlewareTest(APITestCase):
+    """Tests for replaying retried requests"""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.refresh = UserRefreshToken.for_user(self.user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}",
+        )
+        self.warehouse = WarehouseFactory()
+        self.url = reverse("api:rack-list")
+        self.data = {
+            "code": "RACK-IDEM",
+            "name": "Idempotent Rack",
+            "warehouse": self.warehouse.pk,
+            "zone": "A",
+            "aisle": "A01",
+            "bay": "B01",
+            "level": "L1",
+            "position": "P01",
+        }
+
+    def _create(self, key="create-1", data=None):
+        return self.client.post(
+            self.url,
+            data or self.data,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_response(self):
+        """A retried create returns the first response without running again"""
+        first = self._create()
+        with self.assertNumQueries(0):
+            retry = self._create()
+
+        assert first.status_code == status.HTTP_201_CREATED
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry["Idempotent-Replayed"] == "true"
+        assert retry.json() == first.json()
+        assert Rack.objects.filter(code="RACK-IDEM").count() == 1
+
+    def test_retry_with_refreshed_token(self):
+        """Keys belong to the user, not to one access token"""
+        self._create()
+        access = UserRefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        assert self._create()["Idempotent-Replayed"] == "true"
+
+    def test_key_reused_for_other_request(self):
+        """Reusing a key with a different body is rejected"""
+        self._create()
+        response = self._create(data={**self.data, "code": "RACK-OTHER"})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert not Rack.objects.filter(code="RACK-OTHER").exists()
+
+    def test_concurrent_duplicate(self):
+        """A duplicate of an in-flight request gets 409"""
+        caller = f"user-{self.user.pk}"
+        cache.add(f"{KEY_PREFIX}:{caller}:create-1:lock", "in-flight")
+
+        response = self._create()
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response["Retry-After"] == "1"
+        assert not Rack.objects.exists()
+
+    def test_conflict_is_not_stored(self):
+        """A retry after a 409 runs the request again"""
+        conflict = Response(status=status.HTTP_409_CONFLICT)
+        with mock.patch.object(RackViewSet, "create", return_value=conflict):
+            assert self._create().status_code == status.HTTP_409_CONFLICT
+
+        response = self._create()
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert "Idempotent-Replayed" not in response
+
+    def test_lock_taken_by_another_request_is_kept(self):
+        """Releasing only deletes the lock holding the caller's token"""
+        lock_key = f"{KEY_PREFIX}:user-{self.user.pk}:create-1:lock"
+        cache.add(lock_key, "other")
+
+        idempotency._release(lock_key, "mine")  # noqa: SLF001
+        assert cache.get(lock_key) == "other"
+        idempotency._release(lock_key, "other")  # noqa: SLF001
+        assert cache.get(lock_key) is None
+
+    def test_keys_are_scoped_to_user(self):
+        """Another user's identical key runs its own request"""
+        rack = RackFactory(warehouse=self.warehouse, is_active=False)
+        url = reverse("api:rack-activate", kwargs={"pk": rack.pk})
+        self.client.post(url, HTTP_IDEMPOTENCY_KEY="activate-1")
+        rack.is_active = False
+        rack.save()
+
+        other = UserRefreshToken.for_user(UserFactory()).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {other}")
+        response = self.client.post(url, HTTP_IDEMPOTENCY_KEY="activate-1")
+
+        assert "Idempotent-Replayed" not in response
+        rack.refresh_from_db()
+        assert rack.is_active
+
+    def test_requests_without_key(self):
+        """Requests without the header are never replayed"""
+        self.client.post(self.url, self.data, format="json")
+        response = self.client.post(self.url, self.data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,66 @@
+"""
+Tests for the load test command
+"""
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import LiveServerTestCase
+
+from kancraonewms.master.tests.factories import ItemUOMFactory
+from kancraonewms.master.tests.factories import RackFactory
+from kancraonewms.users.tests.factories import UserFactory
+
+
+class LoadTestCommandTest(LiveServerTestCase):
+    """Tests for load_test against a live server"""
+
+    def setUp(self):
+        self.user = UserFactory(username="loadtest")
+        ItemUOMFactory.create_batch(5)
+        RackFactory()
+
+    def test_reports_every_scenario(self):
+        """Each scenario's requests are timed and none fail"""
+        output = Path(tempfile.mkdtemp()) / "result.json"
+        call_command(
+            "load_test",
+            f"--host={self.live_server_url}",
+            "--username=loadtest",
+            "--users=1",
+            "--spawn-rate=100",
+            "--duration=1",
+            "--wait=0",
+            f"--output={output}",
+            stdout=StringIO(),
+        )
+
+        result = json.loads(output.read_text())
+        requests = result["requests"]
+        assert {
+            "GET /api/item-uoms/?search=[barcode]",
+            "GET /api/racks/?warehouse=[id]",
+            "GET /api/auth/me/bootstrap/",
+        } <= set(requests)
+        assert result["total"]["requests"] > 0
+        assert result["total"]["failures"] == 0
+        stats = requests["GET /api/auth/me/bootstrap/"]
+        assert stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+
+    def test_requires_data(self):
+        """Running against an empty dataset fails early"""
+        with pytest.raises(CommandError):
+            call_command(
+                "load_test",
+                f"--host={self.live_server_url}",
+                "--username=missing",
+                "--duration=1",
+                "--scenario=scanner",
+                "--sample=0",
+                stdout=StringIO(),
+            )
@@ -0,0 +1,183 @@
+"""
+Tests for read replica routing
+"""
+
+from unittest import mock
+
+from django.db import connections
+from django.test import TransactionTestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from kancraonewms.core import replicas
+from kancraonewms.master.models import Rack
+from kancraonewms.master.services import permissions
+from kancraonewms.master.services import uom_cache
+from kancraonewms.master.services import user_roles
+from kancraonewms.master.tests.factories import AccessibilityFactory
+from kancraonewms.master.tests.factories import ItemUOMFactory
+from kancraonewms.master.tests.factories import RackFactory
+from kancraonewms.master.tests.factories import RoleFactory
+from kancraonewms.master.tests.factories import UserRoleFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaMiddlewareTest(APITransactionTestCase):
+    """Tests for reading safe requests from the replica"""
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        replicas._lag_checks.clear()  # noqa: SLF001
+        self.addCleanup(replicas._lag_checks.clear)  # noqa: SLF001
+        self.addCleanup(replicas.cache.clear)
+        token = UserRefreshToken.for_user(UserFactory()).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.warehouse = WarehouseFactory()
+        self.rack = RackFactory(warehouse=self.warehouse)
+        self.url = reverse("api:rack-list")
+
+    def _get(self, url=None):
+        with (
+            CaptureQueriesContext(connections["default"]) as primary,
+            CaptureQueriesContext(connections["replica"]) as replica,
+        ):
+            response = self.client.get(url or self.url)
+        assert response.status_code == status.HTTP_200_OK
+        return len(primary), len(replica)
+
+    def _create(self):
+        return self.client.post(
+            self.url,
+            {
+                "code": "RACK-PIN",
+                "name": "Pinned Rack",
+                "warehouse": self.warehouse.pk,
+                "zone": "A",
+                "aisle": "A01",
+                "bay": "B01",
+                "level": "L1",
+                "position": "P01",
+            },
+            format="json",
+        )
+
+    def test_list_and_retrieve_read_from_replica(self):
+        """Lists and retrieves do not touch the primary"""
+        for url in (self.url, reverse("api:rack-detail", args=[self.rack.pk])):
+            primary, replica = self._get(url)
+
+            assert primary == 0
+            assert replica > 0
+
+    def test_write_pins_caller_to_primary(self):
+        """After a write the caller reads from the primary"""
+        response = self._create()
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.cookies[replicas.PIN_COOKIE]["max-age"] == 5  # noqa: PLR2004
+        primary, replica = self._get()
+        assert primary > 0
+        assert replica == 0
+
+        # Another device of the same user is pinned through the cache
+        self.client.cookies.pop(replicas.PIN_COOKIE)
+        primary, replica = self._get()
+        assert replica == 0
+
+    def test_failed_write_does_not_pin(self):
+        """Rejected writes change nothing and keep reading from the replica"""
+        response = self.client.post(self.url, {}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert replicas.PIN_COOKIE not in response.cookies
+        assert self._get()[0] == 0
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        """A replica behind REPLICA_MAX_LAG is skipped until the next check"""
+        with mock.patch.object(replicas, "replica_lag", return_value=30.0) as lag:
+            primary, replica = self._get()
+            self._get()
+
+        assert primary > 0
+        assert replica == 0
+        lag.assert_called_once_with("replica")
+
+    @override_settings(REPLICA_LAG_CHECK_INTERVAL=0)
+    def test_unreachable_replica_falls_back_to_primary(self):
+        """A replica that cannot be queried is treated as lagging"""
+        with mock.patch.object(
+            replicas,
+            "replica_lag",
+            side_effect=replicas.DatabaseError,
+        ):
+            primary, replica = self._get()
+
+        assert primary > 0
+        assert replica == 0
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTest(TransactionTestCase):
+    """Tests for routing outside requests"""
+
+    databases = {"default", "replica"}
+
+    def test_reads_outside_requests_use_primary(self):
+        """Tasks and commands read from the primary"""
+        RackFactory()
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            list(Rack.objects.all())
+
+        assert len(replica) == 0
+
+    def test_cached_permissions_are_compiled_from_primary(self):
+        """Long-lived permission cache entries never read a lagging replica"""
+        role = RoleFactory()
+        AccessibilityFactory(role=role, is_granted=True)
+        user = UserRoleFactory(role=role).user
+        generation = permissions.get_generation()
+        token = replicas._request.set({"replica": "replica", "wrote": False})  # noqa: SLF001
+        self.addCleanup(replicas._request.reset, token)  # noqa: SLF001
+
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            compiled = permissions.compile_role(role.pk)
+            catalog = permissions.get_catalog.__wrapped__(generation)
+            assignments = user_roles._get_assignments.__wrapped__(  # noqa: SLF001
+                generation,
+                user.pk,
+            )
+
+        assert len(replica) == 0
+        assert compiled["permissions"] == list(catalog)
+        assert assignments == {None: role.pk}
+
+    def test_uom_cache_misses_are_loaded_from_primary(self):
+        """UOM and item-UOM lookups never cache a lagging replica's rows"""
+        item_uom = ItemUOMFactory(barcode="8990000000017")
+        uom_cache.clear_local()
+        self.addCleanup(uom_cache.clear_local)
+        self.addCleanup(replicas.cache.clear)
+        token = replicas._request.set({"replica": "replica", "wrote": False})  # noqa: SLF001
+        self.addCleanup(replicas._request.reset, token)  # noqa: SLF001
+
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            assert uom_cache.get_uom(item_uom.uom_id)["id"] == item_uom.uom_id
+            assert uom_cache.get_item_uoms(item_uom.item_id)
+            assert uom_cache.get_by_barcode(item_uom.barcode)["id"] == item_uom.pk
+
+        assert len(replica) == 0
+
+    def test_replica_rows_are_saved_to_primary(self):
+        """Saving a row read from a replica writes to the primary"""
+        rack = Rack.objects.using("replica").get(pk=RackFactory().pk)
+        rack.name = "Renamed"
+
+        assert replicas.ReplicaRouter().db_for_write(Rack, instance=rack) == "default"
+        assert not replicas.ReplicaRouter().allow_migrate("replica", "master")
@@ -0,0 +1,168 @@
+"""
+Tests for request throttles and load shedding
+"""
+
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test import SimpleTestCase
+from django.test import override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from kancraonewms.core.middleware import LoadSheddingMiddleware
+from kancraonewms.core.middleware import queue_latency
+from kancraonewms.core.throttling import AuthIPThrottle
+from kancraonewms.core.throttling import AuthUsernameThrottle
+from kancraonewms.core.throttling import TokenBucketThrottle
+
+RATES = {
+    "auth_ip": "3/min",
+    "auth_username": "2/min",
+    "scans": "2/s",
+}
+
+
+class _View:
+    throttle_scope = "scans"
+
+
+@override_settings(REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": RATES})
+class SlidingWindowThrottleTest(SimpleTestCase):
+    """Tests for sliding-window throttles"""
+
+    def _request(self, username="picker", ip="10.0.0.1"):
+        request = APIRequestFactory().post(
+            "/api/auth/login/",
+            {"username": username},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+        return Request(request, parsers=[JSONParser()])
+
+    def _allow(self, throttle_class, request, now):
+        throttle = throttle_class()
+        throttle.timer = lambda: now
+        return throttle.allow_request(request, _View()), throttle
+
+    def test_limit_per_ip(self):
+        """Requests beyond the rate are rejected until the window slides"""
+        allowed = [
+            self._allow(AuthIPThrottle, self._request(), 60.0)[0] for _ in range(4)
+        ]
+
+        assert allowed == [True, True, True, False]
+        assert self._allow(AuthIPThrottle, self._request(ip="10.0.0.2"), 60.0)[0]
+
+    def test_previous_window_is_weighted(self):
+        """Half of the previous window still counts halfway through the next"""
+        for _ in range(3):
+            self._allow(AuthIPThrottle, self._request(), 60.0)
+
+        allowed, throttle = self._allow(AuthIPThrottle, self._request(), 150.0)
+        assert allowed
+        allowed, throttle = self._allow(AuthIPThrottle, self._request(), 150.0)
+        assert not allowed
+        assert 0 < throttle.wait() <= 30  # noqa: PLR2004
+
+    def test_limit_per_username_across_ips(self):
+        """The username limit applies whatever the client IP"""
+        allowed = [
+            self._allow(
+                AuthUsernameThrottle,
+                self._request(username="Picker", ip=f"10.0.0.{i}"),
+                60.0,
+            )[0]
+            for i in range(3)
+        ]
+
+        assert allowed == [True, True, False]
+
+
+@override_settings(REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": RATES})
+class TokenBucketThrottleTest(SimpleTestCase):
+    """Tests for the token bucket throttle"""
+
+    def _allow(self, now):
+        request = Request(APIRequestFactory().get("/api/racks/"))
+        request.user = None
+        throttle = TokenBucketThrottle()
+        throttle.timer = lambda: now
+        return throttle.allow_request(request, _View()), throttle
+
+    def test_burst_then_refill(self):
+        """A full bucket allows a burst, then refills at the rate"""
+        assert self._allow(100.0)[0]
+        assert self._allow(100.0)[0]
+        allowed, throttle = self._allow(100.0)
+        assert not allowed
+        assert throttle.wait() == 0.5  # noqa: PLR2004
+        assert self._allow(100.5)[0]
+
+    def test_view_without_scope(self):
+        """Views without a throttle scope are not throttled"""
+        request = Request(APIRequestFactory().get("/api/racks/"))
+
+        assert TokenBucketThrottle().allow_request(request, object())
+
+
+@override_settings(LOAD_SHEDDING_QUEUE_LATENCY=0.5, LOAD_SHEDDING_PATHS=["/api/"])
+class LoadSheddingMiddlewareTest(SimpleTestCase):
+    """Tests for adaptive load shedding"""
+
+    def setUp(self):
+        self.middleware = LoadSheddingMiddleware(lambda request: HttpResponse())
+
+    def _request(self, path, latency):
+        request = RequestFactory().get(path)
+        request.scope = {"received_at": 0.0}
+        patcher = patch("kancraonewms.core.middleware.time.monotonic")
+        patcher.start().return_value = latency
+        self.addCleanup(patcher.stop)
+        return request
+
+    def test_serves_when_workers_keep_up(self):
+        """Short queue latency never sheds"""
+        response = self.middleware(self._request("/api/racks/", 0.1))
+
+        assert response.status_code == 200  # noqa: PLR2004
+
+    def test_sheds_when_overloaded(self):
+        """A sustained latency twice the threshold sheds API requests"""
+        for _ in range(30):
+            response = self.middleware(self._request("/api/racks/", 2.0))
+
+        assert response.status_code == 503  # noqa: PLR2004
+        assert response["Retry-After"] == "1"
+
+    def test_other_paths_are_not_shed(self):
+        """Only configured paths are shed"""
+        for _ in range(30):
+            response = self.middleware(self._request("/admin/", 2.0))
+
+        assert response.status_code == 200  # noqa: PLR2004
+
+    @override_settings(LOAD_SHEDDING_TRUSTED_PROXIES=["127.0.0.0/8"])
+    def test_latency_from_proxy_header(self):
+        """The proxy's X-Request-Start header measures queue time"""
+        request = RequestFactory().get("/", HTTP_X_REQUEST_START="t=1700000000.0")
+        millis = RequestFactory().get("/", HTTP_X_REQUEST_START="1700000000000")
+
+        assert queue_latency(request, now=1700000000.25) == 0.25  # noqa: PLR2004
+        assert queue_latency(millis, now=1700000000.25) == 0.25  # noqa: PLR2004
+        assert queue_latency(RequestFactory().get("/")) is None
+
+    @override_settings(LOAD_SHEDDING_TRUSTED_PROXIES=["10.0.0.1"])
+    def test_header_from_untrusted_client_is_ignored(self):
+        """Clients cannot fake queue latency by sending the header themselves"""
+        request = RequestFactory().get("/", HTTP_X_REQUEST_START="t=0")
+
+        assert queue_latency(request, now=1700000000.0) is None
+
+    def test_samples_are_clamped(self):
+        """One huge sample moves the average by at most twice the threshold"""
+        self.middleware(self._request("/api/racks/", 1e9))
+
+        assert self.middleware.average == 0.2  # noqa: PLR2004
@@ -0,0 +1,182 @@
+"""
+Tests for atomic requests limited to writes
+"""
+
+import threading
+import unittest
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.db import connections
+from django.db import transaction
+from django.urls import resolve
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import APITransactionTestCase
+
+from kancraonewms.core.transactions import atomic_writes
+from kancraonewms.master.api.views import RackViewSet
+from kancraonewms.master.models import Rack
+from kancraonewms.master.tests.factories import RackFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
+
+RACK_LOCKS_SQL = """
+SELECT count(*) FROM pg_locks
+WHERE relation = 'master_rack'::regclass AND pid <> pg_backend_pid()
+"""
+
+
+class AtomicWritesTest(APITransactionTestCase):
+    """Tests for running reads outside transactions"""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.token = UserRefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        self.warehouse = WarehouseFactory()
+        self.url = reverse("api:rack-list")
+
+    def _in_atomic_block(self, action, request):
+        seen = []
+        original = getattr(RackViewSet, action)
+
+        def record(view, *args, **kwargs):
+            seen.append(connection.in_atomic_block)
+            return original(view, *args, **kwargs)
+
+        with mock.patch.object(RackViewSet, action, autospec=True, side_effect=record):
+            response = request()
+        return response, seen
+
+    def test_reads_run_outside_transactions(self):
+        """Lists, retrieves and read actions run in autocommit mode"""
+        rack = RackFactory(warehouse=self.warehouse)
+        detail = reverse("api:rack-detail", args=[rack.pk])
+        for action, url in (("list", self.url), ("retrieve", detail)):
+            response, seen = self._in_atomic_block(
+                action,
+                lambda url=url: self.client.get(url),
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert seen == [False]
+
+    def test_writes_run_in_a_transaction(self):
+        """Creates keep the ATOMIC_REQUESTS transaction"""
+        response, seen = self._in_atomic_block(
+            "create",
+            lambda: self.client.post(
+                self.url,
+                {
+                    "code": "RACK-TX",
+                    "name": "Transactional Rack",
+                    "warehouse": self.warehouse.pk,
+                    "zone": "A",
+                    "aisle": "A01",
+                    "bay": "B01",
+                    "level": "L1",
+                    "position": "P01",
+                },
+                format="json",
+            ),
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert seen == [True]
+
+    def test_failed_write_is_rolled_back(self):
+        """An exception after a save still rolls the request back"""
+
+        def save_then_fail(view, serializer):
+            serializer.save()
+            raise RuntimeError
+
+        with (
+            mock.patch.object(
+                RackViewSet,
+                "perform_create",
+                autospec=True,
+                side_effect=save_then_fail,
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            self.client.post(
+                self.url,
+                {
+                    "code": "RACK-ROLLBACK",
+                    "name": "Rolled Back Rack",
+                    "warehouse": self.warehouse.pk,
+                    "zone": "A",
+                    "aisle": "A01",
+                    "bay": "B01",
+                    "level": "L1",
+                    "position": "P01",
+                },
+                format="json",
+            )
+
+        assert not Rack.objects.filter(code="RACK-ROLLBACK").exists()
+
+    def test_wrapping_is_idempotent(self):
+        """Views included twice are wrapped once"""
+        view = resolve(self.url).func
+
+        assert atomic_writes(view) is view
+        assert view._non_atomic_requests >= {"default"}  # noqa: SLF001
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "Requires PostgreSQL")
+    def test_list_releases_locks_during_bulk_writes(self):
+        """
+        A list holds no lock on its table while the response is built, where
+        the same list in a transaction holds it until the request ends
+        """
+        RackFactory.create_batch(20, warehouse=self.warehouse)
+        view = resolve(self.url).func
+        factory = APIRequestFactory()
+
+        def locks_while_listing(callback):
+            listed = threading.Event()
+            release = threading.Event()
+            original = RackViewSet.list
+
+            def list_and_wait(viewset, request, *args, **kwargs):
+                response = original(viewset, request, *args, **kwargs)
+                listed.set()
+                release.wait(10)
+                return response
+
+            def run():
+                request = factory.get(
+                    self.url,
+                    HTTP_AUTHORIZATION=f"Bearer {self.token}",
+                )
+                try:
+                    callback(request)
+                finally:
+                    connections.close_all()
+
+            with mock.patch.object(
+                RackViewSet,
+                "list",
+                autospec=True,
+                side_effect=list_and_wait,
+            ):
+                thread = threading.Thread(target=run)
+                thread.start()
+                listed.wait(10)
+                # Concurrent bulk write while the list response is pending
+                RackFactory.create_batch(20, warehouse=self.warehouse)
+                with connection.cursor() as cursor:
+                    cursor.execute(RACK_LOCKS_SQL)
+                    locks = cursor.fetchone()[0]
+                release.set()
+                thread.join()
+            return locks
+
+        assert locks_while_listing(view) == 0
+        # What ATOMIC_REQUESTS did for every GET
+        assert locks_while_listing(transaction.atomic()(view.__wrapped__)) > 0
@@ -0,0 +1,211 @@
+"""
+Request throttles backed by the shared cache (Redis in production).
+
+DRF's own rate throttles keep a list of request timestamps per client that
+every request reads, rewrites and races on. These throttles keep counters
+instead:
+
+* :class:`SlidingWindowThrottle` estimates the requests of the last window
+  from two fixed-window counters (the previous window weighted by how much
+  of it still overlaps). Counting is a single atomic ``INCR``, so concurrent
+  requests cannot slip past the limit together.
+* :class:`TokenBucketThrottle` refills a bucket at the scope's rate up to a
+  burst capacity, updated by one Lua script in Redis. Any view or ViewSet can
+  use it by listing it in ``throttle_classes`` and setting ``throttle_scope``.
+
+Rates come from ``REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]`` and are read on
+each request, so overriding settings takes effect immediately.
+"""
+
+import math
+import time
+
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+KEY_PREFIX = "throttle"
+
+# KEYS[1] bucket; ARGV capacity, refill rate (tokens/s), now.
+# Returns {allowed, tokens left}.
+BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "ts", now)
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+def _redis():
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Sliding-window rate limit on the identity returned by :meth:`get_ident_key`.
+
+    Subclasses set ``scope`` and implement :meth:`get_ident_key`; returning
+    None skips throttling the request.
+    """
+
+    timer = time.time
+
+    def get_rate(self):
+        if not getattr(self, "scope", None):
+            return super().get_rate()
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return None
+        return f"{KEY_PREFIX}:{self.scope}:{ident}"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        current_key = f"{self.key}:{window}"
+        cache.add(current_key, 0, self.duration * 2)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # The counter expired between add and incr
+            return True
+        self.previous = cache.get(f"{self.key}:{window - 1}", 0)
+        self.elapsed = self.now % self.duration
+        weight = 1 - self.elapsed / self.duration
+        if self.previous * weight + current <= self.num_requests:
+            return True
+        # Rejected requests do not count against the window
+        cache.decr(current_key)
+        self.current = current - 1
+        return False
+
+    def wait(self):
+        # Seconds until the weighted previous window leaves room for one more
+        room = self.num_requests - self.current - 1
+        if self.previous and room >= 0:
+            return max(
+                0,
+                (1 - room / self.previous) * self.duration - self.elapsed,
+            )
+        return self.duration - self.elapsed
+
+
+class IPSlidingWindowThrottle(SlidingWindowThrottle):
+    """Sliding-window limit per client IP address"""
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UsernameSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    Sliding-window limit per submitted username, whatever the client IP.
+
+    The view's ``throttle_username_field`` names the request field holding
+    the username (default ``username``).
+    """
+
+    def get_ident_key(self, request, view):
+        field = getattr(view, "throttle_username_field", "username")
+        username = request.data.get(field) if hasattr(request.data, "get") else None
+        if not username or not isinstance(username, str):
+            return None
+        return username.strip().lower()
+
+
+class AuthIPThrottle(IPSlidingWindowThrottle):
+    scope = "auth_ip"
+
+
+class AuthUsernameThrottle(UsernameSlidingWindowThrottle):
+    scope = "auth_username"
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket per user (or client IP when anonymous) and view scope.
+
+    The view sets ``throttle_scope``; ``DEFAULT_THROTTLE_RATES[scope]`` is the
+    refill rate and the view's ``throttle_burst`` (default: the rate's request
+    count) the bucket capacity. Views without a scope are not throttled.
+    """
+
+    timer = time.time
+
+    def __init__(self):
+        # The rate depends on the view, see allow_request
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, "throttle_scope", None)
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if not self.scope or self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.capacity = getattr(view, "throttle_burst", None) or self.num_requests
+        self.refill = self.num_requests / self.duration
+
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        self.key = f"{KEY_PREFIX}:bucket:{self.scope}:{ident}"
+        self.now = self.timer()
+
+        client = _redis()
+        if client is None:
+            allowed, self.tokens = self._take_from_cache()
+        else:
+            allowed, tokens = client.eval(
+                BUCKET_SCRIPT,
+                1,
+                self.key,
+                self.capacity,
+                self.refill,
+                self.now,
+            )
+            self.tokens = float(tokens)
+        return bool(allowed)
+
+    def _take_from_cache(self):
+        # Not atomic; only used where the cache is not Redis (development)
+        tokens, ts = cache.get(self.key, (self.capacity, self.now))
+        tokens = min(self.capacity, tokens + max(0, self.now - ts) * self.refill)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        cache.set(
+            self.key,
+            (tokens, self.now),
+            math.ceil(self.capacity / self.refill) + 1,
+        )
+        return allowed, tokens
+
+    def wait(self):
+        return (1 - self.tokens) / self.refill
@@ -0,0 +1,56 @@
+"""
+Atomic requests for writes only.
+
+``ATOMIC_REQUESTS`` wraps every request in a transaction, reads included: a
+large list or export keeps its transaction open, and the locks of every table
+it read, until the response is built, in the way of bulk writes and of DDL
+such as attaching stock partitions.
+
+:func:`atomic_writes` keeps ``ATOMIC_REQUESTS`` for POST, PUT, PATCH and
+DELETE and runs GET, HEAD and OPTIONS (lists, retrieves and custom read
+actions) in autocommit mode: every query sees the latest committed data and
+releases its snapshot and locks as soon as it finishes. Exceptions roll a
+write back and DRF's error responses mark it for rollback just as before.
+
+The API URLs are wrapped with :func:`atomic_writes_patterns`.
+"""
+
+import functools
+
+from django.db import connections
+from django.db import transaction
+from django.urls import URLResolver
+from rest_framework.permissions import SAFE_METHODS
+
+
+def atomic_writes(view):
+    """Apply ``ATOMIC_REQUESTS`` to ``view`` for unsafe methods only"""
+    if getattr(view, "_atomic_writes", False):
+        return view
+    non_atomic_requests = getattr(view, "_non_atomic_requests", set())
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return view(request, *args, **kwargs)
+        # What the request handler does for every request
+        atomic_view = view
+        for alias, settings_dict in connections.settings.items():
+            if settings_dict["ATOMIC_REQUESTS"] and alias not in non_atomic_requests:
+                atomic_view = transaction.atomic(using=alias)(atomic_view)
+        return atomic_view(request, *args, **kwargs)
+
+    # The handler must not wrap the view again
+    wrapper._non_atomic_requests = set(connections.settings)  # noqa: SLF001
+    wrapper._atomic_writes = True  # noqa: SLF001
+    return wrapper
+
+
+def atomic_writes_patterns(patterns):
+    """Wrap the views of ``patterns`` and their includes with atomic_writes"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            atomic_writes_patterns(pattern.url_patterns)
+        else:
+            pattern.callback = atomic_writes(pattern.callback)
+    return patterns
@@ -0,0 +1,124 @@
+from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
+
+from .models import CycleCountTask
+from .models import ItemClassification
+from .models import StockBalance
+from .models import StockMovement
+from .models import StockReservation
+from .models import StockSummary
+
+
+@admin.register(StockBalance)
+class StockBalanceAdmin(admin.ModelAdmin):
+    list_display = [
+        "item",
+        "rack",
+        "warehouse",
+        "quantity",
+        "reserved_quantity",
+        "updated_at",
+    ]
+    list_filter = ["warehouse"]
+    search_fields = ["item__code", "item__name", "rack__code"]
+    ordering = ["warehouse", "rack", "item"]
+    readonly_fields = ["reserved_quantity", "version", "updated_at"]
+    autocomplete_fields = ["item", "rack", "warehouse"]
+    list_select_related = ["item", "rack", "warehouse"]
+    list_per_page = 50
+
+
+@admin.register(StockSummary)
+class StockSummaryAdmin(admin.ModelAdmin):
+    list_display = [
+        "item",
+        "warehouse",
+        "quantity",
+        "reserved_quantity",
+        "rack_count",
+        "updated_at",
+    ]
+    list_filter = ["warehouse"]
+    search_fields = ["item__code", "item__name"]
+    ordering = ["warehouse", "item"]
+    readonly_fields = ["quantity", "reserved_quantity", "rack_count", "updated_at"]
+    list_select_related = ["item", "warehouse"]
+    list_per_page = 50
+
+
+@admin.register(StockReservation)
+class StockReservationAdmin(admin.ModelAdmin):
+    list_display = [
+        "reference",
+        "item",
+        "rack",
+        "warehouse",
+        "quantity",
+        "status",
+        "created_at",
+    ]
+    list_filter = ["status", "warehouse", "created_at"]
+    search_fields = ["reference", "item__code", "rack__code"]
+    ordering = ["-created_at"]
+    readonly_fields = ["created_at", "updated_at"]
+    list_select_related = ["item", "rack", "warehouse"]
+    list_per_page = 50
+
+
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    list_display = [
+        "created_at",
+        "movement_type",
+        "item",
+        "rack",
+        "warehouse",
+        "quantity",
+        "reference",
+    ]
+    list_filter = ["movement_type", "warehouse", "created_at"]
+    search_fields = ["item__code", "rack__code", "reference"]
+    ordering = ["-created_at"]
+    readonly_fields = ["created_at"]
+    autocomplete_fields = ["item", "rack", "warehouse"]
+    list_select_related = ["item", "rack", "warehouse"]
+    list_per_page = 50
+
+
+@admin.register(ItemClassification)
+class ItemClassificationAdmin(admin.ModelAdmin):
+    list_display = ["item", "warehouse", "abc_class", "velocity", "classified_at"]
+    list_filter = ["abc_class", "warehouse"]
+    search_fields = ["item__code", "item__name"]
+    ordering = ["warehouse", "abc_class", "item"]
+    readonly_fields = ["classified_at"]
+    list_select_related = ["item", "warehouse"]
+    list_per_page = 50
+
+
+@admin.register(CycleCountTask)
+class CycleCountTaskAdmin(admin.ModelAdmin):
+    list_display = [
+        "scheduled_date",
+        "item",
+        "rack",
+        "warehouse",
+        "abc_class",
+        "status",
+        "expected_quantity",
+        "counted_quantity",
+    ]
+    list_filter = ["status", "abc_class", "warehouse", "scheduled_date"]
+    search_fields = ["item__code", "rack__code"]
+    ordering = ["scheduled_date", "rack", "item"]
+    readonly_fields = ["counted_at", "reconciled_at", "created_at", "updated_at"]
+    list_select_related = ["item", "rack", "warehouse"]
+    list_per_page = 50
+    actions = ["cancel_tasks"]
+
+    @admin.action(description=_("Cancel selected count tasks"))
+    def cancel_tasks(self, request, queryset):
+        updated = queryset.filter(status=CycleCountTask.STATUS_PENDING).update(
+            status=CycleCountTask.STATUS_CANCELLED,
+        )
+        self.message_user(request, _(f"{updated} count tasks cancelled successfully."))  # noqa: INT001
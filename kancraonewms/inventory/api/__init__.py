@@ -0,0 +1 @@
+"""Inventory API package"""
@@ -0,0 +1,17 @@
+"""Inventory API serializers package"""
+
+from .cycle_count import CycleCountSubmitSerializer
+from .cycle_count import CycleCountTaskListSerializer
+from .cycle_count import CycleCountTaskSerializer
+from .stock_availability import StockAvailabilityQuerySerializer
+from .stock_availability import StockAvailabilitySerializer
+from .stock_availability import StockAvailabilityUOMSerializer
+
+__all__ = [
+    "CycleCountSubmitSerializer",
+    "CycleCountTaskListSerializer",
+    "CycleCountTaskSerializer",
+    "StockAvailabilityQuerySerializer",
+    "StockAvailabilitySerializer",
+    "StockAvailabilityUOMSerializer",
+]
@@ -0,0 +1,71 @@
+from rest_framework import serializers
+
+from kancraonewms.inventory.models import CycleCountTask
+
+
+class CycleCountTaskSerializer(serializers.ModelSerializer):
+    """Serializer for CycleCountTask detail view"""
+
+    warehouse_code = serializers.CharField(source="warehouse.code", read_only=True)
+    rack_code = serializers.CharField(source="rack.code", read_only=True)
+    item_code = serializers.CharField(source="item.code", read_only=True)
+    item_name = serializers.CharField(source="item.name", read_only=True)
+
+    class Meta:
+        model = CycleCountTask
+        fields = [
+            "id",
+            "warehouse",
+            "warehouse_code",
+            "rack",
+            "rack_code",
+            "item",
+            "item_code",
+            "item_name",
+            "abc_class",
+            "scheduled_date",
+            "status",
+            "expected_quantity",
+            "counted_quantity",
+            "counted_by",
+            "counted_at",
+            "reconciled_at",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class CycleCountTaskListSerializer(serializers.ModelSerializer):
+    """Serializer for CycleCountTask list view with limited fields"""
+
+    rack_code = serializers.CharField(source="rack.code", read_only=True)
+    item_code = serializers.CharField(source="item.code", read_only=True)
+
+    class Meta:
+        model = CycleCountTask
+        fields = [
+            "id",
+            "warehouse",
+            "rack",
+            "rack_code",
+            "item",
+            "item_code",
+            "abc_class",
+            "scheduled_date",
+            "status",
+            "counted_quantity",
+        ]
+
+
+class CycleCountSubmitSerializer(serializers.Serializer):
+    """Serializer for submitting a count result"""
+
+    counted_quantity = serializers.DecimalField(max_digits=15, decimal_places=4)
+
+    def validate_counted_quantity(self, value):
+        """Validate that counted quantity is not negative"""
+        if value < 0:
+            msg = "Counted quantity cannot be negative."
+            raise serializers.ValidationError(msg)
+        return value
@@ -0,0 +1,37 @@
+from rest_framework import serializers
+
+from kancraonewms.inventory.services.availability import MAX_ITEMS
+
+
+class StockAvailabilityQuerySerializer(serializers.Serializer):
+    """Serializer for a batch stock availability query"""
+
+    items = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=MAX_ITEMS,
+    )
+    warehouse = serializers.IntegerField(min_value=1, required=False)
+
+
+class StockAvailabilityUOMSerializer(serializers.Serializer):
+    """Serializer for the available quantity converted to one UOM"""
+
+    uom = serializers.IntegerField()
+    uom_code = serializers.CharField()
+    conversion_factor = serializers.DecimalField(max_digits=10, decimal_places=4)
+    quantity = serializers.DecimalField(max_digits=22, decimal_places=4)
+    is_purchase_uom = serializers.BooleanField()
+    is_sales_uom = serializers.BooleanField()
+    is_stock_uom = serializers.BooleanField()
+
+
+class StockAvailabilitySerializer(serializers.Serializer):
+    """Serializer for the availability of one item"""
+
+    item = serializers.IntegerField()
+    warehouse = serializers.IntegerField(allow_null=True)
+    quantity = serializers.DecimalField(max_digits=18, decimal_places=4)
+    reserved_quantity = serializers.DecimalField(max_digits=18, decimal_places=4)
+    available_quantity = serializers.DecimalField(max_digits=18, decimal_places=4)
+    uoms = StockAvailabilityUOMSerializer(many=True)
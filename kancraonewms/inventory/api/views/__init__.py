@@ -0,0 +1,9 @@
+"""Inventory API views package"""
+
+from .cycle_count import CycleCountTaskViewSet
+from .stock_availability import StockAvailabilityViewSet
+
+__all__ = [
+    "CycleCountTaskViewSet",
+    "StockAvailabilityViewSet",
+]
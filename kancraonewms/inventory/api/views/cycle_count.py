@@ -0,0 +1,83 @@
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.mixins import ListModelMixin
+from rest_framework.mixins import RetrieveModelMixin
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from kancraonewms.inventory.api.serializers import CycleCountSubmitSerializer
+from kancraonewms.inventory.api.serializers import CycleCountTaskListSerializer
+from kancraonewms.inventory.api.serializers import CycleCountTaskSerializer
+from kancraonewms.inventory.models import CycleCountTask
+
+
+class CycleCountTaskViewSet(
+    ListModelMixin,
+    RetrieveModelMixin,
+    GenericViewSet,
+):
+    """ViewSet untuk CycleCountTask model"""
+
+    queryset = CycleCountTask.objects.select_related("warehouse", "rack", "item").all()
+    permission_classes = [IsAuthenticated]
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return CycleCountTaskListSerializer
+        if self.action == "count":
+            return CycleCountSubmitSerializer
+        return CycleCountTaskSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # Filter by warehouse
+        warehouse_id = self.request.query_params.get("warehouse")
+        if warehouse_id:
+            queryset = queryset.filter(warehouse_id=warehouse_id)
+
+        # Filter by rack
+        rack_id = self.request.query_params.get("rack")
+        if rack_id:
+            queryset = queryset.filter(rack_id=rack_id)
+
+        # Filter by status
+        task_status = self.request.query_params.get("status")
+        if task_status:
+            queryset = queryset.filter(status=task_status)
+
+        # Filter by ABC class
+        abc_class = self.request.query_params.get("abc_class")
+        if abc_class:
+            queryset = queryset.filter(abc_class=abc_class.upper())
+
+        # Filter by scheduled date
+        scheduled_date = self.request.query_params.get("scheduled_date")
+        if scheduled_date:
+            queryset = queryset.filter(scheduled_date=scheduled_date)
+
+        return queryset
+
+    @action(detail=True, methods=["post"])
+    def count(self, request, pk=None):
+        """Submit the counted quantity of a pending task"""
+        task = self.get_object()
+        if task.status not in [
+            CycleCountTask.STATUS_PENDING,
+            CycleCountTask.STATUS_COUNTED,
+        ]:
+            return Response(
+                {"error": f"Task is already {task.status}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        task.counted_quantity = serializer.validated_data["counted_quantity"]
+        task.counted_by = request.user
+        task.counted_at = timezone.now()
+        task.status = CycleCountTask.STATUS_COUNTED
+        task.save()
+        return Response(CycleCountTaskSerializer(task).data)
@@ -0,0 +1,43 @@
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from kancraonewms.inventory.api.serializers import StockAvailabilityQuerySerializer
+from kancraonewms.inventory.api.serializers import StockAvailabilitySerializer
+from kancraonewms.inventory.services.availability import get_availability
+
+
+class StockAvailabilityViewSet(GenericViewSet):
+    """ViewSet untuk ketersediaan stok per item dalam berbagai UOM"""
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = StockAvailabilitySerializer
+
+    def list(self, request):
+        """Availability of ``?items=1,2,3`` optionally in ``?warehouse=``"""
+        data = {
+            "items": [
+                value
+                for value in request.query_params.get("items", "").split(",")
+                if value
+            ],
+        }
+        if request.query_params.get("warehouse"):
+            data["warehouse"] = request.query_params["warehouse"]
+        return self._respond(data)
+
+    @action(detail=False, methods=["post"])
+    def query(self, request):
+        """Availability of up to 1,000 items posted in the request body"""
+        return self._respond(request.data)
+
+    def _respond(self, data):
+        query = StockAvailabilityQuerySerializer(data=data)
+        query.is_valid(raise_exception=True)
+        results = get_availability(
+            query.validated_data["items"],
+            warehouse_id=query.validated_data.get("warehouse"),
+        )
+        serializer = self.get_serializer(results, many=True)
+        return Response(serializer.data)
@@ -0,0 +1,128 @@
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import Sum
+
+from kancraonewms.inventory import partitions
+from kancraonewms.inventory.models import StockBalance
+from kancraonewms.master.models import Item
+from kancraonewms.master.models import Rack
+from kancraonewms.organizations.models import Company
+from kancraonewms.organizations.models import Warehouse
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure warehouse-scoped stock balance queries while the number of "
+        "warehouse partitions grows. Runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--warehouses",
+            default="1,10,50,100",
+            help="Comma separated warehouse counts to measure at (ascending)",
+        )
+        parser.add_argument("--rows-per-warehouse", type=int, default=10_000)
+        parser.add_argument("--racks-per-warehouse", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if not partitions.is_supported():
+            msg = "Stock partitioning is only available on PostgreSQL."
+            raise CommandError(msg)
+
+        scales = sorted({int(value) for value in options["warehouses"].split(",")})
+        self.random = random.Random(options["seed"])  # noqa: S311
+        self.options = options
+
+        self.stdout.write(
+            f"{'warehouses':>10} {'rows':>10} {'mean ms':>9} {'p95 ms':>9} "
+            f"{'partitions scanned':>19}",
+        )
+        with transaction.atomic():
+            self._run(scales)
+            transaction.set_rollback(True)
+
+    def _run(self, scales):
+        rows = self.options["rows_per_warehouse"]
+        items = self._create_items(rows // self.options["racks_per_warehouse"] or 1)
+        company = Company.objects.create(code="BENCH-PART", name="Benchmark")
+        warehouses = []
+        for scale in scales:
+            while len(warehouses) < scale:
+                warehouses.append(
+                    self._create_warehouse(company, len(warehouses), items),
+                )
+            timings, scanned = self._measure(warehouses)
+            self.stdout.write(
+                f"{scale:>10} {scale * rows:>10} "
+                f"{statistics.mean(timings):>9.3f} "
+                f"{statistics.quantiles(timings, n=20)[-1]:>9.3f} "
+                f"{scanned:>19}",
+            )
+
+    def _create_items(self, count):
+        return Item.objects.bulk_create(
+            [
+                Item(code=f"BENCH-PART-{index:06d}", name="Benchmark item", unit="pcs")
+                for index in range(count)
+            ],
+        )
+
+    def _create_warehouse(self, company, index, items):
+        warehouse = Warehouse.objects.create(
+            company=company,
+            code=f"BENCH-PART-{index:04d}",
+            name=f"Benchmark warehouse {index}",
+        )
+        partitions.ensure_warehouse_partition(warehouse.pk)
+        racks = Rack.objects.bulk_create(
+            [
+                Rack(
+                    warehouse=warehouse,
+                    code=f"BENCH-PART-{index:04d}-{rack:04d}",
+                    name="Benchmark rack",
+                )
+                for rack in range(self.options["racks_per_warehouse"])
+            ],
+        )
+        StockBalance.objects.bulk_create(
+            [
+                StockBalance(
+                    warehouse=warehouse,
+                    item=item,
+                    rack=rack,
+                    quantity=Decimal(self.random.randint(0, 1000)),
+                )
+                for rack in racks
+                for item in items
+            ],
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ANALYZE {partitions.warehouse_partition_name(warehouse.pk)}",
+            )
+        return warehouse
+
+    def _measure(self, warehouses):
+        timings = []
+        for _ in range(self.options["repeat"]):
+            warehouse = self.random.choice(warehouses)
+            queryset = StockBalance.objects.for_warehouse(warehouse)
+            started = time.perf_counter()
+            queryset.aggregate(total=Sum("quantity"), pairs=Count("id"))
+            timings.append((time.perf_counter() - started) * 1000)
+
+        plan = StockBalance.objects.for_warehouse(warehouses[0]).values("id").explain()
+        scanned = plan.count(f"on {partitions.STOCK_BALANCE_TABLE}_")
+        return timings, scanned
@@ -0,0 +1,160 @@
+import multiprocessing
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import connections
+from django.db.models import F
+from django.db.models import Sum
+
+from kancraonewms.inventory.models import StockBalance
+from kancraonewms.inventory.models import StockReservation
+from kancraonewms.inventory.services import reservation
+from kancraonewms.master.models import Item
+from kancraonewms.master.models import Rack
+from kancraonewms.organizations.models import Company
+from kancraonewms.organizations.models import Warehouse
+
+PREFIX = "STRESS-RSV"
+
+
+def _worker(args):
+    """Reserve random quantities until the deadline; runs in a child process."""
+    warehouse_id, item_ids, deadline, seed = args
+    connections.close_all()
+    rng = random.Random(seed)  # noqa: S311
+    reserved = insufficient = conflicts = 0
+    while time.monotonic() < deadline:
+        try:
+            reservation.reserve(
+                warehouse_id,
+                rng.choice(item_ids),
+                rng.randint(1, 5),
+                f"{PREFIX}-{seed}",
+            )
+        except reservation.InsufficientStockError:
+            insufficient += 1
+        except reservation.ReservationConflictError:
+            conflicts += 1
+        else:
+            reserved += 1
+    connections.close_all()
+    return reserved, insufficient, conflicts
+
+
+class Command(BaseCommand):
+    help = (
+        "Stress the stock reservation service with concurrent worker processes "
+        "and check that no balance is over-allocated. Creates and removes its "
+        "own data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            default="1,2,4,8",
+            help="Comma separated worker process counts to run",
+        )
+        parser.add_argument("--items", type=int, default=200)
+        parser.add_argument("--racks", type=int, default=8)
+        parser.add_argument("--quantity", type=int, default=500)
+        parser.add_argument("--duration", type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            msg = "The reservation stress test needs PostgreSQL (row locks)."
+            raise CommandError(msg)
+
+        warehouse, item_ids = self._seed(options)
+        try:
+            self.stdout.write(
+                f"{'workers':>8} {'reserved':>9} {'per sec':>9} {'short':>7} "
+                f"{'conflicts':>9}",
+            )
+            for workers in sorted({int(v) for v in options["workers"].split(",")}):
+                self._reset(warehouse)
+                self._run(warehouse, item_ids, workers, options["duration"])
+                self._check(warehouse)
+        finally:
+            self._cleanup()
+
+    def _seed(self, options):
+        self._cleanup()
+        company = Company.objects.create(code=PREFIX, name="Reservation stress")
+        warehouse = Warehouse.objects.create(
+            company=company,
+            code=PREFIX,
+            name="Reservation stress",
+        )
+        racks = Rack.objects.bulk_create(
+            Rack(warehouse=warehouse, code=f"{PREFIX}-{i:04d}", name="Stress")
+            for i in range(options["racks"])
+        )
+        items = Item.objects.bulk_create(
+            Item(code=f"{PREFIX}-{i:06d}", name="Stress", unit="pcs")
+            for i in range(options["items"])
+        )
+        StockBalance.objects.bulk_create(
+            (
+                StockBalance(
+                    warehouse=warehouse,
+                    item=item,
+                    rack=rack,
+                    quantity=Decimal(options["quantity"]),
+                )
+                for item in items
+                for rack in racks
+            ),
+            batch_size=5000,
+        )
+        return warehouse, [item.pk for item in items]
+
+    def _reset(self, warehouse):
+        StockReservation.objects.filter(warehouse=warehouse).delete()
+        StockBalance.objects.for_warehouse(warehouse).update(
+            reserved_quantity=0,
+            version=0,
+        )
+
+    def _run(self, warehouse, item_ids, workers, duration):
+        connections.close_all()
+        deadline = time.monotonic() + duration
+        context = multiprocessing.get_context("fork")
+        with context.Pool(workers) as pool:
+            results = pool.map(
+                _worker,
+                [(warehouse.pk, item_ids, deadline, seed) for seed in range(workers)],
+            )
+        reserved, insufficient, conflicts = (
+            sum(column) for column in zip(*results, strict=True)
+        )
+        self.stdout.write(
+            f"{workers:>8} {reserved:>9} {reserved / duration:>9.1f} "
+            f"{insufficient:>7} {conflicts:>9}",
+        )
+
+    def _check(self, warehouse):
+        balances = StockBalance.objects.for_warehouse(warehouse)
+        over = balances.filter(reserved_quantity__gt=F("quantity")).count()
+        reserved = balances.aggregate(total=Sum("reserved_quantity"))["total"]
+        booked = StockReservation.objects.filter(
+            warehouse=warehouse,
+            status=StockReservation.STATUS_ACTIVE,
+        ).aggregate(total=Sum("quantity"))["total"]
+        if over or (reserved or 0) != (booked or 0):
+            msg = (
+                f"Inconsistent reservations: {over} over-allocated balances, "
+                f"{reserved} reserved on balances vs {booked} in reservations."
+            )
+            raise CommandError(msg)
+
+    def _cleanup(self):
+        StockReservation.objects.filter(reference__startswith=PREFIX).delete()
+        StockBalance.objects.filter(warehouse__code=PREFIX).delete()
+        Rack.objects.filter(code__startswith=PREFIX).delete()
+        Item.objects.filter(code__startswith=PREFIX).delete()
+        Warehouse.objects.filter(code=PREFIX).delete()
+        Company.objects.filter(code=PREFIX).delete()
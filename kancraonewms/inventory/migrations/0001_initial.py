@@ -0,0 +1,104 @@
+# Generated by Django 5.2.11 on 2026-10-19 16:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('master', '0005_role_menu_accessibility_rolemenuaccess'),
+        ('organizations', '0002_warehouse'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CycleCountTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('abc_class', models.CharField(choices=[('A', 'A'), ('B', 'B'), ('C', 'C')], default='C', max_length=1, verbose_name='ABC Class')),
+                ('scheduled_date', models.DateField(help_text='Working day the count is planned for', verbose_name='Scheduled Date')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('counted', 'Counted'), ('reconciled', 'Reconciled'), ('cancelled', 'Cancelled')], default='pending', max_length=20, verbose_name='Status')),
+                ('expected_quantity', models.DecimalField(decimal_places=4, default=0, help_text='System quantity when the task was generated', max_digits=15, verbose_name='Expected Quantity')),
+                ('counted_quantity', models.DecimalField(blank=True, decimal_places=4, max_digits=15, null=True, verbose_name='Counted Quantity')),
+                ('counted_at', models.DateTimeField(blank=True, null=True, verbose_name='Counted At')),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True, verbose_name='Reconciled At')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('counted_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Counted By')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cycle_count_tasks', to='master.item', verbose_name='Item')),
+                ('rack', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cycle_count_tasks', to='master.rack', verbose_name='Rack')),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cycle_count_tasks', to='organizations.warehouse', verbose_name='Warehouse')),
+            ],
+            options={
+                'verbose_name': 'Cycle Count Task',
+                'verbose_name_plural': 'Cycle Count Tasks',
+                'db_table': 'inventory_cycle_count_task',
+                'ordering': ['scheduled_date', 'rack', 'item'],
+                'indexes': [models.Index(fields=['warehouse', 'scheduled_date', 'status'], name='inventory_c_warehou_ec32c7_idx'), models.Index(fields=['status'], name='inventory_c_status_8d9451_idx')],
+                'unique_together': {('rack', 'item', 'scheduled_date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ItemClassification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('abc_class', models.CharField(choices=[('A', 'A - Fast moving'), ('B', 'B - Medium moving'), ('C', 'C - Slow moving')], default='C', max_length=1, verbose_name='ABC Class')),
+                ('velocity', models.DecimalField(decimal_places=4, default=0, help_text='Outbound quantity over the classification window', max_digits=18, verbose_name='Velocity')),
+                ('classified_at', models.DateTimeField(help_text='When this classification was last computed', verbose_name='Classified At')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='classifications', to='master.item', verbose_name='Item')),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='item_classifications', to='organizations.warehouse', verbose_name='Warehouse')),
+            ],
+            options={
+                'verbose_name': 'Item Classification',
+                'verbose_name_plural': 'Item Classifications',
+                'db_table': 'inventory_item_classification',
+                'ordering': ['warehouse', 'abc_class', 'item'],
+                'unique_together': {('warehouse', 'item')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StockBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.DecimalField(decimal_places=4, default=0, help_text="Quantity on hand in the item's base UOM", max_digits=15, verbose_name='Quantity')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='stock_balances', to='master.item', verbose_name='Item')),
+                ('rack', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='stock_balances', to='master.rack', verbose_name='Rack')),
+                ('warehouse', models.ForeignKey(help_text='Warehouse of the rack (denormalized for warehouse scoping)', on_delete=django.db.models.deletion.CASCADE, related_name='stock_balances', to='organizations.warehouse', verbose_name='Warehouse')),
+            ],
+            options={
+                'verbose_name': 'Stock Balance',
+                'verbose_name_plural': 'Stock Balances',
+                'db_table': 'inventory_stock_balance',
+                'ordering': ['warehouse', 'rack', 'item'],
+                'indexes': [models.Index(fields=['warehouse', 'item'], name='inventory_s_warehou_e3e124_idx')],
+                'unique_together': {('item', 'rack')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('movement_type', models.CharField(choices=[('inbound', 'Inbound'), ('outbound', 'Outbound'), ('transfer_in', 'Transfer In'), ('transfer_out', 'Transfer Out'), ('adjustment', 'Adjustment')], max_length=20, verbose_name='Movement Type')),
+                ('quantity', models.DecimalField(decimal_places=4, help_text='Signed quantity in base UOM (negative for stock leaving)', max_digits=15, verbose_name='Quantity')),
+                ('reference', models.CharField(blank=True, help_text='Source document reference', max_length=100, verbose_name='Reference')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='stock_movements', to='master.item', verbose_name='Item')),
+                ('rack', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='stock_movements', to='master.rack', verbose_name='Rack')),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='organizations.warehouse', verbose_name='Warehouse')),
+            ],
+            options={
+                'verbose_name': 'Stock Movement',
+                'verbose_name_plural': 'Stock Movements',
+                'db_table': 'inventory_stock_movement',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['warehouse', 'created_at'], name='inventory_s_warehou_f5fb44_idx'), models.Index(fields=['item', 'created_at'], name='inventory_s_item_id_3b8a88_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,98 @@
+# Generated by Django 5.2.11 on 2026-10-19 16:12
+
+import datetime
+
+from django.conf import settings
+from django.db import migrations
+
+from kancraonewms.inventory import partitions
+
+
+def partition_stock_tables(apps, schema_editor):
+    """Convert the stock tables to partitioned tables on Postgres."""
+    if not partitions.is_supported(schema_editor.connection):
+        return
+
+    Warehouse = apps.get_model("organizations", "Warehouse")
+    partitions.partition_table(
+        schema_editor,
+        partitions.STOCK_BALANCE_TABLE,
+        "LIST (warehouse_id)",
+        [
+            (
+                partitions.warehouse_partition_name(warehouse_id),
+                f"FOR VALUES IN ({warehouse_id})",
+            )
+            for warehouse_id in Warehouse.objects.values_list("id", flat=True)
+        ],
+        primary_key=["id", "warehouse_id"],
+        unique=[["warehouse_id", "item_id", "rack_id"]],
+        foreign_keys=[
+            ("warehouse_id", "organizations_warehouse"),
+            ("item_id", "master_item"),
+            ("rack_id", "master_rack"),
+        ],
+        indexes=[
+            ("inventory_s_warehou_e3e124_idx", ["warehouse_id", "item_id"]),
+            ("inventory_stock_balance_item_id_idx", ["item_id"]),
+            ("inventory_stock_balance_rack_id_idx", ["rack_id"]),
+        ],
+    )
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(created_at) FROM inventory_stock_movement")
+        (oldest,) = cursor.fetchone()
+    today = datetime.datetime.now(tz=datetime.UTC).date()
+    month = partitions.month_start(oldest.date() if oldest else today)
+    last = partitions.add_months(
+        partitions.month_start(today),
+        settings.STOCK_MOVEMENT_PARTITION_MONTHS_AHEAD,
+    )
+    months = []
+    while month <= last:
+        months.append(month)
+        month = partitions.add_months(month, 1)
+
+    partitions.partition_table(
+        schema_editor,
+        partitions.STOCK_MOVEMENT_TABLE,
+        "RANGE (created_at)",
+        [
+            (partitions.month_partition_name(month), partitions.month_bound(month))
+            for month in months
+        ],
+        primary_key=["id", "created_at"],
+        unique=[],
+        foreign_keys=[
+            ("warehouse_id", "organizations_warehouse"),
+            ("item_id", "master_item"),
+            ("rack_id", "master_rack"),
+            ("created_by_id", "users_user"),
+        ],
+        indexes=[
+            ("inventory_s_warehou_f5fb44_idx", ["warehouse_id", "created_at"]),
+            ("inventory_s_item_id_3b8a88_idx", ["item_id", "created_at"]),
+            ("inventory_stock_movement_rack_id_idx", ["rack_id"]),
+            ("inventory_stock_movement_created_by_id_idx", ["created_by_id"]),
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+        ('master', '0005_role_menu_accessibility_rolemenuaccess'),
+        ('organizations', '0002_warehouse'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='stockbalance',
+            unique_together={('warehouse', 'item', 'rack')},
+        ),
+        # Partitioned tables cannot carry the original single-column primary
+        # key, so this conversion is not reversible.
+        migrations.RunPython(partition_stock_tables),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.11 on 2026-10-19 16:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_stock_summary(apps, schema_editor):
+    StockBalance = apps.get_model('inventory', 'StockBalance')
+    StockSummary = apps.get_model('inventory', 'StockSummary')
+    rows = (
+        StockBalance.objects.order_by()
+        .values('warehouse_id', 'item_id')
+        .annotate(total=Sum('quantity'), racks=Count('id'))
+    )
+    StockSummary.objects.bulk_create(
+        (
+            StockSummary(
+                warehouse_id=row['warehouse_id'],
+                item_id=row['item_id'],
+                quantity=row['total'],
+                rack_count=row['racks'],
+            )
+            for row in rows.iterator(chunk_size=5000)
+        ),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_partition_stock_tables'),
+        ('master', '0006_rack_location_numbers'),
+        ('organizations', '0003_warehouse_location_code_format'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.DecimalField(decimal_places=4, default=0, help_text="Quantity on hand over all racks in the item's base UOM", max_digits=18, verbose_name='Quantity')),
+                ('rack_count', models.PositiveIntegerField(default=0, help_text='Number of racks holding a balance of the item', verbose_name='Rack Count')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_summaries', to='master.item', verbose_name='Item')),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_summaries', to='organizations.warehouse', verbose_name='Warehouse')),
+            ],
+            options={
+                'verbose_name': 'Stock Summary',
+                'verbose_name_plural': 'Stock Summaries',
+                'db_table': 'inventory_stock_summary',
+                'ordering': ['warehouse', 'item'],
+                'indexes': [models.Index(fields=['item'], name='inventory_s_item_id_ef75e8_idx')],
+                'unique_together': {('warehouse', 'item')},
+            },
+        ),
+        migrations.RunPython(populate_stock_summary, migrations.RunPython.noop),
+    ]
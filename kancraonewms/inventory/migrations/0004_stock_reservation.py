@@ -0,0 +1,55 @@
+# Generated by Django 5.2.11 on 2026-10-19 16:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_stock_summary'),
+        ('master', '0006_rack_location_numbers'),
+        ('organizations', '0003_warehouse_location_code_format'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockbalance',
+            name='reserved_quantity',
+            field=models.DecimalField(decimal_places=4, default=0, help_text='Part of the quantity on hand reserved for outbound orders', max_digits=15, verbose_name='Reserved Quantity'),
+        ),
+        migrations.AddField(
+            model_name='stockbalance',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented on every reservation change (optimistic locking)', verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='stocksummary',
+            name='reserved_quantity',
+            field=models.DecimalField(decimal_places=4, default=0, help_text='Quantity reserved for outbound orders over all racks', max_digits=18, verbose_name='Reserved Quantity'),
+        ),
+        migrations.CreateModel(
+            name='StockReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.DecimalField(decimal_places=4, help_text="Reserved quantity in the item's base UOM", max_digits=15, verbose_name='Quantity')),
+                ('reference', models.CharField(help_text='Outbound document the stock is reserved for', max_length=100, verbose_name='Reference')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('released', 'Released'), ('fulfilled', 'Fulfilled')], default='active', max_length=20, verbose_name='Status')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='stock_reservations', to='master.item', verbose_name='Item')),
+                ('rack', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='stock_reservations', to='master.rack', verbose_name='Rack')),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_reservations', to='organizations.warehouse', verbose_name='Warehouse')),
+            ],
+            options={
+                'verbose_name': 'Stock Reservation',
+                'verbose_name_plural': 'Stock Reservations',
+                'db_table': 'inventory_stock_reservation',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['reference', 'status'], name='inventory_s_referen_873624_idx'), models.Index(fields=['warehouse', 'item', 'status'], name='inventory_s_warehou_eb47e3_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+"""Inventory models package"""
+
+from .cycle_count_task import CycleCountTask
+from .item_classification import ItemClassification
+from .stock_balance import StockBalance
+from .stock_movement import StockMovement
+from .stock_reservation import StockReservation
+from .stock_summary import StockSummary
+
+__all__ = [
+    "CycleCountTask",
+    "ItemClassification",
+    "StockBalance",
+    "StockMovement",
+    "StockReservation",
+    "StockSummary",
+]
@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from kancraonewms.master.models import Item
+from kancraonewms.master.models import Rack
+from kancraonewms.organizations.models import Warehouse
+
+
+class CycleCountTask(models.Model):
+    """Model untuk tugas cycle count per item per rack"""
+
+    STATUS_PENDING = "pending"
+    STATUS_COUNTED = "counted"
+    STATUS_RECONCILED = "reconciled"
+    STATUS_CANCELLED = "cancelled"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("Pending")),
+        (STATUS_COUNTED, _("Counted")),
+        (STATUS_RECONCILED, _("Reconciled")),
+        (STATUS_CANCELLED, _("Cancelled")),
+    ]
+
+    warehouse = models.ForeignKey(
+        Warehouse,
+        on_delete=models.CASCADE,
+        related_name="cycle_count_tasks",
+        verbose_name=_("Warehouse"),
+    )
+    rack = models.ForeignKey(
+        Rack,
+        on_delete=models.CASCADE,
+        related_name="cycle_count_tasks",
+        verbose_name=_("Rack"),
+    )
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.CASCADE,
+        related_name="cycle_count_tasks",
+        verbose_name=_("Item"),
+    )
+    abc_class = models.CharField(
+        _("ABC Class"),
+        max_length=1,
+        choices=[("A", "A"), ("B", "B"), ("C", "C")],
+        default="C",
+    )
+    scheduled_date = models.DateField(
+        _("Scheduled Date"),
+        help_text=_("Working day the count is planned for"),
+    )
+    status = models.CharField(
+        _("Status"),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+    expected_quantity = models.DecimalField(
+        _("Expected Quantity"),
+        max_digits=15,
+        decimal_places=4,
+        default=0,
+        help_text=_("System quantity when the task was generated"),
+    )
+    counted_quantity = models.DecimalField(
+        _("Counted Quantity"),
+        max_digits=15,
+        decimal_places=4,
+        null=True,
+        blank=True,
+    )
+    counted_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Counted By"),
+    )
+    counted_at = models.DateTimeField(_("Counted At"), null=True, blank=True)
+    reconciled_at = models.DateTimeField(_("Reconciled At"), null=True, blank=True)
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Cycle Count Task")
+        verbose_name_plural = _("Cycle Count Tasks")
+        ordering = ["scheduled_date", "rack", "item"]
+        db_table = "inventory_cycle_count_task"
+        unique_together = [["rack", "item", "scheduled_date"]]
+        indexes = [
+            models.Index(fields=["warehouse", "scheduled_date", "status"]),
+            models.Index(fields=["status"]),
+        ]
+
+    def __str__(self):
+        return f"{self.item.code} @ {self.rack.code} on {self.scheduled_date}"
@@ -0,0 +1,55 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from kancraonewms.master.models import Item
+from kancraonewms.organizations.models import Warehouse
+
+
+class ItemClassification(models.Model):
+    """Model untuk klasifikasi ABC item per warehouse"""
+
+    ABC_CLASS_CHOICES = [
+        ("A", _("A - Fast moving")),
+        ("B", _("B - Medium moving")),
+        ("C", _("C - Slow moving")),
+    ]
+
+    warehouse = models.ForeignKey(
+        Warehouse,
+        on_delete=models.CASCADE,
+        related_name="item_classifications",
+        verbose_name=_("Warehouse"),
+    )
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.CASCADE,
+        related_name="classifications",
+        verbose_name=_("Item"),
+    )
+    abc_class = models.CharField(
+        _("ABC Class"),
+        max_length=1,
+        choices=ABC_CLASS_CHOICES,
+        default="C",
+    )
+    velocity = models.DecimalField(
+        _("Velocity"),
+        max_digits=18,
+        decimal_places=4,
+        default=0,
+        help_text=_("Outbound quantity over the classification window"),
+    )
+    classified_at = models.DateTimeField(
+        _("Classified At"),
+        help_text=_("When this classification was last computed"),
+    )
+
+    class Meta:
+        verbose_name = _("Item Classification")
+        verbose_name_plural = _("Item Classifications")
+        ordering = ["warehouse", "abc_class", "item"]
+        db_table = "inventory_item_classification"
+        unique_together = [["warehouse", "item"]]
+
+    def __str__(self):
+        return f"{self.item.code} ({self.warehouse.code}): {self.abc_class}"
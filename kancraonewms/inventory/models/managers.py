@@ -0,0 +1,40 @@
+from django.db import models
+
+
+def _pk(value):
+    return getattr(value, "pk", value)
+
+
+class StockBalanceQuerySet(models.QuerySet):
+    """QuerySet for the warehouse-partitioned stock balance table"""
+
+    def for_warehouse(self, warehouse):
+        """Restrict to one warehouse so Postgres only scans its partition"""
+        return self.filter(warehouse_id=_pk(warehouse))
+
+    def for_warehouses(self, warehouses):
+        """Restrict to several warehouses, pruning all other partitions"""
+        return self.filter(
+            warehouse_id__in=[_pk(warehouse) for warehouse in warehouses],
+        )
+
+
+class StockMovementQuerySet(models.QuerySet):
+    """QuerySet for the month-partitioned stock movement table"""
+
+    def for_warehouse(self, warehouse):
+        """Restrict to one warehouse"""
+        return self.filter(warehouse_id=_pk(warehouse))
+
+    def for_period(self, start=None, end=None):
+        """Restrict to ``[start, end)`` so only the matching months are scanned"""
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(created_at__gte=start)
+        if end is not None:
+            queryset = queryset.filter(created_at__lt=end)
+        return queryset
+
+
+StockBalanceManager = models.Manager.from_queryset(StockBalanceQuerySet)
+StockMovementManager = models.Manager.from_queryset(StockMovementQuerySet)
@@ -0,0 +1,83 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from kancraonewms.master.models import Item
+from kancraonewms.master.models import Rack
+from kancraonewms.organizations.models import Warehouse
+
+from .managers import StockBalanceManager
+
+
+class StockBalance(models.Model):
+    """
+    Model untuk saldo stok per item per rack
+
+    On Postgres the table is LIST-partitioned by warehouse (see
+    ``kancraonewms.inventory.partitions``); filter by warehouse whenever
+    possible, e.g. with ``StockBalance.objects.for_warehouse()``.
+
+    Reservations change ``reserved_quantity`` through
+    ``services.reservation`` only, which bumps ``version`` on every write.
+    """
+
+    warehouse = models.ForeignKey(
+        Warehouse,
+        on_delete=models.CASCADE,
+        related_name="stock_balances",
+        verbose_name=_("Warehouse"),
+        help_text=_("Warehouse of the rack (denormalized for warehouse scoping)"),
+    )
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.PROTECT,
+        related_name="stock_balances",
+        verbose_name=_("Item"),
+    )
+    rack = models.ForeignKey(
+        Rack,
+        on_delete=models.PROTECT,
+        related_name="stock_balances",
+        verbose_name=_("Rack"),
+    )
+    quantity = models.DecimalField(
+        _("Quantity"),
+        max_digits=15,
+        decimal_places=4,
+        default=0,
+        help_text=_("Quantity on hand in the item's base UOM"),
+    )
+    reserved_quantity = models.DecimalField(
+        _("Reserved Quantity"),
+        max_digits=15,
+        decimal_places=4,
+        default=0,
+        help_text=_("Part of the quantity on hand reserved for outbound orders"),
+    )
+    version = models.PositiveIntegerField(
+        _("Version"),
+        default=0,
+        help_text=_("Incremented on every reservation change (optimistic locking)"),
+    )
+    updated_at = models.DateTimeField(
+        _("Updated At"),
+        auto_now=True,
+    )
+
+    objects = StockBalanceManager()
+
+    class Meta:
+        verbose_name = _("Stock Balance")
+        verbose_name_plural = _("Stock Balances")
+        ordering = ["warehouse", "rack", "item"]
+        db_table = "inventory_stock_balance"
+        unique_together = [["warehouse", "item", "rack"]]
+        indexes = [
+            models.Index(fields=["warehouse", "item"]),
+        ]
+
+    def __str__(self):
+        return f"{self.item.code} @ {self.rack.code}: {self.quantity}"
+
+    @property
+    def available_quantity(self):
+        return self.quantity - self.reserved_quantity
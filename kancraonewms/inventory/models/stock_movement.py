@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from kancraonewms.master.models import Item
+from kancraonewms.master.models import Rack
+from kancraonewms.organizations.models import Warehouse
+
+from .managers import StockMovementManager
+
+
+class StockMovement(models.Model):
+    """
+    Model untuk riwayat pergerakan stok
+
+    On Postgres the table is RANGE-partitioned by month of ``created_at``;
+    bound history queries with ``StockMovement.objects.for_period()``.
+    """
+
+    MOVEMENT_TYPE_CHOICES = [
+        ("inbound", _("Inbound")),
+        ("outbound", _("Outbound")),
+        ("transfer_in", _("Transfer In")),
+        ("transfer_out", _("Transfer Out")),
+        ("adjustment", _("Adjustment")),
+    ]
+
+    warehouse = models.ForeignKey(
+        Warehouse,
+        on_delete=models.CASCADE,
+        related_name="stock_movements",
+        verbose_name=_("Warehouse"),
+    )
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.PROTECT,
+        related_name="stock_movements",
+        verbose_name=_("Item"),
+    )
+    rack = models.ForeignKey(
+        Rack,
+        on_delete=models.PROTECT,
+        related_name="stock_movements",
+        verbose_name=_("Rack"),
+    )
+    movement_type = models.CharField(
+        _("Movement Type"),
+        max_length=20,
+        choices=MOVEMENT_TYPE_CHOICES,
+    )
+    quantity = models.DecimalField(
+        _("Quantity"),
+        max_digits=15,
+        decimal_places=4,
+        help_text=_("Signed quantity in base UOM (negative for stock leaving)"),
+    )
+    reference = models.CharField(
+        _("Reference"),
+        max_length=100,
+        blank=True,
+        help_text=_("Source document reference"),
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Created By"),
+    )
+    created_at = models.DateTimeField(
+        _("Created At"),
+        auto_now_add=True,
+    )
+
+    objects = StockMovementManager()
+
+    class Meta:
+        verbose_name = _("Stock Movement")
+        verbose_name_plural = _("Stock Movements")
+        ordering = ["-created_at"]
+        db_table = "inventory_stock_movement"
+        indexes = [
+            models.Index(fields=["warehouse", "created_at"]),
+            models.Index(fields=["item", "created_at"]),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.movement_type} {self.item.code} @ {self.rack.code}: {self.quantity}"
+        )
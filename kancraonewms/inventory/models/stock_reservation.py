@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from kancraonewms.master.models import Item
+from kancraonewms.master.models import Rack
+from kancraonewms.organizations.models import Warehouse
+
+
+class StockReservation(models.Model):
+    """
+    Model untuk reservasi stok per item per rack
+
+    One row per (item, rack) balance a reservation was allocated from. The
+    balance is referenced by its natural key because the partitioned stock
+    balance table cannot be the target of a foreign key on ``id`` alone.
+    """
+
+    STATUS_ACTIVE = "active"
+    STATUS_RELEASED = "released"
+    STATUS_FULFILLED = "fulfilled"
+    STATUS_CHOICES = [
+        (STATUS_ACTIVE, _("Active")),
+        (STATUS_RELEASED, _("Released")),
+        (STATUS_FULFILLED, _("Fulfilled")),
+    ]
+
+    warehouse = models.ForeignKey(
+        Warehouse,
+        on_delete=models.CASCADE,
+        related_name="stock_reservations",
+        verbose_name=_("Warehouse"),
+    )
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.PROTECT,
+        related_name="stock_reservations",
+        verbose_name=_("Item"),
+    )
+    rack = models.ForeignKey(
+        Rack,
+        on_delete=models.PROTECT,
+        related_name="stock_reservations",
+        verbose_name=_("Rack"),
+    )
+    quantity = models.DecimalField(
+        _("Quantity"),
+        max_digits=15,
+        decimal_places=4,
+        help_text=_("Reserved quantity in the item's base UOM"),
+    )
+    reference = models.CharField(
+        _("Reference"),
+        max_length=100,
+        help_text=_("Outbound document the stock is reserved for"),
+    )
+    status = models.CharField(
+        _("Status"),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_ACTIVE,
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Created By"),
+    )
+    created_at = models.DateTimeField(
+        _("Created At"),
+        auto_now_add=True,
+    )
+    updated_at = models.DateTimeField(
+        _("Updated At"),
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = _("Stock Reservation")
+        verbose_name_plural = _("Stock Reservations")
+        ordering = ["-created_at"]
+        db_table = "inventory_stock_reservation"
+        indexes = [
+            models.Index(fields=["reference", "status"]),
+            models.Index(fields=["warehouse", "item", "status"]),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.reference}: {self.quantity} x {self.item.code} @ {self.rack.code}"
+        )
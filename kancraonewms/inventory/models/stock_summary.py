@@ -0,0 +1,64 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from kancraonewms.master.models import Item
+from kancraonewms.organizations.models import Warehouse
+
+
+class StockSummary(models.Model):
+    """
+    Model untuk ringkasan stok per item per warehouse
+
+    Precomputed sum of the item's StockBalance rows over all racks of the
+    warehouse, kept up to date by ``services.stock_summary``. Availability
+    queries read this table instead of aggregating balances.
+    """
+
+    warehouse = models.ForeignKey(
+        Warehouse,
+        on_delete=models.CASCADE,
+        related_name="stock_summaries",
+        verbose_name=_("Warehouse"),
+    )
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.CASCADE,
+        related_name="stock_summaries",
+        verbose_name=_("Item"),
+    )
+    quantity = models.DecimalField(
+        _("Quantity"),
+        max_digits=18,
+        decimal_places=4,
+        default=0,
+        help_text=_("Quantity on hand over all racks in the item's base UOM"),
+    )
+    reserved_quantity = models.DecimalField(
+        _("Reserved Quantity"),
+        max_digits=18,
+        decimal_places=4,
+        default=0,
+        help_text=_("Quantity reserved for outbound orders over all racks"),
+    )
+    rack_count = models.PositiveIntegerField(
+        _("Rack Count"),
+        default=0,
+        help_text=_("Number of racks holding a balance of the item"),
+    )
+    updated_at = models.DateTimeField(
+        _("Updated At"),
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = _("Stock Summary")
+        verbose_name_plural = _("Stock Summaries")
+        ordering = ["warehouse", "item"]
+        db_table = "inventory_stock_summary"
+        unique_together = [["warehouse", "item"]]
+        indexes = [
+            models.Index(fields=["item"]),
+        ]
+
+    def __str__(self):
+        return f"{self.item.code} @ {self.warehouse.code}: {self.quantity}"
@@ -0,0 +1,206 @@
+"""
+Postgres declarative partitioning for the stock tables.
+
+``inventory_stock_balance`` is LIST-partitioned by ``warehouse_id`` (one
+partition per warehouse plus a DEFAULT partition) and
+``inventory_stock_movement`` is RANGE-partitioned by ``created_at`` (one
+partition per calendar month, UTC, plus a DEFAULT partition). The monthly
+helpers take a ``table`` so other append-only tables (the audit trail) are
+partitioned the same way.
+
+Django keeps treating ``id`` as the primary key; at the database level the
+primary key also carries the partition key, as Postgres requires. Every
+helper is a no-op on other database vendors so the tables stay plain there.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+STOCK_BALANCE_TABLE = "inventory_stock_balance"
+STOCK_MOVEMENT_TABLE = "inventory_stock_movement"
+
+
+def is_supported(conn=None):
+    """Return whether the connection supports declarative partitioning."""
+    return (conn or connection).vendor == "postgresql"
+
+
+def warehouse_partition_name(warehouse_id):
+    return f"{STOCK_BALANCE_TABLE}_w{int(warehouse_id)}"
+
+
+def month_partition_name(month: datetime.date, table=STOCK_MOVEMENT_TABLE):
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def month_start(day: datetime.date) -> datetime.date:
+    return day.replace(day=1)
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def _utc_midnight(day: datetime.date) -> datetime.datetime:
+    return datetime.datetime.combine(day, datetime.time(), tzinfo=datetime.UTC)
+
+
+def _table_exists(cursor, name):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+    return cursor.fetchone()[0]
+
+
+def _attach_partition(cursor, parent, name, bound, where):
+    """
+    Create partition ``name`` of ``parent`` for ``bound``.
+
+    Rows already routed to the DEFAULT partition for that bound (selected by
+    the ``(sql, params)`` pair ``where``) are moved into the new partition
+    before it is attached, otherwise Postgres would refuse to create it.
+    """
+    rows_filter, params = where
+    quote = connection.ops.quote_name
+    if _table_exists(cursor, name):
+        return False
+    # CHECK constraints of the parent (e.g. of positive integer columns) must
+    # be present on the table to attach it
+    cursor.execute(
+        f"CREATE TABLE {quote(name)} "
+        f"(LIKE {quote(parent)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+    )
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {quote(parent + '_default')} "  # noqa: S608
+        f"WHERE {rows_filter} RETURNING *) "
+        f"INSERT INTO {quote(name)} SELECT * FROM moved",
+        params,
+    )
+    cursor.execute(
+        f"ALTER TABLE {quote(parent)} ATTACH PARTITION {quote(name)} {bound}",
+    )
+    return True
+
+
+def ensure_warehouse_partition(warehouse_id, conn=None):
+    """Create the stock balance partition of a warehouse if it is missing."""
+    conn = conn or connection
+    if not is_supported(conn):
+        return False
+    warehouse_id = int(warehouse_id)
+    with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+        return _attach_partition(
+            cursor,
+            STOCK_BALANCE_TABLE,
+            warehouse_partition_name(warehouse_id),
+            f"FOR VALUES IN ({warehouse_id})",
+            ("warehouse_id = %s", [warehouse_id]),
+        )
+
+
+def ensure_month_partition(month: datetime.date, conn=None, table=STOCK_MOVEMENT_TABLE):
+    """Create the partition of a calendar month of ``table`` if missing."""
+    conn = conn or connection
+    if not is_supported(conn):
+        return False
+    start = month_start(month)
+    end = add_months(start, 1)
+    with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+        return _attach_partition(
+            cursor,
+            table,
+            month_partition_name(start, table),
+            month_bound(start),
+            (
+                "created_at >= %s AND created_at < %s",
+                [_utc_midnight(start), _utc_midnight(end)],
+            ),
+        )
+
+
+def ensure_upcoming_month_partitions(
+    months_ahead=None,
+    conn=None,
+    table=STOCK_MOVEMENT_TABLE,
+):
+    """Create partitions of ``table`` for this month and the next months."""
+    months_ahead = (
+        settings.STOCK_MOVEMENT_PARTITION_MONTHS_AHEAD
+        if months_ahead is None
+        else months_ahead
+    )
+    current = month_start(timezone.now().astimezone(datetime.UTC).date())
+    return [
+        add_months(current, offset)
+        for offset in range(months_ahead + 1)
+        if ensure_month_partition(add_months(current, offset), conn=conn, table=table)
+    ]
+
+
+def partition_table(  # noqa: PLR0913
+    schema_editor,
+    table,
+    partition_by,
+    partitions,
+    primary_key,
+    unique,
+    foreign_keys,
+    indexes,
+):
+    """
+    Convert an existing plain table into a partitioned one, keeping its rows.
+
+    Used by migrations. Column definitions and defaults are copied with
+    ``LIKE``; the identity column is replaced by an owned sequence because
+    identity columns are not available on partitioned tables before
+    Postgres 17. ``partitions`` is a list of ``(name, bound)`` pairs created
+    next to the DEFAULT partition before the rows are copied back.
+    """
+    quote = schema_editor.quote_name
+    old = f"{table}_unpartitioned"
+    sequence = f"{table}_id_seq"
+    statements = [
+        f"ALTER TABLE {quote(table)} RENAME TO {quote(old)}",
+        f"CREATE TABLE {quote(table)} (LIKE {quote(old)} INCLUDING DEFAULTS) "
+        f"PARTITION BY {partition_by}",
+        f"CREATE TABLE {quote(table + '_default')} PARTITION OF {quote(table)} DEFAULT",
+        *(
+            f"CREATE TABLE {quote(name)} PARTITION OF {quote(table)} {bound}"
+            for name, bound in partitions
+        ),
+        f"INSERT INTO {quote(table)} SELECT * FROM {quote(old)}",  # noqa: S608
+        f"DROP TABLE {quote(old)}",
+        f"CREATE SEQUENCE {quote(sequence)} OWNED BY {quote(table)}.id",
+        f"ALTER TABLE {quote(table)} ALTER COLUMN id SET DEFAULT nextval('{sequence}')",
+        f"SELECT setval('{sequence}', COALESCE(MAX(id), 0) + 1, false) "  # noqa: S608
+        f"FROM {quote(table)}",
+        f"ALTER TABLE {quote(table)} ADD PRIMARY KEY ({', '.join(primary_key)})",
+        *(
+            f"ALTER TABLE {quote(table)} ADD UNIQUE ({', '.join(columns)})"
+            for columns in unique
+        ),
+        *(
+            f"ALTER TABLE {quote(table)} ADD FOREIGN KEY ({column}) "
+            f"REFERENCES {quote(target)} (id) DEFERRABLE INITIALLY DEFERRED"
+            for column, target in foreign_keys
+        ),
+        *(
+            f"CREATE INDEX {quote(name)} ON {quote(table)} ({', '.join(columns)})"
+            for name, columns in indexes
+        ),
+    ]
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def month_bound(month: datetime.date):
+    """Return the ``FOR VALUES`` clause of a monthly partition."""
+    start = month_start(month)
+    end = add_months(start, 1)
+    return (
+        f"FOR VALUES FROM ('{start.isoformat()}T00:00:00+00:00') "
+        f"TO ('{end.isoformat()}T00:00:00+00:00')"
+    )
@@ -0,0 +1,96 @@
+"""
+Stock availability per item, converted to the item's trade UOMs.
+
+Quantities come from the precomputed ``StockSummary`` table and are stored
+in the item's base UOM. The quantity available for new orders is the
+quantity on hand minus reservations; that is what gets converted.
+``ItemUOM.conversion_factor`` is the number of base
+units in one unit of that UOM, so the quantity in a UOM is
+``base quantity / conversion_factor``.
+
+Conversion factors come from the UOM cache
+(:mod:`kancraonewms.master.services.uom_cache`), so a batch of items costs one
+summary query plus, on cache misses only, one ItemUOM query.
+"""
+
+from decimal import Decimal
+
+from django.db.models import Sum
+
+from kancraonewms.inventory.models import StockSummary
+from kancraonewms.master.services import uom_cache
+
+MAX_ITEMS = 1000
+QUANTITY_EXPONENT = Decimal("0.0001")
+FACTOR_FIELDS = (
+    "uom",
+    "uom_code",
+    "conversion_factor",
+    "is_purchase_uom",
+    "is_sales_uom",
+    "is_stock_uom",
+)
+
+
+def get_uom_factors(item_ids):
+    """
+    Return ``{item_id: [uom, ...]}`` for the purchase, sales and stock UOMs.
+
+    Each uom is a dict with ``uom``, ``uom_code``, ``conversion_factor`` and
+    the three usage flags. Items without such UOMs map to an empty list.
+    """
+    return {
+        item_id: [
+            {field: item_uom[field] for field in FACTOR_FIELDS}
+            for item_uom in item_uoms
+            if item_uom["is_purchase_uom"]
+            or item_uom["is_sales_uom"]
+            or item_uom["is_stock_uom"]
+        ]
+        for item_id, item_uoms in uom_cache.get_item_uoms_many(item_ids).items()
+    }
+
+
+def get_availability(item_ids, warehouse_id=None):
+    """
+    Return the availability of ``item_ids`` in one warehouse or in all of them.
+
+    The result keeps the order of ``item_ids``; items without stock report
+    zero quantities.
+    """
+    item_ids = list(dict.fromkeys(item_ids))
+    summaries = StockSummary.objects.filter(item_id__in=item_ids)
+    if warehouse_id is not None:
+        summaries = summaries.filter(warehouse_id=warehouse_id)
+    totals = {
+        item_id: (quantity, reserved)
+        for item_id, quantity, reserved in summaries.order_by()
+        .values("item_id")
+        .annotate(total=Sum("quantity"), reserved=Sum("reserved_quantity"))
+        .values_list("item_id", "total", "reserved")
+    }
+    factors = get_uom_factors(item_ids)
+
+    results = []
+    for item_id in item_ids:
+        quantity, reserved = totals.get(item_id, (Decimal(0), Decimal(0)))
+        available = quantity - reserved
+        results.append(
+            {
+                "item": item_id,
+                "warehouse": warehouse_id,
+                "quantity": quantity,
+                "reserved_quantity": reserved,
+                "available_quantity": available,
+                "uoms": [
+                    {**uom, "quantity": _convert(available, uom["conversion_factor"])}
+                    for uom in factors[item_id]
+                    if uom["conversion_factor"]
+                ],
+            },
+        )
+    return results
+
+
+def _convert(quantity, factor):
+    return (quantity / factor).quantize(QUANTITY_EXPONENT)
@@ -0,0 +1,307 @@
+"""
+Cycle counting: ABC classification, count scheduling and reconciliation.
+
+All three steps work on whole warehouses at once and are written to scale to
+millions of item-rack pairs: rows are streamed with ``values_list`` instead of
+model instances, classification and slot selection are vectorized with NumPy,
+and writes go through ``bulk_create``/``bulk_update`` in fixed-size batches.
+"""
+
+import datetime
+from decimal import Decimal
+from itertools import batched
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from kancraonewms.inventory.models import CycleCountTask
+from kancraonewms.inventory.models import ItemClassification
+from kancraonewms.inventory.models import StockBalance
+from kancraonewms.inventory.models import StockMovement
+from kancraonewms.inventory.services import stock_summary
+
+ABC_CLASSES = ("A", "B", "C")
+OUTBOUND_MOVEMENT_TYPES = ("outbound", "transfer_out")
+
+# Working days are numbered from a fixed Monday so that a pair keeps the same
+# slot in its counting cycle from one night to the next.
+_WORKING_DAY_EPOCH = np.datetime64("2000-01-03", "D")
+
+
+def _batch_size():
+    return settings.CYCLE_COUNT_BATCH_SIZE
+
+
+def _busday_kwargs():
+    return {
+        "weekmask": settings.CYCLE_COUNT_WEEKMASK,
+        "holidays": settings.CYCLE_COUNT_HOLIDAYS,
+    }
+
+
+def is_working_day(day: datetime.date) -> bool:
+    """Return whether ``day`` is a counting day for the configured calendar."""
+    return bool(np.is_busday(np.datetime64(day, "D"), **_busday_kwargs()))
+
+
+def working_day_ordinal(day: datetime.date) -> int:
+    """Return the number of working days between the epoch and ``day``."""
+    end = np.datetime64(day, "D")
+    return int(np.busday_count(_WORKING_DAY_EPOCH, end, **_busday_kwargs()))
+
+
+def compute_abc_classes(velocities, thresholds=None):
+    """
+    Pareto-classify items by velocity.
+
+    Returns an array of class indexes (0=A, 1=B, 2=C) aligned with
+    ``velocities``. An item belongs to the class in which its cumulative share
+    *starts*, so the item that crosses a threshold stays in the higher class.
+    Items that did not move are always C.
+    """
+    a_cut, b_cut = thresholds or settings.CYCLE_COUNT_ABC_THRESHOLDS
+    velocities = np.asarray(velocities, dtype=np.float64)
+    classes = np.full(velocities.shape, 2, dtype=np.int8)
+    total = velocities.sum()
+    if total <= 0:
+        return classes
+
+    order = np.argsort(-velocities, kind="stable")
+    ranked_velocities = velocities[order]
+    share_before = (np.cumsum(ranked_velocities) - ranked_velocities) / total
+    ranked = np.where(share_before < a_cut, 0, np.where(share_before < b_cut, 1, 2))
+    ranked[ranked_velocities <= 0] = 2
+    classes[order] = ranked
+    return classes
+
+
+def classify_items(warehouse_id, *, as_of=None):
+    """
+    Recompute the ABC class of every stocked item in a warehouse.
+
+    Velocity is the outbound quantity over ``CYCLE_COUNT_VELOCITY_DAYS``.
+    Returns the number of items per class.
+    """
+    now = as_of or timezone.now()
+    since = now - datetime.timedelta(days=settings.CYCLE_COUNT_VELOCITY_DAYS)
+
+    item_ids = np.fromiter(
+        StockBalance.objects.for_warehouse(warehouse_id)
+        .values_list("item_id", flat=True)
+        .distinct()
+        .order_by("item_id")
+        .iterator(chunk_size=_batch_size()),
+        dtype=np.int64,
+    )
+    outbound = dict(
+        StockMovement.objects.for_warehouse(warehouse_id)
+        .for_period(since, now)
+        .filter(movement_type__in=OUTBOUND_MOVEMENT_TYPES)
+        .values("item_id")
+        .annotate(total=Sum("quantity"))
+        .values_list("item_id", "total"),
+    )
+    velocities = np.fromiter(
+        (-float(outbound.get(item_id, 0)) for item_id in item_ids.tolist()),
+        dtype=np.float64,
+        count=len(item_ids),
+    )
+    classes = compute_abc_classes(velocities)
+
+    rows = zip(item_ids.tolist(), classes.tolist(), velocities.tolist(), strict=True)
+    for chunk in batched(rows, _batch_size(), strict=False):
+        ItemClassification.objects.bulk_create(
+            [
+                ItemClassification(
+                    warehouse_id=warehouse_id,
+                    item_id=item_id,
+                    abc_class=ABC_CLASSES[class_index],
+                    velocity=Decimal(str(round(velocity, 4))),
+                    classified_at=now,
+                )
+                for item_id, class_index, velocity in chunk
+            ],
+            update_conflicts=True,
+            unique_fields=["warehouse", "item"],
+            update_fields=["abc_class", "velocity", "classified_at"],
+        )
+    # Items that are no longer stocked keep no stale classification.
+    ItemClassification.objects.filter(warehouse_id=warehouse_id).exclude(
+        classified_at=now,
+    ).delete()
+
+    counts = np.bincount(classes, minlength=len(ABC_CLASSES))
+    return dict(zip(ABC_CLASSES, counts.tolist(), strict=True))
+
+
+def generate_count_tasks(warehouse_id, day: datetime.date):
+    """
+    Create the cycle count tasks of one working day for a warehouse.
+
+    Each item-rack pair is counted once every ``CYCLE_COUNT_INTERVALS[class]``
+    working days. The pair's slot inside that cycle is derived from its balance
+    id, which spreads the pairs of each class evenly over the working days
+    without keeping any scheduling state. Running twice for the same day is a
+    no-op. Returns the number of tasks created.
+    """
+    if not is_working_day(day):
+        return 0
+    scheduled = CycleCountTask.objects.filter(
+        warehouse_id=warehouse_id,
+        scheduled_date=day,
+    )
+    # ignore_conflicts leaves no trace of the skipped rows, count the table
+    existing = scheduled.count()
+
+    ordinal = working_day_ordinal(day)
+    intervals = np.array(
+        [settings.CYCLE_COUNT_INTERVALS[abc_class] for abc_class in ABC_CLASSES],
+        dtype=np.int64,
+    )
+    class_index = {abc_class: index for index, abc_class in enumerate(ABC_CLASSES)}
+    class_by_item = {
+        item_id: class_index[abc_class]
+        for item_id, abc_class in ItemClassification.objects.filter(
+            warehouse_id=warehouse_id,
+        ).values_list("item_id", "abc_class")
+    }
+
+    balances = (
+        StockBalance.objects.for_warehouse(warehouse_id)
+        .order_by()
+        .values_list("id", "item_id", "rack_id", "quantity")
+        .iterator(chunk_size=_batch_size())
+    )
+    for chunk in batched(balances, _batch_size(), strict=False):
+        balance_ids = np.fromiter((row[0] for row in chunk), dtype=np.int64)
+        classes = np.fromiter(
+            (class_by_item.get(row[1], 2) for row in chunk),
+            dtype=np.int64,
+        )
+        pair_intervals = intervals[classes]
+        due = np.flatnonzero(balance_ids % pair_intervals == ordinal % pair_intervals)
+        if not len(due):
+            continue
+
+        tasks = [
+            CycleCountTask(
+                warehouse_id=warehouse_id,
+                item_id=chunk[index][1],
+                rack_id=chunk[index][2],
+                abc_class=ABC_CLASSES[classes[index]],
+                scheduled_date=day,
+                expected_quantity=chunk[index][3],
+            )
+            for index in due.tolist()
+        ]
+        CycleCountTask.objects.bulk_create(tasks, ignore_conflicts=True)
+    return scheduled.count() - existing
+
+
+def reconcile_counts(warehouse_id=None):
+    """
+    Post adjustments for counted tasks and mark them reconciled.
+
+    The adjustment is the difference between the counted quantity and the
+    quantity on hand at reconciliation time. Tasks are processed in batches of
+    ``CYCLE_COUNT_BATCH_SIZE``, each in its own transaction; rows locked by a
+    concurrent reconciliation are skipped. A count below the quantity reserved
+    on its balance is not applied: the task stays counted until the
+    reservations are released or the rack is recounted. Returns the number of
+    tasks reconciled.
+    """
+    pending = CycleCountTask.objects.filter(status=CycleCountTask.STATUS_COUNTED)
+    if warehouse_id is not None:
+        pending = pending.filter(warehouse_id=warehouse_id)
+
+    reconciled = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            tasks = list(
+                pending.select_for_update(skip_locked=True)
+                .filter(id__gt=last_id)
+                .order_by("id")[: _batch_size()],
+            )
+            if not tasks:
+                break
+            reconciled += _reconcile_batch(tasks)
+        last_id = tasks[-1].id
+    return reconciled
+
+
+def _reconcile_batch(tasks):
+    now = timezone.now()
+    balances = {
+        (balance.item_id, balance.rack_id): balance
+        for balance in StockBalance.objects.select_for_update()
+        .for_warehouses({task.warehouse_id for task in tasks})
+        .filter(
+            rack_id__in={task.rack_id for task in tasks},
+            item_id__in={task.item_id for task in tasks},
+        )
+    }
+
+    movements = []
+    changed_balances = []
+    new_balances = []
+    reconciled = []
+    for task in tasks:
+        balance = balances.get((task.item_id, task.rack_id))
+        if balance and task.counted_quantity < balance.reserved_quantity:
+            # Reservations hold stock the count did not find
+            continue
+        on_hand = balance.quantity if balance else Decimal(0)
+        difference = task.counted_quantity - on_hand
+        if difference:
+            movements.append(
+                StockMovement(
+                    warehouse_id=task.warehouse_id,
+                    item_id=task.item_id,
+                    rack_id=task.rack_id,
+                    movement_type="adjustment",
+                    quantity=difference,
+                    reference=f"CC-{task.pk}",
+                    created_by_id=task.counted_by_id,
+                ),
+            )
+            if balance:
+                balance.quantity = task.counted_quantity
+                # Invalidate reservations working from the old quantity
+                balance.version += 1
+                balance.updated_at = now
+                changed_balances.append(balance)
+            else:
+                new_balances.append(
+                    StockBalance(
+                        warehouse_id=task.warehouse_id,
+                        item_id=task.item_id,
+                        rack_id=task.rack_id,
+                        quantity=task.counted_quantity,
+                    ),
+                )
+        task.status = CycleCountTask.STATUS_RECONCILED
+        task.reconciled_at = now
+        task.updated_at = now
+        reconciled.append(task)
+
+    StockMovement.objects.bulk_create(movements)
+    StockBalance.objects.bulk_update(
+        changed_balances,
+        ["quantity", "version", "updated_at"],
+    )
+    StockBalance.objects.bulk_create(new_balances)
+    # Bulk writes bypass the signals that keep the stock summary current
+    touched = {}
+    for balance in [*changed_balances, *new_balances]:
+        touched.setdefault(balance.warehouse_id, set()).add(balance.item_id)
+    for warehouse_id, item_ids in touched.items():
+        stock_summary.schedule_refresh(warehouse_id, item_ids)
+    CycleCountTask.objects.bulk_update(
+        reconciled,
+        ["status", "reconciled_at", "updated_at"],
+    )
+    return len(reconciled)
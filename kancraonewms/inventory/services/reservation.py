@@ -0,0 +1,225 @@
+"""
+Stock reservations for outbound allocation.
+
+Reservations are tracked per (item, rack) balance in
+``StockBalance.reserved_quantity``. Two mechanisms keep concurrent pickers
+from over-allocating without a global lock:
+
+* Allocation scans lock candidate balances with ``SELECT ... FOR UPDATE SKIP
+  LOCKED``: a picker never waits for rows another picker is allocating from,
+  it moves on to the next rack. If the skipped rows were needed the whole
+  allocation is retried.
+* Every write to a balance is a conditional ``UPDATE`` on its ``version``
+  (optimistic locking) that also re-checks the available quantity. Releases
+  and fulfilments take no row locks up front; when the version moved in the
+  meantime they re-read the balance and try again.
+
+Retries back off exponentially with jitter and give up after
+``MAX_RETRIES`` attempts.
+"""
+
+import random
+import time
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Sum
+
+from kancraonewms.inventory.models import StockBalance
+from kancraonewms.inventory.models import StockMovement
+from kancraonewms.inventory.models import StockReservation
+from kancraonewms.inventory.services import stock_summary
+
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.005
+
+
+class ReservationError(Exception):
+    """Base class of reservation failures"""
+
+
+class InsufficientStockError(ReservationError):
+    """Raised when the warehouse does not hold enough unreserved stock"""
+
+
+class ReservationConflictError(ReservationError):
+    """Raised when concurrent writers kept winning until retries ran out"""
+
+
+class _Retry(Exception):  # noqa: N818
+    pass
+
+
+def _backoff(attempt):
+    delay = RETRY_BACKOFF * (2**attempt)
+    time.sleep(delay + random.uniform(0, delay))  # noqa: S311
+
+
+def _update_balance(balance, reserved_delta, quantity_delta=Decimal(0)):
+    """
+    Apply deltas to ``balance`` if nobody changed it since it was read.
+
+    The row must still carry the version that was read and, after the change,
+    must not reserve more than it holds. Returns whether the row was updated.
+    """
+    return bool(
+        StockBalance.objects.for_warehouse(balance.warehouse_id)
+        .filter(
+            pk=balance.pk,
+            version=balance.version,
+            quantity__gte=F("reserved_quantity") + reserved_delta - quantity_delta,
+        )
+        .update(
+            quantity=F("quantity") + quantity_delta,
+            reserved_quantity=F("reserved_quantity") + reserved_delta,
+            version=F("version") + 1,
+        ),
+    )
+
+
+def reserve(  # noqa: PLR0913
+    warehouse_id,
+    item_id,
+    quantity,
+    reference,
+    *,
+    user=None,
+    max_retries=MAX_RETRIES,
+):
+    """
+    Reserve ``quantity`` of an item in a warehouse, spread over its racks.
+
+    Returns the created reservations, one per rack allocated from. Raises
+    InsufficientStockError when the warehouse cannot cover the quantity and
+    ReservationConflictError when contention outlasts the retries.
+    """
+    quantity = Decimal(quantity)
+    if quantity <= 0:
+        msg = "Quantity to reserve must be positive."
+        raise ValueError(msg)
+
+    for attempt in range(max_retries + 1):
+        try:
+            with transaction.atomic():
+                reservations = _allocate(
+                    warehouse_id,
+                    item_id,
+                    quantity,
+                    reference,
+                    user,
+                )
+                stock_summary.schedule_refresh(warehouse_id, [item_id])
+        except _Retry:
+            if attempt < max_retries:
+                _backoff(attempt)
+        else:
+            return reservations
+    msg = f"Could not reserve {quantity} of item {item_id}, too much contention."
+    raise ReservationConflictError(msg)
+
+
+def _allocate(warehouse_id, item_id, quantity, reference, user):
+    balances = StockBalance.objects.for_warehouse(warehouse_id).filter(
+        item_id=item_id,
+        quantity__gt=F("reserved_quantity"),
+    )
+    candidates = balances.select_for_update(skip_locked=True).order_by("id")
+
+    remaining = quantity
+    reservations = []
+    for balance in candidates:
+        take = min(balance.available_quantity, remaining)
+        if not _update_balance(balance, take):
+            continue
+        reservations.append(
+            StockReservation(
+                warehouse_id=warehouse_id,
+                item_id=item_id,
+                rack_id=balance.rack_id,
+                quantity=take,
+                reference=reference,
+                created_by=user,
+            ),
+        )
+        remaining -= take
+        if not remaining:
+            return StockReservation.objects.bulk_create(reservations)
+
+    # Our own updates are visible here, so add back what we allocated.
+    available = balances.aggregate(
+        available=Sum(F("quantity") - F("reserved_quantity")),
+    )["available"] or Decimal(0)
+    if available + quantity - remaining < quantity:
+        msg = f"Only {available + quantity - remaining} of item {item_id} available."
+        raise InsufficientStockError(msg)
+    # Enough stock exists but sits in rows locked by other pickers.
+    raise _Retry
+
+
+def release(reservation, *, max_retries=MAX_RETRIES):
+    """Give reserved stock back to the balance it was allocated from"""
+    return _settle(reservation, StockReservation.STATUS_RELEASED, max_retries)
+
+
+def fulfill(reservation, *, user=None, max_retries=MAX_RETRIES):
+    """Ship reserved stock: decrease the balance and post an outbound movement"""
+    return _settle(
+        reservation,
+        StockReservation.STATUS_FULFILLED,
+        max_retries,
+        user=user,
+    )
+
+
+def release_reference(reference):
+    """Release every active reservation of an outbound document"""
+    reservations = StockReservation.objects.filter(
+        reference=reference,
+        status=StockReservation.STATUS_ACTIVE,
+    )
+    return [release(reservation) for reservation in reservations]
+
+
+def _settle(reservation, status, max_retries, user=None):
+    for attempt in range(max_retries + 1):
+        with transaction.atomic():
+            reservation = StockReservation.objects.select_for_update().get(
+                pk=reservation.pk,
+            )
+            if reservation.status != StockReservation.STATUS_ACTIVE:
+                msg = f"Reservation {reservation.pk} is already {reservation.status}."
+                raise ReservationError(msg)
+
+            balance = (
+                StockBalance.objects.for_warehouse(reservation.warehouse_id)
+                .only("id", "warehouse_id", "version")
+                .get(item_id=reservation.item_id, rack_id=reservation.rack_id)
+            )
+            shipped = (
+                reservation.quantity
+                if status == StockReservation.STATUS_FULFILLED
+                else Decimal(0)
+            )
+            if _update_balance(balance, -reservation.quantity, -shipped):
+                reservation.status = status
+                reservation.save(update_fields=["status", "updated_at"])
+                if shipped:
+                    StockMovement.objects.create(
+                        warehouse_id=reservation.warehouse_id,
+                        item_id=reservation.item_id,
+                        rack_id=reservation.rack_id,
+                        movement_type="outbound",
+                        quantity=-shipped,
+                        reference=reservation.reference,
+                        created_by=user,
+                    )
+                stock_summary.schedule_refresh(
+                    reservation.warehouse_id,
+                    [reservation.item_id],
+                )
+                return reservation
+        if attempt < max_retries:
+            _backoff(attempt)
+    msg = f"Could not settle reservation {reservation.pk}, too much contention."
+    raise ReservationConflictError(msg)
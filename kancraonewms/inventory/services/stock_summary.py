@@ -0,0 +1,76 @@
+"""
+Maintenance of the per warehouse/item stock summary.
+
+Summaries are recomputed from ``StockBalance`` with one aggregate query and
+written back with one upsert per call. Single balance writes trigger a
+refresh through signals once the transaction commits; bulk writes, which
+bypass signals, call :func:`schedule_refresh` themselves. A nightly task
+rebuilds every warehouse to repair any drift.
+"""
+
+from itertools import batched
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import Sum
+from django.utils import timezone
+
+from kancraonewms.inventory.models import StockBalance
+from kancraonewms.inventory.models import StockSummary
+
+BATCH_SIZE = 5000
+
+
+def refresh_summaries(warehouse_id, item_ids=None):
+    """
+    Recompute the summaries of ``item_ids`` (default: all items) in a warehouse.
+
+    Returns the number of summaries written.
+    """
+    balances = StockBalance.objects.for_warehouse(warehouse_id)
+    summaries = StockSummary.objects.filter(warehouse_id=warehouse_id)
+    if item_ids is not None:
+        item_ids = list(item_ids)
+        balances = balances.filter(item_id__in=item_ids)
+        summaries = summaries.filter(item_id__in=item_ids)
+
+    now = timezone.now()
+    with transaction.atomic():
+        rows = [
+            StockSummary(
+                warehouse_id=warehouse_id,
+                item_id=row["item_id"],
+                quantity=row["quantity"],
+                reserved_quantity=row["reserved_quantity"],
+                rack_count=row["rack_count"],
+                updated_at=now,
+            )
+            for row in balances.order_by()
+            .values("item_id")
+            .annotate(
+                quantity=Sum("quantity"),
+                reserved_quantity=Sum("reserved_quantity"),
+                rack_count=Count("id"),
+            )
+        ]
+        # Items without any balance left lose their summary
+        summaries.exclude(item_id__in=balances.values("item_id")).delete()
+        for batch in batched(rows, BATCH_SIZE, strict=False):
+            StockSummary.objects.bulk_create(
+                batch,
+                update_conflicts=True,
+                unique_fields=["warehouse", "item"],
+                update_fields=[
+                    "quantity",
+                    "reserved_quantity",
+                    "rack_count",
+                    "updated_at",
+                ],
+            )
+    return len(rows)
+
+
+def schedule_refresh(warehouse_id, item_ids):
+    """Refresh the given summaries once the current transaction commits"""
+    item_ids = set(item_ids)
+    transaction.on_commit(lambda: refresh_summaries(warehouse_id, item_ids))
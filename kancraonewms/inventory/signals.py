@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from kancraonewms.organizations.models import Warehouse
+
+from . import partitions
+from .models import StockBalance
+from .services import stock_summary
+
+
+@receiver(post_save, sender=Warehouse)
+def create_warehouse_partition(sender, instance, created, **kwargs):
+    """Give every new warehouse its own stock balance partition"""
+    if created and partitions.is_supported():
+        transaction.on_commit(
+            lambda: partitions.ensure_warehouse_partition(instance.pk),
+        )
+
+
+@receiver(post_save, sender=StockBalance)
+@receiver(post_delete, sender=StockBalance)
+def refresh_stock_summary(sender, instance, **kwargs):
+    """Keep the warehouse/item summary in line with single balance writes"""
+    stock_summary.schedule_refresh(instance.warehouse_id, [instance.item_id])
@@ -0,0 +1,95 @@
+import datetime
+
+from celery import shared_task
+from django.utils import timezone
+
+from kancraonewms.organizations.models import Warehouse
+
+from . import partitions
+from .services import cycle_count
+from .services import stock_summary
+
+# Per-warehouse jobs process up to millions of rows, well past the global
+# CELERY_TASK_SOFT_TIME_LIMIT meant for request-sized tasks.
+CYCLE_COUNT_SOFT_TIME_LIMIT = 15 * 60
+CYCLE_COUNT_TIME_LIMIT = 20 * 60
+
+
+def _active_warehouse_ids():
+    return Warehouse.objects.filter(is_active=True).values_list("id", flat=True)
+
+
+@shared_task()
+def classify_items_abc():
+    """Nightly: fan out ABC classification to one task per active warehouse."""
+    for warehouse_id in _active_warehouse_ids():
+        classify_warehouse_items.delay(warehouse_id)
+
+
+@shared_task(
+    soft_time_limit=CYCLE_COUNT_SOFT_TIME_LIMIT,
+    time_limit=CYCLE_COUNT_TIME_LIMIT,
+)
+def classify_warehouse_items(warehouse_id):
+    """Recompute ABC classes for one warehouse."""
+    return cycle_count.classify_items(warehouse_id)
+
+
+@shared_task()
+def generate_cycle_count_tasks(day=None):
+    """Nightly: fan out count task generation for ``day`` (default: today)."""
+    day = day or timezone.localdate().isoformat()
+    for warehouse_id in _active_warehouse_ids():
+        generate_warehouse_count_tasks.delay(warehouse_id, day)
+
+
+@shared_task(
+    soft_time_limit=CYCLE_COUNT_SOFT_TIME_LIMIT,
+    time_limit=CYCLE_COUNT_TIME_LIMIT,
+)
+def generate_warehouse_count_tasks(warehouse_id, day):
+    """Create the count tasks of one working day for one warehouse."""
+    return cycle_count.generate_count_tasks(
+        warehouse_id,
+        datetime.date.fromisoformat(day),
+    )
+
+
+@shared_task(
+    soft_time_limit=CYCLE_COUNT_SOFT_TIME_LIMIT,
+    time_limit=CYCLE_COUNT_TIME_LIMIT,
+)
+def reconcile_cycle_counts():
+    """Nightly: post adjustments for all counted tasks."""
+    return cycle_count.reconcile_counts()
+
+
+@shared_task()
+def ensure_stock_partitions():
+    """Daily: create upcoming movement months and any missing warehouse partitions."""
+    created_months = partitions.ensure_upcoming_month_partitions()
+    created_warehouses = [
+        warehouse_id
+        for warehouse_id in Warehouse.objects.values_list("id", flat=True)
+        if partitions.ensure_warehouse_partition(warehouse_id)
+    ]
+    return {
+        "months": [month.isoformat() for month in created_months],
+        "warehouses": created_warehouses,
+    }
+
+
+@shared_task()
+def refresh_stock_summaries():
+    """Nightly: fan out a full stock summary rebuild per active warehouse."""
+    for warehouse_id in _active_warehouse_ids():
+        refresh_warehouse_stock_summary.delay(warehouse_id)
+
+
+@shared_task(
+    soft_time_limit=CYCLE_COUNT_SOFT_TIME_LIMIT,
+    time_limit=CYCLE_COUNT_TIME_LIMIT,
+)
+def refresh_warehouse_stock_summary(warehouse_id):
+    """Rebuild the stock summary of one warehouse from its balances."""
+    return stock_summary.refresh_summaries(warehouse_id)
@@ -0,0 +1,90 @@
+"""
+Tests for CycleCountTask API endpoints
+"""
+
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from kancraonewms.inventory.models import CycleCountTask
+from kancraonewms.inventory.tests.factories import CycleCountTaskFactory
+from kancraonewms.users.tests.factories import UserFactory
+
+
+class CycleCountTaskViewSetTest(APITestCase):
+    """Tests for CycleCountTask ViewSet"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.user = UserFactory()
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}",
+        )
+
+        self.task1 = CycleCountTaskFactory(abc_class="A", scheduled_date="2026-01-05")
+        self.task2 = CycleCountTaskFactory(abc_class="C", scheduled_date="2026-01-06")
+
+        self.list_url = reverse("api:cyclecounttask-list")
+
+    def _get_results(self, response):
+        """Helper to extract results from paginated or non-paginated response"""
+        if isinstance(response.data, dict) and "results" in response.data:
+            return response.data["results"]
+        return response.data
+
+    def test_list_tasks_filter_by_warehouse_and_date(self):
+        """Test listing tasks filtered by warehouse and scheduled date"""
+        response = self.client.get(
+            self.list_url,
+            {"warehouse": self.task1.warehouse_id, "scheduled_date": "2026-01-05"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        results = self._get_results(response)
+        assert [task["id"] for task in results] == [self.task1.id]
+
+    def test_filter_by_abc_class(self):
+        """Test filtering tasks by ABC class"""
+        response = self.client.get(self.list_url, {"abc_class": "c"})
+
+        results = self._get_results(response)
+        assert [task["id"] for task in results] == [self.task2.id]
+
+    def test_submit_count(self):
+        """Test submitting a counted quantity"""
+        url = reverse("api:cyclecounttask-count", kwargs={"pk": self.task1.pk})
+        response = self.client.post(url, {"counted_quantity": "12.5000"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == CycleCountTask.STATUS_COUNTED
+        self.task1.refresh_from_db()
+        assert self.task1.counted_quantity == Decimal("12.5")
+        assert self.task1.counted_by == self.user
+        assert self.task1.counted_at is not None
+
+    def test_submit_negative_count_fails(self):
+        """Test that a negative counted quantity is rejected"""
+        url = reverse("api:cyclecounttask-count", kwargs={"pk": self.task1.pk})
+        response = self.client.post(url, {"counted_quantity": "-1"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_submit_count_on_reconciled_task_fails(self):
+        """Test that reconciled tasks cannot be recounted"""
+        self.task1.status = CycleCountTask.STATUS_RECONCILED
+        self.task1.save()
+        url = reverse("api:cyclecounttask-count", kwargs={"pk": self.task1.pk})
+        response = self.client.post(url, {"counted_quantity": "1"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_unauthenticated_access(self):
+        """Test that unauthenticated requests are rejected"""
+        self.client.credentials()
+        response = self.client.get(self.list_url)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
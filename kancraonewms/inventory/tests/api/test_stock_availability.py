@@ -0,0 +1,91 @@
+"""
+Tests for stock availability API endpoints
+"""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from kancraonewms.inventory.tests.factories import StockBalanceFactory
+from kancraonewms.master.tests.factories import ItemFactory
+from kancraonewms.master.tests.factories import ItemUOMFactory
+from kancraonewms.users.tests.factories import UserFactory
+
+
+class StockAvailabilityViewSetTest(APITestCase):
+    """Tests for StockAvailability ViewSet"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        cache.clear()
+        self.user = UserFactory()
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}",
+        )
+
+        self.item = ItemFactory()
+        ItemUOMFactory(item=self.item, conversion_factor=Decimal(4))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.balance = StockBalanceFactory(item=self.item, quantity=Decimal(10))
+            StockBalanceFactory(item=self.item, quantity=Decimal(6))
+
+        self.list_url = reverse("api:stock-availability-list")
+        self.query_url = reverse("api:stock-availability-query")
+
+    def test_list_availability(self):
+        """Test availability over all warehouses"""
+        response = self.client.get(self.list_url, {"items": str(self.item.pk)})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert Decimal(response.data[0]["quantity"]) == Decimal(16)
+        assert Decimal(response.data[0]["uoms"][0]["quantity"]) == Decimal(4)
+
+    def test_list_availability_by_warehouse(self):
+        """Test availability in one warehouse"""
+        response = self.client.get(
+            self.list_url,
+            {"items": str(self.item.pk), "warehouse": self.balance.warehouse_id},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert Decimal(response.data[0]["quantity"]) == Decimal(10)
+        assert response.data[0]["warehouse"] == self.balance.warehouse_id
+
+    def test_query_batch(self):
+        """Test a batch query keeps the requested order"""
+        other = ItemFactory()
+
+        response = self.client.post(
+            self.query_url,
+            {"items": [other.pk, self.item.pk]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["item"] for row in response.data] == [other.pk, self.item.pk]
+        assert Decimal(response.data[0]["quantity"]) == 0
+
+    def test_query_requires_items(self):
+        """Test items are required and limited"""
+        response = self.client.post(self.query_url, {"items": []}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = self.client.post(
+            self.query_url,
+            {"items": list(range(1, 1002))},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_unauthenticated(self):
+        """Test availability requires authentication"""
+        self.client.credentials()
+
+        response = self.client.get(self.list_url, {"items": str(self.item.pk)})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,43 @@
+from factory import LazyAttribute
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+from factory.fuzzy import FuzzyDecimal
+
+from kancraonewms.inventory.models import CycleCountTask
+from kancraonewms.inventory.models import StockBalance
+from kancraonewms.inventory.models import StockMovement
+from kancraonewms.master.tests.factories import ItemFactory
+from kancraonewms.master.tests.factories import RackFactory
+
+
+class StockBalanceFactory(DjangoModelFactory):
+    rack = SubFactory(RackFactory)
+    warehouse = LazyAttribute(lambda o: o.rack.warehouse)
+    item = SubFactory(ItemFactory)
+    quantity = FuzzyDecimal(0.0, 1000.0, precision=4)
+
+    class Meta:
+        model = StockBalance
+
+
+class StockMovementFactory(DjangoModelFactory):
+    rack = SubFactory(RackFactory)
+    warehouse = LazyAttribute(lambda o: o.rack.warehouse)
+    item = SubFactory(ItemFactory)
+    movement_type = "outbound"
+    quantity = FuzzyDecimal(-100.0, -1.0, precision=4)
+
+    class Meta:
+        model = StockMovement
+
+
+class CycleCountTaskFactory(DjangoModelFactory):
+    rack = SubFactory(RackFactory)
+    warehouse = LazyAttribute(lambda o: o.rack.warehouse)
+    item = SubFactory(ItemFactory)
+    abc_class = "C"
+    scheduled_date = "2026-01-05"
+    expected_quantity = FuzzyDecimal(0.0, 1000.0, precision=4)
+
+    class Meta:
+        model = CycleCountTask
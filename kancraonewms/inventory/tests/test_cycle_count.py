@@ -0,0 +1,209 @@
+"""
+Tests for cycle count services
+"""
+
+import datetime
+from decimal import Decimal
+
+import numpy as np
+from django.test import TestCase
+from django.test import override_settings
+
+from kancraonewms.inventory.models import CycleCountTask
+from kancraonewms.inventory.models import ItemClassification
+from kancraonewms.inventory.models import StockBalance
+from kancraonewms.inventory.models import StockMovement
+from kancraonewms.inventory.services import cycle_count
+from kancraonewms.inventory.tests.factories import CycleCountTaskFactory
+from kancraonewms.inventory.tests.factories import StockBalanceFactory
+from kancraonewms.inventory.tests.factories import StockMovementFactory
+from kancraonewms.master.tests.factories import ItemFactory
+from kancraonewms.master.tests.factories import RackFactory
+
+MONDAY = datetime.date(2026, 1, 5)
+SATURDAY = datetime.date(2026, 1, 10)
+
+
+class ComputeABCClassesTest(TestCase):
+    """Tests for the vectorized Pareto classification"""
+
+    def test_pareto_split(self):
+        """Top movers are A, the long tail is C, non-movers are C"""
+        velocities = [700, 0, 100, 150, 40, 10]
+        classes = cycle_count.compute_abc_classes(velocities, thresholds=(0.8, 0.95))
+
+        # Shares before each ranked item: 0, .7, .85, .95, .99 -> A, A, B, C, C
+        assert classes.tolist() == [0, 2, 1, 0, 2, 2]
+
+    def test_no_movement_is_all_c(self):
+        """Without any movement everything is class C"""
+        classes = cycle_count.compute_abc_classes(np.zeros(4))
+
+        assert classes.tolist() == [2, 2, 2, 2]
+
+
+class ClassifyItemsTest(TestCase):
+    """Tests for classify_items"""
+
+    def setUp(self):
+        self.rack = RackFactory()
+        self.warehouse = self.rack.warehouse
+        self.fast = ItemFactory(code="FAST")
+        self.slow = ItemFactory(code="SLOW")
+        self.idle = ItemFactory(code="IDLE")
+        for item in [self.fast, self.slow, self.idle]:
+            StockBalanceFactory(rack=self.rack, item=item, quantity=Decimal(10))
+
+        StockMovementFactory(rack=self.rack, item=self.fast, quantity=Decimal(-90))
+        StockMovementFactory(rack=self.rack, item=self.slow, quantity=Decimal(-10))
+        # Inbound movements do not count towards velocity
+        StockMovementFactory(
+            rack=self.rack,
+            item=self.idle,
+            movement_type="inbound",
+            quantity=Decimal(500),
+        )
+
+    def test_classify_items(self):
+        """Items are classified by outbound velocity and upserted"""
+        counts = cycle_count.classify_items(self.warehouse.id)
+
+        assert counts == {"A": 1, "B": 1, "C": 1}
+        classes = dict(
+            ItemClassification.objects.values_list("item__code", "abc_class"),
+        )
+        assert classes == {"FAST": "A", "SLOW": "B", "IDLE": "C"}
+        assert ItemClassification.objects.get(item=self.fast).velocity == Decimal(90)
+
+    def test_reclassify_removes_unstocked_items(self):
+        """Running again replaces classifications of items no longer stocked"""
+        cycle_count.classify_items(self.warehouse.id)
+        StockBalance.objects.filter(item=self.idle).delete()
+
+        cycle_count.classify_items(self.warehouse.id)
+
+        assert ItemClassification.objects.count() == 2  # noqa: PLR2004
+        assert not ItemClassification.objects.filter(item=self.idle).exists()
+
+
+@override_settings(CYCLE_COUNT_INTERVALS={"A": 1, "B": 2, "C": 3})
+class GenerateCountTasksTest(TestCase):
+    """Tests for generate_count_tasks"""
+
+    def setUp(self):
+        self.rack = RackFactory()
+        self.warehouse = self.rack.warehouse
+        self.balances = [
+            StockBalanceFactory(rack=self.rack, item=ItemFactory()) for _ in range(6)
+        ]
+
+    def test_class_c_pairs_are_spread_over_working_days(self):
+        """Each pair is scheduled exactly once per cycle of working days"""
+        days = [MONDAY + datetime.timedelta(days=offset) for offset in range(3)]
+        created = [
+            cycle_count.generate_count_tasks(self.warehouse.id, day) for day in days
+        ]
+
+        assert created == [2, 2, 2]
+        assert CycleCountTask.objects.values("item").distinct().count() == 6  # noqa: PLR2004
+
+    def test_class_a_pairs_are_counted_every_day(self):
+        """A-class pairs have the shortest interval"""
+        ItemClassification.objects.bulk_create(
+            [
+                ItemClassification(
+                    warehouse=self.warehouse,
+                    item=balance.item,
+                    abc_class="A",
+                    classified_at=datetime.datetime.now(tz=datetime.UTC),
+                )
+                for balance in self.balances
+            ],
+        )
+
+        assert cycle_count.generate_count_tasks(self.warehouse.id, MONDAY) == 6  # noqa: PLR2004
+        assert set(CycleCountTask.objects.values_list("abc_class", flat=True)) == {"A"}
+
+    def test_generation_is_idempotent(self):
+        """Running twice for the same day does not duplicate tasks"""
+        assert cycle_count.generate_count_tasks(self.warehouse.id, MONDAY) == 2  # noqa: PLR2004
+        assert cycle_count.generate_count_tasks(self.warehouse.id, MONDAY) == 0
+
+        assert CycleCountTask.objects.count() == 2  # noqa: PLR2004
+
+    def test_no_tasks_on_non_working_day(self):
+        """Weekends are skipped with the default weekmask"""
+        assert cycle_count.generate_count_tasks(self.warehouse.id, SATURDAY) == 0
+        assert not CycleCountTask.objects.exists()
+
+
+@override_settings(CYCLE_COUNT_BATCH_SIZE=2)
+class ReconcileCountsTest(TestCase):
+    """Tests for reconcile_counts"""
+
+    def setUp(self):
+        self.rack = RackFactory()
+        self.balances = [
+            StockBalanceFactory(rack=self.rack, quantity=Decimal(10)) for _ in range(3)
+        ]
+        self.tasks = [
+            CycleCountTaskFactory(
+                rack=self.rack,
+                item=balance.item,
+                status=CycleCountTask.STATUS_COUNTED,
+                counted_quantity=counted,
+            )
+            for balance, counted in zip(
+                self.balances,
+                [Decimal(10), Decimal(7), Decimal(12)],
+                strict=True,
+            )
+        ]
+
+    def test_reconcile_posts_adjustments_in_batches(self):
+        """Differences become adjustment movements and balances are corrected"""
+        reconciled = cycle_count.reconcile_counts()
+
+        assert reconciled == 3  # noqa: PLR2004
+        assert list(
+            StockMovement.objects.order_by("quantity").values_list(
+                "movement_type",
+                "quantity",
+            ),
+        ) == [("adjustment", Decimal(-3)), ("adjustment", Decimal(2))]
+        assert sorted(
+            StockBalance.objects.values_list("quantity", flat=True),
+        ) == [Decimal(7), Decimal(10), Decimal(12)]
+        assert set(CycleCountTask.objects.values_list("status", flat=True)) == {
+            CycleCountTask.STATUS_RECONCILED,
+        }
+
+    def test_balance_version_is_bumped(self):
+        """Corrected balances invalidate reservations read before the count"""
+        cycle_count.reconcile_counts()
+
+        versions = dict(StockBalance.objects.values_list("quantity", "version"))
+        assert versions == {Decimal(7): 1, Decimal(10): 0, Decimal(12): 1}
+
+    def test_count_below_reserved_is_not_applied(self):
+        """A count that would leave reservations uncovered stays counted"""
+        StockBalance.objects.filter(pk=self.balances[1].pk).update(
+            reserved_quantity=Decimal(8),
+        )
+
+        assert cycle_count.reconcile_counts() == 2  # noqa: PLR2004
+        balance = StockBalance.objects.get(pk=self.balances[1].pk)
+        assert balance.quantity == Decimal(10)
+        assert balance.version == 0
+        task = CycleCountTask.objects.get(pk=self.tasks[1].pk)
+        assert task.status == CycleCountTask.STATUS_COUNTED
+        assert not StockMovement.objects.filter(reference=f"CC-{task.pk}").exists()
+
+    def test_pending_tasks_are_not_reconciled(self):
+        """Only counted tasks are reconciled"""
+        CycleCountTask.objects.filter(pk=self.tasks[1].pk).update(
+            status=CycleCountTask.STATUS_PENDING,
+        )
+
+        assert cycle_count.reconcile_counts() == 2  # noqa: PLR2004
+        assert StockMovement.objects.count() == 1
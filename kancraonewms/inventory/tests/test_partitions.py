@@ -0,0 +1,141 @@
+"""
+Tests for stock table partitioning
+"""
+
+import datetime
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+
+from kancraonewms.inventory import partitions
+from kancraonewms.inventory.models import StockBalance
+from kancraonewms.inventory.models import StockMovement
+from kancraonewms.inventory.tests.factories import StockBalanceFactory
+from kancraonewms.inventory.tests.factories import StockMovementFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+
+
+class PartitionNamingTest(TestCase):
+    """Tests for partition names and bounds"""
+
+    def test_add_months_crosses_years(self):
+        """Month arithmetic wraps around the year"""
+        month = datetime.date(2026, 11, 1)
+        assert partitions.add_months(month, 2) == datetime.date(2027, 1, 1)
+        assert partitions.add_months(month, -11) == datetime.date(2025, 12, 1)
+
+    def test_month_partition_name(self):
+        """Monthly partitions are named after year and month"""
+        name = partitions.month_partition_name(datetime.date(2026, 3, 1))
+        assert name == "inventory_stock_movement_y2026m03"
+
+    def test_month_bound(self):
+        """Bounds cover exactly one UTC month"""
+        bound = partitions.month_bound(datetime.date(2026, 12, 15))
+        assert "FROM ('2026-12-01T00:00:00+00:00')" in bound
+        assert "TO ('2027-01-01T00:00:00+00:00')" in bound
+
+    def test_warehouse_partition_name(self):
+        """Warehouse partitions are named after the warehouse id"""
+        name = partitions.warehouse_partition_name(7)
+        assert name == "inventory_stock_balance_w7"
+
+
+class PartitionManagerTest(TestCase):
+    """Tests for the partition-pruning querysets"""
+
+    def test_balance_for_warehouse(self):
+        """Balances are restricted to the requested warehouses"""
+        balance = StockBalanceFactory()
+        other = StockBalanceFactory()
+
+        assert list(StockBalance.objects.for_warehouse(balance.warehouse)) == [
+            balance,
+        ]
+        scoped = StockBalance.objects.for_warehouses(
+            [balance.warehouse_id, other.warehouse],
+        )
+        assert set(scoped) == {balance, other}
+
+    def test_movement_for_period(self):
+        """Movements are restricted to the half-open period"""
+        movement = StockMovementFactory()
+        created = movement.created_at
+
+        assert StockMovement.objects.for_period(start=created).count() == 1
+        assert not StockMovement.objects.for_period(end=created).exists()
+        assert (
+            StockMovement.objects.for_warehouse(movement.warehouse)
+            .for_period(created, created + datetime.timedelta(seconds=1))
+            .get()
+            == movement
+        )
+
+
+@unittest.skipIf(
+    partitions.is_supported(),
+    "Only relevant when partitioning is unavailable",
+)
+class PartitionFallbackTest(TestCase):
+    """Partition helpers are no-ops on other databases"""
+
+    def test_helpers_do_nothing(self):
+        """Nothing is created without Postgres"""
+        assert partitions.ensure_warehouse_partition(1) is False
+        assert partitions.ensure_month_partition(datetime.date(2026, 1, 1)) is False
+        assert partitions.ensure_upcoming_month_partitions(months_ahead=2) == []
+
+
+@unittest.skipUnless(partitions.is_supported(), "Requires PostgreSQL")
+class PartitionCreationTest(TestCase):
+    """Tests for partition creation on Postgres"""
+
+    def _partition_of(self, table, row_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT tableoid::regclass::text FROM {table} WHERE id = %s",  # noqa: S608
+                [row_id],
+            )
+            return cursor.fetchone()[0]
+
+    def test_new_warehouse_gets_partition(self):
+        """Balances of a new warehouse land in its own partition"""
+        warehouse = WarehouseFactory()
+        # Creation is deferred to on_commit, which never fires in TestCase
+        partitions.ensure_warehouse_partition(warehouse.pk)
+        balance = StockBalanceFactory(warehouse=warehouse)
+
+        table = self._partition_of(partitions.STOCK_BALANCE_TABLE, balance.pk)
+        assert table == partitions.warehouse_partition_name(warehouse.pk)
+
+    def test_created_warehouse_gets_partition(self):
+        """The on_commit hook attaches a partition despite the parent's CHECKs"""
+        with self.captureOnCommitCallbacks(execute=True):
+            warehouse = WarehouseFactory()
+        balance = StockBalanceFactory(warehouse=warehouse, version=1)
+
+        table = self._partition_of(partitions.STOCK_BALANCE_TABLE, balance.pk)
+        assert table == partitions.warehouse_partition_name(warehouse.pk)
+
+    def test_rows_move_out_of_default_partition(self):
+        """Rows stored in the default partition are moved when attaching"""
+        warehouse = WarehouseFactory()
+        balance = StockBalanceFactory(warehouse=warehouse)
+        table = self._partition_of(partitions.STOCK_BALANCE_TABLE, balance.pk)
+        assert table == f"{partitions.STOCK_BALANCE_TABLE}_default"
+
+        assert partitions.ensure_warehouse_partition(warehouse.pk) is True
+        assert partitions.ensure_warehouse_partition(warehouse.pk) is False
+
+        table = self._partition_of(partitions.STOCK_BALANCE_TABLE, balance.pk)
+        assert table == partitions.warehouse_partition_name(warehouse.pk)
+
+    def test_upcoming_months_are_created(self):
+        """Movements are routed to their monthly partition"""
+        partitions.ensure_upcoming_month_partitions(months_ahead=1)
+        movement = StockMovementFactory()
+
+        table = self._partition_of(partitions.STOCK_MOVEMENT_TABLE, movement.pk)
+        month = partitions.month_start(movement.created_at.date())
+        assert table == partitions.month_partition_name(month)
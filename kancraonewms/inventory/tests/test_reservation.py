@@ -0,0 +1,178 @@
+"""
+Tests for the stock reservation service
+"""
+
+import threading
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.db import connections
+from django.db.models import Sum
+from django.test import TestCase
+from django.test import TransactionTestCase
+
+from kancraonewms.inventory.models import StockBalance
+from kancraonewms.inventory.models import StockMovement
+from kancraonewms.inventory.models import StockReservation
+from kancraonewms.inventory.models import StockSummary
+from kancraonewms.inventory.services import reservation
+from kancraonewms.inventory.tests.factories import StockBalanceFactory
+from kancraonewms.master.tests.factories import ItemFactory
+from kancraonewms.master.tests.factories import RackFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+
+
+class ReservationTest(TestCase):
+    """Tests for reserving, releasing and fulfilling stock"""
+
+    def setUp(self):
+        self.warehouse = WarehouseFactory()
+        self.item = ItemFactory()
+        self.balances = [
+            StockBalanceFactory(
+                warehouse=self.warehouse,
+                rack=RackFactory(warehouse=self.warehouse),
+                item=self.item,
+                quantity=Decimal(quantity),
+            )
+            for quantity in (4, 10)
+        ]
+
+    def _reserve(self, quantity):
+        return reservation.reserve(self.warehouse.pk, self.item.pk, quantity, "SO-1")
+
+    def test_reserve_spreads_over_racks(self):
+        """A reservation larger than one rack takes from the next rack"""
+        reservations = self._reserve(6)
+
+        assert [r.quantity for r in reservations] == [Decimal(4), Decimal(2)]
+        first, second = (
+            StockBalance.objects.get(pk=balance.pk) for balance in self.balances
+        )
+        assert first.reserved_quantity == Decimal(4)
+        assert second.reserved_quantity == Decimal(2)
+        assert first.version == 1
+
+    def test_reserve_insufficient_stock(self):
+        """Nothing is reserved when the warehouse cannot cover the quantity"""
+        self._reserve(10)
+
+        with pytest.raises(reservation.InsufficientStockError):
+            self._reserve(5)
+
+        reserved = StockBalance.objects.aggregate(total=Sum("reserved_quantity"))
+        assert reserved["total"] == Decimal(10)
+        assert StockReservation.objects.count() == 2  # noqa: PLR2004
+
+    def test_reserve_rejects_non_positive(self):
+        """Quantities must be positive"""
+        with pytest.raises(ValueError, match="positive"):
+            self._reserve(0)
+
+    def test_release(self):
+        """Releasing gives the reserved stock back"""
+        (reserved,) = self._reserve(3)
+
+        reservation.release(reserved)
+
+        balance = StockBalance.objects.get(pk=self.balances[0].pk)
+        assert balance.reserved_quantity == 0
+        assert balance.quantity == Decimal(4)
+        reserved.refresh_from_db()
+        assert reserved.status == StockReservation.STATUS_RELEASED
+        with pytest.raises(reservation.ReservationError):
+            reservation.release(reserved)
+
+    def test_fulfill(self):
+        """Fulfilling ships the stock and posts an outbound movement"""
+        (reserved,) = self._reserve(3)
+
+        reservation.fulfill(reserved)
+
+        balance = StockBalance.objects.get(pk=self.balances[0].pk)
+        assert balance.reserved_quantity == 0
+        assert balance.quantity == 1
+        movement = StockMovement.objects.get(reference="SO-1")
+        assert movement.quantity == Decimal(-3)
+
+    def test_settle_retries_on_version_conflict(self):
+        """A stale version makes the settle step re-read and retry"""
+        (reserved,) = self._reserve(3)
+        calls = []
+        update_balance = reservation._update_balance  # noqa: SLF001
+
+        def flaky(balance, *args):
+            calls.append(balance.version)
+            if len(calls) == 1:
+                StockBalance.objects.filter(pk=balance.pk).update(version=99)
+            return update_balance(balance, *args)
+
+        with mock.patch.object(reservation, "_update_balance", flaky):
+            reservation.release(reserved)
+
+        assert calls == [1, 99]
+        assert StockBalance.objects.get(pk=self.balances[0].pk).reserved_quantity == 0
+
+    def test_summary_tracks_reservations(self):
+        """The stock summary follows reservations"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self._reserve(5)
+
+        summary = StockSummary.objects.get(warehouse=self.warehouse, item=self.item)
+        assert summary.quantity == Decimal(14)
+        assert summary.reserved_quantity == Decimal(5)
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "Requires row locks")
+class ConcurrentReservationTest(TransactionTestCase):
+    """Concurrent pickers never over-allocate"""
+
+    workers = 8
+    attempts = 10
+
+    def test_no_over_allocation(self):
+        """Exactly the stock on hand gets reserved under contention"""
+        warehouse = WarehouseFactory()
+        item = ItemFactory()
+        for _ in range(5):
+            StockBalanceFactory(
+                warehouse=warehouse,
+                rack=RackFactory(warehouse=warehouse),
+                item=item,
+                quantity=Decimal(10),
+            )
+        outcomes = []
+
+        def pick(worker):
+            try:
+                for attempt in range(self.attempts):
+                    try:
+                        reservation.reserve(
+                            warehouse.pk,
+                            item.pk,
+                            1,
+                            f"SO-{worker}-{attempt}",
+                        )
+                    except reservation.ReservationError as exc:
+                        outcomes.append(type(exc))
+                    else:
+                        outcomes.append(None)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=pick, args=(worker,))
+            for worker in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert outcomes.count(None) == 50  # noqa: PLR2004
+        balances = StockBalance.objects.filter(item=item)
+        assert all(b.reserved_quantity == b.quantity for b in balances)
+        assert StockReservation.objects.filter(item=item).count() == 50  # noqa: PLR2004
@@ -0,0 +1,124 @@
+"""
+Tests for the stock summary and availability services
+"""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from kancraonewms.inventory.models import StockBalance
+from kancraonewms.inventory.models import StockSummary
+from kancraonewms.inventory.services import availability
+from kancraonewms.inventory.services import stock_summary
+from kancraonewms.inventory.tests.factories import StockBalanceFactory
+from kancraonewms.master.tests.factories import ItemFactory
+from kancraonewms.master.tests.factories import ItemUOMFactory
+from kancraonewms.master.tests.factories import RackFactory
+
+
+class StockSummaryTest(TestCase):
+    """Tests for keeping the summary in line with balances"""
+
+    def setUp(self):
+        self.rack = RackFactory()
+        self.warehouse = self.rack.warehouse
+        self.item = ItemFactory()
+
+    def test_refresh_aggregates_racks(self):
+        """Balances of all racks are summed per item"""
+        StockBalance.objects.bulk_create(
+            [
+                StockBalance(
+                    warehouse=self.warehouse,
+                    item=self.item,
+                    rack=RackFactory(warehouse=self.warehouse),
+                    quantity=Decimal(quantity),
+                )
+                for quantity in ("5", "7.5")
+            ],
+        )
+
+        assert stock_summary.refresh_summaries(self.warehouse.pk) == 1
+        summary = StockSummary.objects.get(warehouse=self.warehouse, item=self.item)
+        assert summary.quantity == Decimal("12.5")
+        assert summary.rack_count == 2  # noqa: PLR2004
+
+    def test_signals_refresh_on_commit(self):
+        """Single balance writes refresh the summary after commit"""
+        with self.captureOnCommitCallbacks(execute=True):
+            balance = StockBalanceFactory(
+                rack=self.rack,
+                item=self.item,
+                quantity=Decimal(3),
+            )
+        assert StockSummary.objects.get(item=self.item).quantity == Decimal(3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            balance.quantity = Decimal(8)
+            balance.save()
+        assert StockSummary.objects.get(item=self.item).quantity == Decimal(8)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            balance.delete()
+        assert not StockSummary.objects.filter(item=self.item).exists()
+
+
+class AvailabilityTest(TestCase):
+    """Tests for availability with UOM conversion"""
+
+    def setUp(self):
+        cache.clear()
+        self.item = ItemFactory()
+        self.box = ItemUOMFactory(
+            item=self.item,
+            conversion_factor=Decimal(12),
+            is_purchase_uom=True,
+            is_sales_uom=False,
+            is_stock_uom=False,
+        )
+        # Not flagged for purchase, sales or stock: not reported
+        ItemUOMFactory(
+            item=self.item,
+            is_purchase_uom=False,
+            is_sales_uom=False,
+            is_stock_uom=False,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.balance = StockBalanceFactory(item=self.item, quantity=Decimal(30))
+
+    def test_converts_to_flagged_uoms(self):
+        """Quantities are converted with the ItemUOM factors"""
+        (result,) = availability.get_availability([self.item.pk])
+
+        assert result["quantity"] == Decimal(30)
+        assert [uom["uom"] for uom in result["uoms"]] == [self.box.uom_id]
+        assert result["uoms"][0]["quantity"] == Decimal("2.5000")
+        assert result["uoms"][0]["is_purchase_uom"]
+
+    def test_batch_query_count(self):
+        """A batch costs two queries cold and one once factors are cached"""
+        items = [ItemFactory() for _ in range(5)]
+        item_ids = [self.item.pk, *(item.pk for item in items)]
+
+        with self.assertNumQueries(2):
+            results = availability.get_availability(item_ids)
+        with self.assertNumQueries(1):
+            availability.get_availability(
+                item_ids,
+                warehouse_id=self.balance.warehouse_id,
+            )
+
+        assert [result["item"] for result in results] == item_ids
+        assert results[1]["quantity"] == 0
+        assert results[1]["uoms"] == []
+
+    def test_item_uom_change_invalidates_cache(self):
+        """Saving an ItemUOM drops the cached factors of its item"""
+        availability.get_availability([self.item.pk])
+
+        self.box.conversion_factor = Decimal(6)
+        self.box.save()
+
+        (result,) = availability.get_availability([self.item.pk])
+        assert result["uoms"][0]["quantity"] == Decimal("5.0000")
@@ -1,6 +1,9 @@
 from django.contrib import admin  # pyright: ignore[reportMissingModuleSource]
 from django.utils.translation import gettext_lazy as _  # type: ignore  # noqa: PGH003
 
+from kancraonewms.core import bulk
+from kancraonewms.core.flags import set_exclusive_flag
+
 from .models import UOM
 from .models import Accessibility
 from .models import Item
@@ -9,6 +12,7 @@ from .models import Menu
 from .models import Rack
 from .models import Role
 from .models import RoleMenuAccess
+from .models import UserRole
 
 
 class ItemUOMInline(admin.TabularInline):
@@ -41,12 +45,12 @@ class ItemAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Activate selected items"))
     def activate_items(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = bulk.update(queryset, is_active=True)
         self.message_user(request, _(f"{updated} items activated successfully."))  # noqa: INT001
 
     @admin.action(description=_("Deactivate selected items"))
     def deactivate_items(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = bulk.update(queryset, is_active=False)
         self.message_user(request, _(f"{updated} items deactivated successfully."))  # noqa: INT001
 
     fieldsets = (
@@ -94,12 +98,12 @@ class UOMAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Activate selected UOMs"))
     def activate_uoms(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = bulk.update(queryset, is_active=True)
         self.message_user(request, _(f"{updated} UOMs activated successfully."))  # noqa: INT001
 
     @admin.action(description=_("Deactivate selected UOMs"))
     def deactivate_uoms(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = bulk.update(queryset, is_active=False)
         self.message_user(request, _(f"{updated} UOMs deactivated successfully."))  # noqa: INT001
 
     fieldsets = (
@@ -155,27 +159,32 @@ class ItemUOMAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Activate selected item UOMs"))
     def activate_item_uoms(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = bulk.update(queryset, is_active=True)
         self.message_user(request, _(f"{updated} item UOMs activated successfully."))  # noqa: INT001
 
     @admin.action(description=_("Deactivate selected item UOMs"))
     def deactivate_item_uoms(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = bulk.update(queryset, is_active=False)
         self.message_user(request, _(f"{updated} item UOMs deactivated successfully."))  # noqa: INT001
 
     @admin.action(description=_("Set as base UOM"))
     def set_as_base_uom(self, request, queryset):
-        if queryset.count() != 1:
+        item_uoms = list(queryset.values_list("pk", "item_id"))
+        if len({item_id for _pk, item_id in item_uoms}) != len(item_uoms):
             self.message_user(
                 request,
-                _("Please select only one item UOM to set as base."),
+                _("Please select only one item UOM per item to set as base."),
                 level="error",
             )
             return
-        item_uom = queryset.first()
-        item_uom.is_base_uom = True
-        item_uom.save()
-        self.message_user(request, _(f"{item_uom} set as base UOM successfully."))  # noqa: INT001
+        updated = set_exclusive_flag(
+            ItemUOM,
+            "is_base_uom",
+            "item",
+            [pk for pk, _item_id in item_uoms],
+        )
+        message = _(f"{updated} item UOMs set as base UOM successfully.")  # noqa: INT001
+        self.message_user(request, message)
 
     fieldsets = (
         (
@@ -235,12 +244,12 @@ class RackAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Activate selected racks"))
     def activate_racks(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = bulk.update(queryset, is_active=True)
         self.message_user(request, _(f"{updated} racks activated successfully."))  # noqa: INT001
 
     @admin.action(description=_("Deactivate selected racks"))
     def deactivate_racks(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = bulk.update(queryset, is_active=False)
         self.message_user(request, _(f"{updated} racks deactivated successfully."))  # noqa: INT001
 
     fieldsets = (
@@ -306,12 +315,12 @@ class RoleAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Activate selected roles"))
     def activate_roles(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = bulk.update(queryset, is_active=True)
         self.message_user(request, _(f"{updated} roles activated successfully."))  # noqa: INT001
 
     @admin.action(description=_("Deactivate selected roles"))
     def deactivate_roles(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = bulk.update(queryset, is_active=False)
         self.message_user(request, _(f"{updated} roles deactivated successfully."))  # noqa: INT001
 
     fieldsets = (
@@ -358,12 +367,12 @@ class AccessibilityAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Grant permission"))
     def grant_permission(self, request, queryset):
-        updated = queryset.update(is_granted=True)
+        updated = bulk.update(queryset, is_granted=True)
         self.message_user(request, _(f"{updated} permissions granted successfully."))  # noqa: INT001
 
     @admin.action(description=_("Revoke permission"))
     def revoke_permission(self, request, queryset):
-        updated = queryset.update(is_granted=False)
+        updated = bulk.update(queryset, is_granted=False)
         self.message_user(request, _(f"{updated} permissions revoked successfully."))  # noqa: INT001
 
     fieldsets = (
@@ -411,12 +420,12 @@ class MenuAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Activate selected menus"))
     def activate_menus(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = bulk.update(queryset, is_active=True)
         self.message_user(request, _(f"{updated} menus activated successfully."))  # noqa: INT001
 
     @admin.action(description=_("Deactivate selected menus"))
     def deactivate_menus(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = bulk.update(queryset, is_active=False)
         self.message_user(request, _(f"{updated} menus deactivated successfully."))  # noqa: INT001
 
     fieldsets = (
@@ -462,12 +471,12 @@ class RoleMenuAccessAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Grant access"))
     def grant_access(self, request, queryset):
-        updated = queryset.update(can_access=True)
+        updated = bulk.update(queryset, can_access=True)
         self.message_user(request, _(f"{updated} accesses granted successfully."))  # noqa: INT001
 
     @admin.action(description=_("Revoke access"))
     def revoke_access(self, request, queryset):
-        updated = queryset.update(can_access=False)
+        updated = bulk.update(queryset, can_access=False)
         self.message_user(request, _(f"{updated} accesses revoked successfully."))  # noqa: INT001
 
     fieldsets = (
@@ -491,3 +500,15 @@ class RoleMenuAccessAdmin(admin.ModelAdmin):
             },
         ),
     )
+
+
+@admin.register(UserRole)
+class UserRoleAdmin(admin.ModelAdmin):
+    list_display = ["user", "role", "warehouse", "created_at"]
+    list_display_links = ["user", "role"]
+    list_filter = ["role", "warehouse", "created_at"]
+    search_fields = ["user__username", "user__name", "role__name", "warehouse__code"]
+    ordering = ["user", "warehouse"]
+    readonly_fields = ["created_at", "updated_at"]
+    autocomplete_fields = ["user", "role", "warehouse"]
+    list_per_page = 50
@@ -0,0 +1,55 @@
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.permissions import BasePermission
+
+from kancraonewms.master.services import permissions
+from kancraonewms.master.services import user_roles
+
+ACTION_PERMISSIONS = {
+    "list": "read",
+    "retrieve": "read",
+    "create": "create",
+    "update": "update",
+    "partial_update": "update",
+    "destroy": "delete",
+}
+
+
+class HasAccessibility(BasePermission):
+    """
+    Permission berdasarkan Accessibility role user
+
+    Guards the permission administration ViewSets (roles, user roles,
+    accessibilities, role menu accesses); master data and inventory ViewSets
+    only require authentication. Views declare
+    ``accessibility = ("module", "feature")`` and may map custom actions with
+    ``accessibility_actions``; an action mapped to None is open to every user.
+    Other actions need ``read`` for safe methods and ``update`` otherwise. The
+    permission bitmap of the access token is used when present, so most checks
+    run no lookup at all. Only views declaring ``warehouse_scoped = True``, whose
+    data all belongs to the requested warehouse, check the role of the
+    ``?warehouse=`` given instead. Superusers hold every permission.
+    """
+
+    def has_permission(self, request, view):
+        module, feature = view.accessibility
+        action_permissions = {
+            **ACTION_PERMISSIONS,
+            **getattr(view, "accessibility_actions", {}),
+        }
+        permission = action_permissions.get(
+            getattr(view, "action", None),
+            "read" if request.method in SAFE_METHODS else "update",
+        )
+        if permission is None:
+            return True
+        warehouse_scoped = getattr(view, "warehouse_scoped", False)
+        granted = permissions.has_permission(
+            user_roles.get_request_role_id(
+                request,
+                warehouse_scoped=warehouse_scoped,
+            ),
+            permissions.permission_key(module, feature, permission),
+            user_roles.get_request_claim(request, warehouse_scoped=warehouse_scoped),
+        )
+        # Only a denied check pays for loading the user
+        return granted or request.user.is_superuser
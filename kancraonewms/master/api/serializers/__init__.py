@@ -10,14 +10,17 @@ from .menu import MenuListSerializer
 from .menu import MenuSerializer
 from .menu import MenuTreeSerializer
 from .rack import RackCreateUpdateSerializer
+from .rack import RackGenerateSerializer
 from .rack import RackListSerializer
 from .rack import RackSerializer
 from .role import RoleListSerializer
+from .role import RoleMatrixSerializer
 from .role import RoleSerializer
 from .role_menu_access import RoleMenuAccessListSerializer
 from .role_menu_access import RoleMenuAccessSerializer
 from .uom import UOMListSerializer
 from .uom import UOMSerializer
+from .user_role import UserRoleSerializer
 
 __all__ = [
     "AccessibilityListSerializer",
@@ -30,12 +33,15 @@ __all__ = [
     "MenuSerializer",
     "MenuTreeSerializer",
     "RackCreateUpdateSerializer",
+    "RackGenerateSerializer",
     "RackListSerializer",
     "RackSerializer",
     "RoleListSerializer",
+    "RoleMatrixSerializer",
     "RoleMenuAccessListSerializer",
     "RoleMenuAccessSerializer",
     "RoleSerializer",
     "UOMListSerializer",
     "UOMSerializer",
+    "UserRoleSerializer",
 ]
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from kancraonewms.master.location_code import LocationCodeError
+from kancraonewms.master.location_code import validate_location_code_format
 from kancraonewms.master.models import Rack
 from kancraonewms.organizations.api.serializers.warehouse import WarehouseListSerializer
 
@@ -95,6 +97,30 @@ class RackCreateUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(msg)
         return value
 
+    def validate(self, attrs):
+        """Normalize the code against the warehouse location code format"""
+        warehouse = attrs.get("warehouse") or getattr(self.instance, "warehouse", None)
+        grammar = warehouse.location_code_grammar if warehouse else None
+        code = attrs.get("code") or getattr(self.instance, "code", None)
+        if grammar is None or code is None:
+            return attrs
+
+        try:
+            location = grammar.parse(code)
+        except LocationCodeError as exc:
+            raise serializers.ValidationError({"code": str(exc)}) from exc
+
+        if location.code != code:
+            duplicates = Rack.objects.filter(code=location.code)
+            if self.instance:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                msg = "Rack with this code already exists."
+                raise serializers.ValidationError({"code": msg})
+        attrs["code"] = location.code
+        attrs.update(location.parts)
+        return attrs
+
     def validate_capacity(self, value):
         """Validate that capacity is not negative"""
         if value < 0:
@@ -108,3 +134,65 @@ class RackCreateUpdateSerializer(serializers.ModelSerializer):
             msg = "Max weight cannot be negative."
             raise serializers.ValidationError(msg)
         return value
+
+
+class RackRangeSerializer(serializers.Serializer):
+    """Inclusive number range of one location component"""
+
+    start = serializers.IntegerField(min_value=0, default=1)
+    end = serializers.IntegerField(min_value=0)
+
+    def validate(self, attrs):
+        if attrs["end"] < attrs["start"]:
+            msg = "End must not be lower than start."
+            raise serializers.ValidationError(msg)
+        return attrs
+
+
+class RackGenerateSerializer(serializers.Serializer):
+    """Serializer for generating the racks of a warehouse layout"""
+
+    zones = RackRangeSerializer(required=False)
+    aisles = RackRangeSerializer(required=False)
+    bays = RackRangeSerializer(required=False)
+    levels = RackRangeSerializer(required=False)
+    code_format = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        max_length=100,
+        validators=[validate_location_code_format],
+    )
+    capacity = serializers.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        min_value=0,
+        default=0,
+    )
+    max_weight = serializers.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        min_value=0,
+        default=0,
+    )
+    is_active = serializers.BooleanField(default=True)
+
+    DIMENSIONS = {"zones": "zone", "aisles": "aisle", "bays": "bay", "levels": "level"}
+
+    def validate(self, attrs):
+        """Ensure the layout has at least one dimension"""
+        if not any(dimension in attrs for dimension in self.DIMENSIONS):
+            msg = "At least one of zones, aisles, bays or levels is required."
+            raise serializers.ValidationError(msg)
+        return attrs
+
+    @property
+    def ranges(self):
+        """Layout as ``{component: (start, end)}``"""
+        return {
+            component: (
+                self.validated_data[dimension]["start"],
+                self.validated_data[dimension]["end"],
+            )
+            for dimension, component in self.DIMENSIONS.items()
+            if dimension in self.validated_data
+        }
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from kancraonewms.master.models import Accessibility
 from kancraonewms.master.models import Role
 
 
@@ -26,3 +27,19 @@ class RoleListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Role
         fields = ["id", "code", "name", "is_active"]
+
+
+class RoleMatrixPermissionSerializer(serializers.Serializer):
+    """One accessibility of a role matrix"""
+
+    module = serializers.CharField(max_length=100)
+    feature = serializers.CharField(max_length=100)
+    permission = serializers.ChoiceField(choices=Accessibility.PERMISSION_CHOICES)
+    is_granted = serializers.BooleanField(default=True)
+
+
+class RoleMatrixSerializer(serializers.Serializer):
+    """Serializer for the full permission matrix and menu set of a role"""
+
+    permissions = RoleMatrixPermissionSerializer(many=True)
+    menus = serializers.ListField(child=serializers.IntegerField(min_value=1))
@@ -0,0 +1,45 @@
+from rest_framework import serializers
+
+from kancraonewms.master.models import UserRole
+
+
+class UserRoleSerializer(serializers.ModelSerializer):
+    """Serializer untuk UserRole model"""
+
+    username = serializers.CharField(source="user.username", read_only=True)
+    role_name = serializers.CharField(source="role.name", read_only=True)
+    warehouse_code = serializers.CharField(
+        source="warehouse.code",
+        read_only=True,
+        default=None,
+    )
+
+    class Meta:
+        model = UserRole
+        fields = [
+            "id",
+            "user",
+            "username",
+            "role",
+            "role_name",
+            "warehouse",
+            "warehouse_code",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["id", "created_at", "updated_at"]
+
+    def validate(self, attrs):
+        user = attrs.get("user", getattr(self.instance, "user", None))
+        warehouse = attrs.get("warehouse", getattr(self.instance, "warehouse", None))
+        existing = UserRole.objects.filter(user=user, warehouse=warehouse)
+        if self.instance is not None:
+            existing = existing.exclude(pk=self.instance.pk)
+        if existing.exists():
+            msg = (
+                "User already has a role in this warehouse."
+                if warehouse
+                else "User already has a global role."
+            )
+            raise serializers.ValidationError({"warehouse": msg})
+        return attrs
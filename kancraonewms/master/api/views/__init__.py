@@ -7,7 +7,9 @@ from .menu import MenuViewSet
 from .rack import RackViewSet
 from .role import RoleViewSet
 from .role_menu_access import RoleMenuAccessViewSet
+from .uom import UOMCacheMetricsView
 from .uom import UOMViewSet
+from .user_role import UserRoleViewSet
 
 __all__ = [
     "AccessibilityViewSet",
@@ -17,5 +19,7 @@ __all__ = [
     "RackViewSet",
     "RoleMenuAccessViewSet",
     "RoleViewSet",
+    "UOMCacheMetricsView",
     "UOMViewSet",
+    "UserRoleViewSet",
 ]
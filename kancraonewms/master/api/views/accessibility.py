@@ -9,9 +9,13 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from kancraonewms.core.bulk import bulk_action
+from kancraonewms.master.api.permissions import HasAccessibility
 from kancraonewms.master.api.serializers import AccessibilityListSerializer
 from kancraonewms.master.api.serializers import AccessibilitySerializer
 from kancraonewms.master.models import Accessibility
+from kancraonewms.master.services import permissions
+from kancraonewms.master.services import user_roles
 
 
 class AccessibilityViewSet(
@@ -25,7 +29,11 @@ class AccessibilityViewSet(
     """ViewSet untuk Accessibility model"""
 
     queryset = Accessibility.objects.select_related("role").all()
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasAccessibility]
+    accessibility = ("master", "accessibility")
+    bulk_filters = ["search", "role", "module", "permission", "is_granted"]
+    # Actions answering for the current user's own role need no grant
+    accessibility_actions = {"by_role": None, "check": None}
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -63,15 +71,36 @@ class AccessibilityViewSet(
 
     @action(detail=False, methods=["get"])
     def by_role(self, request):
-        """Get accessibilities by role"""
-        role_id = request.query_params.get("role_id")
+        """Get accessibilities of the current user's role"""
+        role_id = user_roles.get_request_role_id(request, warehouse_scoped=True)
         if not role_id:
-            return Response({"error": "role_id is required"}, status=400)
+            return Response({"error": "No role assigned"}, status=400)
 
         accessibilities = self.get_queryset().filter(role_id=role_id)
         serializer = self.get_serializer(accessibilities, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"])
+    def check(self, request):
+        """Check a permission of the current user's role"""
+        params = ("module", "feature", "permission")
+        missing = [param for param in params if not request.query_params.get(param)]
+        if missing:
+            return Response(
+                {"error": f"{', '.join(missing)} is required"},
+                status=400,
+            )
+
+        key = permissions.permission_key(
+            *(request.query_params[param] for param in params),
+        )
+        granted = permissions.has_permission(
+            user_roles.get_request_role_id(request, warehouse_scoped=True),
+            key,
+            user_roles.get_request_claim(request, warehouse_scoped=True),
+        )
+        return Response({"permission": key, "granted": granted})
+
     @action(detail=True, methods=["post"])
     def grant(self, request, pk=None):
         """Grant permission"""
@@ -89,3 +118,6 @@ class AccessibilityViewSet(
         accessibility.save()
         serializer = self.get_serializer(accessibility)
         return Response(serializer.data)
+
+    bulk_grant = bulk_action("bulk-grant", is_granted=True)
+    bulk_revoke = bulk_action("bulk-revoke", is_granted=False)
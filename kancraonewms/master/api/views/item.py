@@ -9,6 +9,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from kancraonewms.core.bulk import bulk_action
 from kancraonewms.master.api.serializers import ItemListSerializer
 from kancraonewms.master.api.serializers import ItemSerializer
 from kancraonewms.master.models import Item
@@ -26,6 +27,7 @@ class ItemViewSet(
 
     queryset = Item.objects.all()
     permission_classes = [IsAuthenticated]
+    bulk_filters = ["is_active", "search"]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -66,3 +68,6 @@ class ItemViewSet(
         item.save()
         serializer = self.get_serializer(item)
         return Response(serializer.data)
+
+    bulk_activate = bulk_action("bulk-activate", is_active=True)
+    bulk_deactivate = bulk_action("bulk-deactivate", is_active=False)
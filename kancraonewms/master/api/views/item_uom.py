@@ -9,6 +9,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from kancraonewms.core.bulk import bulk_action
+from kancraonewms.core.flags import set_exclusive_flag
 from kancraonewms.master.api.serializers import ItemUOMListSerializer
 from kancraonewms.master.api.serializers import ItemUOMSerializer
 from kancraonewms.master.models import ItemUOM
@@ -26,6 +28,16 @@ class ItemUOMViewSet(
 
     queryset = ItemUOM.objects.select_related("item", "uom").all()
     permission_classes = [IsAuthenticated]
+    bulk_filters = [
+        "is_active",
+        "item",
+        "uom",
+        "is_base_uom",
+        "is_purchase_uom",
+        "is_sales_uom",
+        "is_stock_uom",
+        "search",
+    ]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -89,8 +101,8 @@ class ItemUOMViewSet(
     def set_as_base(self, request, pk=None):
         """Set this item-UOM as base UOM for the item"""
         item_uom = self.get_object()
-        item_uom.is_base_uom = True
-        item_uom.save()
+        set_exclusive_flag(ItemUOM, "is_base_uom", "item", [item_uom.pk])
+        item_uom.refresh_from_db()
         serializer = self.get_serializer(item_uom)
         return Response(serializer.data)
 
@@ -111,3 +123,6 @@ class ItemUOMViewSet(
         item_uom.save()
         serializer = self.get_serializer(item_uom)
         return Response(serializer.data)
+
+    bulk_activate = bulk_action("bulk-activate", is_active=True)
+    bulk_deactivate = bulk_action("bulk-deactivate", is_active=False)
@@ -9,10 +9,16 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from kancraonewms.core.bulk import bulk_action
+from kancraonewms.core.caching import cached_action
 from kancraonewms.master.api.serializers import MenuListSerializer
 from kancraonewms.master.api.serializers import MenuSerializer
 from kancraonewms.master.api.serializers import MenuTreeSerializer
 from kancraonewms.master.models import Menu
+from kancraonewms.master.services import permissions
+
+# Menu changes start a new permissions generation, which invalidates the tree
+TREE_CACHE_TIMEOUT = 5 * 60
 
 
 class MenuViewSet(
@@ -27,6 +33,7 @@ class MenuViewSet(
 
     queryset = Menu.objects.select_related("parent").all()
     permission_classes = [IsAuthenticated]
+    bulk_filters = ["search", "is_active", "module", "parent"]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -69,6 +76,7 @@ class MenuViewSet(
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"])
+    @cached_action(TREE_CACHE_TIMEOUT, stale=60, version=permissions.get_generation)
     def tree(self, request):
         """Get menu tree (hierarchical structure)"""
         # Get only parent menus (no parent)
@@ -108,3 +116,6 @@ class MenuViewSet(
         menu.save()
         serializer = self.get_serializer(menu)
         return Response(serializer.data)
+
+    bulk_activate = bulk_action("bulk-activate", is_active=True)
+    bulk_deactivate = bulk_action("bulk-deactivate", is_active=False)
@@ -9,9 +9,12 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from kancraonewms.core.bulk import bulk_action
 from kancraonewms.master.api.serializers.rack import RackCreateUpdateSerializer
 from kancraonewms.master.api.serializers.rack import RackListSerializer
 from kancraonewms.master.api.serializers.rack import RackSerializer
+from kancraonewms.master.location_code import LOCATION_COMPONENTS
+from kancraonewms.master.location_code import component_number
 from kancraonewms.master.models import Rack
 
 
@@ -27,6 +30,18 @@ class RackViewSet(
 
     queryset = Rack.objects.select_related("warehouse").all()
     permission_classes = [IsAuthenticated]
+    bulk_filters = [
+        "warehouse",
+        "is_active",
+        "zone",
+        "aisle",
+        *(
+            f"{component}_{bound}"
+            for component in LOCATION_COMPONENTS
+            for bound in ("min", "max")
+        ),
+        "search",
+    ]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -58,6 +73,17 @@ class RackViewSet(
         if aisle:
             queryset = queryset.filter(aisle__icontains=aisle)
 
+        # Filter by location component ranges, e.g. aisle_min=3&aisle_max=7
+        for component in LOCATION_COMPONENTS:
+            low = self.request.query_params.get(f"{component}_min")
+            high = self.request.query_params.get(f"{component}_max")
+            if low or high:
+                queryset = queryset.in_location_range(
+                    component,
+                    low=component_number(low) if low else None,
+                    high=component_number(high) if high else None,
+                )
+
         # Search by code, name, zone, aisle, bay, or level
         search = self.request.query_params.get("search")
         if search:
@@ -70,7 +96,7 @@ class RackViewSet(
                 | Q(level__icontains=search),
             )
 
-        return queryset
+        return queryset.natural_order()
 
     @action(detail=True, methods=["post"])
     def activate(self, request, pk=None):
@@ -89,3 +115,6 @@ class RackViewSet(
         rack.save()
         serializer = self.get_serializer(rack)
         return Response(serializer.data)
+
+    bulk_activate = bulk_action("bulk-activate", is_active=True)
+    bulk_deactivate = bulk_action("bulk-deactivate", is_active=False)
@@ -1,4 +1,5 @@
 from django.db.models import Q
+from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.mixins import CreateModelMixin
 from rest_framework.mixins import DestroyModelMixin
@@ -9,9 +10,21 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from kancraonewms.core.bulk import bulk_action
+from kancraonewms.core.caching import cached_action
+from kancraonewms.master.api.permissions import HasAccessibility
 from kancraonewms.master.api.serializers import RoleListSerializer
+from kancraonewms.master.api.serializers import RoleMatrixSerializer
 from kancraonewms.master.api.serializers import RoleSerializer
 from kancraonewms.master.models import Role
+from kancraonewms.master.services import permissions
+from kancraonewms.master.services.role_matrix import RoleMatrixError
+from kancraonewms.master.services.role_matrix import apply_matrix
+from kancraonewms.master.services.role_matrix import clone_role
+from kancraonewms.master.services.role_matrix import get_matrix
+
+# Matrix changes start a new permissions generation, which invalidates it
+MATRIX_CACHE_TIMEOUT = 5 * 60
 
 
 class RoleViewSet(
@@ -25,11 +38,16 @@ class RoleViewSet(
     """ViewSet untuk Role model"""
 
     queryset = Role.objects.all()
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasAccessibility]
+    accessibility = ("master", "role")
+    bulk_filters = ["search", "is_active"]
+    accessibility_actions = {"clone": "create"}
 
     def get_serializer_class(self):
         if self.action == "list":
             return RoleListSerializer
+        if self.action == "matrix":
+            return RoleMatrixSerializer
         return RoleSerializer
 
     def get_queryset(self):
@@ -73,3 +91,35 @@ class RoleViewSet(
         role.save()
         serializer = self.get_serializer(role)
         return Response(serializer.data)
+
+    @action(detail=True, methods=["get", "put"])
+    @cached_action(MATRIX_CACHE_TIMEOUT, stale=60, version=permissions.get_generation)
+    def matrix(self, request, pk=None):
+        """Get or replace the permission matrix and menu set of a role"""
+        role = self.get_object()
+        if request.method == "GET":
+            return Response(get_matrix(role))
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            counts = apply_matrix(
+                role,
+                serializer.validated_data["permissions"],
+                serializer.validated_data["menus"],
+            )
+        except RoleMatrixError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(counts)
+
+    @action(detail=True, methods=["post"])
+    def clone(self, request, pk=None):
+        """Create a new role with a copy of this role's matrix"""
+        source = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        role = clone_role(source, **serializer.validated_data)
+        return Response(RoleSerializer(role).data, status=status.HTTP_201_CREATED)
+
+    bulk_activate = bulk_action("bulk-activate", is_active=True)
+    bulk_deactivate = bulk_action("bulk-deactivate", is_active=False)
@@ -9,9 +9,13 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from kancraonewms.core.bulk import bulk_action
+from kancraonewms.master.api.permissions import HasAccessibility
 from kancraonewms.master.api.serializers import RoleMenuAccessListSerializer
 from kancraonewms.master.api.serializers import RoleMenuAccessSerializer
 from kancraonewms.master.models import RoleMenuAccess
+from kancraonewms.master.services import permissions
+from kancraonewms.master.services import user_roles
 
 
 class RoleMenuAccessViewSet(
@@ -25,7 +29,11 @@ class RoleMenuAccessViewSet(
     """ViewSet untuk RoleMenuAccess model"""
 
     queryset = RoleMenuAccess.objects.select_related("role", "menu").all()
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasAccessibility]
+    accessibility = ("master", "role_menu_access")
+    bulk_filters = ["search", "role", "menu", "can_access"]
+    # Actions answering for the current user's own role need no grant
+    accessibility_actions = {"by_role": None, "accessible_menus": None}
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -59,10 +67,10 @@ class RoleMenuAccessViewSet(
 
     @action(detail=False, methods=["get"])
     def by_role(self, request):
-        """Get menu accesses by role"""
-        role_id = request.query_params.get("role_id")
+        """Get menu accesses of the current user's role"""
+        role_id = user_roles.get_request_role_id(request, warehouse_scoped=True)
         if not role_id:
-            return Response({"error": "role_id is required"}, status=400)
+            return Response({"error": "No role assigned"}, status=400)
 
         accesses = self.get_queryset().filter(role_id=role_id, can_access=True)
         serializer = self.get_serializer(accesses, many=True)
@@ -70,21 +78,14 @@ class RoleMenuAccessViewSet(
 
     @action(detail=False, methods=["get"])
     def accessible_menus(self, request):
-        """Get accessible menus for a role"""
-        role_id = request.query_params.get("role_id")
-        if not role_id:
-            return Response({"error": "role_id is required"}, status=400)
-
-        from kancraonewms.master.api.serializers import MenuTreeSerializer  # noqa: I001, PLC0415
-
-        accesses = self.get_queryset().filter(
-            role_id=role_id,
-            can_access=True,
-            menu__is_active=True,
+        """Get accessible menus of the current user's role"""
+        # Compiled from the cache
+        compiled = permissions.get_role(
+            user_roles.get_request_role_id(request, warehouse_scoped=True),
         )
-        menus = [access.menu for access in accesses if access.menu.parent is None]
-        serializer = MenuTreeSerializer(menus, many=True)
-        return Response(serializer.data)
+        if compiled is None:
+            return Response({"error": "No role assigned"}, status=400)
+        return Response(compiled["menus"])
 
     @action(detail=True, methods=["post"])
     def grant(self, request, pk=None):
@@ -103,3 +104,6 @@ class RoleMenuAccessViewSet(
         access.save()
         serializer = self.get_serializer(access)
         return Response(serializer.data)
+
+    bulk_grant = bulk_action("bulk-grant", can_access=True)
+    bulk_revoke = bulk_action("bulk-revoke", can_access=False)
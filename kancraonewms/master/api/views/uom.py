@@ -5,13 +5,17 @@ from rest_framework.mixins import DestroyModelMixin
 from rest_framework.mixins import ListModelMixin
 from rest_framework.mixins import RetrieveModelMixin
 from rest_framework.mixins import UpdateModelMixin
+from rest_framework.permissions import IsAdminUser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
+from kancraonewms.core.bulk import bulk_action
 from kancraonewms.master.api.serializers import UOMListSerializer
 from kancraonewms.master.api.serializers import UOMSerializer
 from kancraonewms.master.models import UOM
+from kancraonewms.master.services import uom_cache
 
 
 class UOMViewSet(
@@ -26,6 +30,7 @@ class UOMViewSet(
 
     queryset = UOM.objects.all()
     permission_classes = [IsAuthenticated]
+    bulk_filters = ["is_active", "uom_type", "search"]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -71,3 +76,19 @@ class UOMViewSet(
         uom.save()
         serializer = self.get_serializer(uom)
         return Response(serializer.data)
+
+    bulk_activate = bulk_action("bulk-activate", is_active=True)
+    bulk_deactivate = bulk_action("bulk-deactivate", is_active=False)
+
+
+class UOMCacheMetricsView(APIView):
+    """
+    API endpoint untuk statistik cache lookup UOM dan item-UOM
+    Returns: hit lokal, hit Redis dan miss per jenis lookup
+    Angka berlaku untuk worker process yang melayani request (lihat ``pid``)
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(uom_cache.stats())
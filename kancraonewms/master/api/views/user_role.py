@@ -0,0 +1,49 @@
+from rest_framework.mixins import CreateModelMixin
+from rest_framework.mixins import DestroyModelMixin
+from rest_framework.mixins import ListModelMixin
+from rest_framework.mixins import RetrieveModelMixin
+from rest_framework.mixins import UpdateModelMixin
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.viewsets import GenericViewSet
+
+from kancraonewms.master.api.permissions import HasAccessibility
+from kancraonewms.master.api.serializers import UserRoleSerializer
+from kancraonewms.master.models import UserRole
+
+
+class UserRoleViewSet(
+    ListModelMixin,
+    RetrieveModelMixin,
+    CreateModelMixin,
+    UpdateModelMixin,
+    DestroyModelMixin,
+    GenericViewSet,
+):
+    """ViewSet untuk UserRole model"""
+
+    queryset = UserRole.objects.select_related("user", "role", "warehouse").all()
+    serializer_class = UserRoleSerializer
+    permission_classes = [IsAuthenticated, HasAccessibility]
+    accessibility = ("master", "user_role")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # Filter by user
+        user_id = self.request.query_params.get("user", None)
+        if user_id:
+            queryset = queryset.filter(user_id=user_id)
+
+        # Filter by role
+        role_id = self.request.query_params.get("role", None)
+        if role_id:
+            queryset = queryset.filter(role_id=role_id)
+
+        # Filter by warehouse ("none" for global roles)
+        warehouse_id = self.request.query_params.get("warehouse", None)
+        if warehouse_id == "none":
+            queryset = queryset.filter(warehouse__isnull=True)
+        elif warehouse_id:
+            queryset = queryset.filter(warehouse_id=warehouse_id)
+
+        return queryset.order_by("user", "warehouse")
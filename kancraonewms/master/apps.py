@@ -6,3 +6,6 @@ class MasterConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "kancraonewms.master"
     verbose_name = _("Master")
+
+    def ready(self):
+        from . import signals  # noqa: F401, PLC0415
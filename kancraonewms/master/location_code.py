@@ -0,0 +1,190 @@
+"""
+Location code grammar for racks.
+
+A warehouse may define the shape of its rack codes with a format such as
+``Z{zone:d2}-A{aisle:d2}-B{bay:d2}-L{level:d}``. Literal text must match
+exactly (case-insensitive) and every ``{component:kind[width]}`` placeholder
+captures one location component:
+
+* ``component`` is one of ``zone``, ``aisle``, ``bay`` or ``level``
+* ``kind`` is ``d`` for digits or ``a`` for letters
+* ``width`` optionally zero-pads digits when the code is normalized
+
+Parsing a code yields its normalized form (``z1-a3-b12-l2`` becomes
+``Z01-A03-B12-L2``) together with an integer per component, so racks can be
+range-filtered and naturally ordered on indexed integer columns.
+"""
+
+import functools
+import re
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+LOCATION_COMPONENTS = ("zone", "aisle", "bay", "level")
+
+_PLACEHOLDER = re.compile(r"\{(?P<component>\w+):(?P<kind>[ad])(?P<width>\d*)\}")
+_TOKEN = {"d": r"\d+", "a": r"[A-Za-z]+"}
+_TRAILING_DIGITS = re.compile(r"(\d+)\D*$")
+# Upper bound of the PositiveIntegerField columns holding component numbers
+MAX_COMPONENT_NUMBER = 2_147_483_647
+
+
+class LocationCodeError(ValueError):
+    """Raised when a format or a code does not follow the grammar"""
+
+
+@dataclass(frozen=True)
+class LocationCode:
+    """A parsed rack code"""
+
+    code: str
+    parts: dict
+    numbers: dict
+
+
+def letters_to_number(letters):
+    """Convert letters to a bijective base-26 number (A=1, Z=26, AA=27)"""
+    number = 0
+    for char in letters.upper():
+        number = number * 26 + ord(char) - ord("A") + 1
+    return number
+
+
+def number_to_letters(number):
+    """Inverse of :func:`letters_to_number`"""
+    letters = ""
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def component_number(value):
+    """
+    Return the natural sort number of a free-text location component.
+
+    Digits win over letters: ``"A03"`` is 3, ``"12"`` is 12 and letter-only
+    values such as ``"C"`` use base-26. Anything else has no number.
+    """
+    value = str(value).strip()
+    if value.isdigit():
+        number = int(value)
+    elif value.isascii() and value.isalpha():
+        number = letters_to_number(value)
+    elif match := _TRAILING_DIGITS.search(value):
+        number = int(match.group(1))
+    else:
+        return None
+    return number if number <= MAX_COMPONENT_NUMBER else None
+
+
+class LocationCodeGrammar:
+    """Compiled location code format"""
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.segments = []
+        regex = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(pattern):
+            literal = pattern[position : match.start()]
+            self._check_literal(literal)
+            if literal:
+                self.segments.append(literal.upper())
+                regex.append(re.escape(literal))
+
+            component = match.group("component")
+            if component not in LOCATION_COMPONENTS:
+                msg = f"Unknown location component '{component}'."
+                raise LocationCodeError(msg)
+            if any(isinstance(s, tuple) and s[0] == component for s in self.segments):
+                msg = f"Location component '{component}' is used twice."
+                raise LocationCodeError(msg)
+            kind = match.group("kind")
+            width = int(match.group("width") or 0)
+            self.segments.append((component, kind, width))
+            regex.append(f"(?P<{component}>{_TOKEN[kind]})")
+            position = match.end()
+
+        literal = pattern[position:]
+        self._check_literal(literal)
+        if literal:
+            self.segments.append(literal.upper())
+            regex.append(re.escape(literal))
+
+        if not any(isinstance(segment, tuple) for segment in self.segments):
+            msg = "The format must contain at least one location component."
+            raise LocationCodeError(msg)
+        self.regex = re.compile("".join(regex), re.IGNORECASE)
+
+    @staticmethod
+    def _check_literal(literal):
+        if "{" in literal or "}" in literal:
+            msg = f"Invalid placeholder near '{literal}'."
+            raise LocationCodeError(msg)
+
+    @property
+    def components(self):
+        return [component for component, _kind, _width in self._placeholders()]
+
+    def parse(self, code):
+        """Parse and normalize ``code``, raising LocationCodeError on mismatch"""
+        match = self.regex.fullmatch(code.strip())
+        if match is None:
+            msg = f"Code '{code}' does not match the location format '{self.pattern}'."
+            raise LocationCodeError(msg)
+
+        numbers = {}
+        for component, kind, _width in self._placeholders():
+            token = match.group(component)
+            numbers[component] = int(token) if kind == "d" else letters_to_number(token)
+        return self.build(**numbers)
+
+    def build(self, **numbers):
+        """Build the normalized code from component numbers"""
+        code = []
+        parts = {}
+        for segment in self.segments:
+            if isinstance(segment, str):
+                code.append(segment)
+                continue
+            component, kind, width = segment
+            number = numbers[component]
+            if kind == "d":
+                token = str(number).zfill(width)
+            elif number > 0:
+                token = number_to_letters(number)
+            else:
+                msg = f"Location component '{component}' must be at least 1."
+                raise LocationCodeError(msg)
+            parts[component] = token
+            code.append(token)
+        return LocationCode(
+            code="".join(code),
+            parts=parts,
+            numbers={component: numbers[component] for component in parts},
+        )
+
+    def _placeholders(self):
+        return [s for s in self.segments if isinstance(s, tuple)]
+
+
+@functools.lru_cache(maxsize=256)
+def get_grammar(pattern):
+    """Return the compiled grammar of ``pattern`` (cached per process)"""
+    return LocationCodeGrammar(pattern)
+
+
+def validate_location_code_format(value):
+    """Model field validator for ``Warehouse.location_code_format``"""
+    if not value:
+        return
+    try:
+        get_grammar(value)
+    except LocationCodeError as exc:
+        raise ValidationError(
+            _("Invalid location code format: %(error)s"),
+            params={"error": exc},
+        ) from exc
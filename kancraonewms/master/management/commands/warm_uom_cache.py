@@ -0,0 +1,56 @@
+import itertools
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from kancraonewms.master.models import UOM
+from kancraonewms.master.models import ItemUOM
+from kancraonewms.master.services import uom_cache
+
+
+def _sources():
+    active = ItemUOM.objects.filter(is_active=True)
+    return {
+        "uom": UOM.objects.order_by("pk").values_list("pk", flat=True),
+        "item": active.order_by("item_id").values_list("item_id", flat=True).distinct(),
+        "barcode": active.exclude(barcode="")
+        .order_by("barcode")
+        .values_list("barcode", flat=True)
+        .distinct(),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Load UOMs, the UOMs of every item and all barcodes into the shared "
+        "cache, e.g. after a deploy or a cache flush."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--kinds",
+            default=",".join(uom_cache.KINDS),
+            help=f"Comma separated lookups to warm ({', '.join(uom_cache.KINDS)})",
+        )
+
+    def handle(self, *args, **options):
+        kinds = options["kinds"].split(",")
+        unknown = set(kinds) - set(uom_cache.KINDS)
+        if unknown:
+            msg = f"Unknown kinds: {', '.join(sorted(unknown))}."
+            raise CommandError(msg)
+
+        sources = _sources()
+        self.stdout.write(f"{'kind':<8} {'entries':>10} {'seconds':>8}")
+        for kind in kinds:
+            started = time.perf_counter()
+            entries = 0
+            keys = sources[kind].iterator(chunk_size=options["batch_size"])
+            for batch in itertools.batched(keys, options["batch_size"], strict=False):
+                entries += uom_cache.warm(kind, batch)
+            self.stdout.write(
+                f"{kind:<8} {entries:>10} {time.perf_counter() - started:>8.2f}",
+            )
+        self.stdout.write(f"generation {uom_cache.get_generation()}")
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.11 on 2026-10-19 16:16
+
+from django.db import migrations, models
+
+from kancraonewms.master.location_code import component_number
+
+COMPONENTS = ('zone', 'aisle', 'bay', 'level')
+
+
+def backfill_location_numbers(apps, schema_editor):
+    Rack = apps.get_model('master', 'Rack')
+    batch = []
+    for rack in Rack.objects.only(*COMPONENTS).iterator(chunk_size=2000):
+        for component in COMPONENTS:
+            setattr(rack, f'{component}_no', component_number(getattr(rack, component)))
+        batch.append(rack)
+        if len(batch) == 2000:
+            Rack.objects.bulk_update(batch, [f'{c}_no' for c in COMPONENTS])
+            batch = []
+    if batch:
+        Rack.objects.bulk_update(batch, [f'{c}_no' for c in COMPONENTS])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('master', '0005_role_menu_accessibility_rolemenuaccess'),
+        ('organizations', '0003_warehouse_location_code_format'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rack',
+            name='aisle_no',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Natural sort number of the aisle', null=True, verbose_name='Aisle Number'),
+        ),
+        migrations.AddField(
+            model_name='rack',
+            name='bay_no',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Natural sort number of the bay', null=True, verbose_name='Bay Number'),
+        ),
+        migrations.AddField(
+            model_name='rack',
+            name='level_no',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Natural sort number of the level', null=True, verbose_name='Level Number'),
+        ),
+        migrations.AddField(
+            model_name='rack',
+            name='zone_no',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Natural sort number of the zone', null=True, verbose_name='Zone Number'),
+        ),
+        migrations.AddIndex(
+            model_name='rack',
+            index=models.Index(fields=['warehouse', 'zone_no', 'aisle_no', 'bay_no', 'level_no'], name='master_rack_warehou_14e722_idx'),
+        ),
+        migrations.RunPython(backfill_location_numbers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.11 on 2026-10-19 16:27
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def keep_latest_base_uom(apps, schema_editor):
+    # Older saves could leave several flagged rows per item; keep the
+    # most recently updated one so the unique index can be created.
+    ItemUOM = apps.get_model('master', 'ItemUOM')
+    duplicated = (
+        ItemUOM.objects.filter(is_base_uom=True)
+        .order_by()
+        .values('item_id')
+        .annotate(flagged=Count('id'))
+        .filter(flagged__gt=1)
+        .values_list('item_id', flat=True)
+    )
+    for parent_id in duplicated:
+        flagged = ItemUOM.objects.filter(item_id=parent_id, is_base_uom=True)
+        keep = flagged.order_by('-updated_at', '-id').values_list('id', flat=True)[0]
+        flagged.exclude(id=keep).update(is_base_uom=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('master', '0006_rack_location_numbers'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_base_uom, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='itemuom',
+            constraint=models.UniqueConstraint(models.F('item'), condition=models.Q(('is_base_uom', True)), name='master_itemuom_one_base_uom'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.11 on 2026-10-19 16:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('master', '0007_itemuom_one_base_uom'),
+        ('organizations', '0004_warehouse_one_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserRole',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('role', models.ForeignKey(help_text='Role assigned to the user', on_delete=django.db.models.deletion.CASCADE, related_name='user_assignments', to='master.role', verbose_name='Role')),
+                ('user', models.ForeignKey(help_text='User that is assigned the role', on_delete=django.db.models.deletion.CASCADE, related_name='role_assignments', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+                ('warehouse', models.ForeignKey(blank=True, help_text='Warehouse the role applies to, empty for all warehouses', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='user_roles', to='organizations.warehouse', verbose_name='Warehouse')),
+            ],
+            options={
+                'verbose_name': 'User Role',
+                'verbose_name_plural': 'User Roles',
+                'db_table': 'master_user_role',
+                'ordering': ['user', 'warehouse'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'warehouse'), name='master_userrole_one_role_per_warehouse'), models.UniqueConstraint(models.F('user'), condition=models.Q(('warehouse__isnull', True)), name='master_userrole_one_global_role')],
+            },
+        ),
+    ]
@@ -8,6 +8,7 @@ from .rack import Rack
 from .role import Role
 from .role_menu_access import RoleMenuAccess
 from .uom import UOM
+from .user_role import UserRole
 
 __all__ = [
     "UOM",
@@ -18,4 +19,5 @@ __all__ = [
     "Rack",
     "Role",
     "RoleMenuAccess",
+    "UserRole",
 ]
@@ -1,10 +1,12 @@
 from django.db import models  # pyright: ignore[reportMissingModuleSource]  # noqa: I001
 from django.utils.translation import gettext_lazy as _  # pyright: ignore[reportMissingModuleSource]
 
+from kancraonewms.audit.mixins import AuditedModelMixin
+
 from .role import Role
 
 
-class Accessibility(models.Model):
+class Accessibility(AuditedModelMixin, models.Model):
     """Model untuk accessibility/hak akses per role"""
 
     PERMISSION_CHOICES = [
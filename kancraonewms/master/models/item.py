@@ -1,8 +1,10 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from kancraonewms.audit.mixins import AuditedModelMixin
 
-class Item(models.Model):
+
+class Item(AuditedModelMixin, models.Model):
     """Model untuk master items"""
 
     code = models.CharField(
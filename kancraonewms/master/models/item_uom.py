@@ -1,9 +1,20 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from kancraonewms.core.flags import ExclusiveFlagMixin
+from kancraonewms.core.flags import exclusive_flag_constraint
 
-class ItemUOM(models.Model):
-    """Model untuk Item UOM Conversion"""
+
+class ItemUOM(ExclusiveFlagMixin, models.Model):
+    """
+    Model untuk Item UOM Conversion
+
+    An item has at most one base UOM; the database enforces it and saving a
+    new base UOM clears the previous one.
+    """
+
+    exclusive_flag = "is_base_uom"
+    exclusive_flag_parent = "item"
 
     item = models.ForeignKey(
         "Item",
@@ -75,15 +86,13 @@ class ItemUOM(models.Model):
             models.Index(fields=["barcode"]),
             models.Index(fields=["is_active"]),
         ]
+        constraints = [
+            exclusive_flag_constraint(
+                "item",
+                "is_base_uom",
+                name="master_itemuom_one_base_uom",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.item.code} - {self.uom.code} (x{self.conversion_factor})"
-
-    def save(self, *args, **kwargs):
-        """Ensure only one base UOM per item"""
-        if self.is_base_uom:
-            # Set all other UOMs for this item to non-base
-            ItemUOM.objects.filter(item=self.item, is_base_uom=True).exclude(
-                pk=self.pk,
-            ).update(is_base_uom=False)
-        super().save(*args, **kwargs)
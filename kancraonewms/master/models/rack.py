@@ -1,11 +1,47 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from kancraonewms.audit.mixins import AuditedModelMixin
+from kancraonewms.master.location_code import LOCATION_COMPONENTS
+from kancraonewms.master.location_code import LocationCodeError
+from kancraonewms.master.location_code import component_number
 from kancraonewms.organizations.models import Warehouse
 
 
-class Rack(models.Model):
-    """Model untuk Rack yang berada dalam Warehouse"""
+class RackQuerySet(models.QuerySet):
+    """QuerySet untuk Rack dengan filter berbasis komponen lokasi"""
+
+    def in_location_range(self, component, low=None, high=None):
+        """Filter by an inclusive range of a location component number"""
+        queryset = self
+        if low is not None:
+            queryset = queryset.filter(**{f"{component}_no__gte": low})
+        if high is not None:
+            queryset = queryset.filter(**{f"{component}_no__lte": high})
+        return queryset
+
+    def natural_order(self):
+        """Order by warehouse, then zone, aisle, bay and level numerically"""
+        # warehouse_id, not warehouse: the relation would expand to the
+        # warehouse ordering and join away from the location index
+        return self.order_by(
+            "warehouse_id",
+            *(
+                models.F(f"{component}_no").asc(nulls_last=True)
+                for component in LOCATION_COMPONENTS
+            ),
+            "code",
+        )
+
+
+class Rack(AuditedModelMixin, models.Model):
+    """
+    Model untuk Rack yang berada dalam Warehouse
+
+    When the warehouse defines a location code format the code is parsed and
+    normalized on save and fills zone/aisle/bay/level. The ``*_no`` columns
+    hold the natural number of each component for range queries and ordering.
+    """
 
     warehouse = models.ForeignKey(
         Warehouse,
@@ -57,6 +93,36 @@ class Rack(models.Model):
         help_text=_("Level or shelf number"),
     )
 
+    # Indexed location component numbers (derived on save)
+    zone_no = models.PositiveIntegerField(
+        _("Zone Number"),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Natural sort number of the zone"),
+    )
+    aisle_no = models.PositiveIntegerField(
+        _("Aisle Number"),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Natural sort number of the aisle"),
+    )
+    bay_no = models.PositiveIntegerField(
+        _("Bay Number"),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Natural sort number of the bay"),
+    )
+    level_no = models.PositiveIntegerField(
+        _("Level Number"),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Natural sort number of the level"),
+    )
+
     # Capacity Information
     capacity = models.DecimalField(
         _("Capacity"),
@@ -89,6 +155,8 @@ class Rack(models.Model):
     created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
 
+    objects = RackQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Rack")
         verbose_name_plural = _("Racks")
@@ -97,7 +165,62 @@ class Rack(models.Model):
             models.Index(fields=["warehouse", "code"]),
             models.Index(fields=["is_active"]),
             models.Index(fields=["zone", "aisle"]),
+            models.Index(
+                fields=["warehouse", "zone_no", "aisle_no", "bay_no", "level_no"],
+            ),
         ]
 
     def __str__(self):
         return f"{self.code} - {self.name} ({self.warehouse.name})"
+
+    def save(self, *args, **kwargs):
+        """Override save to keep location component numbers in sync"""
+        self.apply_location_code()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                "code",
+                *LOCATION_COMPONENTS,
+                *(f"{component}_no" for component in LOCATION_COMPONENTS),
+            }
+        super().save(*args, **kwargs)
+        self._loaded_location = self._location()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_location = instance._location()  # noqa: SLF001
+        return instance
+
+    def _location(self):
+        return (self.__dict__.get("warehouse_id"), self.__dict__.get("code"))
+
+    def apply_location_code(self):
+        """
+        Normalize the code against the warehouse grammar and derive numbers.
+
+        Codes that do not match the grammar are left untouched; serializers
+        reject them before they get here. The grammar is only read for new
+        codes (or a different warehouse), unless the warehouse is loaded
+        anyway, so saving other fields costs no warehouse query.
+        """
+        code_changed = self._location() != getattr(self, "_loaded_location", None)
+        warehouse_loaded = Rack.warehouse.is_cached(self)
+        grammar = (
+            self.warehouse.location_code_grammar
+            if code_changed or warehouse_loaded
+            else None
+        )
+        if grammar is not None:
+            try:
+                location = grammar.parse(self.code)
+            except LocationCodeError:
+                pass
+            else:
+                self.code = location.code
+                for component, value in location.parts.items():
+                    setattr(self, component, value)
+        for component in LOCATION_COMPONENTS:
+            number = component_number(getattr(self, component))
+            setattr(self, f"{component}_no", number)
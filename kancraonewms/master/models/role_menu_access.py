@@ -1,11 +1,13 @@
 from django.db import models  # pyright: ignore[reportMissingModuleSource]  # noqa: I001
 from django.utils.translation import gettext_lazy as _  # pyright: ignore[reportMissingModuleSource]
 
+from kancraonewms.audit.mixins import AuditedModelMixin
+
 from .menu import Menu
 from .role import Role
 
 
-class RoleMenuAccess(models.Model):
+class RoleMenuAccess(AuditedModelMixin, models.Model):
     """Model untuk menghubungkan role dengan menu yang bisa diakses"""
 
     role = models.ForeignKey(
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from kancraonewms.organizations.models import Warehouse
+
+from .role import Role
+
+
+class UserRole(models.Model):
+    """
+    Model untuk assignment role ke user
+
+    A user has at most one global role (no warehouse) and at most one role per
+    warehouse; within a warehouse its warehouse role takes precedence over the
+    global one.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="role_assignments",
+        verbose_name=_("User"),
+        help_text=_("User that is assigned the role"),
+    )
+    role = models.ForeignKey(
+        Role,
+        on_delete=models.CASCADE,
+        related_name="user_assignments",
+        verbose_name=_("Role"),
+        help_text=_("Role assigned to the user"),
+    )
+    warehouse = models.ForeignKey(
+        Warehouse,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="user_roles",
+        verbose_name=_("Warehouse"),
+        help_text=_("Warehouse the role applies to, empty for all warehouses"),
+    )
+    created_at = models.DateTimeField(
+        _("Created At"),
+        auto_now_add=True,
+    )
+    updated_at = models.DateTimeField(
+        _("Updated At"),
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = _("User Role")
+        verbose_name_plural = _("User Roles")
+        ordering = ["user", "warehouse"]
+        db_table = "master_user_role"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "warehouse"],
+                name="master_userrole_one_role_per_warehouse",
+            ),
+            # An expression keeps DRF from adding a validator on ``user``
+            models.UniqueConstraint(
+                models.F("user"),
+                condition=models.Q(warehouse__isnull=True),
+                name="master_userrole_one_global_role",
+            ),
+        ]
+
+    def __str__(self):
+        scope = self.warehouse.code if self.warehouse_id else _("All warehouses")
+        return f"{self.user} - {self.role.name} ({scope})"
@@ -0,0 +1 @@
+"""Master services package"""
@@ -0,0 +1,199 @@
+"""
+Compiled role permissions and menus.
+
+Every role's effective permissions (granted Accessibility rows, as
+``module.feature.permission`` keys) and its accessible menu tree are compiled
+once and cached. Cache entries are keyed by a generation token that any
+change to roles, menus, accessibilities or menu accesses replaces (see
+``master.signals``), so stale entries are simply never read again. Because a
+generation's entries never change, they are also memoized in-process and a
+warm lookup costs a single cache read of the current generation. For the same
+reason they are always compiled from the primary: a lagging replica would
+cache a stale role for the whole generation.
+
+Access tokens may carry a role's permissions as a compact bitmap over the
+generation's permission catalog (:func:`token_claim`). The bitmap is only
+trusted while its generation is current; afterwards checks fall back to the
+compiled role.
+"""
+
+import base64
+import functools
+import uuid
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+
+from kancraonewms.master.models import Accessibility
+from kancraonewms.master.models import Menu
+from kancraonewms.master.models import Role
+from kancraonewms.master.models import RoleMenuAccess
+
+GENERATION_KEY = "master:permissions:generation"
+CATALOG_KEY = "master:permissions:{generation}:catalog"
+ROLE_KEY = "master:permissions:{generation}:role:{role_id}"
+CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def permission_key(module, feature, permission):
+    return f"{module}.{feature}.{permission}"
+
+
+def get_generation():
+    """Return the current permissions generation"""
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid.uuid4().hex[:12], None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    """Invalidate every compiled role, now and once the transaction commits"""
+    cache.set(GENERATION_KEY, uuid.uuid4().hex[:12], None)
+    transaction.on_commit(
+        lambda: cache.set(GENERATION_KEY, uuid.uuid4().hex[:12], None),
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def get_catalog(generation):
+    """Return the ordered permission keys addressed by token bitmaps"""
+    key = CATALOG_KEY.format(generation=generation)
+    catalog = cache.get(key)
+    if catalog is None:
+        rows = (
+            Accessibility.objects.using(DEFAULT_DB_ALIAS)
+            .order_by("module", "feature", "permission")
+            .values_list("module", "feature", "permission")
+            .distinct()
+        )
+        catalog = tuple(permission_key(*row) for row in rows)
+        cache.set(key, catalog, CACHE_TIMEOUT)
+    return catalog
+
+
+@functools.lru_cache(maxsize=64)
+def _catalog_index(generation):
+    return {key: bit for bit, key in enumerate(get_catalog(generation))}
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_role(generation, role_id):
+    key = ROLE_KEY.format(generation=generation, role_id=role_id)
+    compiled = cache.get(key)
+    if compiled is None:
+        compiled = compile_role(role_id)
+        cache.set(key, compiled, CACHE_TIMEOUT)
+    return compiled
+
+
+def get_role(role_id):
+    """
+    Return the compiled role ``role_id``: ``role``, ``permissions`` and
+    ``menus``, or None for an unknown or inactive role.
+    """
+    if role_id is None:
+        return None
+    return _get_role(get_generation(), int(role_id))
+
+
+def compile_role(role_id):
+    role = (
+        Role.objects.using(DEFAULT_DB_ALIAS).filter(pk=role_id, is_active=True).first()
+    )
+    if role is None:
+        return None
+    permissions = sorted(
+        permission_key(*row)
+        for row in Accessibility.objects.using(DEFAULT_DB_ALIAS)
+        .filter(
+            role=role,
+            is_granted=True,
+        )
+        .values_list("module", "feature", "permission")
+    )
+    return {
+        "role": {"id": role.pk, "code": role.code, "name": role.name},
+        "permissions": permissions,
+        "menus": _menu_tree(role),
+    }
+
+
+def _menu_tree(role):
+    """Accessible active menus nested under accessible parents"""
+    accessible = set(
+        RoleMenuAccess.objects.using(DEFAULT_DB_ALIAS)
+        .filter(
+            role=role,
+            can_access=True,
+        )
+        .values_list("menu_id", flat=True),
+    )
+    menus = (
+        Menu.objects.using(DEFAULT_DB_ALIAS)
+        .filter(is_active=True, id__in=accessible)
+        .order_by("order", "name")
+    )
+    nodes = {
+        menu.pk: {
+            "id": menu.pk,
+            "code": menu.code,
+            "name": menu.name,
+            "icon": menu.icon,
+            "url": menu.url,
+            "order": menu.order,
+            "module": menu.module,
+            "parent_id": menu.parent_id,
+            "children": [],
+        }
+        for menu in menus
+    }
+    roots = []
+    for node in nodes.values():
+        parent_id = node.pop("parent_id")
+        if parent_id is None:
+            roots.append(node)
+        elif parent_id in nodes:
+            nodes[parent_id]["children"].append(node)
+    return roots
+
+
+def encode_bitmap(permissions, generation):
+    index = _catalog_index(generation)
+    bits = 0
+    for key in permissions:
+        if key in index:
+            bits |= 1 << index[key]
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8 or 1, "little")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def token_claim(role_id):
+    """Return the permission bitmap claim of a role, or None"""
+    generation = get_generation()
+    compiled = _get_role(generation, int(role_id))
+    if compiled is None:
+        return None
+    return {"g": generation, "b": encode_bitmap(compiled["permissions"], generation)}
+
+
+def has_permission(role_id, key, claim=None):
+    """
+    Return whether a role holds the permission ``key``.
+
+    ``claim`` is the bitmap claim of the request's access token; it is used
+    instead of the compiled role while its generation is current.
+    """
+    generation = get_generation()
+    if claim and claim.get("g") == generation:
+        bit = _catalog_index(generation).get(key)
+        if bit is None:
+            return False
+        raw = base64.urlsafe_b64decode(claim["b"] + "=" * (-len(claim["b"]) % 4))
+        return bool(int.from_bytes(raw, "little") >> bit & 1)
+    if role_id is None:
+        return False
+    compiled = _get_role(generation, int(role_id))
+    return compiled is not None and key in compiled["permissions"]
@@ -0,0 +1,147 @@
+"""
+Bulk rack generation from a warehouse layout.
+
+A layout is the cartesian product of zone, aisle, bay and level ranges.
+Codes come from a location code grammar (see ``master.location_code``), so
+generated racks carry the same normalized codes and component numbers as
+racks created one by one. Existing codes are looked up in a single query and
+the racks are written with ``bulk_create`` in fixed-size batches.
+"""
+
+import itertools
+
+from django.db import connection
+from django.db import transaction
+
+from kancraonewms.audit.services import recorder
+from kancraonewms.master.location_code import LOCATION_COMPONENTS
+from kancraonewms.master.location_code import get_grammar
+from kancraonewms.master.models import Rack
+
+MAX_GENERATED_RACKS = 100_000
+BATCH_SIZE = 5000
+# Number of conflicting codes reported back to the client
+MAX_REPORTED_CONFLICTS = 50
+
+
+class RackLayoutError(ValueError):
+    """Raised when a layout cannot be generated"""
+
+    def __init__(self, message, conflicts=()):
+        super().__init__(message)
+        self.conflicts = list(conflicts)
+
+
+def default_code_format(warehouse):
+    """Format used when neither the request nor the warehouse defines one"""
+    prefix = warehouse.code.replace("{", "").replace("}", "")
+    return f"{prefix}-Z{{zone:d2}}-A{{aisle:d2}}-B{{bay:d2}}-L{{level:d}}"
+
+
+def layout_size(ranges):
+    """Number of racks described by ``{component: (start, end)}``"""
+    size = 1
+    for start, end in ranges.values():
+        size *= end - start + 1
+    return size
+
+
+def iter_locations(grammar, ranges):
+    """Yield the parsed location of every rack in the layout, in natural order"""
+    components = list(ranges)
+    for numbers in itertools.product(
+        *(range(start, end + 1) for start, end in ranges.values()),
+    ):
+        yield grammar.build(**dict(zip(components, numbers, strict=True)))
+
+
+def _check_lengths(locations):
+    """Reject layouts whose codes or components do not fit the rack columns"""
+    for field in ("code", *LOCATION_COMPONENTS):
+        max_length = Rack._meta.get_field(field).max_length  # noqa: SLF001
+        for location in locations:
+            value = location.code if field == "code" else location.parts.get(field, "")
+            if len(value) > max_length:
+                msg = (
+                    f"Generated {field} '{value}' is longer than {max_length} "
+                    "characters, use a shorter code format."
+                )
+                raise RackLayoutError(msg)
+
+
+def existing_codes(codes):
+    """Return which of ``codes`` already exist, in one query"""
+    if connection.vendor == "postgresql":
+        # A single array parameter instead of one bind parameter per code,
+        # which would exceed the protocol limit for large layouts.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT code FROM master_rack WHERE code = ANY(%s)",
+                [list(codes)],
+            )
+            return {row[0] for row in cursor.fetchall()}
+    return set(Rack.objects.filter(code__in=codes).values_list("code", flat=True))
+
+
+def generate_racks(warehouse, ranges, code_format=None, **defaults):
+    """
+    Create every rack of a layout in ``warehouse``.
+
+    ``ranges`` maps location components to inclusive ``(start, end)`` number
+    ranges; components left out are not part of the layout. ``defaults`` are
+    extra Rack field values (capacity, max_weight, is_active, ...). Returns the
+    number of racks created. Nothing is created if any code already exists.
+    """
+    code_format = (
+        code_format or warehouse.location_code_format or default_code_format(warehouse)
+    )
+    grammar = get_grammar(code_format)
+
+    missing = [
+        component
+        for component, (start, end) in ranges.items()
+        if component not in grammar.components and end > start
+    ]
+    if missing:
+        msg = (
+            f"The code format '{code_format}' has no placeholder for "
+            f"{', '.join(missing)}, generated codes would not be unique."
+        )
+        raise RackLayoutError(msg)
+    ranges = {
+        component: ranges.get(component, (1, 1)) for component in grammar.components
+    }
+
+    size = layout_size(ranges)
+    if size > MAX_GENERATED_RACKS:
+        msg = f"The layout describes {size} racks, at most {MAX_GENERATED_RACKS}."
+        raise RackLayoutError(msg)
+
+    locations = list(iter_locations(grammar, ranges))
+    _check_lengths(locations)
+    conflicts = existing_codes([location.code for location in locations])
+    if conflicts:
+        msg = f"{len(conflicts)} rack codes already exist."
+        raise RackLayoutError(msg, sorted(conflicts)[:MAX_REPORTED_CONFLICTS])
+
+    racks = (
+        Rack(
+            warehouse=warehouse,
+            code=location.code,
+            name=location.code,
+            **location.parts,
+            **{
+                f"{component}_no": number
+                for component, number in location.numbers.items()
+            },
+            **defaults,
+        )
+        for location in locations
+    )
+    created = 0
+    with transaction.atomic():
+        for batch in itertools.batched(racks, BATCH_SIZE, strict=False):
+            racks_created = Rack.objects.bulk_create(batch)
+            recorder.record(rack.audit_entry("create") for rack in racks_created)
+            created += len(racks_created)
+    return created
@@ -0,0 +1,190 @@
+"""
+A role's full permission matrix: its accessibilities and accessible menus.
+
+:func:`apply_matrix` replaces a role's matrix with the desired one. The
+current rows are loaded in one query per table and diffed in memory, then the
+difference is written set-based: one ``bulk_create`` for new rows, one
+``UPDATE`` per target value for changed rows and one ``DELETE`` for rows left
+out. The role row is locked so concurrent edits of the same role apply one
+after the other.
+
+:func:`clone_role` copies a role's matrix into a new role with one
+``INSERT ... SELECT`` per table, without loading the rows.
+
+Both record the rows they touch in the audit trail, which the set-based
+writes would otherwise bypass.
+"""
+
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from kancraonewms.audit.services import recorder
+from kancraonewms.master.models import Accessibility
+from kancraonewms.master.models import Menu
+from kancraonewms.master.models import Role
+from kancraonewms.master.models import RoleMenuAccess
+
+from . import permissions
+
+
+class RoleMatrixError(ValueError):
+    """Raised when a matrix cannot be applied"""
+
+
+def get_matrix(role):
+    """Return the matrix of ``role`` in the shape :func:`apply_matrix` takes"""
+    rows = role.accessibilities.order_by("module", "feature", "permission")
+    return {
+        "permissions": list(
+            rows.values("module", "feature", "permission", "is_granted"),
+        ),
+        "menus": list(
+            role.menu_accesses.filter(can_access=True)
+            .order_by("menu_id")
+            .values_list("menu_id", flat=True),
+        ),
+    }
+
+
+def apply_matrix(role, permission_rows, menu_ids):
+    """
+    Make the matrix of ``role`` exactly ``permission_rows`` and ``menu_ids``.
+
+    ``permission_rows`` are dicts with ``module``, ``feature``, ``permission``
+    and ``is_granted``; ``menu_ids`` is the set of accessible menus. Returns
+    ``{"permissions": counts, "menus": counts}`` with the rows created,
+    updated and deleted.
+    """
+    desired = {}
+    for row in permission_rows:
+        key = (row["module"], row["feature"], row["permission"])
+        if key in desired:
+            msg = f"Permission {'.'.join(key)} is listed more than once."
+            raise RoleMatrixError(msg)
+        desired[key] = row["is_granted"]
+    menu_ids = set(menu_ids)
+    unknown = menu_ids - set(
+        Menu.objects.filter(pk__in=menu_ids).order_by().values_list("pk", flat=True),
+    )
+    if unknown:
+        msg = f"Unknown menus: {', '.join(map(str, sorted(unknown)))}."
+        raise RoleMatrixError(msg)
+
+    with transaction.atomic():
+        list(
+            Role.objects.select_for_update()
+            .filter(pk=role.pk)
+            .order_by()
+            .values_list("pk"),
+        )
+        rows = (
+            Accessibility.objects.filter(role=role)
+            .order_by()
+            .values_list(
+                "pk",
+                "module",
+                "feature",
+                "permission",
+                "is_granted",
+            )
+        )
+        current = {tuple(row[1:4]): (row[0], row[4]) for row in rows}
+        permission_counts = _apply(
+            Accessibility,
+            "is_granted",
+            current,
+            desired,
+            lambda key, value: Accessibility(
+                role=role,
+                module=key[0],
+                feature=key[1],
+                permission=key[2],
+                is_granted=value,
+            ),
+        )
+
+        current = {
+            menu_id: (pk, can_access)
+            for pk, menu_id, can_access in RoleMenuAccess.objects.filter(role=role)
+            .order_by()
+            .values_list("pk", "menu_id", "can_access")
+        }
+        menu_counts = _apply(
+            RoleMenuAccess,
+            "can_access",
+            current,
+            dict.fromkeys(menu_ids, True),
+            lambda menu_id, value: RoleMenuAccess(
+                role=role,
+                menu_id=menu_id,
+                can_access=value,
+            ),
+        )
+
+        if any(permission_counts.values()) or any(menu_counts.values()):
+            permissions.bump_generation()
+    return {"permissions": permission_counts, "menus": menu_counts}
+
+
+def _apply(model, flag, current, desired, build):
+    """Write the difference between ``current`` and ``desired`` flags"""
+    now = timezone.now()
+    created = model.objects.bulk_create(
+        [build(key, value) for key, value in desired.items() if key not in current],
+    )
+    entries = [row.audit_entry("create") for row in created]
+    updated = 0
+    for value in (True, False):
+        pks = [
+            pk
+            for key, (pk, flag_value) in current.items()
+            if key in desired and desired[key] == value and flag_value != value
+        ]
+        if pks:
+            updated += model.objects.filter(pk__in=pks).update(
+                **{flag: value, "updated_at": now},
+            )
+            entries.extend(
+                recorder.entry(model, pk, "update", {flag: (not value, value)})
+                for pk in pks
+            )
+    stale = [pk for key, (pk, _flag_value) in current.items() if key not in desired]
+    deleted = 0
+    if stale:
+        entries.extend(
+            recorder.entry(model, pk, "delete", {flag: (flag_value, None)})
+            for key, (pk, flag_value) in current.items()
+            if key not in desired
+        )
+        # Nothing references these rows; skip loading them for per-row
+        # signals, the caller invalidates compiled permissions once.
+        queryset = model.objects.filter(pk__in=stale)
+        deleted = queryset._raw_delete(queryset.db)  # noqa: SLF001
+    recorder.record(entries)
+    return {"created": len(created), "updated": updated, "deleted": deleted}
+
+
+def clone_role(source, **fields):
+    """Create a role from ``fields`` with a copy of the matrix of ``source``"""
+    with transaction.atomic():
+        role = Role.objects.create(**fields)
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        for model, columns in (
+            (Accessibility, ("module", "feature", "permission", "is_granted")),
+            (RoleMenuAccess, ("menu_id", "can_access")),
+        ):
+            table = connection.ops.quote_name(model._meta.db_table)  # noqa: SLF001
+            names = ", ".join(connection.ops.quote_name(column) for column in columns)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (role_id, {names}, created_at, updated_at) "  # noqa: S608
+                    f"SELECT %s, {names}, %s, %s FROM {table} WHERE role_id = %s",
+                    [role.pk, now, now, source.pk],
+                )
+            recorder.record(
+                row.audit_entry("create")
+                for row in model.objects.filter(role=role).order_by()
+            )
+        permissions.bump_generation()
+    return role
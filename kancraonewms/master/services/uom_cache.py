@@ -0,0 +1,234 @@
+"""
+Cached UOM and item-UOM lookups.
+
+Transactional flows resolve UOMs, the UOMs of an item and scanned barcodes
+in tight loops. Every lookup goes through three levels:
+
+1. a per-process :class:`~kancraonewms.core.caching.LocalCache` (LRU, TTL)
+2. the shared cache (Redis in production)
+3. the database, with one query per batch of misses
+
+Entries are keyed by a generation token that any UOM or item-UOM change
+replaces (see ``master.signals``), as for the compiled permissions. The
+process making the change drops its local entries at once; other processes
+serve theirs for at most ``LOCAL_TTL`` seconds, the lifetime of their local
+copy of the generation. Misses are always loaded from the primary: a row
+read from a lagging replica would be cached for the whole generation.
+
+Lookups return plain dicts shared by every caller; do not modify them. Hits
+and misses are counted per level and per process (:func:`stats`).
+"""
+
+import os
+import threading
+import uuid
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+
+from kancraonewms.core.caching import LocalCache
+from kancraonewms.master.models import UOM
+from kancraonewms.master.models import ItemUOM
+
+GENERATION_KEY = "master:uoms:generation"
+ENTRY_KEY = "master:uoms:{generation}:{kind}:{key}"
+CACHE_TIMEOUT = 24 * 60 * 60
+LOCAL_SIZE = 10_000
+LOCAL_TTL = 10
+KINDS = ("uom", "item", "barcode")
+
+UOM_FIELDS = (
+    "id",
+    "code",
+    "name",
+    "uom_type",
+    "conversion_factor",
+    "base_uom_id",
+    "is_active",
+)
+# ItemUOM column -> key of the looked up dict
+ITEM_UOM_FIELDS = {
+    "id": "id",
+    "item_id": "item",
+    "uom_id": "uom",
+    "uom__code": "uom_code",
+    "conversion_factor": "conversion_factor",
+    "is_base_uom": "is_base_uom",
+    "is_purchase_uom": "is_purchase_uom",
+    "is_sales_uom": "is_sales_uom",
+    "is_stock_uom": "is_stock_uom",
+    "barcode": "barcode",
+}
+
+_local = LocalCache(LOCAL_SIZE, LOCAL_TTL)
+_counters = Counter()
+_counters_lock = threading.Lock()
+_missing = object()
+
+
+def get_generation():
+    """Return the current UOM cache generation"""
+    generation = _local.get(GENERATION_KEY)
+    if generation is None:
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            cache.add(GENERATION_KEY, uuid.uuid4().hex[:12], None)
+            generation = cache.get(GENERATION_KEY)
+        _local.set(GENERATION_KEY, generation)
+    return generation
+
+
+def bump_generation():
+    """Invalidate every cached lookup, now and once the transaction commits"""
+    _new_generation()
+    transaction.on_commit(_new_generation)
+
+
+def _new_generation():
+    cache.set(GENERATION_KEY, uuid.uuid4().hex[:12], None)
+    _local.clear()
+
+
+def clear_local():
+    """Drop the entries of this process, e.g. between tests"""
+    _local.clear()
+
+
+def get_uom(uom_id):
+    """Return the UOM ``uom_id`` as a dict, or None"""
+    uom_id = int(uom_id)
+    return _lookup("uom", [uom_id])[uom_id]
+
+
+def get_item_uoms(item_id):
+    """Return the active item-UOMs of ``item_id``, smallest factor first"""
+    item_id = int(item_id)
+    return _lookup("item", [item_id])[item_id]
+
+
+def get_item_uoms_many(item_ids):
+    """Return ``{item_id: [item_uom, ...]}`` for a batch of items"""
+    return _lookup("item", [int(item_id) for item_id in item_ids])
+
+
+def get_by_barcode(barcode):
+    """Return the active item-UOM carrying ``barcode``, or None"""
+    return _lookup("barcode", [barcode])[barcode]
+
+
+def warm(kind, keys):
+    """Load ``keys`` of ``kind`` from the database into the shared cache"""
+    generation = get_generation()
+    values = LOADERS[kind](list(keys))
+    cache.set_many(
+        {_key(generation, kind, key): value for key, value in values.items()},
+        CACHE_TIMEOUT,
+    )
+    return len(values)
+
+
+def stats():
+    """Hits and misses per lookup kind and level, for this process"""
+    with _counters_lock:
+        counters = dict(_counters)
+    return {
+        "pid": os.getpid(),
+        "local_entries": len(_local),
+        **{
+            kind: {
+                level: counters.get((kind, level), 0)
+                for level in ("local_hits", "shared_hits", "misses")
+            }
+            for kind in KINDS
+        },
+    }
+
+
+def _key(generation, kind, key):
+    return ENTRY_KEY.format(generation=generation, kind=kind, key=key)
+
+
+def _lookup(kind, keys):
+    keys = list(dict.fromkeys(keys))
+    generation = get_generation()
+    found = {}
+    for key in keys:
+        value = _local.get((generation, kind, key), _missing)
+        if value is not _missing:
+            found[key] = value
+    local_hits = len(found)
+
+    remaining = [key for key in keys if key not in found]
+    shared = {}
+    if remaining:
+        cache_keys = {_key(generation, kind, key): key for key in remaining}
+        shared = {
+            cache_keys[cache_key]: value
+            for cache_key, value in cache.get_many(cache_keys).items()
+        }
+        remaining = [key for key in remaining if key not in shared]
+
+    loaded = {}
+    if remaining:
+        loaded = LOADERS[kind](remaining)
+        cache.set_many(
+            {_key(generation, kind, key): value for key, value in loaded.items()},
+            CACHE_TIMEOUT,
+        )
+
+    for key, value in (shared | loaded).items():
+        _local.set((generation, kind, key), value)
+        found[key] = value
+    with _counters_lock:
+        _counters[kind, "local_hits"] += local_hits
+        _counters[kind, "shared_hits"] += len(shared)
+        _counters[kind, "misses"] += len(loaded)
+    return found
+
+
+def _item_uoms(queryset):
+    rows = queryset.order_by("item_id", "conversion_factor", "uom__code", "pk")
+    return [
+        dict(zip(ITEM_UOM_FIELDS.values(), row, strict=True))
+        for row in rows.values_list(*ITEM_UOM_FIELDS)
+    ]
+
+
+def _load_uoms(uom_ids):
+    uoms = dict.fromkeys(uom_ids)
+    rows = UOM.objects.using(DEFAULT_DB_ALIAS).filter(pk__in=uom_ids)
+    for uom in rows.values(*UOM_FIELDS):
+        uoms[uom["id"]] = uom
+    return uoms
+
+
+def _load_items(item_ids):
+    items = {item_id: [] for item_id in item_ids}
+    for item_uom in _item_uoms(
+        ItemUOM.objects.using(DEFAULT_DB_ALIAS).filter(
+            item_id__in=item_ids,
+            is_active=True,
+        ),
+    ):
+        items[item_uom["item"]].append(item_uom)
+    return items
+
+
+def _load_barcodes(barcodes):
+    found = dict.fromkeys(barcodes)
+    item_uoms = _item_uoms(
+        ItemUOM.objects.using(DEFAULT_DB_ALIAS).filter(
+            barcode__in=barcodes,
+            is_active=True,
+        ),
+    )
+    # The oldest item-UOM wins when a barcode is not unique
+    for item_uom in sorted(item_uoms, key=lambda item_uom: item_uom["id"]):
+        if found[item_uom["barcode"]] is None:
+            found[item_uom["barcode"]] = item_uom
+    return found
+
+
+LOADERS = {"uom": _load_uoms, "item": _load_items, "barcode": _load_barcodes}
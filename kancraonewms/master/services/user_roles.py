@@ -0,0 +1,91 @@
+"""
+Cached resolution of the role a user acts under.
+
+A user's role assignments are loaded once per permissions generation (see
+:mod:`kancraonewms.master.services.permissions`), which assignment changes
+replace, and kept both in the shared cache and in-process. A warm lookup
+costs one cache read of the current generation and no query. Like compiled
+roles they are loaded from the primary, never from a lagging replica.
+"""
+
+import functools
+from collections.abc import Mapping
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.tokens import Token
+
+from kancraonewms.master.models import UserRole
+
+from .permissions import CACHE_TIMEOUT
+from .permissions import get_generation
+
+USER_KEY = "master:permissions:{generation}:user:{user_id}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_assignments(generation, user_id):
+    key = USER_KEY.format(generation=generation, user_id=user_id)
+    assignments = cache.get(key)
+    if assignments is None:
+        assignments = dict(
+            UserRole.objects.using(DEFAULT_DB_ALIAS)
+            .filter(user_id=user_id)
+            .values_list("warehouse_id", "role_id"),
+        )
+        cache.set(key, assignments, CACHE_TIMEOUT)
+    return assignments
+
+
+def get_role_id(user_id, warehouse_id=None):
+    """
+    Return the role id of a user, within ``warehouse_id`` when given.
+
+    A warehouse assignment wins over the user's global role.
+    """
+    if user_id is None:
+        return None
+    assignments = _get_assignments(get_generation(), int(user_id))
+    if warehouse_id is not None and int(warehouse_id) in assignments:
+        return assignments[int(warehouse_id)]
+    return assignments.get(None)
+
+
+def get_request_role_id(request, *, warehouse_scoped=False):
+    """
+    Return the role of the authenticated user of ``request``.
+
+    With ``warehouse_scoped`` a ``warehouse`` query parameter selects the
+    warehouse scope. The caller picks that parameter, so it is only honoured
+    where the answer describes the caller's own role or the endpoint only
+    serves data of that warehouse; never to authorize global resources such
+    as role administration.
+    """
+    user = request.user
+    if not user or not user.is_authenticated:
+        return None
+    warehouse_id = _request_warehouse_id(request) if warehouse_scoped else None
+    return get_role_id(user.pk, warehouse_id)
+
+
+def get_request_claim(request, *, warehouse_scoped=False):
+    """
+    Return the permission bitmap claim of the request's access token.
+
+    The bitmap holds the permissions of the user's global role, so it is not
+    returned for warehouse scoped requests (see :func:`get_request_role_id`),
+    where a warehouse role may apply instead.
+    """
+    # Other authentications (e.g. DRF's Token model) carry no claims
+    if not isinstance(request.auth, Token | Mapping):
+        return None
+    if warehouse_scoped and _request_warehouse_id(request) is not None:
+        return None
+    return request.auth.get("perms")
+
+
+def _request_warehouse_id(request):
+    warehouse_id = request.query_params.get("warehouse")
+    if not (warehouse_id and warehouse_id.isdigit()):
+        return None
+    return warehouse_id
@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from kancraonewms.core.bulk import bulk_updated
+
+from .models import UOM
+from .models import Accessibility
+from .models import ItemUOM
+from .models import Menu
+from .models import Role
+from .models import RoleMenuAccess
+from .models import UserRole
+from .services import permissions
+from .services import uom_cache
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(bulk_updated, sender=Role)
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+@receiver(bulk_updated, sender=Menu)
+@receiver(post_save, sender=Accessibility)
+@receiver(post_delete, sender=Accessibility)
+@receiver(bulk_updated, sender=Accessibility)
+@receiver(post_save, sender=RoleMenuAccess)
+@receiver(post_delete, sender=RoleMenuAccess)
+@receiver(bulk_updated, sender=RoleMenuAccess)
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def invalidate_compiled_permissions(sender, **kwargs):
+    """Start a new permissions generation on any role, menu or access change"""
+    permissions.bump_generation()
+
+
+@receiver(post_save, sender=UOM)
+@receiver(post_delete, sender=UOM)
+@receiver(bulk_updated, sender=UOM)
+@receiver(post_save, sender=ItemUOM)
+@receiver(post_delete, sender=ItemUOM)
+@receiver(bulk_updated, sender=ItemUOM)
+def invalidate_uom_cache(sender, **kwargs):
+    """Start a new UOM cache generation on any UOM or item-UOM change"""
+    uom_cache.bump_generation()
@@ -10,6 +10,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from kancraonewms.master.models import Accessibility
 from kancraonewms.master.tests.factories import AccessibilityFactory
 from kancraonewms.master.tests.factories import RoleFactory
+from kancraonewms.master.tests.factories import UserRoleFactory
 from kancraonewms.users.tests.factories import UserFactory
 
 
@@ -18,7 +19,7 @@ class AccessibilityViewSetTest(APITestCase):
 
     def setUp(self):
         """Set up test fixtures"""
-        self.user = UserFactory()
+        self.user = UserFactory(is_superuser=True)
         self.refresh = RefreshToken.for_user(self.user)
         self.client.credentials(
             HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}",
@@ -152,9 +153,11 @@ class AccessibilityViewSetTest(APITestCase):
         assert len(results) == 2  # noqa: PLR2004
 
     def test_get_by_role_action(self):
-        """Test getting accessibilities by role via action"""
+        """Test getting the accessibilities of the current user's role"""
+        UserRoleFactory(user=self.user, role=self.role1)
         url = reverse("api:accessibility-by-role")
-        response = self.client.get(url, {"role_id": self.role1.pk})
+        # A client-supplied role is ignored
+        response = self.client.get(url, {"role_id": self.role2.pk})
 
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 2  # noqa: PLR2004
@@ -186,6 +186,20 @@ class MenuViewSetTest(APITestCase):
         assert "children" in master_menu
         assert len(master_menu["children"]) == 1  # Only active child
 
+    def test_menu_tree_is_cached_until_menus_change(self):
+        """The tree is served from the cache until a menu changes"""
+        url = reverse("api:menu-tree")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+
+        self.menu1.is_active = False
+        self.menu1.save()
+        response = self.client.get(url)
+
+        assert len(cached.data) == 2  # noqa: PLR2004
+        assert len(response.data) == 1
+
     def test_get_root_menus(self):
         """Test getting root menus (without parent)"""
         url = reverse("api:menu-roots")
@@ -506,3 +506,75 @@ class RackViewSetTest(APITestCase):
         """Test rack string representation"""
         expected = f"{self.rack1.code} - {self.rack1.name} ({self.warehouse1.name})"
         assert str(self.rack1) == expected
+
+    def test_filter_by_location_range(self):
+        """Test filtering by location component number ranges"""
+        for aisle in range(1, 10):
+            RackFactory(
+                code=f"RANGE-{aisle}",
+                warehouse=self.warehouse1,
+                aisle=f"A{aisle:02d}",
+                level=str(aisle % 3 + 1),
+            )
+
+        response = self.client.get(
+            self.list_url,
+            {
+                "warehouse": self.warehouse1.pk,
+                "aisle_min": "3",
+                "aisle_max": "A07",
+                "level_max": "2",
+                "page_size": 100,
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        codes = {rack["code"] for rack in self._get_results(response)}
+        assert codes == {"RANGE-3", "RANGE-4", "RANGE-6", "RANGE-7"}
+
+    def test_natural_ordering(self):
+        """Test racks are ordered numerically by location components"""
+        Rack.objects.all().delete()
+        for aisle in (10, 2, 1):
+            RackFactory(
+                code=f"A{aisle}",
+                warehouse=self.warehouse1,
+                zone="A",
+                aisle=str(aisle),
+                bay="1",
+                level="1",
+            )
+
+        response = self.client.get(self.list_url)
+
+        codes = [rack["code"] for rack in self._get_results(response)]
+        assert codes == ["A1", "A2", "A10"]
+
+    def test_create_rack_with_location_format(self):
+        """Test codes are normalized with the warehouse location format"""
+        self.warehouse1.location_code_format = "Z{zone:d2}-A{aisle:d2}-L{level:d}"
+        self.warehouse1.save()
+
+        response = self.client.post(
+            self.list_url,
+            {"warehouse": self.warehouse1.pk, "code": "z1-a3-l2", "name": "Rack"},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["code"] == "Z01-A03-L2"
+        assert response.data["aisle"] == "03"
+        rack = Rack.objects.get(code="Z01-A03-L2")
+        assert (rack.zone_no, rack.aisle_no, rack.level_no) == (1, 3, 2)
+
+    def test_create_rack_code_not_matching_format(self):
+        """Test codes outside the warehouse location format are rejected"""
+        self.warehouse1.location_code_format = "Z{zone:d2}-A{aisle:d2}"
+        self.warehouse1.save()
+
+        response = self.client.post(
+            self.list_url,
+            {"warehouse": self.warehouse1.pk, "code": "RACK-X", "name": "Rack"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "code" in response.data
@@ -7,8 +7,12 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from kancraonewms.master.models import Accessibility
 from kancraonewms.master.models import Role
+from kancraonewms.master.tests.factories import AccessibilityFactory
+from kancraonewms.master.tests.factories import MenuFactory
 from kancraonewms.master.tests.factories import RoleFactory
+from kancraonewms.master.tests.factories import RoleMenuAccessFactory
 from kancraonewms.users.tests.factories import UserFactory
 
 
@@ -17,7 +21,7 @@ class RoleViewSetTest(APITestCase):
 
     def setUp(self):
         """Set up test fixtures"""
-        self.user = UserFactory()
+        self.user = UserFactory(is_superuser=True)
         self.refresh = RefreshToken.for_user(self.user)
         self.client.credentials(
             HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}",
@@ -153,3 +157,130 @@ class RoleViewSetTest(APITestCase):
         assert response.status_code == status.HTTP_200_OK
         self.role1.refresh_from_db()
         assert self.role1.is_active is False
+
+
+class RoleMatrixTest(APITestCase):
+    """Tests for editing and cloning role matrices"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.user = UserFactory(is_superuser=True)
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.role = RoleFactory(code="PICKER", name="Picker")
+        self.menus = MenuFactory.create_batch(3)
+        self.kept = AccessibilityFactory(
+            role=self.role,
+            module="master",
+            feature="item",
+            permission="read",
+            is_granted=True,
+        )
+        self.flipped = AccessibilityFactory(
+            role=self.role,
+            module="master",
+            feature="item",
+            permission="update",
+            is_granted=True,
+        )
+        self.dropped = AccessibilityFactory(
+            role=self.role,
+            module="master",
+            feature="item",
+            permission="delete",
+            is_granted=True,
+        )
+        RoleMenuAccessFactory(role=self.role, menu=self.menus[0], can_access=True)
+        RoleMenuAccessFactory(role=self.role, menu=self.menus[1], can_access=True)
+        self.url = reverse("api:role-matrix", kwargs={"pk": self.role.pk})
+
+    def _permission(self, permission, *, is_granted=True, feature="item"):
+        return {
+            "module": "master",
+            "feature": feature,
+            "permission": permission,
+            "is_granted": is_granted,
+        }
+
+    def test_get_matrix(self):
+        """Test reading the matrix of a role"""
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["permissions"]) == 3  # noqa: PLR2004
+        assert response.data["menus"] == [self.menus[0].pk, self.menus[1].pk]
+
+    def test_put_matrix_applies_diff(self):
+        """Test replacing the matrix creates, updates and deletes rows"""
+        data = {
+            "permissions": [
+                self._permission("read"),
+                self._permission("update", is_granted=False),
+                self._permission("read", feature="rack"),
+            ],
+            "menus": [self.menus[1].pk, self.menus[2].pk],
+        }
+        response = self.client.put(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "permissions": {"created": 1, "updated": 1, "deleted": 1},
+            "menus": {"created": 1, "updated": 0, "deleted": 1},
+        }
+        self.flipped.refresh_from_db()
+        assert self.flipped.is_granted is False
+        assert not Accessibility.objects.filter(pk=self.dropped.pk).exists()
+        assert self.client.get(self.url).data["menus"] == [
+            self.menus[1].pk,
+            self.menus[2].pk,
+        ]
+
+    def test_put_unchanged_matrix_writes_nothing(self):
+        """Test an unchanged matrix only reads the current rows"""
+        data = self.client.get(self.url).data
+        # Role, menu check, role lock, accessibilities, menu accesses
+        # and the request and matrix savepoints
+        with self.assertNumQueries(9):
+            response = self.client.put(self.url, data, format="json")
+
+        assert response.data["permissions"] == {
+            "created": 0,
+            "updated": 0,
+            "deleted": 0,
+        }
+
+    def test_put_matrix_rejects_unknown_menu(self):
+        """Test unknown menus are rejected"""
+        data = {"permissions": [], "menus": [999999]}
+        response = self.client.put(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Accessibility.objects.filter(role=self.role).count() == 3  # noqa: PLR2004
+
+    def test_put_matrix_rejects_duplicates(self):
+        """Test a permission listed twice is rejected"""
+        data = {
+            "permissions": [self._permission("read"), self._permission("read")],
+            "menus": [],
+        }
+        response = self.client.put(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_clone_role(self):
+        """Test cloning copies the full matrix into a new role"""
+        url = reverse("api:role-clone", kwargs={"pk": self.role.pk})
+        response = self.client.post(url, {"code": "PICKER2", "name": "Picker 2"})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        clone = Role.objects.get(code="PICKER2")
+        clone_url = reverse("api:role-matrix", kwargs={"pk": clone.pk})
+        assert self.client.get(clone_url).data == self.client.get(self.url).data
+
+    def test_clone_role_duplicate_code(self):
+        """Test cloning into an existing code fails"""
+        url = reverse("api:role-clone", kwargs={"pk": self.role.pk})
+        response = self.client.post(url, {"code": "PICKER", "name": "Again"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
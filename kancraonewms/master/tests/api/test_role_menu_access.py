@@ -11,6 +11,7 @@ from kancraonewms.master.models import RoleMenuAccess
 from kancraonewms.master.tests.factories import MenuFactory
 from kancraonewms.master.tests.factories import RoleFactory
 from kancraonewms.master.tests.factories import RoleMenuAccessFactory
+from kancraonewms.master.tests.factories import UserRoleFactory
 from kancraonewms.users.tests.factories import UserFactory
 
 
@@ -19,7 +20,7 @@ class RoleMenuAccessViewSetTest(APITestCase):
 
     def setUp(self):
         """Set up test fixtures"""
-        self.user = UserFactory()
+        self.user = UserFactory(is_superuser=True)
         self.refresh = RefreshToken.for_user(self.user)
         self.client.credentials(
             HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}",
@@ -161,22 +162,32 @@ class RoleMenuAccessViewSetTest(APITestCase):
         assert len(results) == 2  # noqa: PLR2004
 
     def test_get_by_role_action(self):
-        """Test getting role menu accesses by role via action"""
+        """Test getting the role menu accesses of the current user's role"""
+        UserRoleFactory(user=self.user, role=self.role1)
         url = reverse("api:rolemenuaccess-by-role")
-        response = self.client.get(url, {"role_id": self.role1.pk})
+        # A client-supplied role is ignored
+        response = self.client.get(url, {"role_id": self.role2.pk})
 
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 2  # noqa: PLR2004
 
     def test_get_accessible_menus(self):
-        """Test getting accessible menus for a role"""
+        """Test getting accessible menus of the current user's role"""
+        UserRoleFactory(user=self.user, role=self.role1)
         url = reverse("api:rolemenuaccess-accessible-menus")
-        response = self.client.get(url, {"role_id": self.role1.pk})
+        response = self.client.get(url, {"role_id": self.role2.pk})
 
         assert response.status_code == status.HTTP_200_OK
         # Should return menu tree structure with only accessible menus
         assert len(response.data) == 2  # noqa: PLR2004
 
+    def test_accessible_menus_without_role(self):
+        """Users without a role cannot ask for another role's menus"""
+        url = reverse("api:rolemenuaccess-accessible-menus")
+        response = self.client.get(url, {"role_id": self.role1.pk})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_grant_access(self):
         """Test granting access to menu"""
         url = reverse("api:rolemenuaccess-grant", kwargs={"pk": self.access3.pk})
@@ -0,0 +1,140 @@
+"""
+Tests for UserRole API endpoints
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from kancraonewms.master.models import UserRole
+from kancraonewms.master.tests.factories import AccessibilityFactory
+from kancraonewms.master.tests.factories import MenuFactory
+from kancraonewms.master.tests.factories import RoleFactory
+from kancraonewms.master.tests.factories import RoleMenuAccessFactory
+from kancraonewms.master.tests.factories import UserRoleFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+from kancraonewms.users.tests.factories import UserFactory
+
+
+class UserRoleViewSetTest(APITestCase):
+    """Tests for UserRole ViewSet"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        cache.clear()
+        self.user = UserFactory(is_superuser=True)
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}",
+        )
+
+        self.role = RoleFactory(code="ADMIN", name="Administrator")
+        self.warehouse = WarehouseFactory()
+        self.assignment = UserRoleFactory(user=self.user, role=self.role)
+
+        self.list_url = reverse("api:userrole-list")
+
+    def test_list_user_roles_success(self):
+        """Test listing user roles"""
+        response = self.client.get(self.list_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]["role_name"] == "Administrator"
+
+    def test_create_warehouse_role_success(self):
+        """Test assigning a role within a warehouse"""
+        data = {
+            "user": self.user.pk,
+            "role": RoleFactory().pk,
+            "warehouse": self.warehouse.pk,
+        }
+        response = self.client.post(self.list_url, data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["warehouse_code"] == self.warehouse.code
+
+    def test_create_second_global_role_fails(self):
+        """Test a user holds at most one global role"""
+        data = {"user": self.user.pk, "role": RoleFactory().pk}
+        response = self.client.post(self.list_url, data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert UserRole.objects.filter(user=self.user).count() == 1
+
+    def test_filter_global_roles(self):
+        """Test filtering global assignments"""
+        UserRoleFactory(user=self.user, warehouse=self.warehouse)
+        response = self.client.get(self.list_url, {"warehouse": "none"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["id"] for row in response.data] == [
+            self.assignment.pk,
+        ]
+
+
+class CurrentUserRoleActionsTest(APITestCase):
+    """Tests for actions defaulting to the current user's role"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        cache.clear()
+        self.user = UserFactory(is_superuser=True)
+        self.role = RoleFactory()
+        UserRoleFactory(user=self.user, role=self.role)
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        self.menu = MenuFactory(parent=None, is_active=True)
+        RoleMenuAccessFactory(role=self.role, menu=self.menu, can_access=True)
+        AccessibilityFactory(
+            role=self.role,
+            module="master",
+            feature="item",
+            permission="read",
+            is_granted=True,
+        )
+
+    def test_accessible_menus_of_current_user(self):
+        """Accessible menus are served from the cache once warm"""
+        url = reverse("api:rolemenuaccess-accessible-menus")
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        # Only the ATOMIC_REQUESTS savepoint is left
+        assert all("SAVEPOINT" in query["sql"] for query in queries)
+        assert [menu["id"] for menu in response.data] == [self.menu.pk]
+
+    def test_by_role_defaults_to_current_user(self):
+        """Accessibilities of the current user's role"""
+        response = self.client.get(reverse("api:accessibility-by-role"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+
+    def test_check_permission(self):
+        """Permission checks resolve the role server-side"""
+        url = reverse("api:accessibility-check")
+        granted = self.client.get(
+            url,
+            {"module": "master", "feature": "item", "permission": "read"},
+        )
+        denied = self.client.get(
+            url,
+            {"module": "master", "feature": "item", "permission": "delete"},
+        )
+
+        assert granted.data == {"permission": "master.item.read", "granted": True}
+        assert denied.data["granted"] is False
+
+    def test_check_permission_requires_params(self):
+        """Module, feature and permission are required"""
+        response = self.client.get(reverse("api:accessibility-check"))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
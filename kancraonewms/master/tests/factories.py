@@ -12,7 +12,9 @@ from kancraonewms.master.models import Menu
 from kancraonewms.master.models import Rack
 from kancraonewms.master.models import Role
 from kancraonewms.master.models import RoleMenuAccess
+from kancraonewms.master.models import UserRole
 from kancraonewms.organizations.tests.factories import WarehouseFactory
+from kancraonewms.users.tests.factories import UserFactory
 
 
 class ItemFactory(DjangoModelFactory):
@@ -118,3 +120,12 @@ class RoleMenuAccessFactory(DjangoModelFactory):
 
     class Meta:
         model = RoleMenuAccess
+
+
+class UserRoleFactory(DjangoModelFactory):
+    user = SubFactory(UserFactory)
+    role = SubFactory(RoleFactory)
+    warehouse = None
+
+    class Meta:
+        model = UserRole
@@ -0,0 +1,119 @@
+"""
+Tests for the rack location code grammar
+"""
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from django.test import TestCase
+
+from kancraonewms.master.location_code import LocationCodeError
+from kancraonewms.master.location_code import component_number
+from kancraonewms.master.location_code import get_grammar
+from kancraonewms.master.location_code import letters_to_number
+from kancraonewms.master.location_code import number_to_letters
+from kancraonewms.master.location_code import validate_location_code_format
+from kancraonewms.master.models import Rack
+from kancraonewms.master.tests.factories import RackFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+
+FORMAT = "Z{zone:d2}-A{aisle:d2}-B{bay:d2}-L{level:d}"
+
+
+class LocationCodeGrammarTest(SimpleTestCase):
+    """Tests for parsing and normalizing codes"""
+
+    def test_parse_normalizes_code(self):
+        """Codes are upper-cased and zero-padded"""
+        location = get_grammar(FORMAT).parse(" z1-a3-b12-l2 ")
+
+        assert location.code == "Z01-A03-B12-L2"
+        assert location.parts == {
+            "zone": "01",
+            "aisle": "03",
+            "bay": "12",
+            "level": "2",
+        }
+        assert location.numbers == {"zone": 1, "aisle": 3, "bay": 12, "level": 2}
+
+    def test_letter_components(self):
+        """Letter components are numbered in base 26"""
+        grammar = get_grammar("{zone:a}{aisle:d3}")
+        location = grammar.parse("ab7")
+
+        assert location.code == "AB007"
+        assert location.numbers == {"zone": 28, "aisle": 7}
+        assert grammar.build(zone=28, aisle=7) == location
+
+    def test_code_not_matching(self):
+        """Codes with another shape are rejected"""
+        with pytest.raises(LocationCodeError):
+            get_grammar(FORMAT).parse("RACK-001")
+
+    def test_invalid_formats(self):
+        """Formats must use known components once and balanced braces"""
+        for pattern in ("plain", "{row:d}", "{zone:d}-{zone:d}", "{zone:x}", "Z{zone"):
+            with pytest.raises(ValidationError):
+                validate_location_code_format(pattern)
+
+    def test_component_number(self):
+        """Free-text components get a natural number"""
+        assert component_number("A07") == 7  # noqa: PLR2004
+        assert component_number("12") == 12  # noqa: PLR2004
+        assert component_number("C") == 3  # noqa: PLR2004
+        assert component_number("") is None
+        assert component_number("-") is None
+
+    def test_letters_round_trip(self):
+        """Letter numbering is bijective"""
+        for number in (1, 26, 27, 702, 703):
+            assert letters_to_number(number_to_letters(number)) == number
+
+
+class RackLocationTest(TestCase):
+    """Tests for location numbers stored on racks"""
+
+    def test_free_text_components(self):
+        """Without a format the numbers come from the component fields"""
+        rack = RackFactory(zone="B", aisle="A10", bay="", level="3")
+
+        assert (rack.zone_no, rack.aisle_no, rack.bay_no, rack.level_no) == (
+            2,
+            10,
+            None,
+            3,
+        )
+
+    def test_code_parsed_with_warehouse_format(self):
+        """With a format the code fills and normalizes the components"""
+        warehouse = WarehouseFactory(location_code_format=FORMAT)
+        rack = RackFactory(warehouse=warehouse, code="z2-a7-b1-l1", zone="", aisle="")
+
+        assert rack.code == "Z02-A07-B01-L1"
+        assert (rack.zone, rack.aisle, rack.bay, rack.level) == ("02", "07", "01", "1")
+        assert (rack.zone_no, rack.aisle_no, rack.bay_no, rack.level_no) == (
+            2,
+            7,
+            1,
+            1,
+        )
+
+    def test_saving_other_fields_skips_warehouse(self):
+        """The grammar is only read when the code changes"""
+        warehouse = WarehouseFactory(location_code_format=FORMAT)
+        rack = RackFactory(warehouse=warehouse, code="z2-a7-b1-l1")
+        rack = Rack.objects.get(pk=rack.pk)
+
+        rack.name = "Renamed"
+        with self.assertNumQueries(1):
+            rack.save()
+        rack.code = "z3-a1-b1-l1"
+        rack.save()
+
+        assert rack.code == "Z03-A01-B01-L1"
+
+    def test_natural_order_uses_location_index(self):
+        """Ordering by warehouse does not join the warehouse table"""
+        sql = str(Rack.objects.natural_order().query)
+
+        assert "organizations_warehouse" not in sql
@@ -0,0 +1,223 @@
+"""
+Tests for compiled role permissions
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from kancraonewms.master.api.permissions import HasAccessibility
+from kancraonewms.master.services import permissions
+from kancraonewms.master.tests.factories import AccessibilityFactory
+from kancraonewms.master.tests.factories import MenuFactory
+from kancraonewms.master.tests.factories import RoleFactory
+from kancraonewms.master.tests.factories import RoleMenuAccessFactory
+from kancraonewms.master.tests.factories import UserRoleFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
+
+
+class CompiledRoleTest(TestCase):
+    """Tests for compiling and caching roles"""
+
+    def setUp(self):
+        cache.clear()
+        self.role = RoleFactory(code="PICKER")
+        AccessibilityFactory(
+            role=self.role,
+            module="master",
+            feature="item",
+            permission="read",
+        )
+        AccessibilityFactory(
+            role=self.role,
+            module="master",
+            feature="item",
+            permission="delete",
+            is_granted=False,
+        )
+        AccessibilityFactory(module="master", feature="rack", permission="update")
+
+        self.parent = MenuFactory(code="MASTER", parent=None, order=1)
+        self.child = MenuFactory(code="ITEM", parent=self.parent, order=1)
+        self.hidden = MenuFactory(code="RACK", parent=self.parent, order=2)
+        RoleMenuAccessFactory(role=self.role, menu=self.parent)
+        RoleMenuAccessFactory(role=self.role, menu=self.child)
+        RoleMenuAccessFactory(role=self.role, menu=self.hidden, can_access=False)
+
+    def test_compiled_role(self):
+        """Granted permissions and accessible menus are compiled"""
+        compiled = permissions.get_role(self.role.pk)
+
+        assert compiled["role"]["code"] == "PICKER"
+        assert compiled["permissions"] == ["master.item.read"]
+        assert [menu["code"] for menu in compiled["menus"]] == ["MASTER"]
+        children = compiled["menus"][0]["children"]
+        assert [menu["code"] for menu in children] == ["ITEM"]
+
+    def test_warm_lookup_runs_no_queries(self):
+        """A compiled role is served from cache"""
+        permissions.get_role(self.role.pk)
+
+        with self.assertNumQueries(0):
+            permissions.get_role(self.role.pk)
+
+    def test_changes_start_new_generation(self):
+        """Granting a permission is visible immediately"""
+        permissions.get_role(self.role.pk)
+        AccessibilityFactory(
+            role=self.role,
+            module="master",
+            feature="rack",
+            permission="update",
+        )
+
+        assert "master.rack.update" in permissions.get_role(self.role.pk)["permissions"]
+
+    def test_inactive_role(self):
+        """Inactive roles compile to nothing"""
+        self.role.is_active = False
+        self.role.save()
+
+        assert permissions.get_role(self.role.pk) is None
+
+    def test_bitmap_claim(self):
+        """The token bitmap answers checks without the compiled role"""
+        claim = permissions.token_claim(self.role.pk)
+
+        with self.assertNumQueries(0):
+            assert permissions.has_permission(None, "master.item.read", claim)
+            assert not permissions.has_permission(None, "master.rack.update", claim)
+            assert not permissions.has_permission(None, "unknown.key.read", claim)
+
+    def test_stale_bitmap_falls_back_to_role(self):
+        """A bitmap from an older generation is ignored"""
+        claim = permissions.token_claim(self.role.pk)
+        permissions.bump_generation()
+
+        assert not permissions.has_permission(None, "master.item.read", claim)
+        assert permissions.has_permission(self.role.pk, "master.item.read", claim)
+
+
+class HasAccessibilityTest(TestCase):
+    """Tests for the Accessibility permission class"""
+
+    def setUp(self):
+        cache.clear()
+        self.role = RoleFactory()
+        AccessibilityFactory(
+            role=self.role,
+            module="master",
+            feature="item",
+            permission="read",
+        )
+        self.user = UserFactory()
+        UserRoleFactory(user=self.user, role=self.role)
+
+    def _request(self, method, data=None):
+        refresh = UserRefreshToken.for_user(self.user)
+        request = getattr(APIRequestFactory(), method)(
+            "/api/items/",
+            data,
+            HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}",
+        )
+
+        class ItemView(APIView):
+            permission_classes = [HasAccessibility]
+            accessibility = ("master", "item")
+            warehouse_scoped = True
+
+            def get(self, request):
+                return Response({})
+
+            def post(self, request):
+                return Response({})
+
+        return ItemView.as_view()(request)
+
+    def test_granted_permission(self):
+        """Reading is allowed with a read accessibility"""
+        assert self._request("get").status_code == status.HTTP_200_OK
+
+    def test_missing_permission(self):
+        """Writing is denied without an update accessibility"""
+        assert self._request("post").status_code == status.HTTP_403_FORBIDDEN
+
+    @override_settings(JWT_PERMISSION_BITMAP=True)
+    def test_warehouse_role_overrides_token_bitmap(self):
+        """The global role's bitmap is not trusted for a warehouse scope"""
+        warehouse, other = WarehouseFactory.create_batch(2)
+        UserRoleFactory(user=self.user, role=RoleFactory(), warehouse=warehouse)
+
+        assert self._request("get").status_code == status.HTTP_200_OK
+        # Warehouses without a role of their own use the global role
+        response = self._request("get", {"warehouse": other.pk})
+        assert response.status_code == status.HTTP_200_OK
+        response = self._request("get", {"warehouse": warehouse.pk})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_warehouse_scope_is_ignored_on_role_administration(self):
+        """A warehouse role cannot be picked to administer global roles"""
+        warehouse = WarehouseFactory()
+        role = RoleFactory()
+        AccessibilityFactory(
+            role=role,
+            module="master",
+            feature="user_role",
+            permission="create",
+        )
+        user = UserFactory()
+        UserRoleFactory(user=user, role=role, warehouse=warehouse)
+        data = {"user": user.pk, "role": role.pk}
+        token = UserRefreshToken.for_user(user).access_token
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+
+        url = f"{reverse('api:userrole-list')}?warehouse={warehouse.pk}"
+        response = self.client.post(url, data)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_superuser_holds_every_permission(self):
+        """Superusers pass without any accessibility"""
+        self.user = UserFactory(is_superuser=True)
+        assert self._request("post").status_code == status.HTTP_200_OK
+
+    def test_drf_token_authentication(self):
+        """Requests authenticated by a DRF token resolve the role server-side"""
+        token = Token.objects.create(user=self.user)
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Token {token.key}"
+
+        response = self.client.get(reverse("api:role-list"))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_viewsets_check_accessibility(self):
+        """Permission administration ViewSets enforce the user's role"""
+        AccessibilityFactory(
+            role=self.role,
+            module="master",
+            feature="role",
+            permission="read",
+        )
+        token = UserRefreshToken.for_user(self.user).access_token
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+
+        # Master data keeps requiring authentication only
+        response = self.client.get(reverse("api:rack-list"))
+        assert response.status_code == status.HTTP_200_OK
+        response = self.client.get(reverse("api:role-list"))
+        assert response.status_code == status.HTTP_200_OK
+        response = self.client.post(reverse("api:role-list"), {})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        # Questions about the user's own role need no grant
+        response = self.client.get(reverse("api:rolemenuaccess-accessible-menus"))
+        assert response.status_code == status.HTTP_200_OK
+        response = self.client.get(reverse("api:userrole-list"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
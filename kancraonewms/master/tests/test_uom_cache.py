@@ -0,0 +1,173 @@
+"""
+Tests for cached UOM and item-UOM lookups
+"""
+
+import time
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from kancraonewms.core import bulk
+from kancraonewms.master.models import ItemUOM
+from kancraonewms.master.services import uom_cache
+from kancraonewms.master.tests.factories import ItemFactory
+from kancraonewms.master.tests.factories import ItemUOMFactory
+from kancraonewms.master.tests.factories import UOMFactory
+from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
+
+
+class UOMCacheTest(TestCase):
+    """Tests for the lookup levels and invalidation"""
+
+    def setUp(self):
+        self.item = ItemFactory()
+        self.box = ItemUOMFactory(
+            item=self.item,
+            conversion_factor=Decimal(12),
+            barcode="8991234567895",
+        )
+        self.piece = ItemUOMFactory(item=self.item, conversion_factor=Decimal(1))
+        ItemUOMFactory(item=self.item, is_active=False)
+        uom_cache.clear_local()
+
+    def _counters(self, kind):
+        return uom_cache.stats()[kind]
+
+    def test_lookup_levels(self):
+        """A lookup hits the database once, then the shared and local caches"""
+        with self.assertNumQueries(1):
+            item_uoms = uom_cache.get_item_uoms(self.item.pk)
+        with self.assertNumQueries(0):
+            assert uom_cache.get_item_uoms(self.item.pk) is item_uoms
+        uom_cache.clear_local()
+        with self.assertNumQueries(0):
+            assert uom_cache.get_item_uoms(self.item.pk) == item_uoms
+
+        assert [item_uom["id"] for item_uom in item_uoms] == [
+            self.piece.pk,
+            self.box.pk,
+        ]
+        assert item_uoms[1]["uom_code"] == self.box.uom.code
+        counters = self._counters("item")
+        assert counters["misses"] >= 1
+        assert counters["local_hits"] >= 1
+        assert counters["shared_hits"] >= 1
+
+    def test_batch_costs_one_query(self):
+        """Misses of a batch are loaded together"""
+        other = ItemUOMFactory().item
+        empty = ItemFactory()
+
+        with self.assertNumQueries(1):
+            item_uoms = uom_cache.get_item_uoms_many(
+                [self.item.pk, other.pk, empty.pk],
+            )
+
+        assert len(item_uoms[self.item.pk]) == 2  # noqa: PLR2004
+        assert len(item_uoms[other.pk]) == 1
+        assert item_uoms[empty.pk] == []
+
+    def test_barcode_and_uom_lookups(self):
+        """Barcodes resolve to active item-UOMs; unknown keys are cached too"""
+        assert uom_cache.get_by_barcode("8991234567895")["id"] == self.box.pk
+        assert uom_cache.get_uom(self.box.uom_id)["code"] == self.box.uom.code
+        assert uom_cache.get_by_barcode("0000000000000") is None
+        uom_cache.clear_local()
+        with self.assertNumQueries(0):
+            assert uom_cache.get_by_barcode("0000000000000") is None
+
+    def test_save_starts_new_generation(self):
+        """Changed item-UOMs and UOMs are read again"""
+        uom_cache.get_item_uoms(self.item.pk)
+        uom_cache.get_uom(self.box.uom_id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.box.conversion_factor = Decimal(6)
+            self.box.save()
+            self.box.uom.name = "Carton"
+            self.box.uom.save()
+
+        factors = [
+            row["conversion_factor"] for row in uom_cache.get_item_uoms(self.item.pk)
+        ]
+        assert factors == [Decimal(1), Decimal(6)]
+        assert uom_cache.get_uom(self.box.uom_id)["name"] == "Carton"
+
+    def test_bulk_update_and_delete_start_new_generation(self):
+        """Bulk deactivation and deletes leave the cached lookups"""
+        uom_cache.get_by_barcode("8991234567895")
+        bulk.update(ItemUOM.objects.filter(pk=self.box.pk), is_active=False)
+        assert uom_cache.get_by_barcode("8991234567895") is None
+
+        uom_cache.get_item_uoms(self.item.pk)
+        self.piece.delete()
+        assert uom_cache.get_item_uoms(self.item.pk) == []
+
+    def test_other_processes_see_changes_within_local_ttl(self):
+        """Local entries of a stale generation are served until they expire"""
+        uom_cache.get_item_uoms(self.item.pk)
+        # Another process changes an item-UOM without touching this one's LRU
+        ItemUOM.objects.filter(pk=self.box.pk).update(is_active=False)
+        uom_cache.cache.set(uom_cache.GENERATION_KEY, "elsewhere", None)
+
+        assert len(uom_cache.get_item_uoms(self.item.pk)) == 2  # noqa: PLR2004
+        later = time.monotonic() + uom_cache.LOCAL_TTL
+        with mock.patch("kancraonewms.core.caching.time.monotonic", return_value=later):
+            assert len(uom_cache.get_item_uoms(self.item.pk)) == 1
+
+    def test_warm_up_command(self):
+        """Warmed lookups are served without queries"""
+        out = StringIO()
+        call_command("warm_uom_cache", "--batch-size=1", stdout=out)
+        uom_cache.clear_local()
+
+        with self.assertNumQueries(0):
+            assert uom_cache.get_item_uoms(self.item.pk)
+            assert uom_cache.get_by_barcode("8991234567895")
+            assert uom_cache.get_uom(self.piece.uom_id)
+        assert out.getvalue().splitlines()[2].split()[:2] == ["item", "1"]
+
+
+class UOMCacheApiTest(APITestCase):
+    """Tests for API paths that bypass model signals and for the metrics"""
+
+    def authenticate(self, **fields):
+        token = UserRefreshToken.for_user(UserFactory(**fields)).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_set_as_base_invalidates(self):
+        """Moving the base UOM is visible to cached lookups"""
+        base = ItemUOMFactory(is_base_uom=True)
+        other = ItemUOMFactory(item=base.item, uom=UOMFactory())
+        uom_cache.get_item_uoms(base.item_id)
+        self.authenticate()
+
+        response = self.client.post(
+            reverse("api:itemuom-set-as-base", args=[other.pk]),
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        flags = {
+            row["id"]: row["is_base_uom"]
+            for row in uom_cache.get_item_uoms(base.item_id)
+        }
+        assert flags == {base.pk: False, other.pk: True}
+
+    def test_metrics(self):
+        """Staff can read the per-process counters"""
+        self.authenticate(is_staff=True)
+        response = self.client.get(reverse("api:uom-cache-metrics"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data["barcode"]) == {"local_hits", "shared_hits", "misses"}
+
+        self.authenticate()
+        response = self.client.get(reverse("api:uom-cache-metrics"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,69 @@
+"""
+Tests for cached user role resolution
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from kancraonewms.master.services import user_roles
+from kancraonewms.master.tests.factories import RoleFactory
+from kancraonewms.master.tests.factories import UserRoleFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+from kancraonewms.users.tests.factories import UserFactory
+
+
+class UserRoleResolverTest(TestCase):
+    """Tests for resolving the role a user acts under"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.warehouse = WarehouseFactory()
+        self.global_role = RoleFactory(code="PICKER")
+        self.warehouse_role = RoleFactory(code="SUPERVISOR")
+        UserRoleFactory(user=self.user, role=self.global_role)
+
+    def test_global_role(self):
+        """Without a warehouse the global role applies"""
+        assert user_roles.get_role_id(self.user.pk) == self.global_role.pk
+        assert (
+            user_roles.get_role_id(self.user.pk, self.warehouse.pk)
+            == self.global_role.pk
+        )
+
+    def test_warehouse_role_wins(self):
+        """A warehouse assignment overrides the global role there"""
+        with self.captureOnCommitCallbacks(execute=True):
+            UserRoleFactory(
+                user=self.user,
+                role=self.warehouse_role,
+                warehouse=self.warehouse,
+            )
+
+        assert (
+            user_roles.get_role_id(self.user.pk, self.warehouse.pk)
+            == self.warehouse_role.pk
+        )
+        assert user_roles.get_role_id(self.user.pk) == self.global_role.pk
+
+    def test_user_without_role(self):
+        """Users without assignments have no role"""
+        assert user_roles.get_role_id(UserFactory().pk) is None
+        assert user_roles.get_role_id(None) is None
+
+    def test_warm_lookup_runs_no_queries(self):
+        """Resolved assignments are served from the cache"""
+        user_roles.get_role_id(self.user.pk)
+
+        with self.assertNumQueries(0):
+            assert user_roles.get_role_id(self.user.pk) == self.global_role.pk
+
+    def test_assignment_change_invalidates(self):
+        """Changing an assignment is visible on the next lookup"""
+        user_roles.get_role_id(self.user.pk)
+        assignment = self.user.role_assignments.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment.role = self.warehouse_role
+            assignment.save()
+
+        assert user_roles.get_role_id(self.user.pk) == self.warehouse_role.pk
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 
+from kancraonewms.core import bulk
+
 from .models import Company
 from .models import Warehouse
 
@@ -27,12 +29,12 @@ class CompanyAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Activate selected companies"))
     def activate_companies(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = bulk.update(queryset, is_active=True)
         self.message_user(request, _(f"{updated} companies activated successfully."))  # noqa: INT001
 
     @admin.action(description=_("Deactivate selected companies"))
     def deactivate_companies(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = bulk.update(queryset, is_active=False)
         self.message_user(request, _(f"{updated} companies deactivated successfully."))  # noqa: INT001
 
     fieldsets = (
@@ -99,12 +101,12 @@ class WarehouseAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Activate selected warehouses"))
     def activate_warehouses(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = bulk.update(queryset, is_active=True)
         self.message_user(request, _(f"{updated} warehouses activated successfully."))  # noqa: INT001
 
     @admin.action(description=_("Deactivate selected warehouses"))
     def deactivate_warehouses(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = bulk.update(queryset, is_active=False)
         self.message_user(request, _(f"{updated} warehouses deactivated successfully."))  # noqa: INT001
 
     fieldsets = (
@@ -136,7 +138,7 @@ class WarehouseAdmin(admin.ModelAdmin):
         (
             _("Settings"),
             {
-                "fields": ("is_active", "is_default"),
+                "fields": ("is_active", "is_default", "location_code_format"),
             },
         ),
         (
@@ -29,6 +29,7 @@ class WarehouseSerializer(serializers.ModelSerializer):
             "email",
             "is_active",
             "is_default",
+            "location_code_format",
             "created_at",
             "updated_at",
         ]
@@ -75,6 +76,7 @@ class WarehouseCreateUpdateSerializer(serializers.ModelSerializer):
             "email",
             "is_active",
             "is_default",
+            "location_code_format",
         ]
 
     def validate_code(self, value):
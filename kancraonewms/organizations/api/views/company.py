@@ -9,6 +9,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from kancraonewms.core.bulk import bulk_action
 from kancraonewms.organizations.api.serializers import CompanyListSerializer
 from kancraonewms.organizations.api.serializers import CompanySerializer
 from kancraonewms.organizations.models import Company
@@ -79,3 +80,6 @@ class CompanyViewSet(
         company.save()
         serializer = self.get_serializer(company)
         return Response(serializer.data)
+
+    bulk_activate = bulk_action("bulk-activate", is_active=True)
+    bulk_deactivate = bulk_action("bulk-deactivate", is_active=False)
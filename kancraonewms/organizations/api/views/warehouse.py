@@ -1,4 +1,6 @@
+from django.db import IntegrityError
 from django.db.models import Q
+from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.mixins import CreateModelMixin
 from rest_framework.mixins import DestroyModelMixin
@@ -9,6 +11,12 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from kancraonewms.core.bulk import bulk_action
+from kancraonewms.core.flags import set_exclusive_flag
+from kancraonewms.master.api.serializers import RackGenerateSerializer
+from kancraonewms.master.location_code import LocationCodeError
+from kancraonewms.master.services.rack_layout import RackLayoutError
+from kancraonewms.master.services.rack_layout import generate_racks
 from kancraonewms.organizations.api.serializers import WarehouseCreateUpdateSerializer
 from kancraonewms.organizations.api.serializers import WarehouseListSerializer
 from kancraonewms.organizations.api.serializers import WarehouseSerializer
@@ -33,6 +41,8 @@ class WarehouseViewSet(
             return WarehouseListSerializer
         if self.action in ["create", "update", "partial_update"]:
             return WarehouseCreateUpdateSerializer
+        if self.action == "generate_racks":
+            return RackGenerateSerializer
         return WarehouseSerializer
 
     def get_queryset(self):
@@ -97,11 +107,44 @@ class WarehouseViewSet(
     def set_as_default(self, request, pk=None):
         """Set this warehouse as the default for its company"""
         warehouse = self.get_object()
-        warehouse.is_default = True
-        warehouse.save()
+        set_exclusive_flag(Warehouse, "is_default", "company", [warehouse.pk])
+        warehouse.refresh_from_db()
         serializer = self.get_serializer(warehouse)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["post"], url_path="generate-racks")
+    def generate_racks(self, request, pk=None):
+        """Generate every rack of a zones x aisles x bays x levels layout"""
+        warehouse = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        options = {
+            key: value
+            for key, value in serializer.validated_data.items()
+            if key not in serializer.DIMENSIONS and key != "code_format"
+        }
+
+        try:
+            created = generate_racks(
+                warehouse,
+                serializer.ranges,
+                code_format=serializer.validated_data.get("code_format"),
+                **options,
+            )
+        except RackLayoutError as exc:
+            data = {"error": str(exc)}
+            if exc.conflicts:
+                data["conflicts"] = exc.conflicts
+            return Response(data, status=status.HTTP_400_BAD_REQUEST)
+        except LocationCodeError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            return Response(
+                {"error": "Some rack codes were created concurrently, try again."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response({"created": created}, status=status.HTTP_201_CREATED)
+
     @action(detail=False, methods=["get"])
     def by_company(self, request):
         """Get warehouses grouped by company"""
@@ -112,3 +155,6 @@ class WarehouseViewSet(
         warehouses = self.get_queryset().filter(company_id=company_id)
         serializer = self.get_serializer(warehouses, many=True)
         return Response(serializer.data)
+
+    bulk_activate = bulk_action("bulk-activate", is_active=True)
+    bulk_deactivate = bulk_action("bulk-deactivate", is_active=False)
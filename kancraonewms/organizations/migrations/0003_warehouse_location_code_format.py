@@ -0,0 +1,19 @@
+# Generated by Django 5.2.11 on 2026-10-19 16:16
+
+import kancraonewms.master.location_code
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0002_warehouse'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='warehouse',
+            name='location_code_format',
+            field=models.CharField(blank=True, help_text='Grammar of rack codes, e.g. Z{zone:d2}-A{aisle:d2}-B{bay:d2}-L{level:d}', max_length=100, validators=[kancraonewms.master.location_code.validate_location_code_format], verbose_name='Location Code Format'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.11 on 2026-10-19 16:27
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def keep_latest_default(apps, schema_editor):
+    # Older saves could leave several flagged rows per company; keep the
+    # most recently updated one so the unique index can be created.
+    Warehouse = apps.get_model('organizations', 'Warehouse')
+    duplicated = (
+        Warehouse.objects.filter(is_default=True)
+        .order_by()
+        .values('company_id')
+        .annotate(flagged=Count('id'))
+        .filter(flagged__gt=1)
+        .values_list('company_id', flat=True)
+    )
+    for parent_id in duplicated:
+        flagged = Warehouse.objects.filter(company_id=parent_id, is_default=True)
+        keep = flagged.order_by('-updated_at', '-id').values_list('id', flat=True)[0]
+        flagged.exclude(id=keep).update(is_default=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0003_warehouse_location_code_format'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_default, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='warehouse',
+            constraint=models.UniqueConstraint(models.F('company'), condition=models.Q(('is_default', True)), name='organizations_warehouse_one_default'),
+        ),
+    ]
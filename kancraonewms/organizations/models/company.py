@@ -1,8 +1,10 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from kancraonewms.audit.mixins import AuditedModelMixin
 
-class Company(models.Model):
+
+class Company(AuditedModelMixin, models.Model):
     """Model untuk Company/Organization"""
 
     COMPANY_TYPE_CHOICES = [
@@ -1,11 +1,24 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from kancraonewms.core.flags import ExclusiveFlagMixin
+from kancraonewms.core.flags import exclusive_flag_constraint
+from kancraonewms.master.location_code import get_grammar
+from kancraonewms.master.location_code import validate_location_code_format
+
 from .company import Company
 
 
-class Warehouse(models.Model):
-    """Model untuk Warehouse yang terhubung dengan Company"""
+class Warehouse(ExclusiveFlagMixin, models.Model):
+    """
+    Model untuk Warehouse yang terhubung dengan Company
+
+    A company has at most one default warehouse; the database enforces it
+    and saving a new default clears the previous one.
+    """
+
+    exclusive_flag = "is_default"
+    exclusive_flag_parent = "company"
 
     company = models.ForeignKey(
         Company,
@@ -94,6 +107,15 @@ class Warehouse(models.Model):
         default=False,
         help_text=_("Whether this is the default warehouse for the company"),
     )
+    location_code_format = models.CharField(
+        _("Location Code Format"),
+        max_length=100,
+        blank=True,
+        validators=[validate_location_code_format],
+        help_text=_(
+            "Grammar of rack codes, e.g. Z{zone:d2}-A{aisle:d2}-B{bay:d2}-L{level:d}",
+        ),
+    )
 
     # Timestamps
     created_at = models.DateTimeField(
@@ -113,16 +135,20 @@ class Warehouse(models.Model):
             models.Index(fields=["company", "code"]),
             models.Index(fields=["is_active"]),
         ]
+        constraints = [
+            exclusive_flag_constraint(
+                "company",
+                "is_default",
+                name="organizations_warehouse_one_default",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.code} - {self.name} ({self.company.name})"
 
-    def save(self, *args, **kwargs):
-        """Override save to ensure only one default warehouse per company"""
-        if self.is_default:
-            # Set all other warehouses of the same company to non-default
-            Warehouse.objects.filter(
-                company=self.company,
-                is_default=True,
-            ).exclude(pk=self.pk).update(is_default=False)
-        super().save(*args, **kwargs)
+    @property
+    def location_code_grammar(self):
+        """Compiled rack code grammar, or None when codes are free text"""
+        if not self.location_code_format:
+            return None
+        return get_grammar(self.location_code_format)
@@ -0,0 +1,144 @@
+"""
+Tests for Warehouse API endpoints
+"""
+
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from kancraonewms.master.models import Rack
+from kancraonewms.master.tests.factories import RackFactory
+from kancraonewms.organizations.tests.factories import WarehouseFactory
+from kancraonewms.users.tests.factories import UserFactory
+
+
+class WarehouseGenerateRacksTest(APITestCase):
+    """Tests for generating racks from a warehouse layout"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.user = UserFactory()
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}",
+        )
+
+        self.warehouse = WarehouseFactory(
+            code="WH-001",
+            location_code_format="Z{zone:d2}-A{aisle:d2}-B{bay:d2}-L{level:d}",
+        )
+        self.url = reverse(
+            "api:warehouse-generate-racks",
+            kwargs={"pk": self.warehouse.pk},
+        )
+
+    def test_generate_racks_success(self):
+        """Test every combination of the layout becomes a rack"""
+        data = {
+            "zones": {"end": 2},
+            "aisles": {"start": 3, "end": 5},
+            "bays": {"end": 4},
+            "levels": {"end": 2},
+            "capacity": "10.00",
+        }
+
+        response = self.client.post(self.url, data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["created"] == 2 * 3 * 4 * 2
+        racks = Rack.objects.filter(warehouse=self.warehouse)
+        assert racks.count() == 2 * 3 * 4 * 2
+        rack = racks.get(code="Z02-A05-B04-L2")
+        assert (rack.zone, rack.aisle, rack.bay, rack.level) == ("02", "05", "04", "2")
+        assert (rack.zone_no, rack.aisle_no, rack.bay_no, rack.level_no) == (
+            2,
+            5,
+            4,
+            2,
+        )
+        assert rack.capacity == Decimal("10.00")
+        assert rack.is_active
+
+    def test_generate_racks_default_format(self):
+        """Test warehouses without a format get codes prefixed by their code"""
+        warehouse = WarehouseFactory(code="WH-002")
+        url = reverse("api:warehouse-generate-racks", kwargs={"pk": warehouse.pk})
+
+        response = self.client.post(
+            url,
+            {"aisles": {"end": 2}, "levels": {"end": 3}},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Rack.objects.filter(code="WH-002-Z01-A02-B01-L3").exists()
+
+    def test_generate_racks_code_too_long(self):
+        """Test codes longer than the rack code column are rejected"""
+        warehouse = WarehouseFactory(code="W" * 40)
+        url = reverse("api:warehouse-generate-racks", kwargs={"pk": warehouse.pk})
+
+        response = self.client.post(url, {"aisles": {"end": 2}}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "longer than 50" in response.data["error"]
+        assert not Rack.objects.filter(warehouse=warehouse).exists()
+
+    def test_generate_racks_existing_codes(self):
+        """Test nothing is created when a generated code already exists"""
+        RackFactory(code="Z01-A02-B01-L1", warehouse=self.warehouse)
+
+        response = self.client.post(
+            self.url,
+            {"zones": {"end": 1}, "aisles": {"end": 3}},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["conflicts"] == ["Z01-A02-B01-L1"]
+        assert Rack.objects.filter(warehouse=self.warehouse).count() == 1
+
+    def test_generate_racks_dimension_not_in_format(self):
+        """Test a varying dimension must be part of the code format"""
+        response = self.client.post(
+            self.url,
+            {"aisles": {"end": 3}, "code_format": "R{zone:d2}"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Rack.objects.exists()
+
+    def test_generate_racks_invalid_layout(self):
+        """Test layouts need a dimension and ordered ranges"""
+        response = self.client.post(self.url, {}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = self.client.post(
+            self.url,
+            {"aisles": {"start": 5, "end": 2}},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_generate_racks_too_many(self):
+        """Test layouts above the limit are rejected"""
+        response = self.client.post(
+            self.url,
+            {"zones": {"end": 99}, "aisles": {"end": 99}, "bays": {"end": 99}},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Rack.objects.exists()
+
+    def test_generate_racks_unauthenticated(self):
+        """Test generating racks requires authentication"""
+        self.client.credentials()
+
+        response = self.client.post(self.url, {"zones": {"end": 1}}, format="json")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
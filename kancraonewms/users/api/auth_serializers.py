@@ -1,7 +1,16 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (
+    TokenRefreshSerializer as BaseTokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from kancraonewms.users.authentication import get_cached_user
+from kancraonewms.users.tokens import UserRefreshToken
+from kancraonewms.users.tokens import user_claims
 
 User = get_user_model()
 
@@ -55,6 +64,7 @@ class RegisterSerializer(serializers.ModelSerializer):
 class LoginSerializer(TokenObtainPairSerializer):
     """Serializer untuk login dengan JWT token"""
 
+    token_class = UserRefreshToken
     username = serializers.CharField(required=True)
     password = serializers.CharField(required=True, write_only=True)
 
@@ -76,6 +86,41 @@ class LoginSerializer(TokenObtainPairSerializer):
         return data
 
 
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """
+    Serializer untuk refresh token
+
+    Checks the user through the authentication cache and rotates the token
+    against the Redis blacklist, so a refresh needs no database query.
+    """
+
+    token_class = UserRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = get_cached_user(refresh[api_settings.USER_ID_CLAIM])
+        # Re-stamped so a change (e.g. losing staff status) reaches the
+        # next access token instead of lasting until the next login
+        for claim, value in user_claims(user).items():
+            refresh[claim] = value
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION and not refresh.blacklist():
+                # Another request rotated this token first
+                msg = "Token is blacklisted"
+                raise TokenError(msg)
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+            data["refresh"] = str(refresh)
+
+        return data
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """Serializer untuk ubah password"""
 
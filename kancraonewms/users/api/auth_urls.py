@@ -1,5 +1,6 @@
 from django.urls import path
 
+from .auth_views import BootstrapView
 from .auth_views import ChangePasswordView
 from .auth_views import CustomTokenRefreshView
 from .auth_views import GetMeView
@@ -17,6 +18,7 @@ urlpatterns = [
     path("login/", LoginView.as_view(), name="login"),
     path("logout/", LogoutView.as_view(), name="logout"),
     path("me/", GetMeView.as_view(), name="me"),
+    path("me/bootstrap/", BootstrapView.as_view(), name="me-bootstrap"),
     # Token Management
     path("token/refresh/", CustomTokenRefreshView.as_view(), name="token-refresh"),
     # Password Management
@@ -1,7 +1,5 @@
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_decode
 from django.utils.http import urlsafe_base64_encode
@@ -11,15 +9,23 @@ from rest_framework.permissions import AllowAny
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from kancraonewms.core.throttling import AuthIPThrottle
+from kancraonewms.core.throttling import AuthUsernameThrottle
+from kancraonewms.core.throttling import TokenBucketThrottle
+from kancraonewms.master.services import permissions
+from kancraonewms.master.services import user_roles
+from kancraonewms.users.tasks import send_password_reset_email
+from kancraonewms.users.tokens import UserRefreshToken
+
 from .auth_serializers import ChangePasswordSerializer
 from .auth_serializers import LoginSerializer
 from .auth_serializers import RegisterSerializer
 from .auth_serializers import ResetPasswordConfirmSerializer
 from .auth_serializers import ResetPasswordRequestSerializer
+from .auth_serializers import TokenRefreshSerializer
 from .auth_serializers import UserProfileSerializer
 
 User = get_user_model()
@@ -32,6 +38,7 @@ class RegisterView(generics.CreateAPIView):
 
     queryset = User.objects.all()
     permission_classes = (AllowAny,)
+    throttle_classes = (AuthIPThrottle, AuthUsernameThrottle)
     serializer_class = RegisterSerializer
 
     def create(self, request, *args, **kwargs):
@@ -40,7 +47,7 @@ class RegisterView(generics.CreateAPIView):
         user = serializer.save()
 
         # Generate JWT tokens untuk user baru
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
 
         return Response(
             {
@@ -67,6 +74,7 @@ class LoginView(TokenObtainPairView):
     """
 
     permission_classes = (AllowAny,)
+    throttle_classes = (AuthIPThrottle, AuthUsernameThrottle)
     serializer_class = LoginSerializer
 
 
@@ -86,7 +94,7 @@ class LogoutView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            token = RefreshToken(refresh_token)
+            token = UserRefreshToken(refresh_token)
             token.blacklist()
 
             return Response(
@@ -112,6 +120,30 @@ class GetMeView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class BootstrapView(APIView):
+    """
+    API endpoint untuk data awal frontend dalam satu request
+    Returns: profile user, role, permissions dan menu tree yang bisa diakses
+    Role diambil dari assignment user (``?warehouse=`` untuk role per warehouse)
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        compiled = permissions.get_role(
+            user_roles.get_request_role_id(request, warehouse_scoped=True),
+        )
+        return Response(
+            {
+                "user": UserProfileSerializer(request.user).data,
+                "role": compiled["role"] if compiled else None,
+                "permissions": compiled["permissions"] if compiled else [],
+                "menus": compiled["menus"] if compiled else [],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class ChangePasswordView(APIView):
     """
     API endpoint untuk ubah password user yang sedang login
@@ -136,10 +168,12 @@ class ChangePasswordView(APIView):
 class ResetPasswordRequestView(APIView):
     """
     API endpoint untuk request reset password
-    Mengirim email dengan token reset password
+    Mengirim email dengan token reset password lewat Celery task
     """
 
     permission_classes = (AllowAny,)
+    throttle_classes = (AuthIPThrottle, AuthUsernameThrottle)
+    throttle_username_field = "email"
 
     def post(self, request):
         serializer = ResetPasswordRequestSerializer(data=request.data)
@@ -151,17 +185,9 @@ class ResetPasswordRequestView(APIView):
             token = default_token_generator.make_token(user)
             uid = urlsafe_base64_encode(force_bytes(user.pk))
 
-            # Kirim email (customize sesuai kebutuhan)
-            reset_url = f"{settings.FRONTEND_URL}/reset-password/{uid}/{token}/"
-
+            # Kirim email; link reset dibuat di task dari user id
             try:
-                send_mail(
-                    subject="Reset Password Request",
-                    message=f"Click this link to reset your password: {reset_url}",
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[email],
-                    fail_silently=False,
-                )
+                send_password_reset_email.delay(user.pk)
                 return Response(
                     {
                         "message": "Password reset email has been sent",
@@ -227,3 +253,6 @@ class CustomTokenRefreshView(TokenRefreshView):
     """
 
     permission_classes = (AllowAny,)
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = "token_refresh"
+    serializer_class = TokenRefreshSerializer
@@ -0,0 +1,114 @@
+"""
+Stateless JWT authentication for the API.
+
+simplejwt's ``JWTAuthentication`` loads the user row on every request. Tokens
+issued by this project carry the attributes API views routinely check
+(see :func:`kancraonewms.users.tokens.user_claims`), so
+``JWTStatelessUserAuthentication`` is used with :class:`LazyUser` as the
+token user: identity and staff checks are answered from the signed claims and
+the full ``User`` is only fetched, from a short-lived cache entry or the
+database, the first time a view touches anything else. The cache entry holds
+``USER_CACHE_FIELDS`` only; other fields, the password hash above all, are
+deferred and read from the database by the rare views that need them.
+
+A deactivated user fails as soon as the full user is loaded, but tokens that
+never need it keep working until they expire (``ACCESS_TOKEN_LIFETIME``).
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.functional import SimpleLazyObject
+from django.utils.functional import empty
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+USER_CACHE_KEY = "users:auth-user-fields:{}"
+# In model field order, as ``Model.from_db`` expects for a subset of fields
+USER_CACHE_FIELDS = (
+    "id",
+    "is_superuser",
+    "username",
+    "email",
+    "is_staff",
+    "is_active",
+    "name",
+)
+
+
+def get_cached_user(user_id):
+    """Return the active user ``user_id``, cached for AUTH_USER_CACHE_TIMEOUT"""
+    key = USER_CACHE_KEY.format(user_id)
+    values = cache.get(key)
+    if values is None:
+        values = (
+            get_user_model()
+            .objects.filter(pk=user_id)
+            .values_list(*USER_CACHE_FIELDS)
+            .first()
+        )
+        if values is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        cache.set(key, values, settings.AUTH_USER_CACHE_TIMEOUT)
+    # Saving a partly loaded instance only writes the loaded fields
+    user = get_user_model().from_db(DEFAULT_DB_ALIAS, USER_CACHE_FIELDS, values)
+    if not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    return user
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(user_id))
+
+
+class LazyUser(SimpleLazyObject):
+    """
+    Request user backed by a validated access token.
+
+    Claims present in the token are served without a query; any other
+    attribute loads the user through :func:`get_cached_user`. Once loaded the
+    object behaves as the ``User`` instance, so it can be assigned to foreign
+    keys or passed to serializers.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        self.__dict__["token"] = token
+        super().__init__(lambda: get_cached_user(self.id))
+
+    def _claim(self, name):
+        token = self.__dict__["token"]
+        if name in token:
+            return token[name]
+        if self._wrapped is empty:
+            self._setup()
+        return getattr(self._wrapped, name)
+
+    @property
+    def id(self):
+        return int(self.__dict__["token"][api_settings.USER_ID_CLAIM])
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def username(self):
+        return self._claim("username")
+
+    @property
+    def is_staff(self):
+        return self._claim("is_staff")
+
+    def __bool__(self):
+        return True
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return self.username
@@ -0,0 +1,58 @@
+"""
+Password hashing on a bounded thread pool.
+
+Argon2 is deliberately expensive: with Django's defaults every hash takes
+about 100 MB of memory and tens of milliseconds of CPU. Under the ASGI worker
+each request runs its sync view in its own thread, so a burst of logins would
+hash in as many threads at once and exhaust memory long before CPU.
+:class:`PooledArgon2PasswordHasher` hands every hash and verification to a
+process-wide pool of ``PASSWORD_HASHING_WORKERS`` threads; argon2 releases the
+GIL, so the pool uses every core while excess logins wait in its queue.
+
+Costs are read from ``PASSWORD_HASHING_ARGON2`` settings. Changing them
+upgrades stored hashes on the next successful login (``must_update``).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the password hashing pool, created on first use"""
+    global _executor  # noqa: PLW0603
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS,
+                    thread_name_prefix="password-hashing",
+                )
+    return _executor
+
+
+class PooledArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 hasher with configurable costs, run on the hashing pool"""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_HASHING_ARGON2["time_cost"]
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_HASHING_ARGON2["memory_cost"]
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_HASHING_ARGON2["parallelism"]
+
+    def encode(self, password, salt):
+        return get_executor().submit(super().encode, password, salt).result()
+
+    def verify(self, password, encoded):
+        return get_executor().submit(super().verify, password, encoded).result()
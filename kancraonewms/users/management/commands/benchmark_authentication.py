@@ -0,0 +1,80 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+
+from kancraonewms.core.caching import isolated_cache
+from kancraonewms.master.api.views import ItemUOMViewSet
+from kancraonewms.master.models import UOM
+from kancraonewms.master.models import Item
+from kancraonewms.master.models import ItemUOM
+from kancraonewms.users.models import User
+from kancraonewms.users.tokens import UserRefreshToken
+
+BARCODE = "8990000000017"
+AUTHENTICATORS = {
+    "database": JWTAuthentication,
+    "stateless": JWTStatelessUserAuthentication,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-request latency of a barcode lookup authenticated by "
+        "loading the user row against claims-based stateless authentication. "
+        "Runs in a transaction that is rolled back, each pass against a cold "
+        "cache namespace of its own."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'authentication':>14} {'queries/req':>11} {'mean ms':>9} {'p95 ms':>9}",
+        )
+        with transaction.atomic():
+            token = self._seed()
+            for name, authentication in AUTHENTICATORS.items():
+                self._measure(name, authentication, token, options["requests"])
+            transaction.set_rollback(True)
+
+    def _seed(self):
+        user = User.objects.create_user(username="bench-auth", password=None)
+        item = Item.objects.create(code="BENCH-AUTH", name="Benchmark", unit="pcs")
+        uom = UOM.objects.create(code="BENCH-AUTH", name="Benchmark")
+        ItemUOM.objects.create(item=item, uom=uom, barcode=BARCODE, is_base_uom=True)
+        return str(UserRefreshToken.for_user(user).access_token)
+
+    def _measure(self, name, authentication, token, requests):
+        with isolated_cache("benchmark-authentication"):
+            self._run(name, authentication, token, requests)
+
+    def _run(self, name, authentication, token, requests):
+        view = ItemUOMViewSet.as_view(
+            {"get": "list"},
+            authentication_classes=[authentication],
+        )
+        factory = APIRequestFactory()
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(requests):
+                request = factory.get(
+                    "/api/item-uoms/",
+                    {"search": BARCODE},
+                    HTTP_AUTHORIZATION=f"Bearer {token}",
+                )
+                started = time.perf_counter()
+                view(request).render()
+                timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f"{name:>14} {len(queries) / requests:>11.1f} "
+            f"{statistics.mean(timings):>9.3f} "
+            f"{statistics.quantiles(timings, n=20)[-1]:>9.3f}",
+        )
@@ -0,0 +1,94 @@
+import os
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from kancraonewms.users.api.auth_serializers import LoginSerializer
+from kancraonewms.users.models import User
+
+PREFIX = "bench-login"
+PASSWORD = "Bench-Login-Storm-1"  # noqa: S105
+
+
+class Command(BaseCommand):
+    help = (
+        "Log in concurrently with the configured password hasher and report "
+        "logins per second per core. Creates and removes its own users."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            default="1,4,16,64",
+            help="Comma separated numbers of concurrent clients to run",
+        )
+        parser.add_argument("--duration", type=float, default=10.0)
+        parser.add_argument("--users", type=int, default=100)
+
+    def handle(self, *args, **options):
+        self._cleanup()
+        encoded = make_password(PASSWORD)
+        usernames = [f"{PREFIX}-{index}" for index in range(options["users"])]
+        User.objects.bulk_create(
+            User(username=username, password=encoded) for username in usernames
+        )
+        cores = os.cpu_count()
+        self.stdout.write(
+            f"{cores} cores, {settings.PASSWORD_HASHING_WORKERS} hashing threads, "
+            f"hasher {get_hasher().algorithm}",
+        )
+        self.stdout.write(
+            f"{'clients':>7} {'logins':>7} {'per sec':>8} {'per core':>9} "
+            f"{'p50 ms':>8} {'p95 ms':>8}",
+        )
+        try:
+            for clients in sorted({int(v) for v in options["concurrency"].split(",")}):
+                timings = self._run(usernames, clients, options["duration"])
+                per_second = len(timings) / options["duration"]
+                quantiles = statistics.quantiles(timings, n=20)
+                self.stdout.write(
+                    f"{clients:>7} {len(timings):>7} {per_second:>8.1f} "
+                    f"{per_second / cores:>9.1f} {quantiles[9]:>8.1f} "
+                    f"{quantiles[-1]:>8.1f}",
+                )
+        finally:
+            self._cleanup()
+
+    def _run(self, usernames, clients, duration):
+        deadline = time.monotonic() + duration
+        timings = []
+
+        def client(offset):
+            index = offset
+            try:
+                while time.monotonic() < deadline:
+                    username = usernames[index % len(usernames)]
+                    started = time.perf_counter()
+                    serializer = LoginSerializer(
+                        data={"username": username, "password": PASSWORD},
+                    )
+                    serializer.is_valid(raise_exception=True)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    index += clients
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=client, args=(offset,)) for offset in range(clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return timings
+
+    def _cleanup(self):
+        OutstandingToken.objects.filter(user__username__startswith=PREFIX).delete()
+        User.objects.filter(username__startswith=PREFIX).delete()
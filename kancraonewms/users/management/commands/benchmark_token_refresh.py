@@ -0,0 +1,77 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.serializers import (
+    TokenRefreshSerializer as DatabaseTokenRefreshSerializer,
+)
+
+from kancraonewms.core.caching import isolated_cache
+from kancraonewms.users.api.auth_serializers import TokenRefreshSerializer
+from kancraonewms.users.models import User
+from kancraonewms.users.tokens import UserRefreshToken
+
+SERIALIZERS = {
+    "database": DatabaseTokenRefreshSerializer,
+    "redis": TokenRefreshSerializer,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare refresh token rotation against the token_blacklist tables "
+        "and the Redis blacklist, for one minute worth of logins at the given "
+        "rate. Runs in a transaction that is rolled back, each pass against a "
+        "cold cache namespace of its own that is deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--logins-per-minute",
+            type=int,
+            default=1000,
+            help="Logins (and so refreshes) to replay",
+        )
+        parser.add_argument("--users", type=int, default=100)
+
+    def handle(self, *args, **options):
+        logins = options["logins_per_minute"]
+        self.stdout.write(
+            f"{'blacklist':>9} {'queries/req':>11} {'mean ms':>9} {'p95 ms':>9} "
+            f"{'refresh/s':>10} {'headroom':>9}",
+        )
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                User(username=f"bench-refresh-{index}")
+                for index in range(options["users"])
+            )
+            for name, serializer_class in SERIALIZERS.items():
+                tokens = [
+                    str(UserRefreshToken.for_user(users[index % len(users)]))
+                    for index in range(logins)
+                ]
+                self._measure(name, serializer_class, tokens, logins)
+            transaction.set_rollback(True)
+
+    def _measure(self, name, serializer_class, tokens, logins):
+        with isolated_cache("benchmark-token-refresh"):
+            self._run(name, serializer_class, tokens, logins)
+
+    def _run(self, name, serializer_class, tokens, logins):
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for token in tokens:
+                started = time.perf_counter()
+                serializer = serializer_class(data={"refresh": token})
+                serializer.is_valid(raise_exception=True)
+                timings.append((time.perf_counter() - started) * 1000)
+        per_second = len(timings) / (sum(timings) / 1000)
+        self.stdout.write(
+            f"{name:>9} {len(queries) / len(tokens):>11.1f} "
+            f"{statistics.mean(timings):>9.3f} "
+            f"{statistics.quantiles(timings, n=20)[-1]:>9.3f} "
+            f"{per_second:>10.1f} {per_second * 60 / logins:>8.1f}x",
+        )
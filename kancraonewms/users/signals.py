@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from . import blacklist
+from .authentication import invalidate_cached_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_authenticated_user(sender, instance, **kwargs):
+    """Drop the cached user loaded by stateless authentication"""
+    # Again after commit, a concurrent request may have cached the old row
+    invalidate_cached_user(instance.pk)
+    transaction.on_commit(lambda: invalidate_cached_user(instance.pk))
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def blacklist_outstanding_token(sender, instance, created, **kwargs):
+    """Honour tokens blacklisted through the admin in the Redis blacklist"""
+    if created:
+        token = instance.token
+        blacklist.add(token.jti, token.expires_at.timestamp())
@@ -1,9 +1,64 @@
+from smtplib import SMTPException
+
 from celery import shared_task
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import send_mail
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
 
 from .models import User
 
+PRUNE_BATCH_SIZE = 5000
+EMAIL_MAX_RETRIES = 5
+
 
 @shared_task()
 def get_users_count():
     """A pointless Celery task to demonstrate usage."""
     return User.objects.count()
+
+
+@shared_task()
+def prune_outstanding_tokens(batch_size=PRUNE_BATCH_SIZE):
+    """
+    Hourly: delete expired outstanding tokens and their blacklist entries.
+
+    Deletes in batches of ``batch_size`` rows so no single statement holds
+    locks on the whole table. Returns the number of tokens deleted.
+    """
+    expired = OutstandingToken.objects.filter(expires_at__lte=aware_utcnow())
+    deleted = 0
+    while batch := list(expired.values_list("id", flat=True)[:batch_size]):
+        OutstandingToken.objects.filter(id__in=batch).delete()
+        deleted += len(batch)
+    return deleted
+
+
+@shared_task(
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    retry_kwargs={"max_retries": EMAIL_MAX_RETRIES},
+)
+def send_password_reset_email(user_id):
+    """
+    Send the reset password link, retrying transient mail failures.
+
+    The link is built here from the user id so that no live reset token
+    travels through the broker or shows up in task events.
+    """
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    token = default_token_generator.make_token(user)
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    reset_url = f"{settings.FRONTEND_URL}/reset-password/{uid}/{token}/"
+    send_mail(
+        subject="Reset Password Request",
+        message=f"Click this link to reset your password: {reset_url}",
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email],
+        fail_silently=False,
+    )
@@ -6,6 +6,8 @@ from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from django.core.cache import cache
 from django.test import override_settings
 from django.urls import reverse
 from django.utils.encoding import force_bytes
@@ -14,7 +16,14 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from kancraonewms.master.services import permissions
+from kancraonewms.master.tests.factories import AccessibilityFactory
+from kancraonewms.master.tests.factories import MenuFactory
+from kancraonewms.master.tests.factories import RoleFactory
+from kancraonewms.master.tests.factories import RoleMenuAccessFactory
+from kancraonewms.master.tests.factories import UserRoleFactory
 from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
 
 User = get_user_model()
 
@@ -152,6 +161,16 @@ class LoginViewTest(APITestCase):
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_login_throttled_per_username(self):
+        """Test repeated attempts on one username are throttled"""
+        data = {"username": "testuser", "password": "WrongPassword123!"}
+        for _ in range(5):
+            self.client.post(self.url, data)
+        response = self.client.post(self.url, data)
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert "Retry-After" in response
+
 
 class LogoutViewTest(APITestCase):
     """Tests for logout endpoint"""
@@ -243,6 +262,63 @@ class GetMeViewTest(APITestCase):
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+class BootstrapViewTest(APITestCase):
+    """Tests for the frontend bootstrap endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("auth:me-bootstrap")
+        self.user = UserFactory(username="testuser")
+        self.role = RoleFactory(code="PICKER")
+        AccessibilityFactory(
+            role=self.role,
+            module="master",
+            feature="item",
+            permission="read",
+        )
+        RoleMenuAccessFactory(role=self.role, menu=MenuFactory(code="ITEM"))
+
+    def _authenticate(self):
+        refresh = UserRefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def test_bootstrap(self):
+        """Profile, role, permissions and menus come in one response"""
+        UserRoleFactory(user=self.user, role=self.role)
+        self._authenticate()
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["user"]["username"] == "testuser"
+        assert response.data["role"]["code"] == "PICKER"
+        assert response.data["permissions"] == ["master.item.read"]
+        assert [menu["code"] for menu in response.data["menus"]] == ["ITEM"]
+
+    def test_bootstrap_without_role(self):
+        """Users without a role get empty permissions"""
+        self._authenticate()
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["role"] is None
+        assert response.data["permissions"] == []
+
+    @override_settings(JWT_PERMISSION_BITMAP=True)
+    def test_access_token_carries_permission_bitmap(self):
+        """Access tokens embed the role permission bitmap"""
+        UserRoleFactory(user=self.user, role=self.role)
+        refresh = UserRefreshToken.for_user(self.user)
+
+        claim = refresh.access_token["perms"]
+        assert permissions.has_permission(None, "master.item.read", claim)
+
+    def test_bootstrap_unauthenticated(self):
+        """Bootstrap requires authentication"""
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
 class ChangePasswordViewTest(APITestCase):
     """Tests for change password endpoint"""
 
@@ -335,6 +411,7 @@ class ChangePasswordViewTest(APITestCase):
     EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
     DEFAULT_FROM_EMAIL="test@example.com",
     FRONTEND_URL="http://localhost:3000",
+    CELERY_TASK_ALWAYS_EAGER=True,
 )
 class ResetPasswordRequestViewTest(APITestCase):
     """Tests for password reset request endpoint"""
@@ -356,6 +433,8 @@ class ResetPasswordRequestViewTest(APITestCase):
         assert "message" in response.data
         assert "token" in response.data
         assert "uid" in response.data
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ["test@example.com"]
 
     def test_reset_password_request_nonexistent_email(self):
         """Test password reset request fails with nonexistent email"""
@@ -380,10 +459,18 @@ class ResetPasswordRequestViewTest(APITestCase):
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    @patch("kancraonewms.users.api.auth_views.send_mail")
-    def test_reset_password_request_email_failure(self, mock_send_mail):
-        """Test password reset request handles email failure"""
-        mock_send_mail.side_effect = Exception("Email service error")
+    @patch("kancraonewms.users.api.auth_views.send_password_reset_email.delay")
+    def test_reset_password_request_queues_user_id(self, mock_delay):
+        """Only the user id is sent to the broker, never the reset link"""
+        response = self.client.post(self.url, {"email": "test@example.com"})
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_delay.assert_called_once_with(self.user.pk)
+
+    @patch("kancraonewms.users.api.auth_views.send_password_reset_email.delay")
+    def test_reset_password_request_email_failure(self, mock_delay):
+        """Test password reset request handles failure to queue the email"""
+        mock_delay.side_effect = Exception("Broker unavailable")
 
         response = self.client.post(
             self.url,
@@ -0,0 +1,138 @@
+"""
+Tests for stateless JWT authentication
+"""
+
+import pytest
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from kancraonewms.inventory.models import CycleCountTask
+from kancraonewms.users.authentication import USER_CACHE_KEY
+from kancraonewms.users.authentication import LazyUser
+from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
+
+
+class StatelessJWTAuthenticationTest(TestCase):
+    """Tests for authenticating from token claims"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory(username="picker", is_staff=True)
+        self.token = UserRefreshToken.for_user(self.user).access_token
+
+    def _authenticate(self, token):
+        request = APIRequestFactory().get(
+            "/api/",
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        user, _token = JWTStatelessUserAuthentication().authenticate(request)
+        return user
+
+    def test_tokens_carry_user_claims(self):
+        """Issued tokens embed username and staff flag"""
+        assert self.token["username"] == "picker"
+        assert self.token["is_staff"] is True
+        # Roles change while tokens live: they are looked up, not claimed
+        assert "role_id" not in self.token
+
+    def test_claims_are_served_without_queries(self):
+        """Identity checks never touch the database"""
+        with self.assertNumQueries(0):
+            user = self._authenticate(self.token)
+            assert isinstance(user, LazyUser)
+            assert user
+            assert user.is_authenticated
+            assert user.pk == self.user.pk
+            assert user.username == "picker"
+            assert user.is_staff
+
+    def test_full_user_is_loaded_once_and_cached(self):
+        """Other attributes load the user, later requests read the cache"""
+        with self.assertNumQueries(1):
+            assert self._authenticate(self.token).email == self.user.email
+        with self.assertNumQueries(0):
+            assert self._authenticate(self.token).email == self.user.email
+
+    def test_cached_user_leaves_out_password(self):
+        """The cache holds the request fields only, the hash stays deferred"""
+        self.user.set_password("TestPass123!@#")
+        self.user.save()
+        user = self._authenticate(self.token)
+        user.email  # noqa: B018
+
+        cached = cache.get(USER_CACHE_KEY.format(self.user.pk))
+        assert self.user.password not in cached
+        assert "password" in user.get_deferred_fields()
+        user.name = "Picker"
+        user.save()
+        self.user.refresh_from_db()
+        assert self.user.name == "Picker"
+        assert self.user.check_password("TestPass123!@#")
+
+    def test_token_without_claims_falls_back_to_user(self):
+        """Tokens issued without claims still resolve the username"""
+        token = RefreshToken.for_user(self.user).access_token
+
+        assert self._authenticate(token).username == "picker"
+
+    def test_user_change_invalidates_cache(self):
+        """Saving the user drops the cached copy"""
+        self._authenticate(self.token).email  # noqa: B018
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.email = "changed@example.com"
+            self.user.save()
+
+        assert self._authenticate(self.token).email == "changed@example.com"
+
+    def test_inactive_user_fails_when_loaded(self):
+        """A deactivated user is rejected once the full user is needed"""
+        self.user.is_active = False
+        self.user.save()
+        user = self._authenticate(self.token)
+
+        with pytest.raises(AuthenticationFailed):
+            user.email  # noqa: B018
+
+    def test_lazy_user_assigns_to_foreign_keys(self):
+        """The lazy user can be stored as a related user"""
+        user = self._authenticate(self.token)
+        task = CycleCountTask(counted_by=user)
+
+        assert task.counted_by_id == self.user.pk
+
+
+class StatelessJWTApiTest(TestCase):
+    """Tests for API requests authenticated from claims"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory(username="picker", email="picker@example.com")
+        token = UserRefreshToken.for_user(self.user).access_token
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+
+    def test_me_returns_full_profile(self):
+        """Views needing the full user still get every field"""
+        response = self.client.get(reverse("auth:me"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["email"] == "picker@example.com"
+
+    def test_login_issues_tokens_with_claims(self):
+        """Login responses carry the stateless claims"""
+        self.user.set_password("TestPass123!@#")
+        self.user.save()
+        response = self.client.post(
+            reverse("auth:login"),
+            {"username": "picker", "password": "TestPass123!@#"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        token = UserRefreshToken(response.data["refresh"])
+        assert token["username"] == "picker"
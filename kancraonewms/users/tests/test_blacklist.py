@@ -0,0 +1,116 @@
+"""
+Tests for the refresh token blacklist
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from kancraonewms.core.caching import isolated_cache
+from kancraonewms.users import blacklist
+from kancraonewms.users.tests.factories import UserFactory
+from kancraonewms.users.tokens import UserRefreshToken
+
+
+class BlacklistTest(TestCase):
+    """Tests for blacklisting token ids"""
+
+    def setUp(self):
+        cache.clear()
+        self.token = UserRefreshToken.for_user(UserFactory())
+        self.jti = self.token["jti"]
+
+    def test_add_and_contains(self):
+        """Blacklisted ids are found until added twice"""
+        assert not blacklist.contains(self.jti, self.token["exp"])
+        assert blacklist.add(self.jti, self.token["exp"])
+        assert blacklist.contains(self.jti, self.token["exp"])
+        assert not blacklist.add(self.jti, self.token["exp"])
+
+    def test_expired_tokens_are_not_stored(self):
+        """Tokens past their expiry need no entry"""
+        assert blacklist.add(self.jti, 0)
+        assert not blacklist.contains(self.jti, 0)
+
+    def test_bloom_offsets(self):
+        """Offsets are stable and inside the filter"""
+        offsets = blacklist.bloom_offsets(self.jti)
+
+        assert offsets == blacklist.bloom_offsets(self.jti)
+        assert len(offsets) == blacklist.BLOOM_HASHES
+        assert all(0 <= offset < blacklist.BLOOM_BITS for offset in offsets)
+
+    def test_raw_keys_follow_cache_prefix(self):
+        """Keys written to Redis directly stay inside a namespaced cache"""
+        assert blacklist._raw_key("key") == "key"  # noqa: SLF001
+        with isolated_cache("test"):
+            assert blacklist._raw_key("key") == f"{cache.key_prefix}:key"  # noqa: SLF001
+            assert not blacklist.contains(self.jti, self.token["exp"])
+            assert blacklist.add(self.jti, self.token["exp"])
+        assert not blacklist.contains(self.jti, self.token["exp"])
+
+    def test_admin_blacklisted_token_is_honoured(self):
+        """Tokens blacklisted in the database are rejected too"""
+        BlacklistedToken.objects.create(
+            token=OutstandingToken.objects.get(jti=self.jti),
+        )
+
+        assert blacklist.contains(self.jti, self.token["exp"])
+
+
+class TokenRefreshTest(TestCase):
+    """Tests for rotating refresh tokens against the blacklist"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("auth:token-refresh")
+        self.refresh = str(UserRefreshToken.for_user(UserFactory()))
+
+    def test_refresh_runs_without_queries(self):
+        """Refreshing with a cached user needs no database query"""
+        response = self.client.post(self.url, {"refresh": self.refresh})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {"refresh": response.data["refresh"]})
+        assert response.status_code == status.HTTP_200_OK
+        # Only the ATOMIC_REQUESTS savepoint is left
+        assert all("SAVEPOINT" in query["sql"] for query in queries)
+
+    def test_rotated_token_is_rejected(self):
+        """A consumed refresh token cannot be used again"""
+        response = self.client.post(self.url, {"refresh": self.refresh})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["refresh"] != self.refresh
+
+        response = self.client.post(self.url, {"refresh": self.refresh})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_refresh_restamps_user_claims(self):
+        """A demoted staff user loses staff access at the next refresh"""
+        user = UserFactory(is_staff=True)
+        refresh = str(UserRefreshToken.for_user(user))
+        user.is_staff = False
+        user.save()
+
+        response = self.client.post(self.url, {"refresh": refresh})
+
+        assert AccessToken(response.data["access"])["is_staff"] is False
+        assert UserRefreshToken(response.data["refresh"])["is_staff"] is False
+        audit = self.client.get(
+            reverse("api:auditentry-list"),
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access']}",
+        )
+        assert audit.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_rotation_writes_no_outstanding_tokens(self):
+        """Rotated tokens are not recorded in the database"""
+        self.client.post(self.url, {"refresh": self.refresh})
+
+        assert OutstandingToken.objects.count() == 1
+        assert not BlacklistedToken.objects.exists()
@@ -0,0 +1,73 @@
+"""
+Tests for pooled password hashing
+"""
+
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth.hashers import Argon2PasswordHasher
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.hashers import identify_hasher
+from django.contrib.auth.hashers import make_password
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from config.settings import base
+from kancraonewms.users.hashers import PooledArgon2PasswordHasher
+
+CHEAP_ARGON2 = {"time_cost": 1, "memory_cost": 64, "parallelism": 1}
+
+
+@override_settings(
+    PASSWORD_HASHERS=["kancraonewms.users.hashers.PooledArgon2PasswordHasher"],
+    PASSWORD_HASHING_ARGON2=CHEAP_ARGON2,
+)
+class PooledArgon2PasswordHasherTest(SimpleTestCase):
+    """Tests for the pooled argon2 hasher"""
+
+    def test_hash_and_verify(self):
+        """Hashes stay compatible with the stock argon2 format"""
+        encoded = make_password("s3cret-Pass")
+
+        assert encoded.startswith("argon2$argon2id$v=19$m=64,t=1,p=1$")
+        assert check_password("s3cret-Pass", encoded)
+        assert not check_password("wrong", encoded)
+
+    def test_hashing_runs_on_pool(self):
+        """Hashing happens on a password hashing thread"""
+        threads = []
+
+        def encode(hasher, password, salt):
+            threads.append(threading.current_thread().name)
+            return "argon2$hash"
+
+        with patch.object(Argon2PasswordHasher, "encode", autospec=True) as mock:
+            mock.side_effect = encode
+            PooledArgon2PasswordHasher().encode("s3cret-Pass", "salt")
+
+        assert threads[0].startswith("password-hashing")
+
+    def test_cost_change_requires_update(self):
+        """Stored hashes are upgraded after the costs are tuned"""
+        encoded = make_password("s3cret-Pass")
+
+        with override_settings(
+            PASSWORD_HASHING_ARGON2={**CHEAP_ARGON2, "time_cost": 2},
+        ):
+            assert get_hasher().must_update(encoded)
+        assert not get_hasher().must_update(encoded)
+
+
+@override_settings(
+    PASSWORD_HASHERS=base.PASSWORD_HASHERS,
+    PASSWORD_HASHING_ARGON2=CHEAP_ARGON2,
+)
+class ConfiguredHashersTest(SimpleTestCase):
+    """Tests for the hashers configured for the project"""
+
+    def test_stored_hashes_use_pool(self):
+        """Stored argon2 hashes are verified by the pooled hasher"""
+        hasher = identify_hasher(make_password("s3cret-Pass"))
+
+        assert isinstance(hasher, PooledArgon2PasswordHasher)
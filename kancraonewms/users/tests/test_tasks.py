@@ -1,7 +1,18 @@
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest.mock import patch
+
 import pytest
 from celery.result import EagerResult
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
 
 from kancraonewms.users.tasks import get_users_count
+from kancraonewms.users.tasks import prune_outstanding_tokens
+from kancraonewms.users.tasks import send_password_reset_email
 from kancraonewms.users.tests.factories import UserFactory
 
 pytestmark = pytest.mark.django_db
@@ -15,3 +26,52 @@ def test_user_count(settings):
     task_result = get_users_count.delay()
     assert isinstance(task_result, EagerResult)
     assert task_result.result == batch_size
+
+
+def test_prune_outstanding_tokens(user):
+    """Expired outstanding tokens are deleted in batches, live ones are kept."""
+    now = aware_utcnow()
+    OutstandingToken.objects.bulk_create(
+        OutstandingToken(
+            user=user,
+            jti=f"expired-{index}",
+            token="token",  # noqa: S106
+            expires_at=now - timedelta(days=1),
+        )
+        for index in range(5)
+    )
+    OutstandingToken.objects.create(
+        user=user,
+        jti="live",
+        token="token",  # noqa: S106
+        expires_at=now + timedelta(days=1),
+    )
+
+    assert prune_outstanding_tokens(batch_size=2) == 5  # noqa: PLR2004
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == ["live"]
+
+
+@patch("kancraonewms.users.tasks.send_mail")
+def test_send_password_reset_email_retries(mock_send_mail, user, settings):
+    """Transient mail failures are retried."""
+    settings.FRONTEND_URL = "http://localhost:3000"
+    mock_send_mail.side_effect = [SMTPException("Try again"), 1]
+
+    send_password_reset_email.apply(args=[user.pk])
+
+    assert mock_send_mail.call_count == 2  # noqa: PLR2004
+    assert mock_send_mail.call_args.kwargs["recipient_list"] == [user.email]
+
+
+@patch("kancraonewms.users.tasks.send_mail")
+def test_send_password_reset_email_builds_link(mock_send_mail, user, settings):
+    """The reset link is built in the task from the user id."""
+    settings.FRONTEND_URL = "http://localhost:3000"
+    send_password_reset_email.apply(args=[user.pk])
+
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    message = mock_send_mail.call_args.kwargs["message"]
+    link = message.rsplit(" ", 1)[-1]
+    assert link.startswith(f"{settings.FRONTEND_URL}/reset-password/{uid}/")
+    token = link.rstrip("/").rsplit("/", 1)[-1]
+    assert default_token_generator.check_token(user, token)
@@ -0,0 +1,65 @@
+"""
+JWT tokens carrying the user claims read by stateless authentication.
+
+Claims are copied from the refresh token into every access token minted from
+it. A refresh stamps them afresh from the current user first, so changes reach
+the caller within one ``ACCESS_TOKEN_LIFETIME``.
+
+With ``JWT_PERMISSION_BITMAP`` access tokens also carry the role's permissions
+as a bitmap (``perms`` claim, see :mod:`kancraonewms.master.services.permissions`),
+stamped afresh whenever an access token is minted.
+
+Refresh tokens are blacklisted in Redis (see :mod:`kancraonewms.users.blacklist`)
+rather than in the token_blacklist tables. Only tokens issued at login are
+recorded as OutstandingToken rows; tokens minted by rotation are not.
+"""
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from kancraonewms.master.services import permissions
+from kancraonewms.master.services import user_roles
+
+from . import blacklist as redis_blacklist
+
+
+def user_claims(user):
+    """Return the user attributes embedded in issued tokens"""
+    return {
+        "username": user.get_username(),
+        "is_staff": user.is_staff,
+    }
+
+
+class UserRefreshToken(RefreshToken):
+    """Refresh token stamped with :func:`user_claims`"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim, value in user_claims(user).items():
+            token[claim] = value
+        return token
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        if settings.JWT_PERMISSION_BITMAP:
+            role_id = user_roles.get_role_id(self[api_settings.USER_ID_CLAIM])
+            if role_id is not None:
+                access["perms"] = permissions.token_claim(role_id)
+        return access
+
+    def check_blacklist(self):
+        if redis_blacklist.contains(self.payload[api_settings.JTI_CLAIM], self["exp"]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """Blacklist this token, returning False if it already was"""
+        return redis_blacklist.add(self.payload[api_settings.JTI_CLAIM], self["exp"])
+
+    def outstand(self):
+        return None